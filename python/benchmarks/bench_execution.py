@@ -0,0 +1,42 @@
+"""Compare sequential, threaded and process-pool module execution.
+
+Usage:
+    python -m benchmarks.bench_execution --rows 1000000 --workers 8
+"""
+
+import argparse
+import logging
+
+from benchmarks.common import MODULES_DIR, best_of, make_dataset
+from src.core.module_registry import ModuleRegistry
+from src.core.module_runner import ModuleRunner
+from src.core.parallel_runner import ParallelModuleRunner, ThreadedModuleRunner
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    dataset = make_dataset(args.rows)
+    modules = ModuleRegistry(MODULES_DIR).discover_modules()
+
+    runners = {
+        "sequential": ModuleRunner(),
+        "thread": ThreadedModuleRunner(max_workers=args.workers),
+        "process": ParallelModuleRunner(max_workers=args.workers),
+    }
+
+    print(f"{len(modules)} modules, {args.rows} rows")
+    baseline = None
+    for mode, runner in runners.items():
+        seconds = best_of(lambda r=runner: r.run_modules(modules, dataset), args.repeat)
+        baseline = baseline or seconds
+        print(f"{mode:>10}: {seconds:8.3f}s  ({baseline / seconds:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Compare JSON ingest paths: json.load + pd.DataFrame vs. column-oriented.
+
+Usage:
+    python -m benchmarks.bench_ingest --rows 1000000 10000000 --workers 8
+"""
+
+import argparse
+import json
+import logging
+import tempfile
+import tracemalloc
+from functools import partial
+from pathlib import Path
+
+import pandas as pd
+
+from benchmarks.common import best_of, make_dataset
+from src.core.json_ingest import ColumnarRecordReader
+from src.core.parallel_ingest import ParallelRecordReader
+
+
+def load_records(path: Path) -> pd.DataFrame:
+    """The plain ingest path: a list of dicts handed to pandas."""
+    with open(path) as f:
+        return pd.DataFrame(json.load(f))
+
+
+def peak_memory_mb(func) -> float:
+    """Return the peak Python heap allocation of one call in MiB."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / (1 << 20)
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 10_000_000])
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--memory", action="store_true", help="Also report peak heap usage (slow)"
+    )
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    paths = {
+        "json.load + DataFrame": load_records,
+        "columnar": ColumnarRecordReader().read,
+        "columnar, parallel": ParallelRecordReader(
+            max_workers=args.workers, min_parallel_bytes=0
+        ).read,
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in args.rows:
+            path = Path(tmp) / f"records_{n_rows}.json"
+            make_dataset(n_rows).to_json(path, orient="records", date_format="iso")
+            size_mb = path.stat().st_size / (1 << 20)
+            print(f"{n_rows} rows ({size_mb:.0f} MiB)")
+
+            baseline = None
+            for name, load in paths.items():
+                run = partial(load, path)
+                seconds = best_of(run, args.repeat)
+                baseline = baseline or seconds
+                line = f"{name:>22}: {seconds:8.3f}s  ({baseline / seconds:.2f}x)"
+                if args.memory:
+                    line += f"  peak {peak_memory_mb(run):8.0f} MiB"
+                print(line)
+            path.unlink()
+
+
+if __name__ == "__main__":
+    main()
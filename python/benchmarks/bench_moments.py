@@ -0,0 +1,112 @@
+"""Compare per-column statistics with the vectorized moments kernel.
+
+The variance modules used to reduce every column separately: drop its
+missing values, then take the mean, two variances, the standard deviation
+and the extremes, one pass each. ``column_moments`` summarizes all columns
+of a wide frame together, with a handful of array operations per block of
+columns rather than a single pass. The benchmark reports what that costs:
+the wall time and the peak memory allocated while computing, as traced
+by ``tracemalloc``, which is the size of the temporaries each approach
+writes.
+
+Usage:
+    python -m benchmarks.bench_moments --rows 200000 --columns 200
+"""
+
+import argparse
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.common import best_of
+from src.core.moments import column_moments, variance
+
+
+def make_wide_dataset(n_rows: int, n_columns: int, seed: int = 42) -> pd.DataFrame:
+    """Create float columns with about 5% missing values."""
+    rng = np.random.default_rng(seed)
+    values = rng.normal(50, 15, (n_rows, n_columns))
+    values[rng.random((n_rows, n_columns)) < 0.05] = np.nan
+    return pd.DataFrame(values, columns=[f"x{i}" for i in range(n_columns)])
+
+
+def per_column(frame: pd.DataFrame, ddof: int = 1) -> dict:
+    """Compute the statistics the way the variance modules used to."""
+    results = {}
+    for column in frame.columns:
+        col_data = frame[column].dropna()
+        results[column] = {
+            "count": len(col_data),
+            "mean": col_data.mean(),
+            "sample_variance": col_data.var(ddof=ddof),
+            "population_variance": col_data.var(ddof=0),
+            "std": col_data.std(ddof=ddof),
+            "min": col_data.min(),
+            "max": col_data.max(),
+        }
+    return results
+
+
+def vectorized(frame: pd.DataFrame, ddof: int = 1) -> dict:
+    """Compute the same statistics from the moments of all columns."""
+    results = {}
+    for column, moments in column_moments(frame).items():
+        sample_variance = variance(moments, ddof)
+        results[column] = {
+            "count": moments["count"],
+            "mean": moments["mean"],
+            "sample_variance": sample_variance,
+            "population_variance": variance(moments, 0),
+            "std": np.sqrt(sample_variance),
+            "min": moments["min"],
+            "max": moments["max"],
+        }
+    return results
+
+
+def peak_bytes(func: Callable[[], Any]) -> int:
+    """Return the peak memory allocated while calling a function."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--columns", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    frame = make_wide_dataset(args.rows, args.columns)
+    print(f"{args.rows} rows x {args.columns} columns, 5% missing")
+
+    data_mib = frame.memory_usage(index=False).sum() / 1024 / 1024
+    print(f"data: {data_mib:.1f} MiB")
+    baseline = best_of(lambda: per_column(frame), args.repeat)
+    seconds = best_of(lambda: vectorized(frame), args.repeat)
+    baseline_peak = peak_bytes(lambda: per_column(frame)) / 1024 / 1024
+    peak = peak_bytes(lambda: vectorized(frame)) / 1024 / 1024
+    print(f"per column: {baseline:8.3f}s  peak {baseline_peak:8.1f} MiB allocated")
+    print(
+        f"vectorized: {seconds:8.3f}s  peak {peak:8.1f} MiB allocated  "
+        f"({baseline / seconds:.2f}x faster)"
+    )
+
+    expected, actual = per_column(frame), vectorized(frame)
+    error = max(
+        abs(actual[column][key] - value) / max(abs(value), 1e-300)
+        for column, stats in expected.items()
+        for key, value in stats.items()
+    )
+    print(f"largest relative difference: {error:.1e}")
+
+
+if __name__ == "__main__":
+    main()
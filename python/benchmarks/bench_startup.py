@@ -0,0 +1,88 @@
+"""Measure CLI cold-start import time and check it against a stored budget.
+
+The ``--list-modules`` fast path is run under ``python -X importtime``; the
+per-module self times are summed into a total import time. The check fails
+(exit status 1) if the best of several runs exceeds the budget in
+``startup_budget.json`` or if any forbidden heavy package gets imported.
+
+Usage:
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --update   # store a new budget
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+BUDGET_FILE = Path(__file__).parent / "startup_budget.json"
+COMMAND = [sys.executable, "-X", "importtime", "-m", "src", "--list-modules"]
+
+
+def measure_once() -> tuple[float, set[str]]:
+    """Run the CLI once and parse its import timings.
+
+    Returns:
+        Total import time in milliseconds and the set of imported
+        top-level packages
+    """
+    completed = subprocess.run(
+        COMMAND, cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    )
+
+    total_us = 0
+    packages = set()
+    for line in completed.stderr.splitlines():
+        # Format: "import time: <self us> | <cumulative us> | <module>"
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:") :].split("|")
+        total_us += int(self_us)
+        packages.add(name.strip().split(".")[0])
+    return total_us / 1000, packages
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--update",
+        action="store_true",
+        help="Store the measured time plus headroom as the new budget",
+    )
+    parser.add_argument("--headroom", type=float, default=2.0)
+    args = parser.parse_args()
+
+    budget = json.loads(BUDGET_FILE.read_text())
+    runs = [measure_once() for _ in range(args.repeat)]
+    import_ms = min(total for total, _ in runs)
+    packages = set().union(*(imported for _, imported in runs))
+    print(f"Cold-start import time: {import_ms:.1f} ms")
+
+    if args.update:
+        budget["max_import_ms"] = round(import_ms * args.headroom, 1)
+        BUDGET_FILE.write_text(json.dumps(budget, indent=2) + "\n")
+        print(f"Stored new budget: {budget['max_import_ms']} ms")
+        return
+
+    failures = []
+    if import_ms > budget["max_import_ms"]:
+        failures.append(
+            f"import time {import_ms:.1f} ms exceeds budget "
+            f"{budget['max_import_ms']} ms"
+        )
+    forbidden = sorted(packages & set(budget["forbidden_imports"]))
+    if forbidden:
+        failures.append(f"heavy packages imported at startup: {forbidden}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print(f"OK (budget {budget['max_import_ms']} ms)")
+
+
+if __name__ == "__main__":
+    main()
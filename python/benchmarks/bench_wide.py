@@ -0,0 +1,102 @@
+"""Time the per-column modules on feature tables of growing width.
+
+``basic_stats`` and ``outlier_detection`` select their columns by pattern
+and process them as two-dimensional blocks, so their cost should grow
+linearly with the number of columns: the time per column stays flat as
+the table widens. Each width is analyzed as the runner would, with a
+fresh ``PreparedDataset`` and its shared column statistics.
+
+The values are uniform, so the fences and z-scores find no outliers and
+the timings measure the screening rather than the reporting. Correlation
+is left out: its matrix grows with the square of the number of columns.
+
+The full size needs about 8 GB per copy of the values in float64; the
+table is generated in float32 to halve that.
+
+Usage:
+    python -m benchmarks.bench_wide --rows 100000 --columns 10000
+"""
+
+import argparse
+import types
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.common import best_of
+from src.core.column_selection import select_columns
+from src.core.prepared import PreparedDataset
+from src.modules.basic_stats import config as basic_stats_config
+from src.modules.basic_stats import engine as basic_stats_engine
+from src.modules.basic_stats import model as basic_stats_model
+from src.modules.outlier_detection import config as outlier_config
+from src.modules.outlier_detection import engine as outlier_engine
+from src.modules.outlier_detection import model as outlier_model
+
+SELECTION = {"include": ["feature_*"], "exclude": ["*_id"]}
+
+MODULES = {
+    "basic_stats": (basic_stats_engine, basic_stats_model, basic_stats_config),
+    "outlier_detection": (outlier_engine, outlier_model, outlier_config),
+}
+
+
+def make_wide_dataset(n_rows: int, n_columns: int, seed: int = 42) -> pd.DataFrame:
+    """Create a feature table of uniform float32 columns and a record id."""
+    rng = np.random.default_rng(seed)
+    values = rng.random((n_rows, n_columns), dtype=np.float32)
+    frame = pd.DataFrame(values, columns=[f"feature_{i}" for i in range(n_columns)])
+    frame.insert(0, "record_id", np.arange(n_rows))
+    return frame
+
+
+def analyze(name: str, dataset: pd.DataFrame) -> dict:
+    """Run one module on the selected columns, as the runner would."""
+    engine, model, config = MODULES[name]
+    parameters = dict(config.PARAMETERS, columns_to_analyze=SELECTION)
+    config = types.SimpleNamespace(
+        DESCRIPTION=config.DESCRIPTION, PARAMETERS=parameters
+    )
+    prepared = PreparedDataset(dataset)
+    return engine.analyze(
+        dataset, model, config, prepared=prepared, stats=prepared.statistics
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--columns", type=int, default=10_000)
+    parser.add_argument("--steps", type=int, default=4, help="widths, halving")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    full = make_wide_dataset(args.rows, args.columns)
+    widths = sorted({max(1, args.columns >> step) for step in range(args.steps)})
+    print(f"{args.rows} rows, up to {args.columns} float32 columns")
+    print(
+        f"{'columns':>8} {'module':>18} {'seconds':>9} {'us/column':>10}"
+        f" {'scaling':>8}"
+    )
+
+    baseline = {}
+    for width in widths:
+        dataset = full.iloc[:, : width + 1]
+        seconds = best_of(lambda d=dataset: select_columns(d, SELECTION), args.repeat)
+        timings = {"column selection": seconds}
+        for name in MODULES:
+            timings[name] = best_of(
+                lambda n=name, d=dataset: analyze(n, d), args.repeat
+            )
+        for name, seconds in timings.items():
+            per_column = seconds / width
+            # Time per column relative to the narrowest table; 1.00 is linear
+            baseline.setdefault(name, per_column)
+            print(
+                f"{width:>8} {name:>18} {seconds:>9.3f} {per_column * 1e6:>10.1f}"
+                f" {per_column / baseline[name]:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
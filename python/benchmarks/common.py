@@ -0,0 +1,46 @@
+"""Shared helpers for the benchmark scripts."""
+
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).parent.parent
+MODULES_DIR = PROJECT_ROOT / "src" / "modules"
+
+
+def make_dataset(n_rows: int, seed: int = 42) -> pd.DataFrame:
+    """Create a synthetic dataset with the same schema as the sample data.
+
+    Args:
+        n_rows: Number of records to generate
+        seed: Random seed for reproducibility
+
+    Returns:
+        DataFrame shaped like ``data/sample_data.json``
+    """
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "id": np.arange(1, n_rows + 1),
+            "value": rng.normal(50, 15, n_rows),
+            "category": rng.choice(["A", "B", "C"], n_rows),
+            "score": rng.uniform(0, 100, n_rows),
+            "count": rng.poisson(10, n_rows),
+            "flag": rng.choice([True, False], n_rows),
+            "timestamp": pd.date_range("2024-01-01", periods=n_rows, freq="s"),
+        }
+    )
+
+
+def best_of(func: Callable[[], Any], repeat: int = 3) -> float:
+    """Return the fastest wall time in seconds over several calls."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
@@ -0,0 +1,140 @@
+"""Selection of the columns a module analyzes, resolved against a schema.
+
+Modules read their columns from ``PARAMETERS["columns_to_analyze"]``,
+given either as a list of names or as a dictionary::
+
+    "columns_to_analyze": {
+        "include": ["value", "feature_*"],  # names and glob patterns
+        "regex": r"sensor_\\d+",             # matched against whole names
+        "dtypes": ["number"],               # as in DataFrame.select_dtypes
+        "exclude": ["*_id"],                # names and patterns to leave out
+    }
+
+A list is short for ``{"include": list}``. Names without glob characters
+are taken as given whatever their dtype, as modules coerce their columns
+to numbers anyway; modules may require them to be present. Patterns and
+the regular expression select among the columns whose dtype is one of
+``dtypes`` (numbers by default), and without ``include`` or ``regex``
+all such columns are selected. Columns come in the order of ``include``,
+the matches of each pattern in dataset order, then those of ``regex``.
+
+``PreparedDataset.select_columns`` resolves a selection once per dataset;
+``resolve_columns`` uses it when the runner shares a preparation.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import re
+from collections.abc import Callable, Hashable
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from src.core.prepared import PreparedDataset
+
+DEFAULT_DTYPES = ("number",)
+
+_GLOB_CHARACTERS = frozenset("*?[")
+
+
+def select_columns(dataset: pd.DataFrame, selection: Any) -> list[Any]:
+    """Return the columns of a dataset that a selection picks.
+
+    Args:
+        dataset: Dataset, or any frame with its schema
+        selection: List of names and patterns, or dictionary with
+            "include", "regex", "dtypes" and "exclude"
+
+    Returns:
+        Selected column labels, without duplicates
+    """
+    include, regex, dtypes, exclude = _normalize(selection)
+    excluded = [_matcher(pattern) for pattern in exclude]
+    # select_dtypes copies the values it selects; only the schema is needed
+    typed = (
+        list(dataset.iloc[:0].select_dtypes(include=list(dtypes)).columns)
+        if dtypes
+        else list(dataset.columns)
+    )
+
+    selected: dict[Any, None] = {}
+
+    def add(columns: list[Any]) -> None:
+        for column in columns:
+            if not any(match(str(column)) for match in excluded):
+                selected.setdefault(column)
+
+    for pattern in include or ():
+        if _is_pattern(pattern):
+            match = _matcher(pattern)
+            add([column for column in typed if match(str(column))])
+        elif pattern in dataset.columns:
+            add([pattern])
+    if regex is not None:
+        match = re.compile(regex).fullmatch
+        add([column for column in typed if match(str(column))])
+    if include is None and regex is None:
+        add(typed)
+    return list(selected)
+
+
+def resolve_columns(
+    dataset: pd.DataFrame, selection: Any, prepared: PreparedDataset | None = None
+) -> list[Any]:
+    """Return the selected columns, memoized in the run's preparation if any.
+
+    Args:
+        dataset: Dataset the module analyzes
+        selection: Column selection, as for ``select_columns``
+        prepared: Shared preparation of the dataset, if the runner provides one
+    """
+    if prepared is not None:
+        return prepared.select_columns(selection)
+    return select_columns(dataset, selection)
+
+
+def required_columns(selection: Any) -> list[str]:
+    """Return the plain names a selection includes, which are not patterns.
+
+    Args:
+        selection: Column selection, as for ``select_columns``
+    """
+    include, _, _, _ = _normalize(selection)
+    return [name for name in include or () if not _is_pattern(name)]
+
+
+def selection_key(selection: Any) -> Hashable:
+    """Return a hashable form of a selection, for memoizing its resolution."""
+    include, regex, dtypes, exclude = _normalize(selection)
+    return (include, regex, dtypes, exclude)
+
+
+def _normalize(
+    selection: Any,
+) -> tuple[tuple[str, ...] | None, str | None, tuple[str, ...], tuple[str, ...]]:
+    """Return the include, regex, dtypes and exclude parts of a selection."""
+    if isinstance(selection, dict):
+        unknown = set(selection) - {"include", "regex", "dtypes", "exclude"}
+        if unknown:
+            raise ValueError(f"Unknown column selection keys: {sorted(unknown)}")
+        include = selection.get("include")
+        return (
+            tuple(include) if include is not None else None,
+            selection.get("regex"),
+            tuple(selection.get("dtypes", DEFAULT_DTYPES) or ()),
+            tuple(selection.get("exclude", ())),
+        )
+    if isinstance(selection, str):
+        selection = [selection]
+    return tuple(selection), None, DEFAULT_DTYPES, ()
+
+
+def _is_pattern(name: Any) -> bool:
+    return isinstance(name, str) and not _GLOB_CHARACTERS.isdisjoint(name)
+
+
+def _matcher(pattern: str) -> Callable[[str], Any]:
+    """Return a function telling whether a column name matches a glob pattern."""
+    return re.compile(fnmatch.translate(pattern)).match
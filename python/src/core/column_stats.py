@@ -0,0 +1,427 @@
+"""Run-scoped column statistics, computed once and shared by all modules.
+
+Several modules describe the same columns: ``basic_stats`` and the
+variance modules all take means, variances, extremes and quartiles, and
+``outlier_detection`` needs the mean, standard deviation and quartiles of
+the columns it screens. A ``StatisticsService`` computes each statistic
+of a column's values on first use and hands the memoized result to every
+later caller, counting hits and misses.
+
+The values of a column are identified by a row selection, since modules
+clean their data differently: by default all non-missing values of the
+column, or with ``rows="complete"`` the values in the rows where all of
+a group of columns are present. Statistics use the same pandas calls as
+the modules did, so migrated modules produce identical results.
+``moments`` summarizes many columns at once with the vectorized kernel
+of ``src.core.moments``, and ``describe`` adds their medians and
+quantiles (``src.core.describe``); order statistics come from the sorted order of
+the columns kept by ``src.core.sorted_index``, or for integers from a
+small range from their counts (``src.core.histogram``).
+
+Engines opt in by accepting a ``stats`` keyword argument in ``analyze``;
+see ``MODULE_SPEC.md``.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable, Iterable
+from typing import TYPE_CHECKING, Any
+
+from src.core.prepared import MemoTable
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+    from src.core.prepared import PreparedDataset
+
+
+class StatisticsService:
+    """Memoized per-column statistics of one prepared dataset."""
+
+    def __init__(self, prepared: PreparedDataset):
+        """Initialize the service.
+
+        Args:
+            prepared: Preparation of the dataset the statistics describe
+        """
+        self.prepared = prepared
+        self._memo = MemoTable()
+        # Selected values are kept apart so the counters only count statistics
+        self._values = MemoTable()
+
+    def column(
+        self,
+        column: str,
+        rows: str | None = None,
+        among: Iterable[str] | None = None,
+    ) -> ColumnStatistics:
+        """Return the statistics of one column's values.
+
+        Args:
+            column: Column name, coerced to numeric
+            rows: None for all non-missing values of the column, or
+                "complete" for its values in the rows where all of
+                ``among`` are present, as after ``dropna(subset=among)``
+            among: Columns that must be present with ``rows="complete"``;
+                defaults to the column alone
+
+        Returns:
+            Lazily computed statistics of the values
+        """
+        if rows not in (None, "complete"):
+            raise ValueError(f"Unknown row selection {rows!r}")
+        among = tuple(among) if among is not None else (column,)
+        if rows is None or among == (column,):
+            return ColumnStatistics(self, (column, None))
+        if column not in among:
+            raise ValueError(f"Column {column!r} is not among {among}")
+        return ColumnStatistics(self, (column, among))
+
+    def values(self, selection: tuple[str, tuple[str, ...] | None]) -> pd.Series:
+        """Return the values a selection describes.
+
+        Args:
+            selection: Column name and the columns whose complete rows are
+                kept, or None to drop just the column's missing values
+        """
+        column, among = selection
+
+        def build() -> pd.Series:
+            values = self.prepared.numeric(column)
+            if among is None:
+                return values.dropna()
+            return values[self.prepared.complete_rows(among)]
+
+        return self._values.get(selection, build)
+
+    def sorted_positions(
+        self, selection: tuple[str, tuple[str, ...] | None]
+    ) -> np.ndarray:
+        """Return the row positions of a selection's values in sorted order.
+
+        Args:
+            selection: Column name and row selection, as for ``values``
+        """
+        column, among = selection
+
+        def build() -> np.ndarray:
+            rows = None if among is None else self.prepared.complete_rows(among)
+            return self.prepared.sorted_index.sorted_positions(column, rows)
+
+        return self._values.get(("sorted_positions", selection), build)
+
+    def sorted_values(
+        self, selection: tuple[str, tuple[str, ...] | None]
+    ) -> np.ndarray:
+        """Return a selection's values in ascending order.
+
+        Args:
+            selection: Column name and row selection, as for ``values``
+        """
+        column, _ = selection
+        return self._values.get(
+            ("sorted_values", selection),
+            lambda: self.prepared.numeric(column).to_numpy()[
+                self.sorted_positions(selection)
+            ],
+        )
+
+    def histogram(
+        self, selection: tuple[str, tuple[str, ...] | None]
+    ) -> dict[str, Any] | None:
+        """Return the value counts of a selection of small-range integers.
+
+        Args:
+            selection: Column name and row selection, as for ``values``
+
+        Returns:
+            Histogram from ``src.core.histogram``, or None if the values are
+            not integers from a small range
+        """
+        from src.core.histogram import integer_histogram
+
+        return self._values.get(
+            ("histogram", selection),
+            lambda: integer_histogram(self.values(selection).to_numpy()),
+        )
+
+    def moments(self, columns: Iterable[str]) -> dict[str, dict[str, Any]]:
+        """Return the moments of the non-missing values of several columns.
+
+        The columns are summarized together by
+        ``src.core.moments.column_moments``, over every row of the dataset.
+
+        Args:
+            columns: Column names, coerced to numeric
+
+        Returns:
+            Mapping of column names to moments, shared between callers
+        """
+        from src.core.moments import column_moments
+
+        columns = tuple(columns)
+        return self._memoize(
+            ("moments", columns),
+            lambda: column_moments(self.prepared.frame(columns), list(columns)),
+        )
+
+    def describe(
+        self,
+        columns: Iterable[str],
+        rows: str | None = None,
+        quantiles: Iterable[float] = (),
+    ) -> dict[str, np.ndarray]:
+        """Return the descriptive statistics of several columns at once.
+
+        The columns are described together by
+        ``src.core.describe.describe_columns``.
+
+        Args:
+            columns: Column names, coerced to numeric
+            rows: None for the non-missing values of each column, or
+                "complete" for the rows where all of ``columns`` are present
+            quantiles: Quantiles to compute besides the median
+
+        Returns:
+            Arrays of statistics with an entry per column, shared between
+            callers
+        """
+        from src.core.describe import describe_columns
+
+        columns = tuple(columns)
+        quantiles = tuple(quantiles)
+        return self._memoize(
+            ("describe", columns, rows, quantiles),
+            lambda: describe_columns(
+                self.prepared.frame(columns, rows=rows), list(quantiles)
+            ),
+        )
+
+    def counters(self) -> dict[str, Any]:
+        """Report the statistics served from the memo and those computed.
+
+        Returns:
+            Hits, misses and the seconds the hits would otherwise have cost
+        """
+        return {
+            "hits": self._memo.hits,
+            "misses": self._memo.misses,
+            "seconds_saved": round(self._memo.seconds_saved, 6),
+        }
+
+    def _memoize(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        return self._memo.get(key, build)
+
+
+class ColumnStatistics:
+    """Statistics of one selection of a column's values.
+
+    Every statistic is computed on first use and memoized in the service,
+    so columns described by several modules are only reduced once. Order
+    statistics (extremes, median, quantiles, ranks) are looked up in the
+    dataset's ``sorted_index``; the others use the pandas method of the
+    same name. Integers from a small range are counted instead, and their
+    extremes, median, quantiles, mode and mean read off the counts
+    (``src.core.histogram``). The methods match those of a Series of the
+    values, which modules without the service use instead.
+    """
+
+    def __init__(
+        self,
+        service: StatisticsService,
+        selection: tuple[str, tuple[str, ...] | None],
+    ):
+        """Initialize the statistics of a selection.
+
+        Args:
+            service: Service holding the memoized results
+            selection: Column name and row selection of the values
+        """
+        self.service = service
+        self.selection = selection
+
+    @property
+    def values(self) -> pd.Series:
+        """The selected values, without missing values."""
+        return self.service.values(self.selection)
+
+    def count(self) -> int:
+        """Return the number of values."""
+        return self._statistic("count", lambda values: len(values))
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def mean(self) -> Any:
+        """Return the mean of the values."""
+        from src.core.histogram import histogram_mean
+
+        def compute(values: pd.Series) -> Any:
+            histogram = self.histogram
+            mean = histogram_mean(histogram) if histogram is not None else None
+            return values.mean() if mean is None else mean
+
+        return self._statistic("mean", compute)
+
+    def var(self, ddof: int = 1) -> Any:
+        """Return the variance of the values.
+
+        Args:
+            ddof: Delta degrees of freedom
+        """
+        return self._statistic("var", lambda values: values.var(ddof=ddof), ddof)
+
+    def std(self, ddof: int = 1) -> Any:
+        """Return the standard deviation, the square root of ``var(ddof)``.
+
+        Args:
+            ddof: Delta degrees of freedom
+        """
+        import numpy as np
+
+        # Series.std is the square root of Series.var, so reuse the variance
+        return self._statistic("std", lambda values: np.sqrt(self.var(ddof)), ddof)
+
+    def min(self) -> Any:
+        """Return the smallest value."""
+        from src.core.histogram import histogram_min
+
+        return self._statistic(
+            "min", lambda values: self._order(histogram_min, 0, values.min)
+        )
+
+    def max(self) -> Any:
+        """Return the largest value."""
+        from src.core.histogram import histogram_max
+
+        return self._statistic(
+            "max", lambda values: self._order(histogram_max, -1, values.max)
+        )
+
+    def median(self) -> Any:
+        """Return the median of the values."""
+        from src.core.histogram import histogram_median
+        from src.core.sorted_index import sorted_median
+
+        def compute(values: pd.Series) -> Any:
+            histogram = self.histogram
+            if histogram is not None:
+                return histogram_median(histogram)
+            return sorted_median(self.sorted)
+
+        return self._statistic("median", compute)
+
+    def quantile(self, q: float) -> Any:
+        """Return a quantile of the values, linearly interpolated.
+
+        Args:
+            q: Quantile between 0 and 1
+        """
+        from src.core.histogram import histogram_quantile
+        from src.core.sorted_index import linear_quantile
+
+        def compute(values: pd.Series) -> Any:
+            histogram = self.histogram
+            if histogram is not None:
+                return histogram_quantile(histogram, q)
+            return linear_quantile(self.sorted, q)
+
+        return self._statistic("quantile", compute, q)
+
+    def mode(self) -> Any:
+        """Return the most frequent value, the smallest of several.
+
+        Returns:
+            The first of ``Series.mode()``, NaN if there are no values
+        """
+        import numpy as np
+
+        from src.core.histogram import histogram_mode
+
+        def compute(values: pd.Series) -> Any:
+            histogram = self.histogram
+            if histogram is not None:
+                return histogram_mode(histogram)
+            modes = values.mode()
+            return modes.iloc[0] if len(modes) else np.nan
+
+        return self._statistic("mode", compute)
+
+    @property
+    def histogram(self) -> dict[str, Any] | None:
+        """Counts of the values if they are integers from a small range."""
+        return self.service.histogram(self.selection)
+
+    @property
+    def sorted(self) -> np.ndarray:
+        """The selected values in ascending order."""
+        return self.service.sorted_values(self.selection)
+
+    def ranks(self) -> pd.Series:
+        """Return the ranks of the values, as ``Series.rank()``.
+
+        Returns:
+            Ranks from 1, tied values sharing their average rank, indexed
+            like the values
+        """
+        from src.core.sorted_index import average_ranks
+
+        def compute(values: pd.Series) -> pd.Series:
+            import numpy as np
+            import pandas as pd
+
+            positions = self.service.sorted_positions(self.selection)
+            ranks = np.empty(len(self.service.prepared.dataset))
+            ranks[positions] = average_ranks(self.sorted)
+            # Back in row order, like the values themselves
+            positions = np.sort(positions)
+            return pd.Series(ranks[positions], index=values.index, name=values.name)
+
+        return self._statistic("ranks", compute)
+
+    def outside(self, lower: float, upper: float) -> list[Any]:
+        """Return the row labels of the values below or above two bounds.
+
+        Equivalent to ``values[(values < lower) | (values > upper)]``, but
+        found by binary search in the sorted values.
+
+        Args:
+            lower: Values below this bound are returned
+            upper: Values above this bound are returned
+
+        Returns:
+            Row labels in row order
+        """
+        import numpy as np
+
+        positions = self.service.sorted_positions(self.selection)
+        sorted_values = self.sorted
+        # Nothing compares below or above a NaN bound
+        below = 0 if np.isnan(lower) else np.searchsorted(sorted_values, lower, "left")
+        above = (
+            len(sorted_values)
+            if np.isnan(upper)
+            else np.searchsorted(sorted_values, upper, "right")
+        )
+        outside = np.sort(np.concatenate([positions[:below], positions[above:]]))
+        return self.service.prepared.dataset.index[outside].tolist()
+
+    def _order(
+        self,
+        from_histogram: Callable[[dict[str, Any]], Any],
+        position: int,
+        fallback: Callable[[], Any],
+    ) -> Any:
+        histogram = self.histogram
+        if histogram is not None:
+            return from_histogram(histogram)
+        sorted_values = self.sorted
+        return sorted_values[position] if len(sorted_values) else fallback()
+
+    def _statistic(
+        self, name: str, compute: Callable[[pd.Series], Any], *args: Any
+    ) -> Any:
+        return self.service._memoize(
+            (name, self.selection, *args), lambda: compute(self.values)
+        )
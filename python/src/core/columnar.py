@@ -0,0 +1,144 @@
+"""Column encoding helpers for moving DataFrames between processes and files.
+
+A DataFrame is split into flat NumPy arrays, one per column. Numeric,
+boolean and datetime columns are kept as their raw values; categorical,
+string and other object columns are factorized into small integer codes
+plus a list of unique values. The arrays can then be placed in shared
+memory or written to disk and turned back into a DataFrame without
+copying the raw values.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+# NumPy dtype kinds that are stored as raw values
+RAW_KINDS = "biufcmM"
+
+
+@dataclass
+class EncodedColumn:
+    """A single column reduced to a flat array plus decoding metadata."""
+
+    name: Any
+    kind: str  # "raw", "categorical" or "encoded"
+    dtype: str
+    values: np.ndarray
+    categories: list[Any] = field(default_factory=list)
+    ordered: bool = False
+
+
+def _codes_dtype(n_uniques: int) -> np.dtype:
+    """Return the smallest signed integer dtype able to hold the codes."""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_uniques < np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def encode_column(name: Any, series: pd.Series) -> EncodedColumn:
+    """Encode a column into a flat NumPy array.
+
+    Args:
+        name: Column label
+        series: Column values
+
+    Returns:
+        EncodedColumn holding the array and the metadata needed to decode it
+    """
+    dtype = series.dtype
+
+    if isinstance(dtype, np.dtype) and dtype.kind in RAW_KINDS:
+        return EncodedColumn(name, "raw", dtype.str, series.to_numpy())
+
+    if isinstance(dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        return EncodedColumn(
+            name,
+            "categorical",
+            str(dtype),
+            codes.astype(_codes_dtype(len(dtype.categories)), copy=False),
+            categories=dtype.categories.tolist(),
+            ordered=bool(dtype.ordered),
+        )
+
+    # Strings and other objects: missing values get their own code, which
+    # decodes to the column's first missing value (e.g. None from JSON)
+    codes, uniques = pd.factorize(series)
+    categories = list(uniques)
+    missing = codes == -1
+    if missing.any():
+        categories.append(series.to_numpy()[missing.argmax()])
+        codes[missing] = len(categories) - 1
+    return EncodedColumn(
+        name,
+        "encoded",
+        str(dtype),
+        codes.astype(_codes_dtype(len(categories)), copy=False),
+        categories=categories,
+    )
+
+
+def decode_column(column: EncodedColumn, values: np.ndarray) -> Any:
+    """Rebuild column data from its encoded array.
+
+    Raw columns are returned as the given array itself, without copying.
+
+    Args:
+        column: Column metadata (``column.values`` is ignored)
+        values: Encoded array, e.g. a view over shared memory
+
+    Returns:
+        Array-like suitable for building a DataFrame column
+    """
+    if column.kind == "raw":
+        return values
+
+    if column.kind == "categorical":
+        return pd.Categorical.from_codes(
+            values,
+            categories=column.categories,
+            ordered=column.ordered,
+        )
+
+    uniques = np.empty(len(column.categories), dtype=object)
+    uniques[:] = column.categories
+    decoded = uniques.take(values)
+    if column.dtype != "object":
+        return pd.array(decoded, dtype=column.dtype)
+    return decoded
+
+
+def frame_from_columns(
+    columns: dict[Any, Any], index: pd.Index | None = None
+) -> pd.DataFrame:
+    """Build a DataFrame from per-column arrays without consolidating them.
+
+    Keeping one block per column means the arrays (shared memory views,
+    memory-mapped files) are used as-is instead of being copied into a new
+    2-D block.
+    """
+    return pd.DataFrame(columns, index=index, copy=False)
+
+
+def read_only_frame(dataset: pd.DataFrame) -> pd.DataFrame:
+    """Return a DataFrame over read-only views of the dataset's columns.
+
+    No values are copied. Numeric, boolean and datetime columns become
+    read-only, so any attempt to modify them in place raises an error
+    instead of silently affecting other readers of the same data. Object
+    and extension columns are shared as they are, since pandas cannot work
+    with read-only object arrays.
+    """
+    columns = {}
+    for name in dataset.columns:
+        column = dataset[name]
+        if isinstance(column.dtype, np.dtype) and column.dtype.kind in RAW_KINDS:
+            values = column.to_numpy().view()
+            values.flags.writeable = False
+            columns[name] = values
+        else:
+            columns[name] = column.array
+    return frame_from_columns(columns, index=dataset.index)
@@ -0,0 +1,225 @@
+"""Per-column binary cache of JSON datasets with memory-mapped loading."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+CACHE_FORMAT = 2
+SCHEMA_FILENAME = "schema.json"
+
+# Key in ``DataFrame.attrs`` of datasets loaded through a cache, naming the
+# source file
+SOURCE_ATTR = "columnar_cache_source"
+
+
+class ColumnarCache:
+    """Binary copy of a dataset file, stored as one ``.npy`` file per column.
+
+    The cache lives in a hidden directory next to the source file (for
+    ``data/sample_data.json`` that is ``data/.sample_data.columns/``). Each
+    column is encoded with ``src.core.columnar`` and saved as a flat array;
+    unique values of string columns go to a small JSON file beside it. The
+    schema file records the source file's size and mtime, so the cache is
+    ignored as soon as the source changes.
+
+    Loading memory-maps the arrays read-only, so the operating system pages
+    data in on demand and shares the pages between processes.
+
+    The permutations that sort the columns (see ``src.core.sorted_index``)
+    can be saved beside them, as ``{position}.order.npy``, once computed.
+    They are removed with the rest of the cache when the source changes.
+    """
+
+    def __init__(self, source_path: Path):
+        """Initialize the cache for a source file.
+
+        Args:
+            source_path: Path to the dataset file being cached
+        """
+        self.source_path = source_path
+        self.cache_dir = source_path.with_name(f".{source_path.stem}.columns")
+
+    def load(self) -> pd.DataFrame | None:
+        """Load the dataset from the cache if it is up to date.
+
+        Returns:
+            DataFrame backed by memory-mapped columns, or None if the cache
+            is missing or stale
+        """
+        import numpy as np
+        import pandas as pd
+
+        from src.core.columnar import (
+            EncodedColumn,
+            decode_column,
+            frame_from_columns,
+        )
+
+        schema = self._read_schema()
+        if schema is None or schema.get("source") != self._source_state():
+            return None
+
+        columns = {}
+        for spec in schema["columns"]:
+            values = np.load(self.cache_dir / spec["file"], mmap_mode="r")
+            categories = []
+            if spec["categories_file"] is not None:
+                categories_path = self.cache_dir / spec["categories_file"]
+                with open(categories_path, encoding="utf-8") as f:
+                    categories = json.load(f)
+            column = EncodedColumn(
+                name=spec["name"],
+                kind=spec["kind"],
+                dtype=spec["dtype"],
+                values=values,
+                categories=categories,
+                ordered=spec["ordered"],
+            )
+            columns[column.name] = decode_column(column, values)
+
+        logger.info(f"Loaded {self.source_path.name} from columnar cache")
+        return frame_from_columns(columns, index=pd.RangeIndex(schema["length"]))
+
+    def store(self, dataset: pd.DataFrame) -> None:
+        """Write the dataset to the cache.
+
+        Failures are logged and leave no usable cache behind; the dataset
+        is simply parsed from the source again next time.
+
+        Args:
+            dataset: Dataset parsed from the source file
+        """
+        import numpy as np
+
+        from src.core.columnar import encode_column
+
+        source_state = self._source_state()
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        try:
+            self.cache_dir.mkdir()
+            specs = []
+            for position, name in enumerate(dataset.columns):
+                column = encode_column(name, dataset[name])
+                spec = {
+                    "name": name,
+                    "kind": column.kind,
+                    "dtype": column.dtype,
+                    "ordered": column.ordered,
+                    "file": f"{position}.npy",
+                    "categories_file": None,
+                }
+                np.save(self.cache_dir / spec["file"], column.values)
+                if column.kind != "raw":
+                    spec["categories_file"] = f"{position}.categories.json"
+                    self._write_json(spec["categories_file"], column.categories)
+                specs.append(spec)
+
+            # The schema is written last, so a partial cache is never valid
+            self._write_json(
+                SCHEMA_FILENAME,
+                {
+                    "format": CACHE_FORMAT,
+                    "source": source_state,
+                    "length": len(dataset),
+                    "columns": specs,
+                },
+            )
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not write columnar cache {self.cache_dir}: {e}")
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+            return
+
+        logger.info(f"Wrote columnar cache {self.cache_dir}")
+
+    def load_order(self, column: str, length: int) -> np.ndarray | None:
+        """Load the saved permutation that sorts a column.
+
+        Args:
+            column: Column name
+            length: Number of rows of the dataset the permutation is for
+
+        Returns:
+            Memory-mapped permutation, or None if there is none for the
+            current source file and this number of rows
+        """
+        import numpy as np
+
+        path = self._order_path(column, length)
+        if path is None:
+            return None
+        try:
+            order = np.load(path, mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        return order if order.shape == (length,) else None
+
+    def store_order(self, column: str, order: np.ndarray) -> None:
+        """Save the permutation that sorts a column, if the cache is current.
+
+        Failures are logged; the column is then sorted again next time.
+
+        Args:
+            column: Column name
+            order: Permutation of the rows of the cached dataset
+        """
+        import numpy as np
+
+        path = self._order_path(column, len(order))
+        if path is None:
+            return
+        tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npy")
+        try:
+            np.save(tmp_path, order)
+            tmp_path.replace(path)
+        except OSError as e:
+            logger.warning(f"Could not save sort order of {column}: {e}")
+            tmp_path.unlink(missing_ok=True)
+
+    def invalidate(self) -> None:
+        """Delete the cache directory."""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def _source_state(self) -> dict[str, int]:
+        stat = self.source_path.stat()
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def _order_path(self, column: str, length: int) -> Path | None:
+        """Return where a column's permutation goes, if the cache is current."""
+        schema = self._read_schema()
+        if (
+            schema is None
+            or schema.get("source") != self._source_state()
+            or schema["length"] != length
+        ):
+            return None
+        for spec in schema["columns"]:
+            if spec["name"] == column:
+                return self.cache_dir / f"{Path(spec['file']).stem}.order.npy"
+        return None
+
+    def _read_schema(self) -> dict[str, Any] | None:
+        try:
+            with open(self.cache_dir / SCHEMA_FILENAME, encoding="utf-8") as f:
+                schema = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if schema.get("format") != CACHE_FORMAT:
+            return None
+        return schema
+
+    def _write_json(self, filename: str, data: Any) -> None:
+        tmp_path = self.cache_dir / f"{filename}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        tmp_path.replace(self.cache_dir / filename)
@@ -1,10 +1,18 @@
 """Data loading utilities for the modular analysis tool."""
 
+from __future__ import annotations
+
 import json
 import logging
+import sys
+from collections.abc import Iterator
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
 
-import pandas as pd
+    from src.core.dataset_cache import DatasetCache
 
 logger = logging.getLogger(__name__)
 
@@ -12,13 +20,28 @@ logger = logging.getLogger(__name__)
 class DataLoader:
     """Handles loading and managing sample datasets for analysis modules."""
 
-    def __init__(self, data_dir: Path):
+    def __init__(
+        self,
+        data_dir: Path,
+        cache: DatasetCache | None = None,
+        use_columnar_cache: bool = True,
+        parse_workers: int | None = None,
+    ):
         """Initialize the data loader with a data directory.
 
         Args:
             data_dir: Path to the directory containing data files
+            cache: Optional cache of parsed datasets, shared between calls
+            use_columnar_cache: Keep a memory-mapped binary copy of each
+                JSON file next to it and load from that when it is current
+            parse_workers: Number of processes parsing large JSON files.
+                Defaults to the number of available CPUs; files under 64 MiB
+                are always parsed in the calling process.
         """
         self.data_dir = data_dir
+        self.cache = cache
+        self.use_columnar_cache = use_columnar_cache
+        self.parse_workers = parse_workers
         self.data_dir.mkdir(exist_ok=True)
 
     def load_sample_data(self) -> pd.DataFrame:
@@ -31,13 +54,153 @@ class DataLoader:
 
         if sample_file.exists():
             logger.info("Loading existing sample data")
-            with open(sample_file) as f:
-                data = json.load(f)
-            return pd.DataFrame(data)
+            return self.load_file(sample_file)
         else:
             logger.info("Creating new sample dataset")
             return self._create_sample_data()
 
+    def load_file(self, path: Path) -> pd.DataFrame:
+        """Load a dataset stored as a JSON array of records.
+
+        If the loader has a cache, unchanged files are parsed only once.
+
+        Args:
+            path: Path to the JSON file
+
+        Returns:
+            DataFrame with one row per record
+        """
+        if self.cache is not None:
+            return self.cache.get(path, self._parse_file)
+        return self._parse_file(path)
+
+    def iter_ndjson(
+        self, path: Path | None = None, batch_size: int | None = None
+    ) -> Iterator[pd.DataFrame]:
+        """Read newline-delimited JSON records as DataFrame micro-batches.
+
+        Records are read lazily, so memory use is bounded by the batch
+        size rather than by the length of the input.
+
+        Args:
+            path: NDJSON file to read, or None to read standard input
+            batch_size: Maximum number of records per batch
+
+        Yields:
+            DataFrames indexed by record position in the whole stream
+        """
+        from src.core.stream_ingest import DEFAULT_BATCH_SIZE, iter_ndjson_batches
+
+        batch_size = batch_size or DEFAULT_BATCH_SIZE
+        if path is None:
+            yield from iter_ndjson_batches(sys.stdin, batch_size)
+            return
+        with open(path, encoding="utf-8") as f:
+            yield from iter_ndjson_batches(f, batch_size)
+
+    def iter_chunks(
+        self, path: Path | None = None, chunk_bytes: int = 64 * 1024 * 1024
+    ) -> Iterator[pd.DataFrame]:
+        """Read a JSON array of records as consecutive chunks of rows.
+
+        If the file has a current columnar cache, the chunks are row slices
+        of its memory-mapped columns. Otherwise the JSON is parsed one range
+        of whole records at a time. The dataset is never loaded as a whole.
+
+        Args:
+            path: JSON file to read. Defaults to the sample dataset, which
+                is created if it does not exist yet.
+            chunk_bytes: Approximate size of the JSON text behind each chunk
+
+        Yields:
+            DataFrames indexed by record position in the whole file
+        """
+        from src.core.parallel_ingest import iter_record_chunks
+
+        if path is None:
+            path = self.data_dir / "sample_data.json"
+            if not path.exists():
+                self._create_sample_data()
+
+        if self.use_columnar_cache:
+            from src.core.columnar_cache import ColumnarCache
+
+            dataset = ColumnarCache(path).load()
+            if dataset is not None:
+                n_rows = len(dataset)
+                size = max(path.stat().st_size, 1)
+                step = max(1, n_rows * chunk_bytes // size)
+                for start in range(0, n_rows, step):
+                    yield dataset.iloc[start : start + step]
+                return
+
+        yield from iter_record_chunks(path, chunk_bytes)
+
+    def _parse_file(self, path: Path) -> pd.DataFrame:
+        """Parse a JSON array of records into a DataFrame.
+
+        With the columnar cache enabled, the JSON is only parsed when its
+        binary copy is missing or stale, and the copy is then refreshed.
+
+        Args:
+            path: Path to the JSON file
+
+        Returns:
+            DataFrame with one row per record
+        """
+        if not self.use_columnar_cache:
+            return self._parse_json(path)
+
+        from src.core.columnar_cache import SOURCE_ATTR, ColumnarCache
+
+        columnar_cache = ColumnarCache(path)
+        dataset = columnar_cache.load()
+        if dataset is None:
+            dataset = self._parse_json(path)
+            columnar_cache.store(dataset)
+        # Lets run-scoped indexes of the dataset be saved with the cache
+        dataset.attrs[SOURCE_ATTR] = str(path)
+        return dataset
+
+    def _parse_json(self, path: Path) -> pd.DataFrame:
+        """Parse a JSON array of records into typed columns.
+
+        Records are read straight into per-column arrays, with ISO 8601
+        date strings converted to datetime64. Large files are split into
+        ranges of records parsed by several processes. Files the
+        column-oriented reader cannot handle exactly are parsed into a list
+        of records instead.
+
+        Args:
+            path: Path to the JSON file
+
+        Returns:
+            DataFrame with one row per record
+        """
+        from src.core.json_ingest import RecordLayoutError
+        from src.core.parallel_ingest import ParallelRecordReader
+
+        try:
+            return ParallelRecordReader(max_workers=self.parse_workers).read(path)
+        except RecordLayoutError as e:
+            logger.info(f"Reading {path.name} record by record: {e}")
+            return self._parse_json_records(path)
+
+    def _parse_json_records(self, path: Path) -> pd.DataFrame:
+        """Parse a JSON array of records with the standard library parser.
+
+        Args:
+            path: Path to the JSON file
+
+        Returns:
+            DataFrame with one row per record
+        """
+        import pandas as pd
+
+        with open(path) as f:
+            data = json.load(f)
+        return pd.DataFrame(data)
+
     def _create_sample_data(self) -> pd.DataFrame:
         """Create a sample dataset for analysis modules.
 
@@ -45,6 +208,7 @@ class DataLoader:
             DataFrame with sample data
         """
         import numpy as np
+        import pandas as pd
 
         # Set random seed for reproducibility
         np.random.seed(42)
@@ -0,0 +1,146 @@
+"""In-process LRU cache of parsed datasets."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheStats:
+    """Counters describing dataset cache activity."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    current_bytes: int = 0
+
+
+@dataclass
+class _CacheEntry:
+    """A parsed dataset together with the file state it was parsed from."""
+
+    fingerprint: tuple
+    dataset: pd.DataFrame
+    nbytes: int
+
+
+class DatasetCache:
+    """Keeps parsed DataFrames in memory, up to a byte budget.
+
+    Entries are keyed by resolved file path and validated against a
+    fingerprint of the file (size plus mtime or content hash),
+    so a file that changes on disk is parsed again. When the budget is
+    exceeded, the least recently used datasets are evicted.
+
+    Cached datasets are handed out as read-only views shared by all
+    callers, so no caller can modify another caller's data.
+    """
+
+    def __init__(self, max_bytes: int = 1 << 30, use_content_hash: bool = False):
+        """Initialize the dataset cache.
+
+        Args:
+            max_bytes: Memory budget for cached DataFrames
+            use_content_hash: Fingerprint files by content hash instead of
+                mtime, so a touched but unchanged file stays cached
+        """
+        self.max_bytes = max_bytes
+        self.use_content_hash = use_content_hash
+        self._entries: OrderedDict[Path, _CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    @property
+    def stats(self) -> CacheStats:
+        """Snapshot of the cache counters."""
+        with self._lock:
+            return CacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                entries=len(self._entries),
+                current_bytes=sum(e.nbytes for e in self._entries.values()),
+            )
+
+    def get(
+        self, path: Path, loader: Callable[[Path], pd.DataFrame]
+    ) -> pd.DataFrame:
+        """Return the dataset for a file, parsing it only on a cache miss.
+
+        Args:
+            path: Path to the dataset file
+            loader: Function parsing the file into a DataFrame
+
+        Returns:
+            Read-only DataFrame for the file's current contents
+        """
+        from src.core.columnar import read_only_frame
+
+        key = path.resolve()
+        fingerprint = self._fingerprint(key)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.fingerprint == fingerprint:
+                self._entries.move_to_end(key)
+                self._stats.hits += 1
+                return entry.dataset
+            self._stats.misses += 1
+
+        dataset = read_only_frame(loader(path))
+        nbytes = int(dataset.memory_usage(deep=True).sum())
+
+        with self._lock:
+            self._entries.pop(key, None)
+            if nbytes <= self.max_bytes:
+                self._entries[key] = _CacheEntry(fingerprint, dataset, nbytes)
+                self._evict()
+            else:
+                logger.info(f"Dataset {path} ({nbytes} bytes) exceeds cache budget")
+        return dataset
+
+    def invalidate(self, path: Path | None = None) -> None:
+        """Drop cached datasets.
+
+        Args:
+            path: Dataset file to drop, or None to clear the whole cache
+        """
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(path.resolve(), None)
+
+    def _fingerprint(self, path: Path) -> tuple:
+        """Identify the current state of a dataset file."""
+        stat = path.stat()
+        if not self.use_content_hash:
+            return (stat.st_size, stat.st_mtime_ns)
+
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return (stat.st_size, digest.hexdigest())
+
+    def _evict(self) -> None:
+        """Evict least recently used entries until within budget."""
+        total = sum(entry.nbytes for entry in self._entries.values())
+        while total > self.max_bytes and self._entries:
+            path, entry = self._entries.popitem(last=False)
+            total -= entry.nbytes
+            self._stats.evictions += 1
+            logger.info(f"Evicted dataset {path} from cache")
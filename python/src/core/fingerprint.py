@@ -0,0 +1,169 @@
+"""Fingerprints identifying datasets, module sources and parameters.
+
+A module's result depends on more than its own three files: the kernels of
+``src.core`` that its engine and model import compute most of it, as do the
+shared preparation and statistics the runner passes to engines. Module
+fingerprints therefore also hash the sources of those core modules,
+following their imports, so that editing a kernel invalidates the results
+computed with it.
+"""
+
+from __future__ import annotations
+
+import ast
+import functools
+import hashlib
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from src.core.module_manifest import MODULE_FILES, content_fingerprint
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from src.core.module_registry import ModuleInfo
+
+# Directory of the src.core package
+CORE_DIR = Path(__file__).resolve().parent
+
+CORE_PACKAGE = "src.core"
+
+# Core modules behind the ``prepared`` and ``stats`` objects the runner
+# passes to engines, which modules use without importing them
+INJECTED_CORE_MODULES = ("prepared", "column_stats")
+
+
+def dataset_fingerprint(dataset: pd.DataFrame) -> str:
+    """Hash a dataset's labels, dtypes and values.
+
+    Numeric, boolean and datetime columns are hashed straight from their
+    value buffers; other columns go through pandas' vectorized object
+    hashing. Either way no per-value Python work is done.
+
+    Args:
+        dataset: Dataset to fingerprint
+
+    Returns:
+        Hex digest identifying the dataset's contents
+    """
+    import numpy as np
+    import pandas as pd
+
+    from src.core.columnar import RAW_KINDS
+
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(repr(dataset.shape).encode())
+
+    def update(label: Any, values: Any) -> None:
+        digest.update(repr((label, str(values.dtype))).encode())
+        if isinstance(values.dtype, np.dtype) and values.dtype.kind in RAW_KINDS:
+            array = np.ascontiguousarray(values.to_numpy())
+        else:
+            array = pd.util.hash_pandas_object(values, index=False).to_numpy()
+        digest.update(array.view(np.uint8))
+
+    for label in dataset.columns:
+        update(label, dataset[label])
+
+    if isinstance(dataset.index, pd.RangeIndex):
+        index = dataset.index
+        digest.update(repr(("range", index.start, index.stop, index.step)).encode())
+    else:
+        update("__index__", dataset.index.to_series())
+
+    return digest.hexdigest()
+
+
+def parameters_fingerprint(parameters: dict[str, Any]) -> str:
+    """Hash a module's PARAMETERS dictionary.
+
+    Args:
+        parameters: Module parameters
+
+    Returns:
+        Hex digest identifying the parameter values
+    """
+    encoded = json.dumps(parameters, sort_keys=True, default=repr)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def module_fingerprint(module_info: ModuleInfo, config: Any) -> dict[str, str]:
+    """Describe the code and configuration a module result depends on.
+
+    Args:
+        module_info: Information about the module
+        config: Loaded config module
+
+    Returns:
+        Dictionary with the module's version, source hash, hash of the core
+        sources it depends on and parameter hash
+    """
+    return {
+        "version": str(getattr(config, "VERSION", "")),
+        "source": content_fingerprint(module_info.path),
+        "core": core_fingerprint(module_info.path),
+        "parameters": parameters_fingerprint(getattr(config, "PARAMETERS", {})),
+    }
+
+
+def core_fingerprint(module_dir: Path) -> str:
+    """Hash the ``src.core`` sources a module depends on.
+
+    These are the core modules the module's files import, those the
+    runner's ``prepared`` and ``stats`` objects are built from, and
+    everything those import in turn, including imports inside functions.
+
+    Args:
+        module_dir: Path to the module directory
+
+    Returns:
+        Hex digest identifying the current source of those core modules
+    """
+    pending = list(INJECTED_CORE_MODULES)
+    for filename in MODULE_FILES:
+        pending.extend(_source_info(module_dir / filename)[1])
+
+    seen: set[str] = set()
+    digest = hashlib.sha256()
+    while pending:
+        name = pending.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        path = CORE_DIR / f"{name}.py"
+        if not path.is_file():
+            continue
+        content_hash, imports = _source_info(path)
+        pending.extend(imports)
+        digest.update(f"{name}:{content_hash}\n".encode())
+    return digest.hexdigest()
+
+
+def _source_info(path: Path) -> tuple[str, tuple[str, ...]]:
+    """Return the content hash of a source file and the core modules it imports.
+
+    Results are memoized per file version, as every module run asks again.
+    """
+    stat = path.stat()
+    return _parse_source(path, stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_source(path: Path, mtime_ns: int, size: int) -> tuple[str, tuple[str, ...]]:
+    source = path.read_bytes()
+    imports = set()
+    for node in ast.walk(ast.parse(source, filename=str(path))):
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            names = [node.module]
+            if node.module == CORE_PACKAGE:
+                # "from src.core import moments" names the submodules
+                names = [f"{CORE_PACKAGE}.{alias.name}" for alias in node.names]
+        else:
+            continue
+        for name in names:
+            if name.startswith(f"{CORE_PACKAGE}."):
+                imports.add(name.split(".")[2])
+    return hashlib.sha256(source).hexdigest(), tuple(sorted(imports))
@@ -0,0 +1,151 @@
+"""Exact order statistics of small-range integer columns by counting.
+
+Columns such as ``count`` hold integers from a narrow range. For them a
+single ``np.bincount`` pass, in time linear in the number of values plus
+the width of the range, yields how often each value occurs, and from
+those counts the extremes, the mode, the mean and any quantile follow
+without sorting: the value at sorted position ``k`` is found by binary
+search in the running totals of the counts.
+
+The results are exactly those of the generic path. Quantiles and the
+median use the interpolation of ``src.core.sorted_index`` on the same
+integer values, and the mean is the exact integer sum divided by the
+count, which is what pandas computes while the sum of the magnitudes
+stays below 2**53. Variances are not taken from the counts: pandas sums
+the squared deviations value by value in floating point, and a weighted
+sum over the distinct values rounds differently.
+
+Like the statistics in ``src.core.moments``, a histogram is a plain
+dictionary of numbers and NumPy arrays.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from src.core.sorted_index import interpolate_median, interpolate_quantile
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Widest value range counted; offsets then fit 16 bits
+MAX_RANGE = 1 << 16
+
+# Integer sums below this are exact in float64, whatever the order
+_EXACT_SUM = 1 << 53
+
+
+def small_integer_range(values: np.ndarray) -> bool:
+    """Return whether an array holds integers from at most ``MAX_RANGE`` values.
+
+    Args:
+        values: One-dimensional array
+
+    Returns:
+        True for a non-empty integer array whose range is small enough
+    """
+    if values.dtype.kind not in "iu" or len(values) == 0:
+        return False
+    return int(values.max()) - int(values.min()) < MAX_RANGE
+
+
+def integer_histogram(values: np.ndarray) -> dict[str, Any] | None:
+    """Count the occurrences of each value of a small-range integer array.
+
+    Args:
+        values: One-dimensional array without missing values
+
+    Returns:
+        The counts, their running totals and the smallest value, or None
+        if the array is not integer or its range is too wide
+    """
+    import numpy as np
+
+    if values.dtype.kind not in "iu" or len(values) == 0:
+        return None
+    low = values.min()
+    if int(values.max()) - int(low) >= MAX_RANGE:
+        return None
+    counts = np.bincount((values - low).astype(np.intp))
+    return {
+        "dtype": values.dtype,
+        "low": int(low),
+        "count": len(values),
+        "counts": counts,
+        "cumulative": np.cumsum(counts),
+    }
+
+
+def histogram_value(histogram: dict[str, Any], position: int) -> Any:
+    """Return the value at a position of the sorted values.
+
+    Args:
+        histogram: Histogram of the values
+        position: Position from 0 in ascending order
+
+    Returns:
+        The value, with the dtype of the counted array
+    """
+    import numpy as np
+
+    offset = np.searchsorted(histogram["cumulative"], position, side="right")
+    return histogram["dtype"].type(histogram["low"] + int(offset))
+
+
+def histogram_min(histogram: dict[str, Any]) -> Any:
+    """Return the smallest counted value."""
+    return histogram_value(histogram, 0)
+
+
+def histogram_max(histogram: dict[str, Any]) -> Any:
+    """Return the largest counted value."""
+    return histogram_value(histogram, histogram["count"] - 1)
+
+
+def histogram_median(histogram: dict[str, Any]) -> Any:
+    """Return the median, as ``Series.median`` computes it."""
+    return interpolate_median(
+        histogram["count"], lambda position: histogram_value(histogram, position)
+    )
+
+
+def histogram_quantile(histogram: dict[str, Any], q: float) -> Any:
+    """Return a quantile, linearly interpolated like ``Series.quantile``.
+
+    Args:
+        histogram: Histogram of the values
+        q: Quantile between 0 and 1
+    """
+    return interpolate_quantile(
+        histogram["count"], q, lambda position: histogram_value(histogram, position)
+    )
+
+
+def histogram_mode(histogram: dict[str, Any]) -> Any:
+    """Return the most frequent value, the smallest of several."""
+    import numpy as np
+
+    offset = int(np.argmax(histogram["counts"]))
+    return histogram["dtype"].type(histogram["low"] + offset)
+
+
+def histogram_mean(histogram: dict[str, Any]) -> Any:
+    """Return the mean, or None if pandas might round its sum differently.
+
+    Args:
+        histogram: Histogram of the values
+
+    Returns:
+        The exact sum divided by the count as float64, or None unless the
+        magnitudes of the values are known to sum below 2**53
+    """
+    import numpy as np
+
+    counts = histogram["counts"]
+    low = histogram["low"]
+    high = low + len(counts) - 1
+    if max(abs(low), abs(high)) * histogram["count"] >= _EXACT_SUM:
+        return None
+    # Below 2**53 the int64 products and their sum are exact as well
+    total = int(np.dot(np.arange(low, high + 1, dtype="int64"), counts))
+    return np.float64(total) / np.float64(histogram["count"])
@@ -0,0 +1,127 @@
+"""Incremental re-runs: reuse results of modules whose inputs are unchanged."""
+
+import json
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from src.core.fingerprint import module_fingerprint
+from src.core.module_cache import ModuleCache, default_module_cache
+from src.core.module_registry import ModuleInfo
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IncrementalPlan:
+    """Which modules must be executed and which results can be reused."""
+
+    stale_modules: dict[str, ModuleInfo] = field(default_factory=dict)
+    reused_results: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+
+def load_previous_output(output_path: Path) -> dict[str, Any] | None:
+    """Read the output document of a previous run.
+
+    Args:
+        output_path: Path to the previous output.json
+
+    Returns:
+        The decoded document, or None if there is no usable previous output
+    """
+    try:
+        with open(output_path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable previous output {output_path}: {e}")
+        return None
+
+
+def compute_module_fingerprints(
+    modules: dict[str, ModuleInfo], module_cache: ModuleCache | None = None
+) -> dict[str, dict[str, str]]:
+    """Fingerprint the code and configuration of several modules.
+
+    Args:
+        modules: Mapping of module names to ModuleInfo objects
+        module_cache: Cache used to load the config files
+
+    Returns:
+        Mapping of module names to their fingerprints. Modules whose config
+        cannot be loaded are left out, so they are always treated as stale.
+    """
+    module_cache = module_cache or default_module_cache
+    fingerprints = {}
+    for module_name, module_info in modules.items():
+        try:
+            config = module_cache.load(
+                module_info.qualified_name("config"), module_info.config_path
+            )
+        except Exception as e:
+            logger.warning(f"Could not fingerprint module {module_name}: {e}")
+            continue
+        fingerprints[module_name] = module_fingerprint(module_info, config)
+    return fingerprints
+
+
+def fingerprints_match(
+    saved: dict[str, str] | None, current: dict[str, str] | None
+) -> bool:
+    """Return whether results computed under a saved fingerprint are current.
+
+    The fingerprints cover the module's version, source, parameters and the
+    core sources it depends on. A module that could not be fingerprinted
+    never matches, so its saved results are never reused.
+
+    Args:
+        saved: Fingerprint recorded with the saved results, if any
+        current: Fingerprint of the module now, if it could be computed
+    """
+    return current is not None and saved == current
+
+
+def plan_incremental_run(
+    previous_output: dict[str, Any] | None,
+    modules: dict[str, ModuleInfo],
+    dataset_fingerprint: str,
+    module_fingerprints: dict[str, dict[str, str]],
+) -> IncrementalPlan:
+    """Decide which modules must be re-executed.
+
+    A previous result is reused only if it succeeded, the dataset
+    fingerprint is unchanged and the module's version, source, parameters
+    and core dependencies are unchanged.
+
+    Args:
+        previous_output: Output document of the previous run, if any
+        modules: Mapping of module names to ModuleInfo objects
+        dataset_fingerprint: Fingerprint of the current dataset
+        module_fingerprints: Current fingerprints of the modules
+
+    Returns:
+        IncrementalPlan splitting the modules into stale and reusable ones
+    """
+    plan = IncrementalPlan()
+    metadata = (previous_output or {}).get("analysis_metadata", {})
+    previous_modules = (previous_output or {}).get("modules", {})
+    previous_fingerprints = metadata.get("module_fingerprints", {})
+    same_dataset = metadata.get("dataset_fingerprint") == dataset_fingerprint
+
+    for module_name, module_info in modules.items():
+        previous = previous_modules.get(module_name, {})
+        if (
+            same_dataset
+            and fingerprints_match(
+                previous_fingerprints.get(module_name),
+                module_fingerprints.get(module_name),
+            )
+            and previous.get("status") == "SUCCESS"
+        ):
+            plan.reused_results[module_name] = previous["result"]
+        else:
+            plan.stale_modules[module_name] = module_info
+
+    return plan
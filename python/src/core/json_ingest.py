@@ -0,0 +1,360 @@
+"""Column-oriented parsing of JSON record arrays.
+
+``json.load`` followed by ``pd.DataFrame(records)`` keeps one dict per
+record alive until the whole frame is built, and then lets pandas infer
+every column from those dicts. The reader in this module instead hooks
+into the standard library parser, turns each record into a row tuple as
+soon as it is decoded and moves rows into typed NumPy column arrays in
+fixed-size chunks, so only one chunk of Python values exists at a time.
+Column types are inferred from a sample of records and widened when a
+later chunk needs it; ISO 8601 date strings are converted to
+``datetime64`` a chunk at a time.
+
+Layouts the reader cannot represent exactly the way pandas would (nested
+objects, numbers that turn into strings half-way through a column, and so
+on) raise RecordLayoutError, so callers can fall back to the plain path.
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import re
+import warnings
+from operator import itemgetter
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+DEFAULT_CHUNK_SIZE = 65536
+DEFAULT_SAMPLE_SIZE = 1000
+
+ISO_DATETIME = re.compile(
+    r"\d{4}-\d{2}-\d{2}"
+    r"([T ]\d{2}:\d{2}(:\d{2}(\.\d{1,9})?)?)?"
+    r"(Z|[+-]\d{2}:?\d{2})?"
+)
+
+
+class RecordLayoutError(ValueError):
+    """The JSON document cannot be read column by column."""
+
+
+class _Missing:
+    """Placeholder for a key that is absent from a record."""
+
+    def __repr__(self) -> str:
+        return "<missing>"
+
+
+class _Record:
+    """Stand-in returned to the parser for every decoded object."""
+
+
+MISSING = _Missing()
+RECORD = _Record()
+
+
+def _value_kind(types: set[type], parse_dates: bool, values: list[Any]) -> str:
+    """Classify a chunk of values by the Python types it contains."""
+    present = types - {type(None), _Missing}
+    has_missing = len(present) < len(types)
+
+    if not present:
+        return "empty"
+    if present <= {int, float}:
+        return "int" if present == {int} and not has_missing else "float"
+    if present == {bool}:
+        return "object" if has_missing else "bool"
+    if present == {str}:
+        if parse_dates and all(
+            ISO_DATETIME.fullmatch(v) for v in values if isinstance(v, str)
+        ):
+            return "datetime"
+        return "str"
+    return "object"
+
+
+class _ColumnBuilder:
+    """Growable typed array for one column."""
+
+    def __init__(self, name: str, offset: int, capacity: int):
+        """Initialize the builder.
+
+        Args:
+            name: Column label
+            offset: Number of rows parsed before the column first appeared;
+                those rows are missing values
+            capacity: Number of rows to allocate room for up front
+        """
+        self.name = name
+        self.capacity = capacity
+        self.kind = "empty"
+        self.size = 0
+        self.data: np.ndarray | None = None
+        self._pending_missing = offset
+
+    def append(self, values: list[Any], parse_dates: bool) -> None:
+        """Convert a chunk of Python values and append it to the array."""
+        types = set(map(type, values))
+        if _Record in types or list in types:
+            raise RecordLayoutError("Records contain nested objects or arrays")
+        # Only the sample decides whether strings are dates; later chunks of
+        # a date column are validated by the conversion itself
+        chunk_kind = _value_kind(types, parse_dates and self.kind == "empty", values)
+        if chunk_kind == "str" and self.kind == "datetime":
+            chunk_kind = "datetime"
+        if chunk_kind == "empty":
+            # Leading missing rows only fix the type once real values arrive
+            if self.kind == "empty":
+                self._pending_missing += len(values)
+                return
+            chunk_kind = self.kind
+        if self._pending_missing:
+            values = [MISSING] * self._pending_missing + values
+            types.add(_Missing)
+            self._pending_missing = 0
+        if _Missing in types or type(None) in types:
+            # Like pandas, missing values turn integers into floats and
+            # booleans into objects
+            chunk_kind = {"int": "float", "bool": "object"}.get(chunk_kind, chunk_kind)
+
+        self.kind = self._widen(chunk_kind)
+        self._write(self._convert(values, types))
+
+    def finish(self) -> np.ndarray:
+        """Return the completed column array."""
+        if self.kind == "empty":
+            raise RecordLayoutError(f"Column {self.name!r} has no values")
+        self.data.resize(self.size, refcheck=False)
+        return self.data
+
+    def _widen(self, chunk_kind: str) -> str:
+        """Return the column type able to hold both old and new values."""
+        if self.kind in ("empty", chunk_kind):
+            return chunk_kind
+        if {self.kind, chunk_kind} == {"int", "float"}:
+            if self.kind == "int":
+                self.data = self.data.astype("float64")
+            return "float"
+        if self.kind in ("str", "object", "bool"):
+            # Values are kept as Python objects, exactly as pandas would
+            if self.kind == "bool":
+                self.data = self.data.astype(object)
+            return "object"
+        # Earlier values were already converted in a way pandas would not
+        raise RecordLayoutError(
+            f"Column {self.name!r} changes from {self.kind} to {chunk_kind} values"
+        )
+
+    def _convert(self, values: list[Any], types: set[type]) -> np.ndarray:
+        import numpy as np
+        import pandas as pd
+
+        has_missing = _Missing in types
+        if self.kind == "float":
+            if has_missing or type(None) in types:
+                values = [np.nan if v is None or v is MISSING else v for v in values]
+            return np.array(values, dtype="float64")
+        if self.kind == "datetime":
+            if has_missing:
+                values = [None if v is MISSING else v for v in values]
+            try:
+                with warnings.catch_warnings():
+                    # Mixed offsets parse to plain objects, refused below
+                    warnings.simplefilter("ignore", FutureWarning)
+                    parsed = pd.to_datetime(values, format="ISO8601")
+            except (ValueError, OverflowError) as e:
+                raise RecordLayoutError(
+                    f"Column {self.name!r} has unparseable dates: {e}"
+                ) from e
+            if not isinstance(parsed, pd.DatetimeIndex) or parsed.tz is not None:
+                raise RecordLayoutError(f"Column {self.name!r} has timezone offsets")
+            return parsed.as_unit("ns").to_numpy()
+
+        if has_missing:
+            values = [np.nan if v is MISSING else v for v in values]
+        dtype = {"int": "int64", "bool": "bool"}.get(self.kind, object)
+        array = np.empty(len(values), dtype=dtype)
+        try:
+            array[:] = values
+        except OverflowError as e:
+            raise RecordLayoutError(f"Column {self.name!r}: {e}") from e
+        return array
+
+    def _write(self, chunk: np.ndarray) -> None:
+        import numpy as np
+
+        needed = self.size + len(chunk)
+        if self.data is None:
+            self.data = np.empty(max(needed, self.capacity), dtype=chunk.dtype)
+        elif needed > len(self.data):
+            self.data.resize(max(needed, 2 * len(self.data)), refcheck=False)
+        self.data[self.size : needed] = chunk
+        self.size = needed
+
+
+class ColumnarRecordReader:
+    """Parses a JSON array of flat records into per-column arrays."""
+
+    def __init__(
+        self,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        sample_size: int = DEFAULT_SAMPLE_SIZE,
+        parse_dates: bool = True,
+    ):
+        """Initialize the reader.
+
+        Args:
+            chunk_size: Number of records converted to arrays at a time
+            sample_size: Number of leading records used to infer the column
+                types before the first conversion
+            parse_dates: Convert columns of ISO 8601 strings to datetime64
+        """
+        self.chunk_size = chunk_size
+        self.sample_size = sample_size
+        self.parse_dates = parse_dates
+
+    def read(self, path: Path) -> pd.DataFrame:
+        """Parse a JSON file holding an array of records.
+
+        Args:
+            path: Path to the JSON file
+
+        Returns:
+            DataFrame with one row per record
+
+        Raises:
+            RecordLayoutError: If the file is not an array of flat records
+                or a column cannot be represented the way pandas would
+        """
+        with open(path, encoding="utf-8") as f:
+            return self.read_text(f.read())
+
+    def read_text(self, text: str) -> pd.DataFrame:
+        """Parse a JSON document holding an array of records.
+
+        Args:
+            text: The JSON document
+
+        Returns:
+            DataFrame with one row per record
+
+        Raises:
+            RecordLayoutError: If the document is not an array of flat
+                records or a column cannot be represented the way pandas would
+        """
+        import pandas as pd
+
+        from src.core.columnar import frame_from_columns
+
+        state = _ParseState(self)
+        # Every buffered pair is a small tuple the cyclic garbage collector
+        # would keep rescanning; none of them can form reference cycles
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            document = json.loads(text, object_pairs_hook=state.add_record)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        if not isinstance(document, list):
+            raise RecordLayoutError("Top-level JSON value is not an array")
+        state.flush()
+        if len(document) != state.n_rows:
+            raise RecordLayoutError("Array elements are not all objects")
+
+        columns = {name: b.finish() for name, b in state.builders.items()}
+        return frame_from_columns(columns, index=pd.RangeIndex(state.n_rows))
+
+
+class _ParseState:
+    """Record buffer and column builders for one parse."""
+
+    def __init__(self, reader: ColumnarRecordReader):
+        self.reader = reader
+        self.builders: dict[str, _ColumnBuilder] = {}
+        # Key/value pairs of the buffered records, flattened, and the number
+        # of pairs in each record
+        self.pairs: list[tuple[str, Any]] = []
+        self.widths: list[int] = []
+        self.keys: list[str] = []
+        self.values: list[Any] = []
+        self.n_rows = 0
+        # The first flush happens after the sample, later ones per chunk
+        self.flush_at = reader.sample_size
+
+    def add_record(self, pairs: list[tuple[str, Any]]) -> _Record:
+        """Object hook called by the JSON parser for every decoded object.
+
+        This runs once per record, so it only buffers the key/value pairs;
+        all per-value work happens a chunk at a time in ``flush``.
+        """
+        self.pairs.extend(pairs)
+        self.widths.append(len(pairs))
+        if len(self.widths) >= self.flush_at:
+            self.flush()
+            self.flush_at = self.reader.chunk_size
+        return RECORD
+
+    def flush(self) -> None:
+        """Move buffered records into the column arrays."""
+        if not self.widths:
+            return
+        self.keys = list(map(itemgetter(0), self.pairs))
+        self.values = list(map(itemgetter(1), self.pairs))
+        self.pairs = []
+
+        columns = self._uniform_columns() or self._aligned_columns()
+        for builder, values in zip(self.builders.values(), columns, strict=True):
+            builder.append(values, self.reader.parse_dates)
+        self.n_rows += len(self.widths)
+        self.widths = []
+        self.keys = []
+        self.values = []
+
+    def _uniform_columns(self) -> list[list[Any]] | None:
+        """Split the buffered records into columns if all share one layout.
+
+        Returns:
+            One list of values per column, or None if the records have
+            differing keys or key order
+        """
+        width = self.widths[0]
+        if len(self.keys) != width * len(self.widths):
+            return None
+        layout = self.keys[:width]
+        if not self.builders and len(set(layout)) == width:
+            for key in layout:
+                self._add_builder(key)
+        if layout != list(self.builders):
+            return None
+        for position, key in enumerate(layout):
+            column_keys = self.keys[position::width]
+            if column_keys.count(key) != len(column_keys):
+                return None
+        return [self.values[position::width] for position in range(width)]
+
+    def _aligned_columns(self) -> list[list[Any]]:
+        """Split records with differing layouts into columns by key."""
+        records = []
+        start = 0
+        for width in self.widths:
+            end = start + width
+            keys = self.keys[start:end]
+            records.append(dict(zip(keys, self.values[start:end], strict=True)))
+            start = end
+
+        for record in records:
+            for key in record:
+                if key not in self.builders:
+                    self._add_builder(key)
+        return [
+            [record.get(key, MISSING) for record in records] for key in self.builders
+        ]
+
+    def _add_builder(self, key: str) -> None:
+        self.builders[key] = _ColumnBuilder(key, self.n_rows, self.reader.chunk_size)
@@ -0,0 +1,107 @@
+"""Cache of loaded module source files with change detection."""
+
+import hashlib
+import importlib.util
+import logging
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _CacheEntry:
+    """A loaded module together with the file state it was loaded from."""
+
+    path: Path
+    mtime_ns: int
+    size: int
+    digest: str
+    module: ModuleType
+
+
+class ModuleCache:
+    """Executes module source files once and hands back the loaded modules.
+
+    Entries are keyed by the qualified module name. On every lookup the
+    file's mtime and size are compared with the cached entry; if they
+    changed, the content hash decides whether the file really has to be
+    executed again (a touched but unmodified file stays cached).
+    """
+
+    def __init__(self):
+        """Initialize an empty module cache."""
+        self._entries: dict[str, _CacheEntry] = {}
+        # The import machinery is not safe to drive from several threads
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, name: str, path: Path) -> ModuleType:
+        """Return the loaded module for a source file, executing it if needed.
+
+        Args:
+            name: Qualified module name, e.g. ``analysis_modules.x.engine``
+            path: Path to the source file
+
+        Returns:
+            Loaded Python module
+        """
+        stat = path.stat()
+
+        with self._lock:
+            entry = self._entries.get(name)
+            if (
+                entry is not None
+                and entry.path == path
+                and entry.mtime_ns == stat.st_mtime_ns
+                and entry.size == stat.st_size
+            ):
+                self.hits += 1
+                return entry.module
+
+            source = path.read_bytes()
+            digest = hashlib.sha256(source).hexdigest()
+            if entry is not None and entry.path == path and entry.digest == digest:
+                entry.mtime_ns, entry.size = stat.st_mtime_ns, stat.st_size
+                self.hits += 1
+                return entry.module
+
+            self.misses += 1
+            module = self._execute(name, path, source)
+            self._entries[name] = _CacheEntry(
+                path=path,
+                mtime_ns=stat.st_mtime_ns,
+                size=stat.st_size,
+                digest=digest,
+                module=module,
+            )
+            if entry is not None:
+                logger.info(f"Reloaded changed module file: {path}")
+            return module
+
+    def invalidate(self, name: str | None = None) -> None:
+        """Drop cached modules.
+
+        Args:
+            name: Qualified module name to drop, or None to clear everything
+        """
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(name, None)
+
+    def _execute(self, name: str, path: Path, source: bytes) -> ModuleType:
+        """Compile and execute source code as a new module."""
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        code = compile(source, str(path), "exec")
+        exec(code, module.__dict__)
+        return module
+
+
+# Cache shared by the registry and all runners of the current process
+default_module_cache = ModuleCache()
@@ -0,0 +1,106 @@
+"""Persistent index of discovered modules for fast startup."""
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = ".module_index.json"
+MANIFEST_FORMAT = 1
+
+# Files whose state makes up a module's fingerprint
+MODULE_FILES = ("config.py", "model.py", "engine.py")
+
+
+def stat_signature(module_dir: Path) -> list[list[int]] | None:
+    """Return the (mtime_ns, size) pairs of a module's files.
+
+    Args:
+        module_dir: Path to the module directory
+
+    Returns:
+        List of [mtime_ns, size] pairs, or None if a file is missing
+    """
+    signature = []
+    for filename in MODULE_FILES:
+        try:
+            stat = (module_dir / filename).stat()
+        except FileNotFoundError:
+            return None
+        signature.append([stat.st_mtime_ns, stat.st_size])
+    return signature
+
+
+def content_fingerprint(module_dir: Path) -> str:
+    """Return a hash over the contents of a module's files.
+
+    Args:
+        module_dir: Path to the module directory
+
+    Returns:
+        Hex digest identifying the module's current source
+    """
+    digest = hashlib.sha256()
+    for filename in MODULE_FILES:
+        digest.update(filename.encode())
+        digest.update((module_dir / filename).read_bytes())
+    return digest.hexdigest()
+
+
+class ModuleManifest:
+    """Reads and writes the module index file.
+
+    The index maps module directory names to the metadata read from their
+    config.py (description, version, parameters) along with a fingerprint
+    of their source files, so that unchanged modules can be registered
+    without executing any of their code.
+    """
+
+    def __init__(self, path: Path):
+        """Initialize the manifest.
+
+        Args:
+            path: Path to the index file
+        """
+        self.path = path
+
+    def load(self) -> dict[str, dict[str, Any]]:
+        """Read the index entries.
+
+        Returns:
+            Mapping of module names to index entries. Empty if the index is
+            missing, unreadable or written in another format.
+        """
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable module index {self.path}: {e}")
+            return {}
+
+        if data.get("format") != MANIFEST_FORMAT:
+            return {}
+        return data.get("modules", {})
+
+    def save(self, entries: dict[str, dict[str, Any]]) -> None:
+        """Write the index entries.
+
+        Failing to write the index is not fatal; discovery simply falls
+        back to scanning on the next start.
+
+        Args:
+            entries: Mapping of module names to index entries
+        """
+        data = {"format": MANIFEST_FORMAT, "modules": entries}
+        tmp_path = self.path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, default=repr)
+            tmp_path.replace(self.path)
+        except OSError as e:
+            logger.warning(f"Could not write module index {self.path}: {e}")
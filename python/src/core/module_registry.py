@@ -1,8 +1,17 @@
 """Module registry for discovering and managing analysis modules."""
 
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any
+
+from src.core.module_cache import ModuleCache, default_module_cache
+from src.core.module_manifest import (
+    MANIFEST_FILENAME,
+    ModuleManifest,
+    content_fingerprint,
+    stat_signature,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +26,19 @@ class ModuleInfo:
     model_path: Path
     config_path: Path
     description: str = ""
+    version: str = ""
+    parameters: dict[str, Any] = field(default_factory=dict)
+
+    def qualified_name(self, component: str) -> str:
+        """Return the unique import name for one of the module's files.
+
+        Args:
+            component: Component name ("config", "model" or "engine")
+
+        Returns:
+            Qualified name such as ``analysis_modules.basic_stats.engine``
+        """
+        return f"analysis_modules.{self.name}.{component}"
 
     @property
     def is_valid(self) -> bool:
@@ -31,38 +53,160 @@ class ModuleInfo:
 class ModuleRegistry:
     """Registry for discovering and managing analysis modules."""
 
-    def __init__(self, modules_dir: Path):
+    def __init__(
+        self,
+        modules_dir: Path,
+        module_cache: ModuleCache | None = None,
+        index_path: Path | None = None,
+        use_index: bool = True,
+    ):
         """Initialize the module registry.
 
         Args:
             modules_dir: Path to the directory containing modules
+            module_cache: Cache of loaded module files. Defaults to the cache
+                shared by the whole process, so config files read during
+                discovery are not executed again by the runner.
+            index_path: Path to the module index file. Defaults to
+                ``.module_index.json`` inside the modules directory.
+            use_index: Whether discovery reads and updates the module index
         """
         self.modules_dir = modules_dir
+        self.module_cache = module_cache or default_module_cache
         self.modules_dir.mkdir(exist_ok=True)
+        self.manifest = ModuleManifest(index_path or modules_dir / MANIFEST_FILENAME)
+        self.use_index = use_index
         self._registered_modules: dict[str, ModuleInfo] = {}
+        # Modules whose config.py failed to load during the last discovery
+        self._config_errors: set[str] = set()
 
     def discover_modules(self) -> dict[str, ModuleInfo]:
         """Discover all valid modules in the modules directory.
 
+        Modules whose files are unchanged since the last discovery are
+        registered straight from the module index; only new or modified
+        modules have their config.py executed.
+
         Returns:
             Dictionary mapping module names to ModuleInfo objects
         """
         self._registered_modules.clear()
+        self._config_errors.clear()
+        index = self.manifest.load() if self.use_index else {}
+        entries: dict[str, dict[str, Any]] = {}
 
         # Look for subdirectories in the modules directory
         for module_dir in self.modules_dir.iterdir():
             if not module_dir.is_dir() or module_dir.name.startswith("."):
                 continue
 
-            module_info = self._analyze_module(module_dir)
+            signature = stat_signature(module_dir)
+            entry = self._lookup_index(
+                index.get(module_dir.name), module_dir, signature
+            )
+            if entry is not None:
+                module_info = self._module_from_entry(module_dir, entry)
+            else:
+                module_info = self._analyze_module(module_dir)
+                if signature is not None and module_info.is_valid:
+                    entry = self._entry_from_module(module_info, signature)
+
             if module_info and module_info.is_valid:
                 self._registered_modules[module_info.name] = module_info
                 logger.info(f"Registered module: {module_info.name}")
+                if entry is not None:
+                    entries[module_info.name] = entry
             else:
                 logger.warning(f"Skipping invalid module: {module_dir.name}")
 
+        if self.use_index and entries != index:
+            self.manifest.save(entries)
+
         return self._registered_modules.copy()
 
+    def rebuild_index(self) -> dict[str, ModuleInfo]:
+        """Rescan every module directory and rewrite the module index.
+
+        Returns:
+            Dictionary mapping module names to ModuleInfo objects
+        """
+        self.manifest.save({})
+        return self.discover_modules()
+
+    def _lookup_index(
+        self,
+        entry: dict[str, Any] | None,
+        module_dir: Path,
+        signature: list[list[int]] | None,
+    ) -> dict[str, Any] | None:
+        """Return the index entry for a module if it is still up to date.
+
+        Args:
+            entry: Index entry recorded for the module, if any
+            module_dir: Path to the module directory
+            signature: Current stat signature of the module's files
+
+        Returns:
+            The up-to-date entry, or None if the module must be rescanned
+        """
+        if entry is None or signature is None:
+            return None
+        if entry.get("stat") == signature:
+            return entry
+        # Files were touched; only rescan if their contents changed too
+        if entry.get("fingerprint") == content_fingerprint(module_dir):
+            return {**entry, "stat": signature}
+        return None
+
+    def _module_from_entry(
+        self, module_dir: Path, entry: dict[str, Any]
+    ) -> ModuleInfo:
+        """Create ModuleInfo from a module index entry.
+
+        Args:
+            module_dir: Path to the module directory
+            entry: Up-to-date index entry for the module
+
+        Returns:
+            ModuleInfo object for the module
+        """
+        return ModuleInfo(
+            name=module_dir.name,
+            path=module_dir,
+            engine_path=module_dir / "engine.py",
+            model_path=module_dir / "model.py",
+            config_path=module_dir / "config.py",
+            description=entry.get("description", ""),
+            version=entry.get("version", ""),
+            parameters=entry.get("parameters", {}),
+        )
+
+    def _entry_from_module(
+        self, module_info: ModuleInfo, signature: list[list[int]]
+    ) -> dict[str, Any] | None:
+        """Create a module index entry from freshly analyzed module info.
+
+        Args:
+            module_info: Information about the module
+            signature: Stat signature of the module's files
+
+        Returns:
+            Index entry, or None if the module's config could not be read
+        """
+        if module_info.name in self._config_errors:
+            return None
+        return {
+            "path": module_info.path.name,
+            "engine_path": module_info.engine_path.name,
+            "model_path": module_info.model_path.name,
+            "config_path": module_info.config_path.name,
+            "description": module_info.description,
+            "version": module_info.version,
+            "parameters": module_info.parameters,
+            "fingerprint": content_fingerprint(module_info.path),
+            "stat": signature,
+        }
+
     def _analyze_module(self, module_dir: Path) -> ModuleInfo:
         """Analyze a module directory and create ModuleInfo.
 
@@ -80,21 +224,20 @@ class ModuleRegistry:
             config_path=module_dir / "config.py",
         )
 
-        # Try to read description from config if it exists
+        # Try to read metadata from config if it exists
         if module_info.config_path.exists():
             try:
-                # Import the config module to get description
-                import importlib.util
-
-                spec = importlib.util.spec_from_file_location(
-                    "config", module_info.config_path
+                # Load the config module to get description
+                config_module = self.module_cache.load(
+                    module_info.qualified_name("config"), module_info.config_path
                 )
-                config_module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(config_module)
 
                 if hasattr(config_module, "DESCRIPTION"):
                     module_info.description = config_module.DESCRIPTION
+                module_info.version = getattr(config_module, "VERSION", "")
+                module_info.parameters = dict(getattr(config_module, "PARAMETERS", {}))
             except Exception as e:
+                self._config_errors.add(module_info.name)
                 logger.warning(f"Could not read config for {module_info.name}: {e}")
 
         return module_info
@@ -1,28 +1,140 @@
 """Module runner for executing analysis modules."""
 
-import importlib.util
+from __future__ import annotations
+
 import logging
+import threading
+import weakref
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
-
-import pandas as pd
+from typing import TYPE_CHECKING, Any
 
+from src.core.fingerprint import dataset_fingerprint, module_fingerprint
+from src.core.module_cache import ModuleCache, default_module_cache
 from src.core.module_registry import ModuleInfo
+from src.core.result_cache import ResultCache
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from src.core.prepared import PreparedDataset
 
 logger = logging.getLogger(__name__)
 
+# Engine functions of the optional chunked contract
+CHUNKED_FUNCTIONS = ("init_state", "analyze_chunk", "merge", "finalize")
+
+# Engine functions of the optional second pass over the chunks
+SCAN_FUNCTIONS = ("init_scan", "scan_chunk", "merge_scans")
+
+# Parameter names of engine functions, for optional keyword arguments
+_engine_parameters: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+@dataclass
+class RunReport:
+    """What a run of several modules did besides producing their results.
+
+    Runners return it along with the results instead of keeping it on the
+    runner, so that runs sharing a runner, like the concurrent requests of
+    the server, each get their own.
+    """
+
+    # Names of the modules served from the result cache
+    cache_hits: set[str] = field(default_factory=set)
+    # What the shared preparation saved, see PreparedDataset.savings
+    preparation_savings: dict[str, Any] | None = None
+
 
 class ModuleRunner:
     """Executes analysis modules following the standard contract."""
 
+    def __init__(
+        self,
+        module_cache: ModuleCache | None = None,
+        result_cache: ResultCache | None = None,
+    ):
+        """Initialize the module runner.
+
+        Args:
+            module_cache: Cache of loaded module files. Defaults to the cache
+                shared by the whole process.
+            result_cache: Optional persistent cache of module results. When
+                set, modules whose dataset, code and parameters are unchanged
+                are not executed again.
+        """
+        self.module_cache = module_cache or default_module_cache
+        self.result_cache = result_cache
+        self._fingerprints: dict[int, tuple[weakref.ref, str]] = {}
+        self._fingerprint_lock = threading.Lock()
+
+    def preload_modules(self, modules: dict[str, ModuleInfo]) -> None:
+        """Load the files of several modules into the module cache.
+
+        Modules that fail to load are skipped here; their error surfaces
+        when they are run.
+
+        Args:
+            modules: Mapping of module names to ModuleInfo objects
+        """
+        for module_name, module_info in modules.items():
+            try:
+                self._load_config(module_info)
+                self._load_model(module_info)
+                self._load_engine(module_info)
+            except Exception as e:
+                logger.warning(f"Could not preload module {module_name}: {e}")
+
+    def run_modules(
+        self, modules: dict[str, ModuleInfo], dataset: pd.DataFrame
+    ) -> tuple[dict[str, Any], RunReport]:
+        """Run several analysis modules one after another.
+
+        Args:
+            modules: Mapping of module names to ModuleInfo objects
+            dataset: Input dataset for analysis
+
+        Returns:
+            Dictionary mapping module names to their results, and the report
+            of the run. Failed modules map to a dictionary with a single
+            "error" key.
+        """
+        from src.core.prepared import PreparedDataset
+
+        results: dict[str, Any] = {}
+        report = RunReport()
+        prepared = PreparedDataset(dataset)
+
+        for module_name, module_info in modules.items():
+            logger.info(f"Running module: {module_name}")
+            try:
+                results[module_name] = self.run_module(
+                    module_info, dataset, prepared, report
+                )
+            except Exception as e:
+                results[module_name] = {"error": str(e)}
+
+        report.preparation_savings = log_preparation_savings(prepared.savings())
+        return results, report
+
     def run_module(
-        self, module_info: ModuleInfo, dataset: pd.DataFrame
+        self,
+        module_info: ModuleInfo,
+        dataset: pd.DataFrame,
+        prepared: PreparedDataset | None = None,
+        report: RunReport | None = None,
     ) -> dict[str, Any]:
         """Run a single analysis module.
 
         Args:
             module_info: Information about the module to run
             dataset: Input dataset for analysis
+            prepared: Shared preparation of ``dataset``, passed to engines
+                whose ``analyze`` accepts a ``prepared`` argument. Its
+                ``statistics`` service is passed as ``stats`` likewise.
+            report: Report of the run the module belongs to, which records
+                whether the result came from the result cache
 
         Returns:
             Dictionary containing the analysis results
@@ -34,9 +146,23 @@ class ModuleRunner:
 
         try:
             # Load the module components
-            config = self._load_config(module_info.config_path)
-            model = self._load_model(module_info.model_path)
-            engine = self._load_engine(module_info.engine_path)
+            config = self._load_config(module_info)
+
+            cache_key = None
+            if self.result_cache is not None:
+                cache_key = ResultCache.make_key(
+                    self.dataset_fingerprint(dataset),
+                    module_fingerprint(module_info, config),
+                )
+                cached = self.result_cache.get(cache_key)
+                if cached is not None:
+                    logger.info(f"Module {module_info.name} served from result cache")
+                    if report is not None:
+                        report.cache_hits.add(module_info.name)
+                    return cached
+
+            model = self._load_model(module_info)
+            engine = self._load_engine(module_info)
 
             # Execute the module following the standard contract
             # Each module should have an 'analyze' function in its engine
@@ -46,7 +172,16 @@ class ModuleRunner:
                 )
 
             # Run the analysis
-            result = engine.analyze(dataset, model, config)
+            result = engine.analyze(
+                dataset,
+                model,
+                config,
+                **_optional_arguments(
+                    engine.analyze,
+                    prepared=prepared,
+                    stats=prepared.statistics if prepared is not None else None,
+                ),
+            )
 
             # Ensure result is a dictionary
             if not isinstance(result, dict):
@@ -56,6 +191,9 @@ class ModuleRunner:
             result["module_name"] = module_info.name
             result["module_description"] = module_info.description
 
+            if cache_key is not None:
+                self.result_cache.put(cache_key, result)
+
             logger.info(f"Module {module_info.name} completed successfully")
             return result
 
@@ -63,44 +201,538 @@ class ModuleRunner:
             logger.error(f"Module {module_info.name} failed: {e}")
             raise
 
-    def _load_config(self, config_path: Path) -> Any:
+    def run_modules_chunked(
+        self,
+        modules: dict[str, ModuleInfo],
+        chunks: Iterable[pd.DataFrame],
+        rescan: Callable[[], Iterable[pd.DataFrame]] | None = None,
+    ) -> tuple[dict[str, Any], RunReport]:
+        """Run several analysis modules over a dataset given in chunks.
+
+        The chunks are iterated once. Modules implementing the chunked
+        contract fold each chunk into their state as it arrives, so the
+        dataset never has to be held in memory as a whole. Modules that
+        also implement the second pass (``SCAN_FUNCTIONS``) then scan the
+        chunks again, as returned by ``rescan``, against bounds computed
+        from their states. Modules that only implement ``analyze`` are run
+        on the concatenated chunks afterwards.
+
+        Args:
+            modules: Mapping of module names to ModuleInfo objects
+            chunks: Consecutive row chunks of the dataset, indexed by their
+                position in the whole dataset
+            rescan: Returns the same chunks again, for the second pass.
+                Without it, modules that need a second pass fail.
+
+        Returns:
+            Dictionary mapping module names to their results, in the order
+            of ``modules``, and the report of the run. Failed modules map to
+            a dictionary with a single "error" key.
+        """
+        whole_modules: dict[str, ModuleInfo] = {}
+        for module_name, module_info in modules.items():
+            try:
+                if not self.supports_chunks(module_info):
+                    whole_modules[module_name] = module_info
+            except Exception:
+                # Reported as the module's error by fold_chunks
+                pass
+
+        buffered: list[pd.DataFrame] = []
+        if whole_modules:
+            logger.info(
+                f"Modules without chunked support need the whole dataset in "
+                f"memory: {list(whole_modules)}"
+            )
+            chunks = _buffer_chunks(chunks, buffered)
+
+        chunked_modules = {
+            name: info for name, info in modules.items() if name not in whole_modules
+        }
+        report = RunReport()
+        states, errors = self.fold_chunks(chunked_modules, chunks, report)
+        scans, scan_errors = self.scan_states(chunked_modules, states, rescan)
+        errors.update(scan_errors)
+        results: dict[str, Any] = {
+            module_name: {"error": error} for module_name, error in errors.items()
+        }
+        for module_name, state in states.items():
+            if module_name in errors:
+                continue
+            try:
+                results[module_name] = self.finalize_state(
+                    modules[module_name], state, scans.get(module_name)
+                )
+            except Exception as e:
+                results[module_name] = {"error": str(e)}
+
+        if whole_modules:
+            import pandas as pd
+
+            from src.core.prepared import add_savings
+
+            dataset = pd.concat(buffered) if buffered else pd.DataFrame()
+            buffered.clear()
+            whole_results, whole_report = self.run_modules(whole_modules, dataset)
+            results.update(whole_results)
+            report.cache_hits |= whole_report.cache_hits
+            if whole_report.preparation_savings:
+                report.preparation_savings = add_savings(
+                    report.preparation_savings or {}, whole_report.preparation_savings
+                )
+
+        return {module_name: results[module_name] for module_name in modules}, report
+
+    def scan_states(
+        self,
+        modules: dict[str, ModuleInfo],
+        states: dict[str, Any],
+        rescan: Callable[[], Iterable[pd.DataFrame]] | None,
+    ) -> tuple[dict[str, Any], dict[str, str]]:
+        """Run the second pass of the modules that need one.
+
+        Args:
+            modules: Mapping of module names to ModuleInfo objects
+            states: States of the modules covering the whole dataset
+            rescan: Returns the chunks of the dataset again, or None if they
+                cannot be read twice
+
+        Returns:
+            Scans of the modules with a second pass that succeeded, and error
+            messages of those that failed
+        """
+        scans: dict[str, Any] = {}
+        errors: dict[str, str] = {}
+        for module_name, state in states.items():
+            try:
+                if not self.needs_scan(modules[module_name]):
+                    continue
+                if rescan is None:
+                    raise ValueError(
+                        f"Module {module_name} needs a second pass over the "
+                        "data, which cannot be read again"
+                    )
+                scans[module_name] = self.init_scan(modules[module_name], state)
+            except Exception as e:
+                logger.error(f"Module {module_name} failed: {e}")
+                errors[module_name] = str(e)
+        if not scans:
+            return scans, errors
+
+        logger.info(f"Scanning the data again for {len(scans)} modules")
+        scans, scan_errors = self.scan_chunks(
+            {name: modules[name] for name in scans}, scans, rescan()
+        )
+        errors.update(scan_errors)
+        return scans, errors
+
+    def fold_chunks(
+        self,
+        modules: dict[str, ModuleInfo],
+        chunks: Iterable[pd.DataFrame],
+        report: RunReport | None = None,
+    ) -> tuple[dict[str, Any], dict[str, str]]:
+        """Fold a sequence of chunks into the states of several modules.
+
+        The chunks are iterated once, each chunk being passed to every
+        module before the next one is read.
+
+        Args:
+            modules: Mapping of module names to ModuleInfo objects
+            chunks: Consecutive row chunks of the dataset
+            report: Report of the run, which receives what the shared
+                preparation of the chunks saved
+
+        Returns:
+            States of the modules that succeeded, and error messages of the
+            modules that failed or do not implement the chunked contract
+        """
+        if report is None:
+            report = RunReport()
+        states: dict[str, Any] = {}
+        errors: dict[str, str] = {}
+        for module_name, module_info in modules.items():
+            try:
+                if not self.supports_chunks(module_info):
+                    raise AttributeError(
+                        f"Module {module_name} engine does not implement "
+                        f"{', '.join(CHUNKED_FUNCTIONS)}"
+                    )
+                states[module_name] = self.init_state(module_info)
+            except Exception as e:
+                logger.error(f"Module {module_name} failed: {e}")
+                errors[module_name] = str(e)
+
+        from src.core.prepared import PreparedDataset, add_savings
+
+        n_chunks = 0
+        savings: dict[str, Any] = {}
+        for chunk in chunks:
+            n_chunks += 1
+            prepared = PreparedDataset(chunk)
+            for module_name in list(states):
+                try:
+                    states[module_name] = self.analyze_chunk(
+                        modules[module_name], states[module_name], chunk, prepared
+                    )
+                except Exception as e:
+                    logger.error(f"Module {module_name} failed: {e}")
+                    errors[module_name] = str(e)
+                    del states[module_name]
+            add_savings(savings, prepared.savings())
+        logger.info(f"Folded {n_chunks} chunks into {len(states)} modules")
+        report.preparation_savings = log_preparation_savings(savings)
+
+        return states, errors
+
+    def scan_chunks(
+        self,
+        modules: dict[str, ModuleInfo],
+        scans: dict[str, Any],
+        chunks: Iterable[pd.DataFrame],
+    ) -> tuple[dict[str, Any], dict[str, str]]:
+        """Fold a sequence of chunks into the second-pass scans of modules.
+
+        The chunks are iterated once, like in ``fold_chunks``.
+
+        Args:
+            modules: Mapping of module names to ModuleInfo objects
+            scans: Scans returned by ``init_scan``, or partial scans of
+                earlier chunks
+            chunks: Consecutive row chunks of the dataset
+
+        Returns:
+            Scans of the modules that succeeded, and error messages of the
+            modules that failed
+        """
+        from src.core.prepared import PreparedDataset
+
+        scans = dict(scans)
+        errors: dict[str, str] = {}
+        for chunk in chunks:
+            prepared = PreparedDataset(chunk)
+            for module_name in list(scans):
+                try:
+                    scans[module_name] = self.scan_chunk(
+                        modules[module_name], scans[module_name], chunk, prepared
+                    )
+                except Exception as e:
+                    logger.error(f"Module {module_name} failed: {e}")
+                    errors[module_name] = str(e)
+                    del scans[module_name]
+        return scans, errors
+
+    def supports_chunks(self, module_info: ModuleInfo) -> bool:
+        """Check whether a module's engine implements the chunked contract.
+
+        Args:
+            module_info: Information about the module
+
+        Returns:
+            True if the engine defines all of ``CHUNKED_FUNCTIONS``
+        """
+        engine = self._load_engine(module_info)
+        return all(hasattr(engine, name) for name in CHUNKED_FUNCTIONS)
+
+    def needs_scan(self, module_info: ModuleInfo) -> bool:
+        """Check whether a module's engine implements the second pass.
+
+        Args:
+            module_info: Information about the module
+
+        Returns:
+            True if the engine defines all of ``SCAN_FUNCTIONS``, in which
+            case ``finalize`` needs the scan of the whole dataset
+        """
+        engine = self._load_engine(module_info)
+        return all(hasattr(engine, name) for name in SCAN_FUNCTIONS)
+
+    def init_state(self, module_info: ModuleInfo) -> Any:
+        """Create a module's empty chunked analysis state.
+
+        Args:
+            module_info: Information about the module
+
+        Returns:
+            State returned by the engine's ``init_state``
+        """
+        config = self._load_config(module_info)
+        return self._load_engine(module_info).init_state(config)
+
+    def analyze_chunk(
+        self,
+        module_info: ModuleInfo,
+        state: Any,
+        chunk: pd.DataFrame,
+        prepared: PreparedDataset | None = None,
+    ) -> Any:
+        """Fold one chunk of the dataset into a module's state.
+
+        Args:
+            module_info: Information about the module
+            state: Current state of the module
+            chunk: Next chunk of the dataset
+            prepared: Shared preparation of ``chunk``, passed to engines
+                whose ``analyze_chunk`` accepts a ``prepared`` argument
+
+        Returns:
+            Updated state
+        """
+        config = self._load_config(module_info)
+        model = self._load_model(module_info)
+        engine = self._load_engine(module_info)
+        return engine.analyze_chunk(
+            state,
+            chunk,
+            model,
+            config,
+            **_optional_arguments(engine.analyze_chunk, prepared=prepared),
+        )
+
+    def merge_states(self, module_info: ModuleInfo, state_a: Any, state_b: Any) -> Any:
+        """Combine a module's states of two disjoint parts of a dataset.
+
+        Args:
+            module_info: Information about the module
+            state_a: State of the earlier part
+            state_b: State of the later part
+
+        Returns:
+            State of both parts
+        """
+        return self._load_engine(module_info).merge(state_a, state_b)
+
+    def init_scan(self, module_info: ModuleInfo, state: Any) -> Any:
+        """Start a module's second pass from its state of the whole dataset.
+
+        Args:
+            module_info: Information about the module
+            state: State covering the whole dataset
+
+        Returns:
+            Empty scan returned by the engine's ``init_scan``, which holds
+            what the second pass compares the rows with
+        """
+        config = self._load_config(module_info)
+        model = self._load_model(module_info)
+        return self._load_engine(module_info).init_scan(state, model, config)
+
+    def scan_chunk(
+        self,
+        module_info: ModuleInfo,
+        scan: Any,
+        chunk: pd.DataFrame,
+        prepared: PreparedDataset | None = None,
+    ) -> Any:
+        """Fold one chunk of the dataset into a module's second-pass scan.
+
+        Args:
+            module_info: Information about the module
+            scan: Current scan of the module
+            chunk: Next chunk of the dataset
+            prepared: Shared preparation of ``chunk``, passed to engines
+                whose ``scan_chunk`` accepts a ``prepared`` argument
+
+        Returns:
+            Updated scan
+        """
+        config = self._load_config(module_info)
+        model = self._load_model(module_info)
+        engine = self._load_engine(module_info)
+        return engine.scan_chunk(
+            scan,
+            chunk,
+            model,
+            config,
+            **_optional_arguments(engine.scan_chunk, prepared=prepared),
+        )
+
+    def merge_scans(self, module_info: ModuleInfo, scan_a: Any, scan_b: Any) -> Any:
+        """Combine a module's scans of two disjoint parts of a dataset.
+
+        Args:
+            module_info: Information about the module
+            scan_a: Scan of the earlier part
+            scan_b: Scan of the later part, started from the same state
+
+        Returns:
+            Scan of both parts
+        """
+        return self._load_engine(module_info).merge_scans(scan_a, scan_b)
+
+    def finalize_state(
+        self, module_info: ModuleInfo, state: Any, scan: Any = None
+    ) -> dict[str, Any]:
+        """Compute a module's results from its state.
+
+        The state itself is left unchanged, so more chunks can be folded
+        into it afterwards.
+
+        Args:
+            module_info: Information about the module
+            state: State covering the analyzed data
+            scan: Second-pass scan of the same data, for modules that need
+                one
+
+        Returns:
+            Dictionary containing the analysis results, with the same
+            metadata as results of ``run_module``
+
+        Raises:
+            Exception: If the module fails to produce results
+        """
+        logger.info(f"Finalizing module: {module_info.name}")
+        try:
+            config = self._load_config(module_info)
+            model = self._load_model(module_info)
+            engine = self._load_engine(module_info)
+            result = engine.finalize(
+                state, model, config, **_optional_arguments(engine.finalize, scan=scan)
+            )
+
+            if not isinstance(result, dict):
+                result = {"result": result}
+            result["module_name"] = module_info.name
+            result["module_description"] = module_info.description
+
+            logger.info(f"Module {module_info.name} completed successfully")
+            return result
+
+        except Exception as e:
+            logger.error(f"Module {module_info.name} failed: {e}")
+            raise
+
+    def dataset_fingerprint(self, dataset: pd.DataFrame) -> str:
+        """Return the dataset's fingerprint, computing it once per object.
+
+        Args:
+            dataset: Input dataset
+
+        Returns:
+            Hex digest identifying the dataset's contents
+        """
+        with self._fingerprint_lock:
+            ref, fingerprint = self._fingerprints.get(id(dataset), (None, None))
+            if ref is not None and ref() is dataset:
+                return fingerprint
+
+        fingerprint = dataset_fingerprint(dataset)
+        with self._fingerprint_lock:
+            self._fingerprints = {
+                key: value
+                for key, value in self._fingerprints.items()
+                if value[0]() is not None
+            }
+            self._fingerprints[id(dataset)] = (weakref.ref(dataset), fingerprint)
+        return fingerprint
+
+    def _load_config(self, module_info: ModuleInfo) -> Any:
         """Load module configuration.
 
         Args:
-            config_path: Path to the config.py file
+            module_info: Information about the module
 
         Returns:
             Loaded configuration module
         """
-        spec = importlib.util.spec_from_file_location("config", config_path)
-        config_module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(config_module)
-        return config_module
+        return self._load_source(module_info, "config", module_info.config_path)
 
-    def _load_model(self, model_path: Path) -> Any:
+    def _load_model(self, module_info: ModuleInfo) -> Any:
         """Load module model.
 
         Args:
-            model_path: Path to the model.py file
+            module_info: Information about the module
 
         Returns:
             Loaded model module
         """
-        spec = importlib.util.spec_from_file_location("model", model_path)
-        model_module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(model_module)
-        return model_module
+        return self._load_source(module_info, "model", module_info.model_path)
 
-    def _load_engine(self, engine_path: Path) -> Any:
+    def _load_engine(self, module_info: ModuleInfo) -> Any:
         """Load module engine.
 
         Args:
-            engine_path: Path to the engine.py file
+            module_info: Information about the module
 
         Returns:
             Loaded engine module
         """
-        spec = importlib.util.spec_from_file_location("engine", engine_path)
-        engine_module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(engine_module)
-        return engine_module
+        return self._load_source(module_info, "engine", module_info.engine_path)
+
+    def _load_source(
+        self, module_info: ModuleInfo, component: str, path: Path
+    ) -> Any:
+        """Load one of a module's source files as a Python module.
+
+        Each file is loaded under a name qualified by its module, e.g.
+        ``analysis_modules.basic_stats.engine``, so that modules loaded side
+        by side never share a name. Files are executed once and served from
+        the module cache until they change on disk.
+
+        Args:
+            module_info: Information about the module
+            component: Component name ("config", "model" or "engine")
+            path: Path to the component's source file
+
+        Returns:
+            Loaded Python module
+        """
+        return self.module_cache.load(module_info.qualified_name(component), path)
+
+
+def _buffer_chunks(
+    chunks: Iterable[pd.DataFrame], buffered: list[pd.DataFrame]
+) -> Iterator[pd.DataFrame]:
+    """Pass chunks through, keeping a reference to each in ``buffered``."""
+    for chunk in chunks:
+        buffered.append(chunk)
+        yield chunk
+
+
+def log_preparation_savings(savings: dict[str, Any]) -> dict[str, Any] | None:
+    """Log what the shared preparation saved and return the report.
+
+    Args:
+        savings: Report of ``PreparedDataset.savings``, possibly summed
+
+    Returns:
+        The report, or None if nothing was prepared
+    """
+    if not savings.get("computed"):
+        return None
+    logger.info(
+        f"Shared data preparation reused {savings['reused']} results, saving "
+        f"{savings['seconds_saved'] * 1000:.1f} ms and "
+        f"{savings['bytes_saved'] / 1024 / 1024:.1f} MiB"
+    )
+    statistics = savings.get("statistics")
+    if statistics:
+        logger.info(
+            f"Column statistics: {statistics['hits']} hits, "
+            f"{statistics['misses']} misses, saving "
+            f"{statistics['seconds_saved'] * 1000:.1f} ms"
+        )
+    return savings
+
+
+def _optional_arguments(function: Any, **candidates: Any) -> dict[str, Any]:
+    """Return the candidate keyword arguments an engine function accepts.
+
+    Args:
+        function: Engine function
+        **candidates: Optional arguments the runner can provide
+
+    Returns:
+        The candidates that are not None and named in the signature
+    """
+    parameters = _engine_parameters.get(function)
+    if parameters is None:
+        import inspect
+
+        parameters = frozenset(inspect.signature(function).parameters)
+        _engine_parameters[function] = parameters
+    return {
+        name: value
+        for name, value in candidates.items()
+        if value is not None and name in parameters
+    }
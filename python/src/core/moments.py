@@ -0,0 +1,341 @@
+"""Mergeable summary statistics for analyzing data in chunks.
+
+The statistics of each chunk are computed the way pandas computes them:
+the mean as sum over count and the variance from squared deviations
+around that mean. Chunks are combined with the pairwise update of Chan,
+Golub and LeVeque. A single chunk therefore reproduces pandas bit for
+bit, and any split of the same values agrees with it to floating-point
+rounding.
+
+Every statistic is a plain dictionary of numbers and NumPy arrays, so
+partial results can be pickled, sent to another process or written to
+disk without custom classes.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+# Values per block of columns summarized at once by array_moments
+BLOCK_VALUES = 1 << 20
+
+
+def empty_moments() -> dict[str, Any]:
+    """Return the moments of no values."""
+    return {"count": 0, "mean": 0.0, "m2": 0.0, "min": None, "max": None}
+
+
+def compute_moments(values: np.ndarray) -> dict[str, Any]:
+    """Compute the moments of one chunk of values.
+
+    Args:
+        values: One-dimensional numeric array without missing values
+
+    Returns:
+        Dictionary with the count, mean, sum of squared deviations from
+        the mean ("m2"), minimum and maximum. The extremes keep the dtype
+        of ``values``.
+    """
+    count = len(values)
+    if count == 0:
+        return empty_moments()
+    mean = values.sum(dtype="float64") / count
+    m2 = ((mean - values) ** 2).sum(dtype="float64")
+    return {
+        "count": count,
+        "mean": mean,
+        "m2": m2,
+        "min": values.min(),
+        "max": values.max(),
+    }
+
+
+def merge_moments(a: dict[str, Any], b: dict[str, Any]) -> dict[str, Any]:
+    """Combine the moments of two disjoint sets of values.
+
+    Args:
+        a: Moments of the first set
+        b: Moments of the second set
+
+    Returns:
+        Moments of both sets together. The extremes have the type NumPy
+        promotes those of both sets to, as pandas does for the dtype of
+        the concatenated values, so the result does not depend on how the
+        values were split.
+    """
+    extreme_type = _common_extreme_type(a, b)
+    if b["count"] == 0:
+        merged = dict(a)
+    elif a["count"] == 0:
+        merged = dict(b)
+    else:
+        count = a["count"] + b["count"]
+        delta = b["mean"] - a["mean"]
+        merged = {
+            "count": count,
+            "mean": a["mean"] + delta * (b["count"] / count),
+            "m2": a["m2"] + b["m2"] + delta**2 * (a["count"] * b["count"] / count),
+            "min": min(a["min"], b["min"]),
+            "max": max(a["max"], b["max"]),
+        }
+    if extreme_type is not None:
+        for key in ("min", "max"):
+            value = merged[key]
+            merged[key] = extreme_type(float("nan") if value is None else value)
+    return merged
+
+
+def _common_extreme_type(a: dict[str, Any], b: dict[str, Any]) -> type | None:
+    """Return the scalar type the extremes of two sets of moments promote to.
+
+    Sets of moments without extremes, such as those of no values, do not
+    take part; None if neither set has extremes.
+    """
+    import numpy as np
+
+    dtypes = [
+        np.asarray(moments["min"]).dtype
+        for moments in (a, b)
+        if moments["min"] is not None
+    ]
+    if not dtypes:
+        return None
+    return np.result_type(*dtypes).type
+
+
+def variance(moments: dict[str, Any], ddof: int = 1) -> float:
+    """Return the variance, or NaN if there are ``ddof`` values or fewer.
+
+    Args:
+        moments: Moments of the values
+        ddof: Delta degrees of freedom, as in pandas and NumPy
+
+    Returns:
+        Variance of the values
+    """
+    import numpy as np
+
+    divisor = moments["count"] - ddof
+    if divisor <= 0:
+        return np.float64(np.nan)
+    return moments["m2"] / divisor
+
+
+def array_moments(values: np.ndarray) -> dict[str, np.ndarray]:
+    """Compute the moments of every column of a two-dimensional array.
+
+    All columns are summarized together, in blocks of about
+    ``BLOCK_VALUES`` values, so the temporaries stay small however many
+    rows and columns there are. Each block still takes several passes:
+    the missing-value mask (and, with missing values, a zero-filled copy
+    and their counts), the sums, the squared deviations from the means
+    and their sums, and NaN-ignoring reductions for the extremes. Each
+    pass is one array operation over every column of the block rather
+    than one reduction per column.
+
+    Columns without missing values reproduce ``compute_moments`` bit for
+    bit. In columns with missing values these count as zeros in the sums,
+    exactly as in pandas' own reductions, so the results agree with those
+    of the dropped values to floating-point rounding.
+
+    Args:
+        values: Array with one row per record and one column per variable,
+            NaN where a value is missing
+
+    Returns:
+        Dictionary of one-dimensional arrays with an entry per column:
+        "count", "mean", "m2", "min" and "max". The mean, extremes and m2
+        are NaN for columns without values.
+    """
+    import numpy as np
+
+    # One contiguous row per variable, so each sum runs over one variable
+    columns = np.ascontiguousarray(np.asarray(values, dtype="float64").T)
+    n_columns, n_rows = columns.shape
+    result = {
+        "count": np.zeros(n_columns, dtype="int64"),
+        "mean": np.full(n_columns, np.nan),
+        "m2": np.full(n_columns, np.nan),
+        "min": np.full(n_columns, np.nan),
+        "max": np.full(n_columns, np.nan),
+    }
+    if n_rows == 0:
+        return result
+
+    step = max(1, BLOCK_VALUES // n_rows)
+    for start in range(0, n_columns, step):
+        block = columns[start : start + step]
+        missing = np.isnan(block)
+        has_missing = missing.any()
+        if has_missing:
+            block = np.where(missing, 0.0, block)
+            count = n_rows - missing.sum(axis=1)
+        else:
+            count = np.full(len(block), n_rows)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = block.sum(axis=1) / count
+        squared = (mean[:, None] - block) ** 2
+        if has_missing:
+            squared[missing] = 0.0
+            block = columns[start : start + step]
+        present = count > 0
+        window = slice(start, start + len(count))
+        result["count"][window] = count
+        result["mean"][window] = np.where(present, mean, np.nan)
+        result["m2"][window] = np.where(present, squared.sum(axis=1), np.nan)
+        with np.errstate(invalid="ignore"):
+            result["min"][window] = np.fmin.reduce(block, axis=1)
+            result["max"][window] = np.fmax.reduce(block, axis=1)
+    return result
+
+
+def column_moments(
+    frame: pd.DataFrame, columns: list[str] | None = None
+) -> dict[str, dict[str, Any]]:
+    """Compute the moments of the non-missing values of several columns.
+
+    The columns are summarized together by ``array_moments``. Extremes keep
+    the dtype of their column, as with ``compute_moments``. Floating-point
+    columns without values get NaN extremes, so that merging them promotes
+    the extremes of other chunks to floating point, as concatenating the
+    chunks would.
+
+    Args:
+        frame: Chunk of data
+        columns: Columns to summarize. Defaults to all columns.
+
+    Returns:
+        Mapping of column names to moments
+    """
+    import numpy as np
+
+    if columns is None:
+        columns = list(frame.columns)
+    if not columns:
+        return {}
+    summary = array_moments(frame[columns].to_numpy(dtype="float64", na_value=np.nan))
+    moments = {}
+    for i, column in enumerate(columns):
+        count = int(summary["count"][i])
+        dtype = frame[column].dtype
+        extreme_type = getattr(dtype, "numpy_dtype", dtype).type
+        if count == 0:
+            moments[column] = empty_moments()
+            if issubclass(extreme_type, np.inexact):
+                moments[column]["min"] = moments[column]["max"] = extreme_type(np.nan)
+            continue
+        moments[column] = {
+            "count": count,
+            "mean": summary["mean"][i],
+            "m2": summary["m2"][i],
+            "min": extreme_type(summary["min"][i]),
+            "max": extreme_type(summary["max"][i]),
+        }
+    return moments
+
+
+def merge_column_moments(
+    a: dict[str, dict[str, Any]], b: dict[str, dict[str, Any]]
+) -> dict[str, dict[str, Any]]:
+    """Combine two mappings of column moments.
+
+    Columns keep the order in which they first appeared; columns present
+    in only one mapping are taken over unchanged.
+
+    Args:
+        a: Column moments of the earlier data
+        b: Column moments of the later data
+
+    Returns:
+        Column moments of both
+    """
+    merged = dict(a)
+    for column, moments in b.items():
+        merged[column] = merge_moments(merged.get(column, empty_moments()), moments)
+    return merged
+
+
+def empty_comoments(n_columns: int) -> dict[str, Any]:
+    """Return the co-moments of no rows.
+
+    Args:
+        n_columns: Number of columns the rows will have
+    """
+    import numpy as np
+
+    return {
+        "count": 0,
+        "mean": np.zeros(n_columns),
+        "comoment": np.zeros((n_columns, n_columns)),
+    }
+
+
+def compute_comoments(matrix: np.ndarray) -> dict[str, Any]:
+    """Compute the co-moments of one chunk of complete rows.
+
+    Args:
+        matrix: Two-dimensional array with one row per record and no
+            missing values
+
+    Returns:
+        Dictionary with the row count, the column means and the matrix of
+        summed products of deviations from those means
+    """
+    count, n_columns = matrix.shape
+    if count == 0:
+        return empty_comoments(n_columns)
+    matrix = matrix.astype("float64", copy=False)
+    mean = matrix.sum(axis=0) / count
+    deviations = matrix - mean
+    return {"count": count, "mean": mean, "comoment": deviations.T @ deviations}
+
+
+def merge_comoments(a: dict[str, Any], b: dict[str, Any]) -> dict[str, Any]:
+    """Combine the co-moments of two disjoint sets of rows.
+
+    Args:
+        a: Co-moments of the first set
+        b: Co-moments of the second set
+
+    Returns:
+        Co-moments of both sets together
+    """
+    import numpy as np
+
+    if b["count"] == 0:
+        return a
+    if a["count"] == 0:
+        return b
+    count = a["count"] + b["count"]
+    delta = b["mean"] - a["mean"]
+    return {
+        "count": count,
+        "mean": a["mean"] + delta * (b["count"] / count),
+        "comoment": a["comoment"]
+        + b["comoment"]
+        + np.outer(delta, delta) * (a["count"] * b["count"] / count),
+    }
+
+
+def correlation_matrix(comoments: dict[str, Any]) -> np.ndarray:
+    """Return the Pearson correlation matrix of the summarized rows.
+
+    Pairs involving a constant column are NaN, as in pandas.
+
+    Args:
+        comoments: Co-moments of the rows
+
+    Returns:
+        Square array of correlation coefficients
+    """
+    import numpy as np
+
+    scale = np.sqrt(np.diag(comoments["comoment"]))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        correlation = comoments["comoment"] / np.outer(scale, scale)
+    correlation[~np.isfinite(correlation)] = np.nan
+    return np.clip(correlation, -1.0, 1.0)
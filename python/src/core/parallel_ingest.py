@@ -0,0 +1,304 @@
+"""Parsing large JSON record arrays in ranges of whole records.
+
+The ranges are either parsed in parallel by worker processes or, for
+datasets that do not fit in memory, one at a time.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import mmap
+import os
+import re
+from collections.abc import Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from src.core.json_ingest import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_SAMPLE_SIZE,
+    ColumnarRecordReader,
+    RecordLayoutError,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Files smaller than this are parsed in the calling process
+DEFAULT_MIN_PARALLEL_BYTES = 64 * 1024 * 1024
+
+# End of one record and start of the next: "}", a comma, "{"
+_RECORD_GAP = re.compile(rb"\}\s*,\s*\{")
+_WHITESPACE = b" \t\r\n"
+
+# Column dtypes that can be combined exactly the way pandas would
+# have inferred them from all records at once
+_COMPATIBLE_DTYPES = ({"int64", "float64"}, {"bool", "object"})
+
+
+def split_record_ranges(
+    path: Path, n_parts: int, offset: int | None = None
+) -> list[tuple[int, int]]:
+    """Split a JSON record array into byte ranges of whole records.
+
+    Split points are placed after the first ``}`` followed by ``,`` and
+    ``{`` at or behind each even share of the file. Such a gap can also
+    occur inside a string or a nested value; the text of a range cut there
+    is not valid JSON, so that case surfaces as a parse error rather than
+    as wrong data.
+
+    Args:
+        path: Path to the JSON file
+        n_parts: Desired number of ranges
+        offset: Cover only the records after this byte offset, which must
+            be the end of a record (see ``record_array_end``), instead of
+            all records after the opening bracket
+
+    Returns:
+        List of (start, end) byte offsets covering the records between the
+        outer brackets, or an empty list if the file is not a JSON array
+    """
+    with open(path, "rb") as f, mmap.mmap(
+        f.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mm:
+        size = len(mm)
+        start = 0 if offset is None else offset
+        while start < size and mm[start] in _WHITESPACE:
+            start += 1
+        end = mm.rfind(b"]")
+        if offset is not None:
+            if end < start:
+                return []
+            if mm[start] == ord(","):
+                start += 1
+            elif start == end:
+                return [(end, end)]
+        elif start >= size or mm[start] != ord("[") or end < start:
+            return []
+        else:
+            start += 1
+
+        ranges = []
+        step = max((end - start) // n_parts, 1)
+        while len(ranges) < n_parts - 1:
+            gap = _RECORD_GAP.search(mm, start + step, end)
+            if gap is None:
+                break
+            ranges.append((start, gap.start() + 1))
+            start = gap.end() - 1
+        ranges.append((start, end))
+        return ranges
+
+
+def record_array_end(path: Path) -> int:
+    """Return the byte offset just past the last record of a JSON array.
+
+    Records appended to the array later start after this offset, so it can
+    be passed to ``iter_record_chunks`` to read only those.
+
+    Args:
+        path: Path to the JSON file
+
+    Returns:
+        Offset of the whitespace and ``]`` that close the array
+
+    Raises:
+        RecordLayoutError: If the file does not end a JSON array
+    """
+    with open(path, "rb") as f, mmap.mmap(
+        f.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mm:
+        end = mm.rfind(b"]")
+        if end < 0 or mm[end + 1 :].strip(_WHITESPACE):
+            raise RecordLayoutError("File does not end with a JSON array")
+        while end > 0 and mm[end - 1] in _WHITESPACE:
+            end -= 1
+        return end
+
+
+def _parse_range(
+    path: Path, start: int, end: int, reader: ColumnarRecordReader
+) -> pd.DataFrame:
+    """Parse one byte range of records inside a worker process."""
+    with open(path, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode("utf-8")
+    return reader.read_text(f"[{text}]")
+
+
+def iter_record_chunks(
+    path: Path,
+    chunk_bytes: int,
+    reader: ColumnarRecordReader | None = None,
+    offset: int | None = None,
+    first_record: int = 0,
+) -> Iterator[pd.DataFrame]:
+    """Parse a JSON record array one range of about ``chunk_bytes`` at a time.
+
+    Only one range is held in memory at a time. Chunks are indexed by the
+    position of their records in the whole array. A range whose split
+    point turns out to lie inside a string is joined with the next one;
+    ranges with nested values are parsed record by record.
+
+    Args:
+        path: Path to the JSON file
+        chunk_bytes: Approximate size of the JSON text of each chunk
+        reader: Reader used to parse each range
+        offset: Read only the records after this byte offset, which must be
+            the end of a record (see ``record_array_end``)
+        first_record: Position in the array of the first record read
+
+    Yields:
+        One DataFrame per range
+
+    Raises:
+        ValueError: If the file is not a valid JSON array of records
+    """
+    import pandas as pd
+
+    if chunk_bytes < 1:
+        raise ValueError("chunk_bytes must be at least 1")
+    reader = reader or ColumnarRecordReader()
+    n_bytes = path.stat().st_size - (offset or 0)
+    n_parts = max(1, -(-n_bytes // chunk_bytes))
+    ranges = split_record_ranges(path, n_parts, offset)
+    if not ranges:
+        raise RecordLayoutError("Top-level JSON value is not an array")
+
+    start = None
+    for i, (range_start, end) in enumerate(ranges):
+        start = range_start if start is None else start
+        try:
+            chunk = _parse_chunk(path, start, end, reader)
+        except ValueError:
+            if i + 1 == len(ranges):
+                raise
+            continue
+        start = None
+        if chunk.empty:
+            continue
+        chunk.index = pd.RangeIndex(first_record, first_record + len(chunk))
+        first_record += len(chunk)
+        yield chunk
+
+
+def _parse_chunk(
+    path: Path, start: int, end: int, reader: ColumnarRecordReader
+) -> pd.DataFrame:
+    """Parse one byte range of records, record by record if need be."""
+    import pandas as pd
+
+    try:
+        return _parse_range(path, start, end, reader)
+    except RecordLayoutError:
+        with open(path, "rb") as f:
+            f.seek(start)
+            text = f.read(end - start).decode("utf-8")
+        return pd.DataFrame(json.loads(f"[{text}]"))
+
+
+class ParallelRecordReader:
+    """Parses a JSON array of flat records on several CPU cores.
+
+    The file is split into byte ranges that start and end on record
+    boundaries, each range is parsed into column arrays by a worker
+    process, and the partial frames are concatenated in file order.
+    Small files, and files that cannot be split safely, are parsed in the
+    calling process.
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        min_parallel_bytes: int = DEFAULT_MIN_PARALLEL_BYTES,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        sample_size: int = DEFAULT_SAMPLE_SIZE,
+        parse_dates: bool = True,
+    ):
+        """Initialize the reader.
+
+        Args:
+            max_workers: Number of worker processes. Defaults to the number
+                of available CPUs.
+            min_parallel_bytes: Files smaller than this are parsed in the
+                calling process
+            chunk_size: Number of records converted to arrays at a time
+            sample_size: Number of leading records of each range used to
+                infer the column types
+            parse_dates: Convert columns of ISO 8601 strings to datetime64
+        """
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        self.min_parallel_bytes = min_parallel_bytes
+        self.reader = ColumnarRecordReader(chunk_size, sample_size, parse_dates)
+
+    def read(self, path: Path) -> pd.DataFrame:
+        """Parse a JSON file holding an array of records.
+
+        Args:
+            path: Path to the JSON file
+
+        Returns:
+            DataFrame with one row per record
+
+        Raises:
+            RecordLayoutError: If the file is not an array of flat records
+                or a column cannot be represented the way pandas would
+        """
+        max_workers = self.max_workers or os.cpu_count() or 1
+        if max_workers < 2 or path.stat().st_size < self.min_parallel_bytes:
+            return self.reader.read(path)
+
+        ranges = split_record_ranges(path, max_workers)
+        if len(ranges) < 2:
+            return self.reader.read(path)
+
+        try:
+            frames = self._parse_ranges(path, ranges)
+        except ValueError as e:
+            # Includes RecordLayoutError and JSON errors from a bad split
+            logger.info(f"Parsing {path.name} in one process: {e}")
+            return self.reader.read(path)
+        dataset = _concat_frames(frames)
+        if dataset is None:
+            return self.reader.read(path)
+        return dataset
+
+    def _parse_ranges(
+        self, path: Path, ranges: list[tuple[int, int]]
+    ) -> list[pd.DataFrame]:
+        from concurrent.futures import ProcessPoolExecutor
+
+        logger.info(f"Parsing {path.name} in {len(ranges)} processes")
+        with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+            futures = [
+                executor.submit(_parse_range, path, start, end, self.reader)
+                for start, end in ranges
+            ]
+            return [future.result() for future in futures]
+
+
+def _concat_frames(frames: list[pd.DataFrame]) -> pd.DataFrame | None:
+    """Concatenate partial frames in order.
+
+    Returns:
+        The combined frame, or None if some column was inferred with types
+        that pandas would not have combined the same way
+    """
+    import pandas as pd
+
+    dtypes: dict[str, set[str]] = {}
+    for frame in frames:
+        for name, dtype in frame.dtypes.items():
+            dtypes.setdefault(name, set()).add(str(dtype))
+    for name, kinds in dtypes.items():
+        if len(kinds) > 1 and kinds not in _COMPATIBLE_DTYPES:
+            logger.info(f"Column {name!r} parsed as {sorted(kinds)} in different parts")
+            return None
+
+    return pd.concat(frames, ignore_index=True, sort=False)
+
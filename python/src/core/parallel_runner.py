@@ -0,0 +1,278 @@
+"""Parallel execution of analysis modules in worker processes or threads."""
+
+from __future__ import annotations
+
+import logging
+import os
+from concurrent.futures import as_completed
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from src.core.module_registry import ModuleInfo
+from src.core.module_runner import ModuleRunner, RunReport, log_preparation_savings
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+    import pandas as pd
+
+    from src.core.prepared import PreparedDataset
+    from src.core.result_cache import ResultCache
+    from src.core.shared_dataset import AttachedDataset, SharedDatasetHandle
+
+logger = logging.getLogger(__name__)
+
+# Read-only view of the shared dataset, attached once per worker process
+_worker_dataset: AttachedDataset | None = None
+_worker_runner: ModuleRunner | None = None
+_worker_prepared: PreparedDataset | None = None
+
+
+@dataclass
+class ModuleOutcome:
+    """How running one module concurrently ended.
+
+    Outcomes are returned from worker processes, so failures are carried
+    as messages rather than as exceptions, whose types may not pickle.
+    """
+
+    # The module's result, None if it failed
+    result: dict[str, Any] | None = None
+    # Whether the result came from the result cache
+    cache_hit: bool = False
+    # Error message if the module or the task running it failed
+    error: str | None = None
+
+
+def _init_worker(
+    handle: SharedDatasetHandle, result_cache: ResultCache | None
+) -> None:
+    """Attach the worker process to the shared dataset."""
+    global _worker_dataset, _worker_runner, _worker_prepared
+    from src.core.prepared import PreparedDataset
+
+    _worker_dataset = handle.attach()
+    _worker_runner = ModuleRunner(result_cache=result_cache)
+    # Shared by the modules this worker runs
+    _worker_prepared = PreparedDataset(_worker_dataset.dataset)
+
+
+def _run_in_worker(module_info: ModuleInfo) -> ModuleOutcome:
+    """Run a single module inside a worker process."""
+    return _run_module(
+        _worker_runner,
+        module_info,
+        _worker_dataset.dataset,
+        _worker_prepared,
+        RunReport(),
+    )
+
+
+def _run_module(
+    runner: ModuleRunner,
+    module_info: ModuleInfo,
+    dataset: pd.DataFrame,
+    prepared: PreparedDataset,
+    report: RunReport,
+) -> ModuleOutcome:
+    """Run a single module, converting its exception into an error outcome.
+
+    Args:
+        runner: Runner executing the module
+        module_info: Information about the module
+        dataset: Input dataset for analysis
+        prepared: Shared preparation of ``dataset``
+        report: Report of the run, which receives the module's cache hit
+
+    Returns:
+        Outcome of the module
+    """
+    try:
+        result = runner.run_module(module_info, dataset, prepared, report)
+    except Exception as e:
+        return ModuleOutcome(error=str(e))
+    return ModuleOutcome(result, cache_hit=module_info.name in report.cache_hits)
+
+
+class ParallelModuleRunner:
+    """Runs analysis modules concurrently using a ProcessPoolExecutor.
+
+    The dataset is placed in shared memory once and every worker process
+    attaches to it, instead of receiving its own pickled copy.
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        result_cache: ResultCache | None = None,
+    ):
+        """Initialize the parallel runner.
+
+        Args:
+            max_workers: Number of worker processes. Defaults to the number
+                of available CPUs.
+            result_cache: Optional persistent cache of module results
+        """
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        self.result_cache = result_cache
+
+    def run_modules(
+        self, modules: dict[str, ModuleInfo], dataset: pd.DataFrame
+    ) -> tuple[dict[str, Any], RunReport]:
+        """Run analysis modules in parallel worker processes.
+
+        Each worker process prepares the dataset for its own modules, so the
+        report has no preparation savings.
+
+        Args:
+            modules: Mapping of module names to ModuleInfo objects
+            dataset: Input dataset for analysis
+
+        Returns:
+            Dictionary mapping module names to their results, in the same
+            order as ``modules``, and the report of the run. Failed modules
+            map to a dictionary with a single "error" key.
+        """
+        report = RunReport()
+        if not modules:
+            return {}, report
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        from src.core.shared_dataset import SharedDataset
+
+        max_workers = min(self.max_workers or os.cpu_count() or 1, len(modules))
+        logger.info(f"Running {len(modules)} modules on {max_workers} processes")
+
+        with SharedDataset(dataset) as shared, ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(shared.handle, self.result_cache),
+        ) as executor:
+            futures = {
+                executor.submit(_run_in_worker, module_info): module_name
+                for module_name, module_info in modules.items()
+            }
+            outcomes = _collect_outcomes(futures)
+
+        return _results_of(outcomes, modules, report), report
+
+
+class ThreadedModuleRunner:
+    """Runs analysis modules concurrently using a ThreadPoolExecutor.
+
+    All threads read the same DataFrame, exposed through read-only views,
+    so nothing is pickled or copied. Most of the engines' work happens in
+    NumPy, which releases the GIL.
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        result_cache: ResultCache | None = None,
+    ):
+        """Initialize the threaded runner.
+
+        Args:
+            max_workers: Number of worker threads. Defaults to the number
+                of available CPUs.
+            result_cache: Optional persistent cache of module results
+        """
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        self._runner = ModuleRunner(result_cache=result_cache)
+
+    def run_modules(
+        self, modules: dict[str, ModuleInfo], dataset: pd.DataFrame
+    ) -> tuple[dict[str, Any], RunReport]:
+        """Run analysis modules in parallel threads.
+
+        Concurrent calls are independent: each gets its own report.
+
+        Args:
+            modules: Mapping of module names to ModuleInfo objects
+            dataset: Input dataset for analysis
+
+        Returns:
+            Dictionary mapping module names to their results, in the same
+            order as ``modules``, and the report of the run. Failed modules
+            map to a dictionary with a single "error" key.
+        """
+        report = RunReport()
+        if not modules:
+            return {}, report
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        from src.core.columnar import read_only_frame
+        from src.core.prepared import PreparedDataset
+
+        max_workers = min(self.max_workers or os.cpu_count() or 1, len(modules))
+        logger.info(f"Running {len(modules)} modules on {max_workers} threads")
+
+        shared_dataset = read_only_frame(dataset)
+        prepared = PreparedDataset(shared_dataset)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    _run_module,
+                    self._runner,
+                    module_info,
+                    shared_dataset,
+                    prepared,
+                    report,
+                ): module_name
+                for module_name, module_info in modules.items()
+            }
+            outcomes = _collect_outcomes(futures)
+        report.preparation_savings = log_preparation_savings(prepared.savings())
+
+        return _results_of(outcomes, modules, report), report
+
+
+def _collect_outcomes(futures: dict[Future, str]) -> dict[str, ModuleOutcome]:
+    """Gather module outcomes from completed futures.
+
+    Args:
+        futures: Mapping of futures to the names of the modules they run
+
+    Returns:
+        Dictionary mapping module names to their outcomes
+    """
+    outcomes: dict[str, ModuleOutcome] = {}
+    for future in as_completed(futures):
+        module_name = futures[future]
+        try:
+            outcomes[module_name] = future.result()
+        except Exception as e:
+            # The task itself broke down, e.g. its worker process died
+            logger.error(f"Module {module_name} failed: {e}")
+            outcomes[module_name] = ModuleOutcome(error=str(e))
+    return outcomes
+
+
+def _results_of(
+    outcomes: dict[str, ModuleOutcome],
+    modules: dict[str, ModuleInfo],
+    report: RunReport,
+) -> dict[str, Any]:
+    """Turn outcomes into module results and record the cache hits.
+
+    Returns:
+        Dictionary mapping module names to their results, in the order of
+        ``modules``. Failed modules map to a dictionary with a single
+        "error" key.
+    """
+    results: dict[str, Any] = {}
+    for module_name in modules:
+        outcome = outcomes[module_name]
+        if outcome.error is not None:
+            results[module_name] = {"error": outcome.error}
+            continue
+        results[module_name] = outcome.result
+        if outcome.cache_hit:
+            report.cache_hits.add(module_name)
+    return results
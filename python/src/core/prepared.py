@@ -0,0 +1,313 @@
+"""Run-scoped preparation of a dataset, shared by all modules of a run.
+
+Most modules start by selecting the numeric columns of the dataset,
+coercing them with ``pd.to_numeric`` and dropping rows with missing
+values. A ``PreparedDataset`` does each of those steps once per dataset
+and hands the results to every module that asks for them: the schema,
+the coerced columns, their missing-value masks, row masks for "all of
+these columns present" and "any of them present", the cleaned frames
+built from those, and the columns each module's selection resolves to.
+
+Engines opt in by accepting a ``prepared`` keyword argument in
+``analyze`` or ``analyze_chunk``; see ``MODULE_SPEC.md``.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Hashable, Iterable
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+    from src.core.column_stats import StatisticsService
+    from src.core.sorted_index import SortedIndex
+
+logger = logging.getLogger(__name__)
+
+
+class PreparedDataset:
+    """Schema, coerced numeric columns and row masks of one dataset.
+
+    Everything is computed lazily on first use and memoized. Frames are
+    returned as shallow copies: modules may add or replace columns, but
+    must not modify the shared values in place.
+
+    For each memoized item the time it took to build and its size are
+    recorded, so ``savings`` can report what later uses did not have to
+    compute or copy again. ``statistics`` memoizes statistics of the
+    columns in the same way, and ``sorted_index`` their sorted order.
+    """
+
+    def __init__(self, dataset: pd.DataFrame):
+        """Initialize the context for a dataset.
+
+        Args:
+            dataset: Dataset every module of the run receives
+        """
+        self.dataset = dataset
+        self._memo = MemoTable(measure=_nbytes)
+        self._statistics: StatisticsService | None = None
+        self._sorted_index: SortedIndex | None = None
+
+    @property
+    def statistics(self) -> StatisticsService:
+        """Memoized column statistics of this dataset, shared like the rest."""
+        from src.core.column_stats import StatisticsService
+
+        with self._memo.lock:
+            if self._statistics is None:
+                self._statistics = StatisticsService(self)
+            return self._statistics
+
+    @property
+    def sorted_index(self) -> SortedIndex:
+        """Permutations sorting the numeric columns, computed on first use."""
+        from src.core.sorted_index import SortedIndex
+
+        with self._memo.lock:
+            if self._sorted_index is None:
+                self._sorted_index = SortedIndex(self)
+            return self._sorted_index
+
+    @property
+    def schema(self) -> dict[str, str]:
+        """Mapping of column names to dtype names."""
+        dtypes = self.dataset.dtypes
+        return self._memoize(
+            ("schema",),
+            lambda: {str(name): str(dtype) for name, dtype in dtypes.items()},
+        )
+
+    @property
+    def numeric_columns(self) -> list[str]:
+        """Columns with a numeric dtype, as ``select_dtypes("number")``."""
+        return self._memoize(
+            ("numeric_columns",),
+            lambda: list(self.dataset.select_dtypes(include="number").columns),
+        )
+
+    def select_columns(self, selection: Any) -> list[Any]:
+        """Resolve a module's column selection against the dataset's schema.
+
+        Args:
+            selection: Column selection, as for
+                ``src.core.column_selection.select_columns``
+
+        Returns:
+            Selected column labels; the list is shared, so do not modify it
+        """
+        from src.core.column_selection import select_columns, selection_key
+
+        return self._memoize(
+            ("select_columns", selection_key(selection)),
+            lambda: select_columns(self.dataset, selection),
+        )
+
+    def numeric(self, column: str) -> pd.Series:
+        """Return a column coerced with ``pd.to_numeric(errors="coerce")``.
+
+        Args:
+            column: Column name
+
+        Returns:
+            Coerced column, sharing the original values if they are numeric
+        """
+        import pandas as pd
+
+        return self._memoize(
+            ("numeric", column),
+            lambda: pd.to_numeric(self.dataset[column], errors="coerce"),
+        )
+
+    def missing(self, column: str) -> np.ndarray:
+        """Return the mask of rows where the coerced column is missing."""
+        return self._memoize(
+            ("missing", column), lambda: self.numeric(column).isna().to_numpy()
+        )
+
+    def complete_rows(self, columns: Iterable[str]) -> np.ndarray:
+        """Return the mask of rows where none of the columns is missing.
+
+        Args:
+            columns: Column names, coerced to numeric
+
+        Returns:
+            Boolean array with one entry per row
+        """
+        import numpy as np
+
+        columns = tuple(columns)
+        return self._memoize(
+            ("complete_rows", columns),
+            lambda: ~self._missing_matrix(columns).any(axis=0)
+            if columns
+            else np.ones(len(self.dataset), dtype=bool),
+        )
+
+    def nonempty_rows(self, columns: Iterable[str]) -> np.ndarray:
+        """Return the mask of rows where at least one column is present.
+
+        Args:
+            columns: Column names, coerced to numeric
+
+        Returns:
+            Boolean array with one entry per row
+        """
+        import numpy as np
+
+        columns = tuple(columns)
+        return self._memoize(
+            ("nonempty_rows", columns),
+            lambda: ~self._missing_matrix(columns).all(axis=0)
+            if columns
+            else np.zeros(len(self.dataset), dtype=bool),
+        )
+
+    def frame(
+        self,
+        columns: Iterable[str],
+        rows: str | None = None,
+        extra_columns: Iterable[str] = (),
+    ) -> pd.DataFrame:
+        """Return a frame of coerced numeric columns.
+
+        Args:
+            columns: Columns to coerce to numeric
+            rows: "complete" to keep the rows where all of ``columns`` are
+                present (``dropna(subset=columns)``), "nonempty" to keep
+                the rows where any of them is (``dropna(how="all")``), or
+                None to keep every row
+            extra_columns: Columns taken over unchanged after ``columns``
+
+        Returns:
+            Shallow copy of the memoized frame, indexed like the dataset
+        """
+        columns = tuple(columns)
+        extra_columns = tuple(extra_columns)
+        if rows not in (None, "complete", "nonempty"):
+            raise ValueError(f"Unknown row selection {rows!r}")
+
+        def build() -> pd.DataFrame:
+            import pandas as pd
+
+            data = {column: self.numeric(column) for column in columns}
+            data.update({column: self.dataset[column] for column in extra_columns})
+            frame = pd.DataFrame(data, index=self.dataset.index, columns=list(data))
+            if rows == "complete":
+                frame = frame[self.complete_rows(columns)]
+            elif rows == "nonempty":
+                frame = frame[self.nonempty_rows(columns)]
+            return frame
+
+        frame = self._memoize(("frame", columns, rows, extra_columns), build)
+        return frame.copy(deep=False)
+
+    def savings(self) -> dict[str, Any]:
+        """Report how much work and memory the shared preparation saved.
+
+        Returns:
+            Number of reused and computed items, and the seconds and bytes
+            the reuses would otherwise have cost
+        """
+        savings = {
+            "reused": self._memo.hits,
+            "computed": self._memo.misses,
+            "seconds_saved": round(self._memo.seconds_saved, 6),
+            "bytes_saved": self._memo.bytes_saved,
+        }
+        if self._statistics is not None:
+            savings["statistics"] = self._statistics.counters()
+        return savings
+
+    def _missing_matrix(self, columns: tuple[str, ...]) -> np.ndarray:
+        import numpy as np
+
+        return np.vstack([self.missing(column) for column in columns])
+
+    def _memoize(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        return self._memo.get(key, build)
+
+
+class MemoTable:
+    """Thread-safe memo of lazily built values with hit and miss counters.
+
+    Each value is built once, under a lock of its own, so threads needing
+    different values do not wait for each other. The time each build took
+    (and optionally the size of its value) is credited as saved whenever
+    the value is reused.
+    """
+
+    def __init__(self, measure: Callable[[Any], int] | None = None):
+        """Initialize an empty memo.
+
+        Args:
+            measure: Returns the size in bytes of a built value
+        """
+        self.measure = measure
+        self.hits = 0
+        self.misses = 0
+        self.seconds_saved = 0.0
+        self.bytes_saved = 0
+        self.lock = threading.RLock()
+        self._items: dict[Hashable, tuple[Any, float, int]] = {}
+        self._key_locks: dict[Hashable, threading.Lock] = {}
+
+    def get(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        """Return the value for a key, building it on first use.
+
+        Args:
+            key: Key of the value
+            build: Computes the value
+
+        Returns:
+            The memoized value
+        """
+        with self.lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            item = self._items.get(key)
+            if item is None:
+                start = time.perf_counter()
+                value = build()
+                seconds = time.perf_counter() - start
+                size = self.measure(value) if self.measure is not None else 0
+                with self.lock:
+                    self._items[key] = (value, seconds, size)
+                    self.misses += 1
+                return value
+        with self.lock:
+            self.hits += 1
+            self.seconds_saved += item[1]
+            self.bytes_saved += item[2]
+        return item[0]
+
+
+def add_savings(total: dict[str, Any], savings: dict[str, Any]) -> dict[str, Any]:
+    """Add one report of ``PreparedDataset.savings`` to a running total.
+
+    Args:
+        total: Running total, updated in place
+        savings: Report to add
+
+    Returns:
+        The updated total
+    """
+    for key, value in savings.items():
+        if isinstance(value, dict):
+            add_savings(total.setdefault(key, {}), value)
+        else:
+            total[key] = total.get(key, 0) + value
+    return total
+
+
+def _nbytes(value: Any) -> int:
+    """Return the memory held by a memoized item, shallowly."""
+    if hasattr(value, "memory_usage"):
+        usage = value.memory_usage(index=False, deep=False)
+        return int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+    return int(getattr(value, "nbytes", 0))
@@ -0,0 +1,226 @@
+"""Mergeable quantile sketches for approximate quantiles in bounded memory.
+
+The sketch is the KLL sketch of Karnin, Lang and Liberty. Values are
+kept in levels; a value on level ``h`` stands for ``2**h`` of the values
+summarized. When the levels hold more values than their capacities
+allow, the lowest full level is sorted and every other value, starting
+at a pseudo-random offset, is promoted to the level above while the rest
+are discarded. Capacities shrink geometrically towards the lower levels,
+so a sketch with parameter ``k`` holds about ``3 * k`` values however
+many it summarizes, and two sketches merge by concatenating their levels.
+
+Until the first compaction the sketch holds every value and quantiles
+are exact (linearly interpolated like NumPy and pandas); afterwards
+their rank error is bounded by ``rank_error``.
+
+Like the statistics in ``src.core.moments``, a sketch is a plain
+dictionary of numbers and NumPy arrays.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import numpy as np
+
+DEFAULT_K = 200
+
+# Capacity of each level relative to the one above
+_CAPACITY_RATIO = 2 / 3
+_MIN_CAPACITY = 2
+
+_MASK64 = (1 << 64) - 1
+
+
+def empty_sketch(k: int = DEFAULT_K) -> dict[str, Any]:
+    """Return the sketch of no values.
+
+    Args:
+        k: Accuracy parameter; the rank error falls roughly as ``1 / k``
+            while the memory grows as ``k``
+    """
+    import numpy as np
+
+    if k < _MIN_CAPACITY:
+        raise ValueError(f"Sketch parameter k must be at least {_MIN_CAPACITY}")
+    return {
+        "k": k,
+        "count": 0,
+        "min": None,
+        "max": None,
+        "compactions": 0,
+        "levels": [np.empty(0)],
+    }
+
+
+def update_sketch(sketch: dict[str, Any], values: np.ndarray) -> dict[str, Any]:
+    """Add values to a sketch.
+
+    Args:
+        sketch: Sketch to add to; it is not modified
+        values: One-dimensional numeric array without missing values
+
+    Returns:
+        Sketch of the previous and the new values
+    """
+    import numpy as np
+
+    if len(values) == 0:
+        return sketch
+    values = np.asarray(values, dtype="float64")
+    levels = list(sketch["levels"])
+    levels[0] = np.concatenate([levels[0], values])
+    updated = {
+        "k": sketch["k"],
+        "count": sketch["count"] + len(values),
+        "min": _extreme(min, sketch["min"], values.min()),
+        "max": _extreme(max, sketch["max"], values.max()),
+        "compactions": sketch["compactions"],
+        "levels": levels,
+    }
+    _compress(updated)
+    return updated
+
+
+def sketch_values(values: np.ndarray, k: int = DEFAULT_K) -> dict[str, Any]:
+    """Summarize one array of values in a new sketch.
+
+    Args:
+        values: One-dimensional numeric array without missing values
+        k: Accuracy parameter of the sketch
+
+    Returns:
+        Sketch of the values
+    """
+    return update_sketch(empty_sketch(k), values)
+
+
+def merge_sketches(a: dict[str, Any], b: dict[str, Any]) -> dict[str, Any]:
+    """Combine the sketches of two disjoint sets of values.
+
+    The result has the smaller of the two accuracy parameters.
+
+    Args:
+        a: Sketch of the first set
+        b: Sketch of the second set
+
+    Returns:
+        Sketch of both sets together
+    """
+    import numpy as np
+
+    if b["count"] == 0:
+        return a
+    if a["count"] == 0:
+        return b
+    n_levels = max(len(a["levels"]), len(b["levels"]))
+    levels = [
+        np.concatenate(
+            [sketch["levels"][h] for sketch in (a, b) if h < len(sketch["levels"])]
+        )
+        for h in range(n_levels)
+    ]
+    merged = {
+        "k": min(a["k"], b["k"]),
+        "count": a["count"] + b["count"],
+        "min": min(a["min"], b["min"]),
+        "max": max(a["max"], b["max"]),
+        "compactions": a["compactions"] + b["compactions"],
+        "levels": levels,
+    }
+    _compress(merged)
+    return merged
+
+
+def sketch_quantiles(sketch: dict[str, Any], quantiles: list[float]) -> np.ndarray:
+    """Estimate quantiles of the summarized values.
+
+    Args:
+        sketch: Sketch of the values
+        quantiles: Quantiles to estimate, between 0 and 1
+
+    Returns:
+        Array of estimates, NaN if the sketch is empty
+    """
+    import numpy as np
+
+    quantiles = np.asarray(quantiles, dtype="float64")
+    if sketch["count"] == 0:
+        return np.full(quantiles.shape, np.nan)
+    levels = sketch["levels"]
+    if len(levels) == 1:
+        return np.quantile(levels[0], quantiles)
+
+    items = np.concatenate(levels)
+    weights = np.concatenate(
+        [np.full(len(level), 2**h, dtype="int64") for h, level in enumerate(levels)]
+    )
+    order = np.argsort(items, kind="stable")
+    items = items[order]
+    cumulative = np.cumsum(weights[order])
+    positions = np.searchsorted(cumulative, quantiles * sketch["count"], side="left")
+    estimates = items[np.minimum(positions, len(items) - 1)]
+    estimates[quantiles <= 0] = sketch["min"]
+    estimates[quantiles >= 1] = sketch["max"]
+    return estimates
+
+
+def rank_error(sketch: dict[str, Any]) -> float:
+    """Return the normalized rank error of the sketch's quantile estimates.
+
+    An estimate for quantile ``q`` is, with about 99% confidence, a value
+    whose rank among the summarized values lies within ``q`` plus or
+    minus this error. Sketches that never compacted are exact.
+
+    Args:
+        sketch: Sketch of the values
+
+    Returns:
+        Rank error as a fraction of the number of values
+    """
+    if len(sketch["levels"]) == 1:
+        return 0.0
+    # Empirical single-quantile bound of the KLL sketch
+    return 2.296 / sketch["k"] ** 0.9723
+
+
+def _level_capacity(k: int, n_levels: int, level: int) -> int:
+    depth = n_levels - level - 1
+    return max(_MIN_CAPACITY, math.ceil(k * _CAPACITY_RATIO**depth))
+
+
+def _compress(sketch: dict[str, Any]) -> None:
+    """Compact levels in place until the sketch fits its capacity."""
+    import numpy as np
+
+    levels = sketch["levels"]
+    k = sketch["k"]
+    while True:
+        capacities = [_level_capacity(k, len(levels), h) for h in range(len(levels))]
+        if sum(len(level) for level in levels) <= sum(capacities):
+            return
+        h = next(h for h, level in enumerate(levels) if len(level) >= capacities[h])
+        if h + 1 == len(levels):
+            levels.append(np.empty(0))
+        level = np.sort(levels[h])
+        # With an odd number of values the smallest one stays on its level
+        odd = len(level) % 2
+        offset = _coin(sketch["compactions"])
+        sketch["compactions"] += 1
+        levels[h + 1] = np.concatenate([levels[h + 1], level[odd + offset :: 2]])
+        levels[h] = level[:odd]
+
+
+def _coin(n: int) -> int:
+    """Return a deterministic pseudo-random bit for the n-th compaction."""
+    # Finalizer of the SplitMix64 generator
+    z = (n * 0x9E3779B97F4A7C15) & _MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return (z ^ (z >> 31)) & 1
+
+
+def _extreme(pick: Any, current: Any, candidate: Any) -> Any:
+    return candidate if current is None else pick(current, candidate)
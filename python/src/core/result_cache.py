@@ -0,0 +1,132 @@
+"""Persistent on-disk cache of module results."""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+from src.core.serialization import NumpyJSONEncoder
+
+logger = logging.getLogger(__name__)
+
+
+class ResultCache:
+    """Stores module results on disk, keyed by everything they depend on.
+
+    A module result is a pure function of the dataset, the module's code,
+    the core code it runs and its PARAMETERS, so the cache key combines the
+    dataset fingerprint with the module's version, source hash, core source
+    hash and parameter hash. Each result
+    is one JSON file; when the directory grows beyond ``max_bytes`` the
+    least recently used files are removed.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int = 256 * 1024 * 1024):
+        """Initialize the result cache.
+
+        Args:
+            cache_dir: Directory holding the cached result files
+            max_bytes: Size budget for the cache directory
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def __reduce__(self):
+        # Rebuilt from its settings when sent to worker processes
+        return (ResultCache, (self.cache_dir, self.max_bytes))
+
+    @staticmethod
+    def make_key(dataset_fingerprint: str, module_fingerprint: dict[str, str]) -> str:
+        """Build the cache key for a module run.
+
+        Args:
+            dataset_fingerprint: Fingerprint of the input dataset
+            module_fingerprint: Version, source, core source and parameter
+                hashes of the module (see
+                ``src.core.fingerprint.module_fingerprint``)
+
+        Returns:
+            Hex digest used as the cache key
+        """
+        encoded = json.dumps([dataset_fingerprint, module_fingerprint], sort_keys=True)
+        return hashlib.sha256(encoded.encode()).hexdigest()
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Return a cached result, or None on a miss.
+
+        Args:
+            key: Cache key from ``make_key``
+
+        Returns:
+            The cached result dictionary, or None
+        """
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                result = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cached result {path}: {e}")
+            return None
+
+        # Mark as recently used for eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return result
+
+    def put(self, key: str, result: dict[str, Any]) -> None:
+        """Store a result and evict old entries if over budget.
+
+        Failing to write the cache is not fatal.
+
+        Args:
+            key: Cache key from ``make_key``
+            result: JSON-serializable module result
+        """
+        path = self._path(key)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(result, f, cls=NumpyJSONEncoder)
+            tmp_path.replace(path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not cache result {path}: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return
+
+        self._evict()
+
+    def clear(self) -> None:
+        """Remove all cached results."""
+        for path in self.cache_dir.glob("*.json"):
+            path.unlink(missing_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _evict(self) -> None:
+        """Remove least recently used results until within budget."""
+        with self._lock:
+            entries = []
+            for path in self.cache_dir.glob("*.json"):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, path))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                logger.info(f"Evicted cached result {path.name}")
@@ -0,0 +1,336 @@
+"""Append-only datasets: persisted module states updated with new records.
+
+A dataset that only ever grows does not have to be analyzed from scratch
+on every run. The chunked states of the modules (see ``MODULE_SPEC.md``)
+summarize every record seen so far, so they are saved next to the
+dataset together with a high-water mark: the byte offset at which the
+last ingested record ends and the largest value of a key column such as
+``id`` or ``timestamp``. The next run reads only what follows the offset,
+keeps the records whose key lies above the mark, folds them into fresh
+states and merges those into the saved ones. Finalizing the merged
+states gives the results of a full recompute. Modules with a second
+pass, such as ``outlier_detection``, still scan the whole file against
+the bounds of their merged state, as any record may lie outside new
+bounds.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from src.core.incremental import compute_module_fingerprints, fingerprints_match
+from src.core.module_registry import ModuleInfo
+from src.core.serialization import decode_state, encode_state
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from src.core.data_loader import DataLoader
+    from src.core.module_runner import ModuleRunner
+
+logger = logging.getLogger(__name__)
+
+STATE_FORMAT = 1
+
+# Bytes before the saved offset that must be unchanged to resume there
+TAIL_BYTES = 4096
+
+
+@dataclass
+class IngestProgress:
+    """What has been ingested from an append-only dataset."""
+
+    records: int = 0
+    file_records: int = 0
+    high_water_mark: Any = None
+
+
+class RunningStateStore:
+    """Module states of an append-only dataset, saved next to the dataset.
+
+    For ``data/sample_data.json`` the states are kept in
+    ``data/.sample_data.state.json``, a JSON document with the states
+    encoded by ``src.core.serialization.encode_state``.
+    """
+
+    def __init__(self, dataset_path: Path, key_column: str = "id"):
+        """Initialize the store for a dataset.
+
+        Args:
+            dataset_path: JSON array of records that is only appended to
+            key_column: Column whose values grow with every appended record
+        """
+        self.dataset_path = dataset_path
+        self.key_column = key_column
+        self.state_path = dataset_path.with_name(f".{dataset_path.stem}.state.json")
+
+    def load(self) -> dict[str, Any] | None:
+        """Read the saved document.
+
+        Returns:
+            The saved document, or None if there is none for this key column
+        """
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                document = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable running state {self.state_path}: {e}")
+            return None
+        if (
+            document.get("format") != STATE_FORMAT
+            or document.get("key_column") != self.key_column
+        ):
+            return None
+        return document
+
+    def store(self, document: dict[str, Any]) -> None:
+        """Write a document, replacing the previous one atomically.
+
+        Failures are logged; the next run then starts from scratch.
+
+        Args:
+            document: Document to save
+        """
+        tmp_path = self.state_path.with_name(f"{self.state_path.name}.tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(document, f)
+            tmp_path.replace(self.state_path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not write running state {self.state_path}: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return
+        logger.info(f"Saved running state to {self.state_path}")
+
+    def resume_offset(self, document: dict[str, Any]) -> int | None:
+        """Return the offset to resume reading at, if the file was appended to.
+
+        Args:
+            document: Saved document
+
+        Returns:
+            The saved offset, or None if the bytes before it have changed
+        """
+        offset = document["offset"]
+        if self.dataset_path.stat().st_size < offset:
+            return None
+        if tail_digest(self.dataset_path, offset) != document["tail_digest"]:
+            return None
+        return offset
+
+
+def tail_digest(path: Path, offset: int) -> str:
+    """Hash the ``TAIL_BYTES`` bytes of a file that end at ``offset``."""
+    start = max(0, offset - TAIL_BYTES)
+    with open(path, "rb") as f:
+        f.seek(start)
+        return hashlib.sha256(f.read(offset - start)).hexdigest()
+
+
+def run_append_only(
+    module_runner: ModuleRunner,
+    modules: dict[str, ModuleInfo],
+    data_loader: DataLoader,
+    dataset_path: Path,
+    key_column: str = "id",
+    chunk_bytes: int = 64 * 1024 * 1024,
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Analyze an append-only dataset, ingesting only the new records.
+
+    Modules with a saved state whose code, core dependencies and
+    parameters are unchanged fold in just the records appended since the
+    previous run. Modules without one (including every module on the
+    first run) fold in the whole dataset. If the file was rewritten
+    rather than appended to, it is read again in full but only records
+    above the high-water mark are ingested.
+
+    Args:
+        module_runner: Runner used to fold, merge and finalize the states
+        modules: Mapping of module names to ModuleInfo objects
+        data_loader: Loader used to read the dataset in chunks
+        dataset_path: JSON array of records that is only appended to
+        key_column: Column whose values grow with every appended record
+        chunk_bytes: Approximate size of the JSON text read per chunk
+
+    Returns:
+        Module results, and dataset information for ``build_output``
+    """
+    from src.core.parallel_ingest import iter_record_chunks, record_array_end
+
+    store = RunningStateStore(dataset_path, key_column)
+    document = store.load()
+    fingerprints = compute_module_fingerprints(modules)
+    end = record_array_end(dataset_path)
+
+    saved_states: dict[str, Any] = {}
+    if document is not None:
+        for module_name in modules:
+            if module_name not in document["states"]:
+                continue
+            if not fingerprints_match(
+                document["fingerprints"].get(module_name),
+                fingerprints.get(module_name),
+            ):
+                logger.info(
+                    f"Module {module_name} changed since its state was saved, "
+                    "discarding the state"
+                )
+                continue
+            saved_states[module_name] = decode_state(document["states"][module_name])
+    stale_modules = {
+        module_name: module_info
+        for module_name, module_info in modules.items()
+        if module_name not in saved_states
+    }
+
+    states: dict[str, Any] = {}
+    errors: dict[str, str] = {}
+    progress = IngestProgress()
+    appended = IngestProgress()
+    if saved_states:
+        progress = IngestProgress(
+            document["records"], document["file_records"], document["high_water_mark"]
+        )
+        offset = store.resume_offset(document)
+        if offset is not None:
+            chunks = iter_record_chunks(
+                dataset_path,
+                chunk_bytes,
+                offset=offset,
+                first_record=progress.file_records,
+            )
+        else:
+            logger.info(f"{dataset_path.name} was rewritten, reading it in full")
+            chunks = data_loader.iter_chunks(dataset_path, chunk_bytes)
+        appended.high_water_mark = progress.high_water_mark
+        new_states, errors = module_runner.fold_chunks(
+            {name: modules[name] for name in saved_states},
+            _after_mark(chunks, key_column, progress.high_water_mark, appended),
+        )
+        for module_name, state in new_states.items():
+            if appended.records:
+                state = module_runner.merge_states(
+                    modules[module_name], saved_states[module_name], state
+                )
+            else:
+                state = saved_states[module_name]
+            states[module_name] = state
+        progress = IngestProgress(
+            progress.records + appended.records,
+            max(progress.file_records, appended.file_records),
+            appended.high_water_mark,
+        )
+        logger.info(f"Ingested {appended.records} appended records")
+
+    if stale_modules:
+        logger.info(f"Folding the whole dataset into {len(stale_modules)} modules")
+        full = IngestProgress()
+        chunks = data_loader.iter_chunks(dataset_path, chunk_bytes)
+        fresh_states, fresh_errors = module_runner.fold_chunks(
+            stale_modules, _after_mark(chunks, key_column, None, full)
+        )
+        states.update(fresh_states)
+        errors.update(fresh_errors)
+        if not saved_states:
+            progress = appended = full
+
+    # Second passes compare rows with bounds of the whole dataset, so they
+    # read the whole file again rather than just the appended records
+    scans, scan_errors = module_runner.scan_states(
+        {name: modules[name] for name in states},
+        states,
+        lambda: data_loader.iter_chunks(dataset_path, chunk_bytes),
+    )
+
+    results: dict[str, Any] = {}
+    saved: dict[str, Any] = {}
+    for module_name, module_info in modules.items():
+        if module_name in errors:
+            results[module_name] = {"error": errors[module_name]}
+            continue
+        try:
+            if module_name in scan_errors:
+                # The state itself is sound and is saved all the same
+                results[module_name] = {"error": scan_errors[module_name]}
+            else:
+                results[module_name] = module_runner.finalize_state(
+                    module_info, states[module_name], scans.get(module_name)
+                )
+        except Exception as e:
+            logger.error(f"Module {module_name} failed: {e}")
+            results[module_name] = {"error": str(e)}
+            continue
+        try:
+            saved[module_name] = encode_state(states[module_name])
+        except TypeError as e:
+            logger.warning(f"Module {module_name} state cannot be saved: {e}")
+
+    store.store(
+        {
+            "format": STATE_FORMAT,
+            "key_column": key_column,
+            "high_water_mark": progress.high_water_mark,
+            "records": progress.records,
+            "file_records": progress.file_records,
+            "offset": end,
+            "tail_digest": tail_digest(dataset_path, end),
+            "fingerprints": {name: fingerprints.get(name) for name in saved},
+            "states": saved,
+        }
+    )
+
+    dataset_info = {
+        "total_records": progress.records,
+        "appended_records": appended.records,
+        "high_water_mark": progress.high_water_mark,
+    }
+    return results, dataset_info
+
+
+def _after_mark(
+    chunks: Iterable[pd.DataFrame],
+    key_column: str,
+    mark: Any,
+    progress: IngestProgress,
+) -> Iterator[pd.DataFrame]:
+    """Drop records at or below a high-water mark and track the new mark.
+
+    Records with a missing key are kept. ``progress`` is updated with the
+    records passed on, the records read and the largest key passed on.
+    """
+    import pandas as pd
+
+    largest = None
+    for chunk in chunks:
+        if key_column not in chunk.columns:
+            raise ValueError(f"Dataset has no {key_column!r} column to track appends")
+        progress.file_records = int(chunk.index[-1]) + 1
+        keys = chunk[key_column]
+        if mark is not None:
+            if pd.api.types.is_datetime64_any_dtype(keys):
+                mark = pd.Timestamp(mark)
+            chunk = chunk[~(keys <= mark)]
+            keys = chunk[key_column]
+        if chunk.empty:
+            continue
+        progress.records += len(chunk)
+        chunk_largest = keys.max()
+        if not pd.isna(chunk_largest) and (largest is None or chunk_largest > largest):
+            largest = chunk_largest
+            progress.high_water_mark = _mark_value(largest)
+        yield chunk
+
+
+def _mark_value(value: Any) -> Any:
+    """Return a key value in a form that can be saved as JSON."""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value.item() if hasattr(value, "item") else value
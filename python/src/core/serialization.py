@@ -0,0 +1,95 @@
+"""JSON serialization helpers for analysis results and states."""
+
+import base64
+import json
+from typing import Any
+
+# Keys marking encoded NumPy values in encoded states
+NDARRAY_KEY = "__ndarray__"
+NUMPY_SCALAR_KEY = "__numpy__"
+
+
+class NumpyJSONEncoder(json.JSONEncoder):
+    """Custom JSON encoder that handles NumPy data types."""
+
+    def default(self, obj):
+        import numpy as np
+
+        if isinstance(obj, (np.integer, np.int64)):
+            return int(obj)
+        elif isinstance(obj, (np.floating, np.float64)):
+            return float(obj)
+        elif isinstance(obj, np.ndarray):
+            return obj.tolist()
+        return super().default(obj)
+
+
+def encode_state(value: Any) -> Any:
+    """Convert a chunked analysis state into JSON-compatible values.
+
+    Unlike NumpyJSONEncoder this is lossless: arrays keep their dtype and
+    shape, with the raw bytes base64-encoded, and NumPy scalars keep their
+    type. Nothing is pickled, so decoding never executes code.
+
+    Args:
+        value: State made of dictionaries with string keys, lists, tuples,
+            Python scalars, NumPy scalars and NumPy arrays
+
+    Returns:
+        Equivalent structure of dictionaries, lists and Python scalars
+
+    Raises:
+        TypeError: If the state contains other types, such as object arrays
+    """
+    import numpy as np
+
+    if isinstance(value, dict):
+        return {_string_key(key): encode_state(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [encode_state(item) for item in value]
+    if isinstance(value, np.ndarray):
+        if value.dtype.hasobject:
+            raise TypeError("Arrays of Python objects cannot be encoded")
+        data = np.ascontiguousarray(value).tobytes()
+        return {
+            NDARRAY_KEY: base64.b64encode(data).decode("ascii"),
+            "dtype": value.dtype.str,
+            "shape": list(value.shape),
+        }
+    if isinstance(value, np.generic):
+        return {NUMPY_SCALAR_KEY: value.dtype.str, "value": value.item()}
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    raise TypeError(f"Cannot encode {type(value).__name__} in a state")
+
+
+def decode_state(value: Any) -> Any:
+    """Rebuild a state converted with ``encode_state``.
+
+    Args:
+        value: Structure returned by ``encode_state``, e.g. after a round
+            trip through ``json.dumps`` and ``json.loads``
+
+    Returns:
+        The original state; tuples come back as lists
+    """
+    import numpy as np
+
+    if isinstance(value, dict):
+        if NDARRAY_KEY in value:
+            data = base64.b64decode(value[NDARRAY_KEY])
+            array = np.frombuffer(data, dtype=np.dtype(value["dtype"]))
+            # frombuffer views are read-only; states are updated in place
+            return array.reshape(value["shape"]).copy()
+        if NUMPY_SCALAR_KEY in value:
+            return np.dtype(value[NUMPY_SCALAR_KEY]).type(value["value"])
+        return {key: decode_state(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [decode_state(item) for item in value]
+    return value
+
+
+def _string_key(key: Any) -> str:
+    if not isinstance(key, str):
+        raise TypeError(f"State keys must be strings, not {type(key).__name__}")
+    return key
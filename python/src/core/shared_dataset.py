@@ -0,0 +1,179 @@
+"""Zero-copy dataset sharing between processes via shared memory."""
+
+import logging
+import weakref
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from src.core.columnar import (
+    EncodedColumn,
+    decode_column,
+    encode_column,
+    frame_from_columns,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SharedColumn:
+    """A column stored in a shared memory segment."""
+
+    column: EncodedColumn  # metadata only, values are left empty
+    shm_name: str
+    length: int
+
+
+@dataclass
+class SharedDatasetHandle:
+    """Picklable description of a shared dataset, sent to worker processes."""
+
+    columns: list[SharedColumn]
+    index: SharedColumn | range
+
+    def attach(self) -> "AttachedDataset":
+        """Attach to the shared segments and rebuild a read-only DataFrame."""
+        return AttachedDataset(self)
+
+
+def _release(segments: list[shared_memory.SharedMemory]) -> None:
+    """Close and unlink shared memory segments, ignoring ones already gone."""
+    for segment in segments:
+        try:
+            segment.close()
+            segment.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedDataset:
+    """Owns the shared memory segments holding a dataset.
+
+    Every column is encoded once (see ``src.core.columnar``) and copied into
+    its own shared memory segment. Worker processes attach through the
+    handle and see read-only views over the same pages, so the dataset is
+    never pickled per worker.
+
+    Segments are unlinked by ``close()``, when the object is garbage
+    collected, or at interpreter exit. If the owning process is killed
+    outright, the multiprocessing resource tracker unlinks them.
+    """
+
+    def __init__(self, dataset: pd.DataFrame):
+        """Copy the dataset into shared memory.
+
+        Args:
+            dataset: DataFrame to share
+        """
+        self._segments: list[shared_memory.SharedMemory] = []
+        self._finalizer = weakref.finalize(self, _release, self._segments)
+
+        try:
+            columns = [
+                self._share(encode_column(name, dataset[name]))
+                for name in dataset.columns
+            ]
+            if isinstance(dataset.index, pd.RangeIndex):
+                index = range(
+                    dataset.index.start, dataset.index.stop, dataset.index.step
+                )
+            else:
+                index = self._share(
+                    encode_column(dataset.index.name, dataset.index.to_series())
+                )
+        except Exception:
+            self.close()
+            raise
+
+        self.handle = SharedDatasetHandle(columns=columns, index=index)
+        logger.info(
+            f"Shared {len(columns)} columns in {len(self._segments)} segments "
+            f"({self.nbytes} bytes)"
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Total size of the shared memory segments."""
+        return sum(segment.size for segment in self._segments)
+
+    def _share(self, column: EncodedColumn) -> SharedColumn:
+        """Copy an encoded column into a new shared memory segment."""
+        values = np.ascontiguousarray(column.values)
+        # Zero-size segments are not allowed
+        segment = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        self._segments.append(segment)
+
+        target = np.ndarray(values.shape, dtype=values.dtype, buffer=segment.buf)
+        target[:] = values
+
+        metadata = EncodedColumn(
+            name=column.name,
+            kind=column.kind,
+            dtype=column.dtype,
+            values=np.empty(0, dtype=values.dtype),
+            categories=column.categories,
+            ordered=column.ordered,
+        )
+        return SharedColumn(column=metadata, shm_name=segment.name, length=len(values))
+
+    def close(self) -> None:
+        """Release all shared memory segments."""
+        self._finalizer()
+
+    def __enter__(self) -> "SharedDataset":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class AttachedDataset:
+    """A worker-side read-only view of a SharedDataset."""
+
+    def __init__(self, handle: SharedDatasetHandle):
+        """Attach to the segments described by the handle.
+
+        Args:
+            handle: Handle received from the owning process
+        """
+        self._segments: list[shared_memory.SharedMemory] = []
+
+        columns = {
+            shared.column.name: self._attach(shared) for shared in handle.columns
+        }
+        if isinstance(handle.index, range):
+            index = pd.RangeIndex(
+                handle.index.start, handle.index.stop, handle.index.step
+            )
+        else:
+            index = pd.Index(
+                self._attach(handle.index), name=handle.index.column.name
+            )
+
+        self.dataset = frame_from_columns(columns, index=index)
+
+    def _attach(self, shared: SharedColumn) -> Any:
+        """Map one shared column and decode it."""
+        segment = shared_memory.SharedMemory(name=shared.shm_name)
+        self._segments.append(segment)
+
+        values = np.ndarray(
+            (shared.length,), dtype=shared.column.values.dtype, buffer=segment.buf
+        )
+        values.flags.writeable = False
+        return decode_column(shared.column, values)
+
+    def close(self) -> None:
+        """Detach from the segments without unlinking them."""
+        self.dataset = None
+        for segment in self._segments:
+            try:
+                segment.close()
+            except BufferError:
+                # A view over the segment is still referenced somewhere
+                pass
+        self._segments.clear()
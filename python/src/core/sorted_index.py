@@ -0,0 +1,201 @@
+"""Sorted order of the numeric columns of a dataset, shared by all modules.
+
+Medians, quartiles, IQR bounds and rank correlations all need the values
+of a column in sorted order. A ``SortedIndex`` sorts each numeric column
+once, on first use, and keeps the permutation that sorts it. Quantiles
+and extremes then become lookups, the values beyond a bound a binary
+search, and the sorted order of a subset of the rows (such as the rows
+where several columns are present) is read off the permutation in linear
+time instead of being sorted again.
+
+When the dataset was loaded through the columnar cache
+(``src.core.columnar_cache``), the permutations are saved in the cache
+directory, so later runs on the same file do not sort at all.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from collections.abc import Callable
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from src.core.prepared import MemoTable
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from src.core.columnar_cache import ColumnarCache
+    from src.core.prepared import PreparedDataset
+
+logger = logging.getLogger(__name__)
+
+
+class SortedIndex:
+    """Permutations sorting the numeric columns of one prepared dataset."""
+
+    def __init__(self, prepared: PreparedDataset):
+        """Initialize the index.
+
+        Args:
+            prepared: Preparation of the dataset whose columns are sorted
+        """
+        self.prepared = prepared
+        self.store = _cache_of(prepared)
+        self._memo = MemoTable()
+
+    def order(self, column: str) -> np.ndarray:
+        """Return the permutation that sorts a column, missing values last.
+
+        Args:
+            column: Column name, coerced to numeric
+
+        Returns:
+            Row positions in ascending order of the column's values; ties
+            keep their row order
+        """
+
+        def build() -> np.ndarray:
+            import numpy as np
+
+            from src.core.histogram import small_integer_range
+
+            if self.store is not None:
+                order = self.store.load_order(column, len(self.prepared.dataset))
+                if order is not None:
+                    return order
+            values = self.prepared.numeric(column).to_numpy()
+            if small_integer_range(values):
+                # Offsets of small integers fit 16 bits, which NumPy radix sorts
+                low = values.min()
+                width = np.min_scalar_type(values.max() - low)
+                order = np.argsort((values - low).astype(width), kind="stable")
+            else:
+                values = self.prepared.numeric(column).to_numpy(
+                    dtype="float64", na_value=np.nan
+                )
+                order = np.argsort(values, kind="stable")
+            if self.store is not None:
+                self.store.store_order(column, order)
+            return order
+
+        return self._memo.get(column, build)
+
+    def sorted_positions(self, column: str, rows: np.ndarray | None = None) -> Any:
+        """Return the positions of a column's values in ascending order.
+
+        Args:
+            column: Column name, coerced to numeric
+            rows: Boolean mask of the rows to consider, or None for all
+
+        Returns:
+            Positions of the selected rows where the column is present
+        """
+        order = self.order(column)
+        keep = ~self.prepared.missing(column)
+        if rows is not None:
+            keep = keep & rows
+        return order[keep[order]]
+
+
+def linear_quantile(sorted_values: np.ndarray, q: float) -> Any:
+    """Return a quantile of sorted values, interpolated like pandas.
+
+    The arithmetic is that of ``Series.quantile`` (NumPy's "linear"
+    method on the percentage ``q * 100``), so results agree bit for bit.
+
+    Args:
+        sorted_values: Values in ascending order, without missing values
+        q: Quantile between 0 and 1
+
+    Returns:
+        The quantile, NaN if there are no values
+    """
+    return interpolate_quantile(len(sorted_values), q, sorted_values.__getitem__)
+
+
+def interpolate_quantile(n: int, q: float, value_at: Callable[[int], Any]) -> Any:
+    """Return a quantile of n values given the value at each sorted position.
+
+    Args:
+        n: Number of values
+        q: Quantile between 0 and 1
+        value_at: Returns the value at a position of the sorted values
+
+    Returns:
+        The quantile, as ``linear_quantile`` computes it
+    """
+    import numpy as np
+
+    if n == 0:
+        return np.float64(np.nan)
+    below, above, gamma = quantile_positions(n, q)
+    a = value_at(below)
+    b = value_at(above)
+    diff = b - a
+    if gamma >= 0.5:
+        return b - diff * (1 - gamma)
+    return a + diff * gamma
+
+
+def quantile_positions(n: int, q: float) -> tuple[int, int, Any]:
+    """Return the sorted positions a quantile of n values lies between.
+
+    Args:
+        n: Number of values, at least one
+        q: Quantile between 0 and 1
+
+    Returns:
+        The positions below and above the quantile and the weight of the
+        one above, as NumPy's "linear" method computes them
+    """
+    import numpy as np
+
+    q = np.float64(q) * 100.0 / 100
+    virtual = (n - 1) * q
+    if virtual >= n - 1:
+        below = above = n - 1
+    elif virtual < 0:
+        below = above = 0
+    else:
+        below = math.floor(virtual)
+        above = below + 1
+    return below, above, virtual - np.floor(virtual)
+
+
+def sorted_median(sorted_values: np.ndarray) -> Any:
+    """Return the median of sorted values, computed like ``Series.median``."""
+    return interpolate_median(len(sorted_values), sorted_values.__getitem__)
+
+
+def interpolate_median(n: int, value_at: Callable[[int], Any]) -> Any:
+    """Return the median of n values given the value at each sorted position."""
+    import numpy as np
+
+    if n == 0:
+        return np.float64(np.nan)
+    middle = [value_at(i) for i in range((n - 1) // 2, n // 2 + 1)]
+    return np.mean(np.array(middle, dtype="float64"))
+
+
+def average_ranks(sorted_values: np.ndarray) -> np.ndarray:
+    """Return the ranks of sorted values, ties sharing their average rank."""
+    import numpy as np
+
+    n = len(sorted_values)
+    if n == 0:
+        return np.empty(0)
+    starts = np.flatnonzero(np.r_[True, sorted_values[1:] != sorted_values[:-1]])
+    ends = np.r_[starts[1:], n]
+    return np.repeat((starts + 1 + ends) / 2, ends - starts)
+
+
+def _cache_of(prepared: PreparedDataset) -> ColumnarCache | None:
+    """Return the columnar cache the dataset was loaded through, if any."""
+    from src.core.columnar_cache import SOURCE_ATTR, ColumnarCache
+
+    source = prepared.dataset.attrs.get(SOURCE_ATTR)
+    if source is None:
+        return None
+    return ColumnarCache(Path(source))
@@ -0,0 +1,88 @@
+"""Reading newline-delimited JSON as a stream of DataFrame micro-batches."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable, Iterator
+from typing import TYPE_CHECKING
+
+from src.core.json_ingest import ColumnarRecordReader, RecordLayoutError
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+DEFAULT_BATCH_SIZE = 10000
+
+
+def iter_ndjson_batches(
+    lines: Iterable[str], batch_size: int = DEFAULT_BATCH_SIZE
+) -> Iterator[pd.DataFrame]:
+    """Group NDJSON records into DataFrames of at most ``batch_size`` rows.
+
+    Only one batch of lines is held in memory at a time. Each batch is
+    indexed by the position of its records in the whole stream, so row
+    labels stay unique across batches. Blank lines are skipped.
+
+    Args:
+        lines: NDJSON lines, e.g. an open file or ``sys.stdin``
+        batch_size: Maximum number of records per batch
+
+    Yields:
+        One DataFrame per batch
+
+    Raises:
+        ValueError: If a line is not a JSON object
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+
+    reader = ColumnarRecordReader(chunk_size=batch_size, sample_size=batch_size)
+    batch: list[str] = []
+    first_line = 1
+    start = 0
+    line_number = 0
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if line:
+            batch.append(line)
+        if len(batch) >= batch_size:
+            yield _parse_batch(reader, batch, start, first_line)
+            start += len(batch)
+            batch = []
+            first_line = line_number + 1
+    if batch:
+        yield _parse_batch(reader, batch, start, first_line)
+
+
+def _parse_batch(
+    reader: ColumnarRecordReader, lines: list[str], start: int, first_line: int
+) -> pd.DataFrame:
+    """Parse one batch of NDJSON lines into a DataFrame."""
+    import pandas as pd
+
+    try:
+        dataset = reader.read_text(f"[{','.join(lines)}]")
+    except RecordLayoutError:
+        dataset = pd.DataFrame(_decode_lines(lines, first_line))
+    except ValueError:
+        # Locate the offending line for the error message
+        _decode_lines(lines, first_line)
+        raise
+    dataset.index = pd.RangeIndex(start, start + len(dataset))
+    return dataset
+
+
+def _decode_lines(lines: list[str], first_line: int) -> list[dict]:
+    """Decode lines one by one, reporting the first invalid one."""
+    records = []
+    line_number = first_line
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            raise ValueError(f"Invalid JSON near line {line_number}: {e}") from e
+        if not isinstance(record, dict):
+            raise ValueError(f"Line {line_number} is not a JSON object")
+        records.append(record)
+        line_number += 1
+    return records
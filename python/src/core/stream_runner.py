@@ -0,0 +1,279 @@
+"""Running analysis modules over a stream of DataFrame micro-batches."""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from src.core.module_registry import ModuleInfo
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Batches read ahead of the modules when reading on a background thread
+READ_AHEAD = 2
+
+# Marks the end of the stream
+_END = object()
+
+
+@dataclass
+class StreamWindow:
+    """The part of the stream an emitted set of results describes.
+
+    Modules with the chunked contract report on all ``records_seen``
+    records; modules run on windows on the ``records`` records of the window,
+    which starts at ``first_record`` and spans ``batches`` batches.
+    """
+
+    first_record: int
+    records: int
+    batches: int
+    records_seen: int
+
+
+class StreamingRunner:
+    """Feeds micro-batches through the modules and emits updated results.
+
+    Modules implementing the chunked contract (see ``MODULE_SPEC.md``)
+    fold every batch into their state as it arrives, and each emission
+    finalizes the states: the results cover every record since the stream
+    started, while only the states are kept, not the records. Modules
+    without the chunked contract, and those needing a second pass over
+    the data (which a stream cannot give), are run on the window of
+    batches that arrived since the previous emission instead.
+
+    Results are emitted once ``emit_every`` batches have arrived or
+    ``emit_interval`` seconds have passed since the previous emission,
+    whichever comes first, and at the latest after ``max_window_batches``
+    batches while windows are kept. With an interval the batches are read
+    on a background thread, so that results are emitted on time even while
+    the stream is idle. Whatever has not been emitted when the stream ends
+    is emitted last.
+    """
+
+    def __init__(
+        self,
+        module_runner: Any,
+        emit_every: int | None = None,
+        emit_interval: float | None = None,
+        max_window_batches: int = 100,
+    ):
+        """Initialize the streaming runner.
+
+        Args:
+            module_runner: Runner used to execute the modules without the
+                chunked contract on a window (sequential, threaded or
+                process-based). States are folded by a ``ModuleRunner``,
+                this one if it is one.
+            emit_every: Emit results after this many batches. Defaults to
+                every batch when no interval is given either.
+            emit_interval: Emit results once this many seconds have passed
+                since the previous emission
+            max_window_batches: Most batches kept for the modules without
+                the chunked contract before results are emitted
+        """
+        from src.core.module_runner import ModuleRunner
+
+        if emit_every is not None and emit_every < 1:
+            raise ValueError("emit_every must be at least 1")
+        if emit_interval is not None and emit_interval <= 0:
+            raise ValueError("emit_interval must be positive")
+        if max_window_batches < 1:
+            raise ValueError("max_window_batches must be at least 1")
+        if emit_every is None and emit_interval is None:
+            emit_every = 1
+        self.module_runner = module_runner
+        self.state_runner = (
+            module_runner if isinstance(module_runner, ModuleRunner) else ModuleRunner()
+        )
+        self.emit_every = emit_every
+        self.emit_interval = emit_interval
+        self.max_window_batches = max_window_batches
+
+    def run(
+        self, modules: dict[str, ModuleInfo], batches: Iterable[pd.DataFrame]
+    ) -> Iterator[tuple[dict[str, Any], StreamWindow]]:
+        """Run the modules over a stream of batches.
+
+        Args:
+            modules: Mapping of module names to ModuleInfo objects
+            batches: DataFrame micro-batches, in stream order
+
+        Yields:
+            Module results, in the order of ``modules``, each time results
+            are due, together with the window they were emitted for
+        """
+        from src.core.prepared import PreparedDataset
+
+        states: dict[str, Any] = {}
+        errors: dict[str, str] = {}
+        window_modules: dict[str, ModuleInfo] = {}
+        for module_name, module_info in modules.items():
+            try:
+                if self.state_runner.supports_chunks(
+                    module_info
+                ) and not self.state_runner.needs_scan(module_info):
+                    states[module_name] = self.state_runner.init_state(module_info)
+                else:
+                    window_modules[module_name] = module_info
+            except Exception as e:
+                logger.error(f"Module {module_name} failed: {e}")
+                errors[module_name] = str(e)
+        if window_modules:
+            logger.info(
+                f"Modules without chunked support or with a second pass only see "
+                f"the batches of each window: {list(window_modules)}"
+            )
+
+        window: list[pd.DataFrame] = []
+        records_seen = 0
+        new_records = new_batches = 0
+        last_emit = time.monotonic()
+
+        def emit() -> tuple[dict[str, Any], StreamWindow]:
+            stream_window = StreamWindow(
+                first_record=records_seen - new_records,
+                records=new_records,
+                batches=new_batches,
+                records_seen=records_seen,
+            )
+            results = self._results(modules, states, errors, window_modules, window)
+            return results, stream_window
+
+        reader = _BatchReader(batches, background=self.emit_interval is not None)
+        while True:
+            deadline = None
+            if self.emit_interval is not None:
+                deadline = last_emit + self.emit_interval
+            batch = reader.next(deadline)
+            if batch is _END:
+                break
+            if batch is not None:
+                prepared = PreparedDataset(batch)
+                for module_name in list(states):
+                    try:
+                        states[module_name] = self.state_runner.analyze_chunk(
+                            modules[module_name], states[module_name], batch, prepared
+                        )
+                    except Exception as e:
+                        logger.error(f"Module {module_name} failed: {e}")
+                        errors[module_name] = str(e)
+                        del states[module_name]
+                if window_modules:
+                    window.append(batch)
+                records_seen += len(batch)
+                new_records += len(batch)
+                new_batches += 1
+            if new_batches and self._should_emit(new_batches, last_emit, window):
+                yield emit()
+                window = []
+                new_records = new_batches = 0
+                last_emit = time.monotonic()
+            elif batch is None:
+                # Nothing arrived during the interval, so nothing to emit
+                last_emit = time.monotonic()
+
+        if new_batches:
+            yield emit()
+
+    def _should_emit(
+        self, n_batches: int, last_emit: float, window: list[pd.DataFrame]
+    ) -> bool:
+        if self.emit_every is not None and n_batches >= self.emit_every:
+            return True
+        if len(window) >= self.max_window_batches:
+            return True
+        return (
+            self.emit_interval is not None
+            and time.monotonic() - last_emit >= self.emit_interval
+        )
+
+    def _results(
+        self,
+        modules: dict[str, ModuleInfo],
+        states: dict[str, Any],
+        errors: dict[str, str],
+        window_modules: dict[str, ModuleInfo],
+        window: list[pd.DataFrame],
+    ) -> dict[str, Any]:
+        """Finalize the states and run the other modules on the window."""
+        results: dict[str, Any] = {
+            module_name: {"error": error} for module_name, error in errors.items()
+        }
+        for module_name, state in states.items():
+            try:
+                results[module_name] = self.state_runner.finalize_state(
+                    modules[module_name], state
+                )
+            except Exception as e:
+                # The next emission may succeed, e.g. once enough records came
+                results[module_name] = {"error": str(e)}
+
+        if window_modules and window:
+            import pandas as pd
+
+            dataset = window[0] if len(window) == 1 else pd.concat(window, sort=False)
+            logger.info(
+                f"Running {len(window_modules)} modules on the last "
+                f"{len(dataset)} records"
+            )
+            window_results, _ = self.module_runner.run_modules(window_modules, dataset)
+            results.update(window_results)
+
+        return {module_name: results[module_name] for module_name in modules}
+
+
+class _BatchReader:
+    """Reads the batches of a stream, optionally on a background thread.
+
+    Reading in the background lets the wait for the next batch time out,
+    so that results can be emitted while the stream is idle.
+    """
+
+    def __init__(self, batches: Iterable[pd.DataFrame], background: bool):
+        self._batches = iter(batches)
+        self._ready: queue.Queue | None = None
+        if background:
+            self._ready = queue.Queue(maxsize=READ_AHEAD)
+            threading.Thread(
+                target=self._read, name="stream-reader", daemon=True
+            ).start()
+
+    def _read(self) -> None:
+        try:
+            for batch in self._batches:
+                self._ready.put(batch)
+        except BaseException as e:
+            self._ready.put(e)
+        else:
+            self._ready.put(_END)
+
+    def next(self, deadline: float | None = None) -> Any:
+        """Return the next batch.
+
+        Args:
+            deadline: Time, as of ``time.monotonic``, after which to stop
+                waiting; only honored when reading in the background
+
+        Returns:
+            The next batch, None if none arrived by the deadline, or
+            ``_END`` at the end of the stream
+        """
+        if self._ready is None:
+            return next(self._batches, _END)
+        timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+        try:
+            item = self._ready.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        if isinstance(item, BaseException):
+            raise item
+        return item
@@ -1,15 +1,24 @@
 """Main application logic for the modular analysis tool."""
 
+import argparse
 import json
 import logging
 from datetime import datetime
 from pathlib import Path
 from typing import Any
-import numpy as np
 
 from src.core.data_loader import DataLoader
+from src.core.fingerprint import dataset_fingerprint
+from src.core.incremental import (
+    compute_module_fingerprints,
+    load_previous_output,
+    plan_incremental_run,
+)
 from src.core.module_registry import ModuleRegistry
 from src.core.module_runner import ModuleRunner
+from src.core.parallel_runner import ParallelModuleRunner, ThreadedModuleRunner
+from src.core.result_cache import ResultCache
+from src.core.serialization import NumpyJSONEncoder
 
 # Configure logging
 logging.basicConfig(
@@ -18,33 +27,40 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-class NumpyJSONEncoder(json.JSONEncoder):
-    """Custom JSON encoder that handles NumPy data types."""
-    
-    def default(self, obj):
-        if isinstance(obj, (np.integer, np.int64)):
-            return int(obj)
-        elif isinstance(obj, (np.floating, np.float64)):
-            return float(obj)
-        elif isinstance(obj, np.ndarray):
-            return obj.tolist()
-        return super().default(obj)
-
-
-def save_results_to_json(results: dict[str, Any], dataset_info: dict[str, Any], output_path: Path) -> None:
-    """Save analysis results to JSON file with module separation."""
+def build_output(
+    results: dict[str, Any], dataset_info: dict[str, Any]
+) -> dict[str, Any]:
+    """Build the structured output document for a set of module results."""
     # Prepare structured output
+    failed = [name for name, result in results.items() if "error" in result]
     output_data = {
         "analysis_metadata": {
             "timestamp": datetime.now().isoformat(),
             "dataset_records": dataset_info.get("total_records", 0),
             "modules_executed": len(results),
-            "modules_successful": len([r for r in results.values() if "error" not in r]),
-            "modules_failed": len([r for r in results.values() if "error" in r])
+            "modules_successful": len(results) - len(failed),
+            "modules_failed": len(failed),
+            "cache_hits": len(dataset_info.get("cached_modules", [])),
+            "cached_modules": dataset_info.get("cached_modules", []),
         },
         "modules": {}
     }
-    
+
+    # Record what the results depend on, for later incremental runs
+    for key in (
+        "dataset_fingerprint",
+        "module_fingerprints",
+        "reused_modules",
+        "recomputed_modules",
+        "stream_window",
+        "shards",
+        "appended_records",
+        "high_water_mark",
+        "shared_preparation",
+    ):
+        if key in dataset_info:
+            output_data["analysis_metadata"][key] = dataset_info[key]
+
     # Process each module's results
     for module_name, result in results.items():
         if "error" in result:
@@ -59,26 +75,423 @@ def save_results_to_json(results: dict[str, Any], dataset_info: dict[str, Any],
                 "error": None,
                 "result": result
             }
-    
+
+    return output_data
+
+
+def save_results_to_json(
+    results: dict[str, Any], dataset_info: dict[str, Any], output_path: Path
+) -> None:
+    """Save analysis results to JSON file with module separation."""
+    output_data = build_output(results, dataset_info)
+
     # Write to JSON file
     try:
         with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, indent=2, ensure_ascii=False, cls=NumpyJSONEncoder)
+            json.dump(
+                output_data, f, indent=2, ensure_ascii=False, cls=NumpyJSONEncoder
+            )
         logger.info(f"Results saved to {output_path}")
     except Exception as e:
         logger.error(f"Failed to save results to JSON: {e}")
 
 
-def main() -> None:
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command-line arguments.
+
+    Args:
+        argv: Argument list, defaults to ``sys.argv[1:]``
+
+    Returns:
+        Parsed arguments namespace
+    """
+    parser = argparse.ArgumentParser(
+        prog="modular-analysis",
+        description="Run all discovered analysis modules on the sample dataset.",
+    )
+    parser.add_argument(
+        "--mode",
+        choices=["sequential", "process", "thread"],
+        default="sequential",
+        help="How to execute modules (default: sequential)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of parallel workers (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--stream",
+        metavar="NDJSON",
+        default=None,
+        help="Analyze newline-delimited JSON records from a file, or '-' for "
+        "standard input, in micro-batches; updated results are written to "
+        "stdout as one JSON line per emission",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=10000,
+        help="Records per micro-batch with --stream (default: 10000)",
+    )
+    parser.add_argument(
+        "--emit-every",
+        type=int,
+        default=None,
+        metavar="BATCHES",
+        help="With --stream, emit results after this many batches",
+    )
+    parser.add_argument(
+        "--emit-interval",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="With --stream, emit results when this much time has passed "
+        "(default: after every batch)",
+    )
+    parser.add_argument(
+        "--chunk-mb",
+        type=int,
+        default=None,
+        metavar="MB",
+        help="Analyze the dataset in chunks of about this many MiB of JSON "
+        "instead of loading it whole; modules implementing the chunked "
+        "contract never see the whole dataset at once",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only re-run modules whose code, config or input data changed "
+        "since the previous output.json",
+    )
+    parser.add_argument(
+        "--append-only",
+        action="store_true",
+        help="Treat the dataset as append-only: keep the modules' running "
+        "state next to it and only ingest records added since the last run",
+    )
+    parser.add_argument(
+        "--key-column",
+        default="id",
+        metavar="COLUMN",
+        help="With --append-only, the column (such as an id or timestamp) "
+        "whose values grow as records are appended (default: id)",
+    )
+    parser.add_argument(
+        "--no-result-cache",
+        action="store_true",
+        help="Bypass the result cache and execute every module",
+    )
+    parser.add_argument(
+        "--result-cache-mb",
+        type=int,
+        default=256,
+        help="Size budget of the on-disk result cache (default: 256)",
+    )
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=None,
+        help="Number of processes parsing large JSON datasets "
+        "(default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--no-columnar-cache",
+        action="store_true",
+        help="Always parse the JSON dataset instead of its memory-mapped "
+        "binary copy",
+    )
+    parser.add_argument(
+        "--shard-worker",
+        type=Path,
+        default=None,
+        metavar="SHARD",
+        help="Serve a coordinator the partial results of this shard (a JSON "
+        "array of records) on the --listen address",
+    )
+    parser.add_argument(
+        "--listen",
+        default="127.0.0.1:8765",
+        metavar="ADDRESS",
+        help="HOST:PORT or Unix socket path for --shard-worker "
+        "(default: 127.0.0.1:8765)",
+    )
+    parser.add_argument(
+        "--coordinate",
+        nargs="+",
+        default=None,
+        metavar="ADDRESS",
+        help="Analyze a dataset sharded over these workers, given in shard "
+        "order, and write the merged results to output.json",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run as a long-lived analysis server on a Unix socket",
+    )
+    parser.add_argument(
+        "--socket",
+        type=Path,
+        default=None,
+        help="Unix socket path for --serve (default: ./modular-analysis.sock)",
+    )
+    parser.add_argument(
+        "--dataset-cache-mb",
+        type=int,
+        default=1024,
+        help="Memory budget for datasets cached by --serve (default: 1024)",
+    )
+    parser.add_argument(
+        "--list-modules",
+        action="store_true",
+        help="List the available modules and exit, without loading any data",
+    )
+    parser.add_argument(
+        "--rebuild-index",
+        action="store_true",
+        help="Rescan all modules, rewrite the module index and exit",
+    )
+    return parser.parse_args(argv)
+
+
+def run_stream(
+    args: argparse.Namespace,
+    data_loader: DataLoader,
+    modules: dict[str, Any],
+    module_runner: Any,
+) -> None:
+    """Analyze an NDJSON stream and print an updated output document regularly.
+
+    Args:
+        args: Parsed command-line arguments
+        data_loader: Loader used to read the stream
+        modules: Mapping of module names to ModuleInfo objects
+        module_runner: Runner used to execute the modules without chunked
+            support on each window
+    """
+    from dataclasses import asdict
+
+    from src.core.stream_runner import StreamingRunner
+
+    path = None if args.stream == "-" else Path(args.stream)
+    batches = data_loader.iter_ndjson(path, batch_size=args.batch_size)
+    streaming_runner = StreamingRunner(
+        module_runner, emit_every=args.emit_every, emit_interval=args.emit_interval
+    )
+    for results, window in streaming_runner.run(modules, batches):
+        dataset_info = {
+            "total_records": window.records_seen,
+            "stream_window": asdict(window),
+        }
+        output_data = build_output(results, dataset_info)
+        line = json.dumps(output_data, ensure_ascii=False, cls=NumpyJSONEncoder)
+        print(line, flush=True)
+
+
+def run_chunked(
+    args: argparse.Namespace,
+    data_loader: DataLoader,
+    modules: dict[str, Any],
+    output_path: Path,
+) -> None:
+    """Analyze the sample dataset chunk by chunk and save the results.
+
+    Args:
+        args: Parsed command-line arguments
+        data_loader: Loader used to read the dataset in chunks
+        modules: Mapping of module names to ModuleInfo objects
+        output_path: Where to write the output document
+    """
+    if args.mode != "sequential":
+        logger.info("Chunked runs fold chunks into the modules sequentially")
+    if args.chunk_mb < 1:
+        raise ValueError("--chunk-mb must be at least 1")
+
+    dataset_info: dict[str, Any] = {"total_records": 0}
+
+    def count_records(chunks):
+        for chunk in chunks:
+            dataset_info["total_records"] += len(chunk)
+            yield chunk
+
+    chunk_bytes = args.chunk_mb * 1024 * 1024
+    chunks = data_loader.iter_chunks(chunk_bytes=chunk_bytes)
+    results, report = ModuleRunner().run_modules_chunked(
+        modules,
+        count_records(chunks),
+        rescan=lambda: data_loader.iter_chunks(chunk_bytes=chunk_bytes),
+    )
+    logger.info(f"Analyzed {dataset_info['total_records']} records in chunks")
+    if report.preparation_savings:
+        dataset_info["shared_preparation"] = report.preparation_savings
+    save_results_to_json(results, dataset_info, output_path)
+    log_module_status(results)
+
+
+def run_append_only(
+    args: argparse.Namespace,
+    data_loader: DataLoader,
+    modules: dict[str, Any],
+    output_path: Path,
+) -> None:
+    """Update the running state of an append-only dataset and save the results.
+
+    Args:
+        args: Parsed command-line arguments
+        data_loader: Loader for the dataset
+        modules: Mapping of module names to ModuleInfo objects
+        output_path: Where to write the output document
+    """
+    from src.core import running_state
+
+    dataset_path = data_loader.data_dir / "sample_data.json"
+    if not dataset_path.exists():
+        data_loader.load_sample_data()
+    results, dataset_info = running_state.run_append_only(
+        ModuleRunner(),
+        modules,
+        data_loader,
+        dataset_path,
+        key_column=args.key_column,
+        chunk_bytes=(args.chunk_mb or 64) * 1024 * 1024,
+    )
+    logger.info(
+        f"Analyzed {dataset_info['total_records']} records, "
+        f"{dataset_info['appended_records']} of them new"
+    )
+    save_results_to_json(results, dataset_info, output_path)
+    log_module_status(results)
+
+
+def run_coordinator(
+    args: argparse.Namespace, modules: dict[str, Any], output_path: Path
+) -> None:
+    """Analyze a dataset spread over shard workers and save the results.
+
+    Args:
+        args: Parsed command-line arguments
+        modules: Mapping of module names to ModuleInfo objects
+        output_path: Where to write the output document
+    """
+    from src.shard import parse_address, run_sharded
+
+    addresses = [parse_address(address) for address in args.coordinate]
+    results, dataset_info = run_sharded(addresses, modules)
+    save_results_to_json(results, dataset_info, output_path)
+    log_module_status(results)
+
+
+def log_module_status(results: dict[str, Any]) -> None:
+    """Log which modules succeeded and why the others failed."""
+    for module_name, result in results.items():
+        if "error" in result:
+            logger.error(f"{module_name}: FAILED - {result['error']}")
+        else:
+            logger.info(f"{module_name}: SUCCESS")
+
+
+def list_modules(module_registry: ModuleRegistry) -> None:
+    """Print the available modules.
+
+    This path only reads the module index, so it never imports pandas.
+
+    Args:
+        module_registry: Registry to discover modules with
+    """
+    for name, module_info in sorted(module_registry.discover_modules().items()):
+        print(f"{name} {module_info.version}: {module_info.description}")
+
+
+def main(argv: list[str] | None = None) -> None:
     """Main entry point for the modular analysis application."""
+    args = parse_args(argv)
+    project_root = Path(__file__).parent.parent
+
+    if args.list_modules:
+        list_modules(ModuleRegistry(project_root / "src" / "modules"))
+        return
+
+    if args.serve:
+        from src.server import serve
+
+        serve(
+            socket_path=args.socket or project_root / "modular-analysis.sock",
+            modules_dir=project_root / "src" / "modules",
+            data_dir=project_root / "data",
+            max_workers=args.workers,
+            dataset_cache_bytes=args.dataset_cache_mb * 1024 * 1024,
+        )
+        return
+
+    if args.shard_worker is not None:
+        from src.shard import parse_address, serve_shard
+
+        serve_shard(
+            address=parse_address(args.listen),
+            shard_path=args.shard_worker,
+            modules_dir=project_root / "src" / "modules",
+            chunk_bytes=(args.chunk_mb or 64) * 1024 * 1024,
+        )
+        return
+
     logger.info("Starting Modular Analysis Tool")
 
     try:
         # Initialize components
-        project_root = Path(__file__).parent.parent
-        data_loader = DataLoader(project_root / "data")
+        data_loader = DataLoader(
+            project_root / "data",
+            use_columnar_cache=not args.no_columnar_cache,
+            parse_workers=args.parse_workers,
+        )
         module_registry = ModuleRegistry(project_root / "src" / "modules")
-        module_runner = ModuleRunner()
+
+        if args.rebuild_index:
+            modules = module_registry.rebuild_index()
+            logger.info(f"Rebuilt module index with {len(modules)} modules")
+            return
+
+        if args.coordinate:
+            modules = module_registry.discover_modules()
+            logger.info(f"Coordinating {len(args.coordinate)} shard workers")
+            run_coordinator(args, modules, project_root / "output.json")
+            return
+
+        result_cache = None
+        # Stream windows never repeat, so caching their results is useless
+        if not args.no_result_cache and args.stream is None:
+            result_cache = ResultCache(
+                project_root / ".cache" / "results",
+                max_bytes=args.result_cache_mb * 1024 * 1024,
+            )
+        if args.mode == "process":
+            module_runner = ParallelModuleRunner(
+                max_workers=args.workers, result_cache=result_cache
+            )
+        elif args.mode == "thread":
+            module_runner = ThreadedModuleRunner(
+                max_workers=args.workers, result_cache=result_cache
+            )
+        else:
+            module_runner = ModuleRunner(result_cache=result_cache)
+
+        if args.stream is not None:
+            modules = module_registry.discover_modules()
+            logger.info(f"Streaming records through {len(modules)} modules")
+            run_stream(args, data_loader, modules, module_runner)
+            return
+
+        if args.append_only:
+            modules = module_registry.discover_modules()
+            logger.info(f"Updating running state of {len(modules)} modules")
+            run_append_only(args, data_loader, modules, project_root / "output.json")
+            return
+
+        if args.chunk_mb is not None:
+            modules = module_registry.discover_modules()
+            logger.info(f"Analyzing the dataset in chunks with {len(modules)} modules")
+            run_chunked(args, data_loader, modules, project_root / "output.json")
+            return
 
         # Load sample data
         logger.info("Loading sample dataset...")
@@ -91,22 +504,43 @@ def main() -> None:
         modules = module_registry.discover_modules()
         logger.info(f"Found {len(modules)} modules: {list(modules.keys())}")
 
-        # Run all modules sequentially
-        logger.info("Running modules sequentially...")
-        results: dict[str, Any] = {}
+        # Fingerprint the inputs so that later runs can detect changes
+        output_path = project_root / "output.json"
+        dataset_info["dataset_fingerprint"] = dataset_fingerprint(dataset)
+        dataset_info["module_fingerprints"] = compute_module_fingerprints(modules)
+
+        modules_to_run = modules
+        reused_results: dict[str, Any] = {}
+        if args.incremental:
+            plan = plan_incremental_run(
+                load_previous_output(output_path),
+                modules,
+                dataset_info["dataset_fingerprint"],
+                dataset_info["module_fingerprints"],
+            )
+            modules_to_run = plan.stale_modules
+            reused_results = plan.reused_results
+            dataset_info["reused_modules"] = list(reused_results)
+            dataset_info["recomputed_modules"] = list(modules_to_run)
+            logger.info(
+                f"Incremental run: reusing {len(reused_results)} modules, "
+                f"recomputing {len(modules_to_run)}"
+            )
 
-        for module_name, module_info in modules.items():
-            logger.info(f"Running module: {module_name}")
-            try:
-                result = module_runner.run_module(module_info, dataset)
-                results[module_name] = result
-                logger.info(f"Module {module_name} completed successfully")
-            except Exception as e:
-                logger.error(f"Module {module_name} failed: {e}")
-                results[module_name] = {"error": str(e)}
+        # Run all modules
+        logger.info(f"Running modules ({args.mode})...")
+        fresh_results, report = module_runner.run_modules(modules_to_run, dataset)
+        results = {
+            module_name: reused_results.get(module_name, fresh_results.get(module_name))
+            for module_name in modules
+        }
+        dataset_info["cached_modules"] = sorted(report.cache_hits)
+        if report.preparation_savings:
+            dataset_info["shared_preparation"] = report.preparation_savings
+        if report.cache_hits:
+            logger.info(f"{len(report.cache_hits)} modules served from cache")
 
         # Save results to JSON file
-        output_path = project_root / "output.json"
         save_results_to_json(results, dataset_info, output_path)
 
         # Display results summary
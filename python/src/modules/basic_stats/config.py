@@ -7,5 +7,10 @@ AUTHOR = "AI Assistant"
 PARAMETERS = {
     "precision": 3,
     "include_outliers": True,
-    "columns_to_analyze": ["value", "score", "count"]
+    # Names, glob patterns or {"include", "regex", "dtypes", "exclude"};
+    # see src/core/column_selection.py
+    "columns_to_analyze": ["value", "score", "count"],
+    "quantiles": [0.25, 0.75],  # Reported as q25, q75, ...
+    "quantile_method": "exact",  # exact (in memory; chunks use sketches), or sketch
+    "sketch_k": 200  # Accuracy of the quantile sketch
 }
@@ -1,72 +1,348 @@
 """Main execution logic for basic statistics analysis."""
 
+from typing import Any
+
+import numpy as np
 import pandas as pd
-from typing import Any, Dict
+
+from src.core.column_selection import required_columns, resolve_columns
+from src.core.describe import column_blocks
+from src.core.moments import column_moments, merge_column_moments, variance
+from src.core.quantile_sketch import (
+    empty_sketch,
+    merge_sketches,
+    rank_error,
+    sketch_quantiles,
+    sketch_values,
+    update_sketch,
+)
 
 
-def analyze(dataset: pd.DataFrame, model: Any, config: Any) -> Dict[str, Any]:
+def analyze(
+    dataset: pd.DataFrame,
+    model: Any,
+    config: Any,
+    prepared: Any = None,
+    stats: Any = None,
+) -> dict[str, Any]:
     """
     Calculate basic statistics for numerical columns in the dataset.
-    
+
+    All selected columns are described at once by ``describe_columns``:
+    the vectorized moments kernel, and one partition for the median and
+    all quantiles of each block of columns.
+
     Args:
         dataset: Input pandas DataFrame
         model: Loaded model module
         config: Loaded config module
-        
+        prepared: Shared preparation of the dataset, if the runner provides one
+        stats: Shared column statistics of the dataset, if the runner provides them
+
     Returns:
         Dictionary containing statistical analysis results
     """
-    
-    # Validate input
-    if not model.validate_input(dataset):
-        raise ValueError("Dataset missing required columns: value, score, count")
-    
+
+    # Validate input and select the columns to analyze
+    columns = _select_columns(dataset, model, config, prepared)
+
     # Prepare data
-    clean_data = model.prepare_data(dataset)
-    
+    clean_data = model.prepare_data(dataset, prepared, columns)
+
     if len(clean_data) == 0:
         raise ValueError("No valid data remaining after cleaning")
-    
-    # Get columns to analyze from config
-    columns_to_analyze = getattr(config, 'PARAMETERS', {}).get(
-        'columns_to_analyze', ['value', 'score', 'count']
+
+    quantiles = _quantiles(config)
+    sketch_k = _sketch_k(config)
+
+    # Calculate statistics for all columns together; a sketch replaces the
+    # partition with one pass over each column's values
+    summary = model.summarize_columns(
+        clean_data, columns, [] if sketch_k is not None else quantiles, stats
     )
-    
-    # Calculate statistics for each column
+    summary_stats = _summary_stats(summary, columns, quantiles, sketch_k is None)
+    if sketch_k is not None:
+        for names, block in column_blocks(clean_data, columns):
+            for col, values in zip(names, block.T, strict=True):
+                if summary_stats[col]['count'] > 0:
+                    sketch = sketch_values(values[~np.isnan(values)], sketch_k)
+                    _add_sketch_quantiles(summary_stats[col], sketch, quantiles)
+
+    return _build_results(summary_stats, len(dataset), len(clean_data), model, config)
+
+
+def init_state(config: Any) -> dict[str, Any]:
+    """
+    Start computing basic statistics over a dataset given in chunks.
+
+    Args:
+        config: Loaded config module
+
+    Returns:
+        Empty analysis state
+    """
+    return {
+        'total_records': 0,
+        'clean_records': 0,
+        'columns': None,
+        'moments': {},
+        'sketches': {},
+    }
+
+
+def analyze_chunk(
+    state: dict[str, Any],
+    chunk: pd.DataFrame,
+    model: Any,
+    config: Any,
+    prepared: Any = None,
+) -> dict[str, Any]:
+    """
+    Add one chunk of the dataset to the analysis state.
+
+    Means and standard deviations are kept as mergeable moments, and the
+    median and quantiles come from a quantile sketch of each column, so
+    the state stays bounded. Exact quantiles would need every value and
+    are only computed in memory, by analyze; the sketch estimates are
+    exact until a column has more values than the sketch holds.
+
+    Args:
+        state: State returned by init_state, analyze_chunk or merge
+        chunk: Next chunk of the dataset
+        model: Loaded model module
+        config: Loaded config module
+        prepared: Shared preparation of the chunk, if the runner provides one
+
+    Returns:
+        Updated analysis state
+    """
+    columns = _select_columns(chunk, model, config, prepared)
+    if state['columns'] is None:
+        state['columns'] = list(columns)
+    elif state['columns'] != list(columns):
+        raise ValueError("Chunks have different numerical columns for basic statistics")
+
+    clean_data = model.prepare_data(chunk, prepared, columns)
+    state['total_records'] += len(chunk)
+    state['clean_records'] += len(clean_data)
+    state['moments'] = merge_column_moments(
+        state['moments'], column_moments(clean_data, columns)
+    )
+
+    sketch_k = _state_sketch_k(config)
+    for names, block in column_blocks(clean_data, columns):
+        for col, values in zip(names, block.T, strict=True):
+            sketch = state['sketches'].get(col, empty_sketch(sketch_k))
+            state['sketches'][col] = update_sketch(sketch, values[~np.isnan(values)])
+
+    return state
+
+
+def merge(state_a: dict[str, Any], state_b: dict[str, Any]) -> dict[str, Any]:
+    """
+    Combine the states of two disjoint parts of a dataset.
+
+    Args:
+        state_a: State of the earlier part
+        state_b: State of the later part
+
+    Returns:
+        State of both parts
+    """
+    if state_a['columns'] is None:
+        return state_b
+    if state_b['columns'] is None:
+        return state_a
+    if state_a['columns'] != state_b['columns']:
+        raise ValueError("Chunks have different numerical columns for basic statistics")
+
+    sketches = dict(state_a['sketches'])
+    for col, sketch in state_b['sketches'].items():
+        sketches[col] = (
+            merge_sketches(sketches[col], sketch) if col in sketches else sketch
+        )
+
+    return {
+        'total_records': state_a['total_records'] + state_b['total_records'],
+        'clean_records': state_a['clean_records'] + state_b['clean_records'],
+        'columns': state_a['columns'],
+        'moments': merge_column_moments(state_a['moments'], state_b['moments']),
+        'sketches': sketches,
+    }
+
+
+def finalize(state: dict[str, Any], model: Any, config: Any) -> dict[str, Any]:
+    """
+    Turn an analysis state into the results analyze would have returned.
+
+    Args:
+        state: State covering the whole dataset
+        model: Loaded model module
+        config: Loaded config module
+
+    Returns:
+        Dictionary containing statistical analysis results
+    """
+    if state['clean_records'] == 0:
+        raise ValueError("No valid data remaining after cleaning")
+
+    columns = state['columns']
+    quantiles = _quantiles(config)
+
+    # Means and standard deviations from the merged moments; the median
+    # and quantiles from the sketches
+    moments = [state['moments'][col] for col in columns]
+    summary = {
+        'count': np.array([m['count'] for m in moments]),
+        'mean': np.array([m['mean'] if m['count'] else np.nan for m in moments]),
+        'std': np.sqrt([variance(m) if m['count'] else np.nan for m in moments]),
+        'min': np.array(
+            [m['min'] if m['count'] else np.nan for m in moments], dtype='float64'
+        ),
+        'max': np.array(
+            [m['max'] if m['count'] else np.nan for m in moments], dtype='float64'
+        ),
+    }
+    summary_stats = _summary_stats(summary, columns, quantiles, False)
+    report_error = _sketch_k(config) is not None
+    for col in columns:
+        if col in state['sketches'] and summary_stats[col]['count'] > 0:
+            _add_sketch_quantiles(
+                summary_stats[col], state['sketches'][col], quantiles, report_error
+            )
+
+    return _build_results(
+        summary_stats, state['total_records'], state['clean_records'], model, config
+    )
+
+
+def _select_columns(
+    dataset: pd.DataFrame, model: Any, config: Any, prepared: Any
+) -> list[Any]:
+    """Validate the dataset and return the columns to analyze."""
+    selection = getattr(config, 'PARAMETERS', {}).get(
+        'columns_to_analyze', model.DEFAULT_COLUMNS
+    )
+    if not model.validate_input(dataset, selection):
+        missing = ', '.join(str(col) for col in required_columns(selection))
+        raise ValueError(f"Dataset missing required columns: {missing}")
+    columns = resolve_columns(dataset, selection, prepared)
+    if not columns:
+        raise ValueError("No columns selected for basic statistics")
+    return columns
+
+
+def _quantiles(config: Any) -> list[float]:
+    """Return the quantiles to report from config."""
+    return list(getattr(config, 'PARAMETERS', {}).get('quantiles', [0.25, 0.75]))
+
+
+def _quantile_key(q: float) -> str:
+    """Return the result key of a quantile, e.g. q25 for 0.25."""
+    return f"q{q * 100:g}"
+
+
+def _sketch_k(config: Any) -> int | None:
+    """Return the sketch accuracy if quantiles are estimated, else None."""
+    parameters = getattr(config, 'PARAMETERS', {})
+    if parameters.get('quantile_method', 'exact') != 'sketch':
+        return None
+    return parameters.get('sketch_k', 200)
+
+
+def _state_sketch_k(config: Any) -> int:
+    """Return the accuracy of the sketches kept by chunked states."""
+    return getattr(config, 'PARAMETERS', {}).get('sketch_k', 200)
+
+
+def _summary_stats(
+    summary: dict[str, np.ndarray],
+    columns: list[Any],
+    quantiles: list[float],
+    exact: bool,
+) -> dict[str, dict[str, Any]]:
+    """Turn arrays of statistics into one dictionary per column.
+
+    Without exact quantiles the median and quantiles are NaN, to be
+    replaced with estimates from sketches.
+    """
+    keys = [_quantile_key(q) for q in quantiles]
+    table = {
+        'mean': summary['mean'].tolist(),
+        'median': summary['median'].tolist() if exact else [np.nan] * len(columns),
+        'std': summary['std'].tolist(),
+        'min': summary['min'].tolist(),
+        'max': summary['max'].tolist(),
+        'count': summary['count'].tolist(),
+    }
+    estimates = (
+        summary['quantiles'].tolist()
+        if exact
+        else [[np.nan] * len(columns)] * len(keys)
+    )
+
     summary_stats = {}
-    for col in columns_to_analyze:
-        if col in clean_data.columns:
-            column_data = clean_data[col]
-            summary_stats[col] = {
-                'mean': float(column_data.mean()),
-                'median': float(column_data.median()),
-                'std': float(column_data.std()),
-                'min': float(column_data.min()),
-                'max': float(column_data.max()),
-                'count': int(column_data.count()),
-                'q25': float(column_data.quantile(0.25)),
-                'q75': float(column_data.quantile(0.75))
-            }
-    
+    for i, col in enumerate(columns):
+        summary_stats[col] = {name: values[i] for name, values in table.items()}
+        summary_stats[col]['count'] = int(summary_stats[col]['count'])
+        summary_stats[col].update(
+            {key: row[i] for key, row in zip(keys, estimates, strict=True)}
+        )
+    return summary_stats
+
+
+def _add_sketch_quantiles(
+    stats: dict[str, Any],
+    sketch: dict[str, Any],
+    quantiles: list[float],
+    report_error: bool = True,
+) -> None:
+    """Replace the median and quantiles with estimates from a sketch.
+
+    The rank error is reported if asked for, or else once the estimates
+    are no longer exact.
+    """
+    median, *estimates = sketch_quantiles(sketch, [0.5, *quantiles])
+    stats['median'] = float(median)
+    for q, estimate in zip(quantiles, estimates, strict=True):
+        stats[_quantile_key(q)] = float(estimate)
+    error = rank_error(sketch)
+    if report_error or error:
+        stats['quantile_rank_error'] = error
+
+
+def _build_results(
+    summary_stats: dict[str, dict[str, Any]],
+    total_records: int,
+    clean_records: int,
+    model: Any,
+    config: Any,
+) -> dict[str, Any]:
+    """Assemble, round and validate the results."""
     # Prepare results
     results = {
         'module': 'basic_stats',
         'description': config.DESCRIPTION,
         'summary_stats': summary_stats,
-        'total_records': len(dataset),
-        'clean_records': len(clean_data),
-        'columns_analyzed': list(summary_stats.keys())
+        'total_records': total_records,
+        'clean_records': clean_records,
+        'columns_analyzed': list(summary_stats.keys()),
     }
-    
-    # Apply precision from config
+
+    # Apply precision from config. Python's round, unlike np.round, rounds
+    # the exact decimal value (2.675 stays 2.67), so it is applied per value
     precision = getattr(config, 'PARAMETERS', {}).get('precision', 3)
-    for col, stats in results['summary_stats'].items():
-        for key, value in stats.items():
-            if isinstance(value, float):
-                stats[key] = round(value, precision)
-    
+    for stats in results['summary_stats'].values():
+        stats.update(
+            {
+                key: round(value, precision)
+                for key, value in stats.items()
+                if isinstance(value, float)
+            }
+        )
+
     # Validate output
     if not model.validate_output(results):
         raise ValueError("Generated results failed validation")
-    
+
     return results
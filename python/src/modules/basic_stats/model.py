@@ -1,46 +1,80 @@
 """Data models and validation for basic statistics module."""
 
+from typing import Any
+
 import pandas as pd
-from typing import Any, Dict, List
 
+from src.core.column_selection import required_columns
+from src.core.describe import describe_columns
+
+DEFAULT_COLUMNS = ['value', 'score', 'count']
+
+
+def validate_input(data: pd.DataFrame, selection: Any = None) -> bool:
+    """Validate that input data has the required numerical columns.
 
-def validate_input(data: pd.DataFrame) -> bool:
-    """Validate that input data has required numerical columns."""
-    required_columns = ['value', 'score', 'count']
-    return all(col in data.columns for col in required_columns)
+    The names in the column selection are required; its patterns may
+    match no column at all.
+    """
+    required = required_columns(selection if selection is not None else DEFAULT_COLUMNS)
+    return all(col in data.columns for col in required)
 
 
-def prepare_data(data: pd.DataFrame) -> pd.DataFrame:
-    """Clean and prepare data for statistical analysis."""
-    # Remove rows with missing values in numerical columns
-    numerical_cols = ['value', 'score', 'count']
-    clean_data = data.dropna(subset=numerical_cols)
-    
+def prepare_data(
+    data: pd.DataFrame, prepared: Any = None, columns: list[Any] | None = None
+) -> pd.DataFrame:
+    """Clean and prepare data for statistical analysis.
+
+    Only the numerical columns (the selected ones, by default value, score
+    and count) are returned, coerced to numbers, in the rows where all of
+    them are present. If the runner shares a prepared context of the data,
+    the coerced columns and the rows to keep are taken from it.
+    """
+    numerical_cols = list(columns) if columns is not None else DEFAULT_COLUMNS
+    if prepared is not None:
+        return prepared.frame(numerical_cols, rows='complete')
+
     # Ensure numerical columns are numeric
-    for col in numerical_cols:
-        clean_data[col] = pd.to_numeric(clean_data[col], errors='coerce')
-    
-    # Remove any rows that couldn't be converted to numeric
+    clean_data = data[numerical_cols].apply(pd.to_numeric, errors='coerce')
+
+    # Remove rows with missing values, including those that couldn't be converted
     clean_data = clean_data.dropna(subset=numerical_cols)
-    
+
     return clean_data
 
 
-def validate_output(result: Dict[str, Any]) -> bool:
+def summarize_columns(
+    data: pd.DataFrame, columns: list[Any], quantiles: list[float], stats: Any = None
+) -> dict[str, Any]:
+    """Describe all columns of the prepared data at once.
+
+    With the runner's shared column statistics the summary of the rows
+    ``prepare_data`` keeps is computed once per run and shared.
+
+    Returns:
+        Arrays of statistics with an entry per column, as from
+        ``src.core.describe.describe_columns``
+    """
+    if stats is not None:
+        return stats.describe(columns, rows='complete', quantiles=quantiles)
+    return describe_columns(data[columns], quantiles)
+
+
+def validate_output(result: dict[str, Any]) -> bool:
     """Validate analysis results."""
     required_keys = ['summary_stats', 'total_records', 'columns_analyzed']
     return all(key in result for key in required_keys)
 
 
-def format_output(result: Dict[str, Any]) -> Dict[str, Any]:
+def format_output(result: dict[str, Any]) -> dict[str, Any]:
     """Format results for display."""
     formatted = result.copy()
-    
+
     # Round numerical values for better display
     if 'summary_stats' in formatted:
-        for col, stats in formatted['summary_stats'].items():
+        for stats in formatted['summary_stats'].values():
             for stat, value in stats.items():
                 if isinstance(value, float):
                     stats[stat] = round(value, 3)
-    
+
     return formatted
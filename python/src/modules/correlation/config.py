@@ -8,5 +8,7 @@ PARAMETERS = {
     "method": "pearson",  # pearson, spearman, kendall
     "min_correlation": 0.1,  # minimum correlation to report
     "precision": 3,
+    # Names, glob patterns or {"include", "regex", "dtypes", "exclude"};
+    # see src/core/column_selection.py
     "columns_to_analyze": ["value", "score", "count"]
 }
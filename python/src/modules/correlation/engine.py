@@ -1,77 +1,276 @@
 """Main execution logic for correlation analysis."""
 
-import pandas as pd
+import logging
+from typing import Any
+
 import numpy as np
-from typing import Any, Dict
+import pandas as pd
 
+from src.core.column_selection import resolve_columns
+from src.core.moments import compute_comoments, correlation_matrix, merge_comoments
 
-def analyze(dataset: pd.DataFrame, model: Any, config: Any) -> Dict[str, Any]:
+logger = logging.getLogger(__name__)
+
+
+def analyze(
+    dataset: pd.DataFrame,
+    model: Any,
+    config: Any,
+    prepared: Any = None,
+    stats: Any = None,
+) -> dict[str, Any]:
     """
     Perform correlation analysis on numerical columns in the dataset.
-    
+
     Args:
         dataset: Input pandas DataFrame
         model: Loaded model module
         config: Loaded config module
-        
+        prepared: Shared preparation of the dataset, if the runner provides one
+        stats: Shared column statistics of the dataset, if the runner provides them
+
     Returns:
         Dictionary containing correlation analysis results
     """
-    
+
     # Validate input
-    if not model.validate_input(dataset):
-        raise ValueError("Dataset needs at least 2 numerical columns for correlation analysis")
-    
+    available_cols = _select_columns(dataset, model, config, prepared)
+
     # Prepare data
-    clean_data = model.prepare_data(dataset)
-    
+    clean_data = model.prepare_data(dataset, prepared, available_cols)
+
     if len(clean_data) < 2:
         raise ValueError("Need at least 2 records for correlation analysis")
-    
+
     # Get parameters from config
     method = getattr(config, 'PARAMETERS', {}).get('method', 'pearson')
-    min_correlation = getattr(config, 'PARAMETERS', {}).get('min_correlation', 0.1)
-    precision = getattr(config, 'PARAMETERS', {}).get('precision', 3)
-    columns_to_analyze = getattr(config, 'PARAMETERS', {}).get(
-        'columns_to_analyze', ['value', 'score', 'count']
-    )
-    
-    # Filter to available columns
-    available_cols = [col for col in columns_to_analyze if col in clean_data.columns]
+
     analysis_data = clean_data[available_cols]
-    
+
+    # Spearman correlations are Pearson correlations of the ranks, which the
+    # shared statistics read off the sorted order of the columns
+    if method == 'spearman' and stats is not None:
+        analysis_data = pd.DataFrame(
+            {
+                col: model.column_statistics(clean_data, col, stats).ranks()
+                for col in available_cols
+            }
+        )
+        method = 'pearson'
+
     # Calculate correlation matrix
     try:
         corr_matrix = analysis_data.corr(method=method)
     except Exception as e:
-        raise ValueError(f"Failed to calculate correlation matrix: {str(e)}")
-    
-    # Convert to regular dict for JSON serialization
-    corr_dict = {}
-    for col in corr_matrix.columns:
-        corr_dict[col] = {}
-        for row in corr_matrix.index:
-            value = corr_matrix.loc[row, col]
-            if pd.isna(value):
-                corr_dict[col][row] = None
-            else:
-                corr_dict[col][row] = round(float(value), precision)
-    
+        raise ValueError(f"Failed to calculate correlation matrix: {str(e)}") from e
+
+    return _build_results(
+        corr_matrix, len(dataset), len(clean_data), available_cols, model, config
+    )
+
+
+def init_state(config: Any) -> dict[str, Any]:
+    """
+    Start correlation analysis over a dataset given in chunks.
+
+    Args:
+        config: Loaded config module
+
+    Returns:
+        Empty analysis state
+    """
+    method = getattr(config, 'PARAMETERS', {}).get('method', 'pearson')
+    if method != 'pearson':
+        logger.warning(
+            f"correlation keeps every cleaned row for {method} correlations, "
+            "so its state grows with the dataset; only pearson is bounded"
+        )
+    return {
+        'total_records': 0,
+        'clean_records': 0,
+        'columns': None,
+        'comoments': None,
+        'rows': [],
+    }
+
+
+def analyze_chunk(
+    state: dict[str, Any],
+    chunk: pd.DataFrame,
+    model: Any,
+    config: Any,
+    prepared: Any = None,
+) -> dict[str, Any]:
+    """
+    Add one chunk of the dataset to the analysis state.
+
+    Pearson correlations are computed from mergeable co-moments. Rank
+    correlations (spearman, kendall) need all rows at once, so for those
+    methods the cleaned rows are kept until the state is finalized, and
+    the state grows with the dataset.
+
+    Args:
+        state: State returned by init_state, analyze_chunk or merge
+        chunk: Next chunk of the dataset
+        model: Loaded model module
+        config: Loaded config module
+        prepared: Shared preparation of the chunk, if the runner provides one
+
+    Returns:
+        Updated analysis state
+    """
+    available_cols = _select_columns(chunk, model, config, prepared)
+    clean_data = model.prepare_data(chunk, prepared, available_cols)
+    if state['columns'] is None:
+        state['columns'] = available_cols
+    elif state['columns'] != available_cols:
+        raise ValueError(
+            "Chunks have different numerical columns for correlation analysis"
+        )
+
+    state['total_records'] += len(chunk)
+    state['clean_records'] += len(clean_data)
+
+    matrix = clean_data[available_cols].to_numpy(dtype='float64')
+    if getattr(config, 'PARAMETERS', {}).get('method', 'pearson') == 'pearson':
+        chunk_comoments = compute_comoments(matrix)
+        if state['comoments'] is not None:
+            chunk_comoments = merge_comoments(state['comoments'], chunk_comoments)
+        state['comoments'] = chunk_comoments
+    else:
+        state['rows'].append(matrix)
+
+    return state
+
+
+def merge(state_a: dict[str, Any], state_b: dict[str, Any]) -> dict[str, Any]:
+    """
+    Combine the states of two disjoint parts of a dataset.
+
+    Args:
+        state_a: State of the earlier part
+        state_b: State of the later part
+
+    Returns:
+        State of both parts
+    """
+    if state_a['columns'] is None:
+        return state_b
+    if state_b['columns'] is None:
+        return state_a
+    if state_a['columns'] != state_b['columns']:
+        raise ValueError(
+            "Chunks have different numerical columns for correlation analysis"
+        )
+
+    # Only Pearson states carry co-moments; rank correlation states keep rows
+    comoments = state_a['comoments']
+    if comoments is not None:
+        comoments = merge_comoments(comoments, state_b['comoments'])
+
+    return {
+        'total_records': state_a['total_records'] + state_b['total_records'],
+        'clean_records': state_a['clean_records'] + state_b['clean_records'],
+        'columns': state_a['columns'],
+        'comoments': comoments,
+        'rows': state_a['rows'] + state_b['rows'],
+    }
+
+
+def finalize(state: dict[str, Any], model: Any, config: Any) -> dict[str, Any]:
+    """
+    Turn an analysis state into the results analyze would have returned.
+
+    Args:
+        state: State covering the whole dataset
+        model: Loaded model module
+        config: Loaded config module
+
+    Returns:
+        Dictionary containing correlation analysis results
+    """
+    if state['clean_records'] < 2:
+        raise ValueError("Need at least 2 records for correlation analysis")
+
+    method = getattr(config, 'PARAMETERS', {}).get('method', 'pearson')
+    columns = state['columns']
+    if method == 'pearson':
+        corr_matrix = pd.DataFrame(
+            correlation_matrix(state['comoments']), index=columns, columns=columns
+        )
+    else:
+        analysis_data = pd.DataFrame(np.concatenate(state['rows']), columns=columns)
+        try:
+            corr_matrix = analysis_data.corr(method=method)
+        except Exception as e:
+            raise ValueError(f"Failed to calculate correlation matrix: {str(e)}") from e
+
+    return _build_results(
+        corr_matrix,
+        state['total_records'],
+        state['clean_records'],
+        columns,
+        model,
+        config,
+    )
+
+
+def _select_columns(
+    dataset: pd.DataFrame, model: Any, config: Any, prepared: Any
+) -> list[Any]:
+    """Validate the dataset and return the columns to correlate."""
+    selection = getattr(config, 'PARAMETERS', {}).get(
+        'columns_to_analyze', model.DEFAULT_COLUMNS
+    )
+    columns = resolve_columns(dataset, selection, prepared)
+    if not model.validate_input(dataset, columns):
+        raise ValueError(
+            "Dataset needs at least 2 numerical columns for correlation analysis"
+        )
+    return list(columns)
+
+
+def _build_results(
+    corr_matrix: pd.DataFrame,
+    total_records: int,
+    clean_records: int,
+    available_cols: list[str],
+    model: Any,
+    config: Any,
+) -> dict[str, Any]:
+    """Summarize a correlation matrix into the module's results."""
+    method = getattr(config, 'PARAMETERS', {}).get('method', 'pearson')
+    min_correlation = getattr(config, 'PARAMETERS', {}).get('min_correlation', 0.1)
+    precision = getattr(config, 'PARAMETERS', {}).get('precision', 3)
+
+    # Convert to regular dict for JSON serialization, a column of the matrix
+    # at a time
+    values = corr_matrix.to_numpy()
+    rows = list(corr_matrix.index)
+    corr_dict = {
+        col: {
+            row: None
+            if value != value
+            else round(value, precision)  # NaN is not equal to itself
+            for row, value in zip(rows, column_values, strict=True)
+        }
+        for col, column_values in zip(
+            corr_matrix.columns, values.T.tolist(), strict=True
+        )
+    }
+
     # Find significant correlations
-    significant_correlations = model.format_correlation_pairs(corr_matrix, min_correlation)
-    
-    # Calculate additional statistics
-    correlations_list = []
-    for i, col1 in enumerate(corr_matrix.columns):
-        for j, col2 in enumerate(corr_matrix.columns):
-            if i < j:  # Only upper triangle
-                corr_val = corr_matrix.loc[col1, col2]
-                if not pd.isna(corr_val):
-                    correlations_list.append(abs(corr_val))
-    
-    avg_correlation = np.mean(correlations_list) if correlations_list else 0
-    max_correlation = max(correlations_list) if correlations_list else 0
-    
+    significant_correlations = model.format_correlation_pairs(
+        corr_matrix, min_correlation
+    )
+
+    # Calculate additional statistics over the upper triangle
+    upper = values[np.triu_indices(len(corr_matrix.columns), k=1)]
+    correlations = np.abs(upper[~np.isnan(upper)])
+
+    avg_correlation = np.mean(correlations) if len(correlations) else 0
+    max_correlation = correlations.max() if len(correlations) else 0
+
     # Prepare results
     results = {
         'module': 'correlation',
@@ -82,16 +281,16 @@ def analyze(dataset: pd.DataFrame, model: Any, config: Any) -> Dict[str, Any]:
         'statistics': {
             'average_correlation': round(float(avg_correlation), precision),
             'max_correlation': round(float(max_correlation), precision),
-            'total_pairs': len(correlations_list),
-            'significant_pairs': len(significant_correlations)
+            'total_pairs': len(correlations),
+            'significant_pairs': len(significant_correlations),
         },
-        'total_records': len(dataset),
-        'clean_records': len(clean_data),
-        'columns_analyzed': available_cols
+        'total_records': total_records,
+        'clean_records': clean_records,
+        'columns_analyzed': available_cols,
     }
-    
+
     # Validate output
     if not model.validate_output(results):
         raise ValueError("Generated results failed validation")
-    
+
     return results
@@ -1,58 +1,89 @@
 """Data models and validation for correlation analysis module."""
 
-import pandas as pd
+from typing import Any
+
 import numpy as np
-from typing import Any, Dict, List
+import pandas as pd
+
+DEFAULT_COLUMNS = ['value', 'score', 'count']
 
 
-def validate_input(data: pd.DataFrame) -> bool:
+def validate_input(data: pd.DataFrame, columns: list[Any] | None = None) -> bool:
     """Validate that input data has at least 2 numerical columns for correlation."""
-    numerical_cols = ['value', 'score', 'count']
+    numerical_cols = columns if columns is not None else DEFAULT_COLUMNS
     available_cols = [col for col in numerical_cols if col in data.columns]
     return len(available_cols) >= 2
 
 
-def prepare_data(data: pd.DataFrame) -> pd.DataFrame:
-    """Clean and prepare data for correlation analysis."""
+def prepare_data(
+    data: pd.DataFrame, prepared: Any = None, columns: list[Any] | None = None
+) -> pd.DataFrame:
+    """Clean and prepare data for correlation analysis.
+
+    The numerical columns (the selected ones, by default value, score and
+    count) are coerced to numbers, in the rows where all of them are
+    present. If the runner shares a prepared context of the data, the
+    coerced columns and the rows to keep are taken from it.
+    """
     # Get numerical columns
-    numerical_cols = ['value', 'score', 'count']
+    numerical_cols = columns if columns is not None else DEFAULT_COLUMNS
     available_cols = [col for col in numerical_cols if col in data.columns]
-    
-    # Select only numerical columns and remove missing values
-    clean_data = data[available_cols].copy()
-    
-    # Convert to numeric
-    for col in available_cols:
-        clean_data[col] = pd.to_numeric(clean_data[col], errors='coerce')
-    
+    if prepared is not None:
+        return prepared.frame(available_cols, rows='complete')
+
+    # Select only numerical columns and convert to numeric
+    clean_data = data[available_cols].apply(pd.to_numeric, errors='coerce')
+
     # Remove rows with any missing values
     clean_data = clean_data.dropna()
-    
+
     return clean_data
 
 
-def validate_output(result: Dict[str, Any]) -> bool:
+def column_statistics(data: pd.DataFrame, column: str, stats: Any = None) -> Any:
+    """Return the runner's shared statistics of one prepared column, if any.
+
+    The values are those of the rows ``prepare_data`` keeps.
+    """
+    if stats is None:
+        return None
+    return stats.column(column, rows='complete', among=list(data.columns))
+
+
+def validate_output(result: dict[str, Any]) -> bool:
     """Validate correlation analysis results."""
     required_keys = ['correlation_matrix', 'significant_correlations', 'total_records']
     return all(key in result for key in required_keys)
 
 
-def format_correlation_pairs(corr_matrix: pd.DataFrame, min_correlation: float = 0.1) -> List[Dict[str, Any]]:
+def format_correlation_pairs(
+    corr_matrix: pd.DataFrame, min_correlation: float = 0.1
+) -> list[dict[str, Any]]:
     """Format correlation matrix into significant correlation pairs."""
-    pairs = []
-    
-    for i, col1 in enumerate(corr_matrix.columns):
-        for j, col2 in enumerate(corr_matrix.columns):
-            if i < j:  # Only upper triangle to avoid duplicates
-                correlation = corr_matrix.loc[col1, col2]
-                if abs(correlation) >= min_correlation:
-                    pairs.append({
-                        'variable_1': col1,
-                        'variable_2': col2,
-                        'correlation': round(float(correlation), 3),
-                        'strength': _get_correlation_strength(abs(correlation))
-                    })
-    
+    columns = list(corr_matrix.columns)
+    values = corr_matrix.to_numpy()
+
+    # Only upper triangle to avoid duplicates, in row order
+    rows, cols = np.triu_indices(len(columns), k=1)
+    correlations = values[rows, cols]
+    with np.errstate(invalid='ignore'):
+        significant = np.abs(correlations) >= min_correlation
+
+    pairs = [
+        {
+            'variable_1': columns[i],
+            'variable_2': columns[j],
+            'correlation': round(correlation, 3),
+            'strength': _get_correlation_strength(abs(correlation)),
+        }
+        for i, j, correlation in zip(
+            rows[significant].tolist(),
+            cols[significant].tolist(),
+            correlations[significant].tolist(),
+            strict=True,
+        )
+    ]
+
     # Sort by absolute correlation value (descending)
     pairs.sort(key=lambda x: abs(x['correlation']), reverse=True)
     return pairs
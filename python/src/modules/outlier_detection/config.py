@@ -8,6 +8,10 @@ PARAMETERS = {
     "iqr_multiplier": 1.5,  # IQR multiplier for outlier detection
     "zscore_threshold": 2.5,  # Z-score threshold for outlier detection
     "methods": ["iqr", "zscore"],  # Methods to use: iqr, zscore, or both
+    # Names, glob patterns or {"include", "regex", "dtypes", "exclude"};
+    # see src/core/column_selection.py
     "columns_to_analyze": ["value", "score", "count"],
+    "quantile_method": "exact",  # exact (in memory; chunks use sketches), or sketch
+    "sketch_k": 200,  # Accuracy of the quantile sketch
     "precision": 3
 }
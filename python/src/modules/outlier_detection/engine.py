@@ -1,87 +1,512 @@
 """Main execution logic for outlier detection analysis."""
 
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+import numpy as np
 import pandas as pd
-from typing import Any, Dict, List, Set
+
+from src.core.column_selection import resolve_columns
+from src.core.describe import column_blocks
+from src.core.moments import column_moments, merge_column_moments, variance
+from src.core.quantile_sketch import (
+    empty_sketch,
+    merge_sketches,
+    rank_error,
+    sketch_quantiles,
+    sketch_values,
+    update_sketch,
+)
 
 
-def analyze(dataset: pd.DataFrame, model: Any, config: Any) -> Dict[str, Any]:
+def analyze(
+    dataset: pd.DataFrame,
+    model: Any,
+    config: Any,
+    prepared: Any = None,
+    stats: Any = None,
+) -> dict[str, Any]:
     """
     Perform outlier detection on numerical columns in the dataset.
-    
+
     Args:
         dataset: Input pandas DataFrame
         model: Loaded model module
         config: Loaded config module
-        
+        prepared: Shared preparation of the dataset, if the runner provides one
+        stats: Shared column statistics of the dataset, if the runner provides them
+
     Returns:
         Dictionary containing outlier detection results
     """
-    
+
     # Validate input
-    if not model.validate_input(dataset):
-        raise ValueError("Dataset missing numerical columns for outlier detection")
-    
+    columns = _select_columns(dataset, model, config, prepared)
+
     # Prepare data
-    clean_data = model.prepare_data(dataset)
-    
+    clean_data = model.prepare_data(dataset, prepared, columns)
+
+    return _detect_outliers(
+        clean_data, columns, len(dataset), model, config, stats=stats
+    )
+
+
+def init_state(config: Any) -> dict[str, Any]:
+    """
+    Start outlier detection over a dataset given in chunks.
+
+    Args:
+        config: Loaded config module
+
+    Returns:
+        Empty analysis state
+    """
+    return {
+        'total_records': 0,
+        'clean_records': 0,
+        'selected': None,
+        'columns': None,
+        'moments': {},
+        'sketches': {},
+    }
+
+
+def analyze_chunk(
+    state: dict[str, Any],
+    chunk: pd.DataFrame,
+    model: Any,
+    config: Any,
+    prepared: Any = None,
+) -> dict[str, Any]:
+    """
+    Add one chunk of the dataset to the analysis state.
+
+    Whether a value is an outlier depends on the quartiles and moments of
+    the whole column, so only those are gathered here: the moments of each
+    screened column and a quantile sketch of it, both of bounded size. The
+    outliers themselves are found by a second pass over the chunks (see
+    init_scan) once the state covers the whole dataset. The quartiles are
+    therefore estimates whichever quantile method is configured, exact
+    until a column has more values than the sketch holds.
+
+    Args:
+        state: State returned by init_state, analyze_chunk or merge
+        chunk: Next chunk of the dataset
+        model: Loaded model module
+        config: Loaded config module
+        prepared: Shared preparation of the chunk, if the runner provides one
+
+    Returns:
+        Updated analysis state
+    """
+    selected = _select_columns(chunk, model, config, prepared)
+    clean_data = model.prepare_data(chunk, prepared, selected)
+    if state['columns'] is not None and state['columns'] != list(clean_data.columns):
+        raise ValueError(
+            "Chunks have different numerical columns for outlier detection"
+        )
+    available_cols = [col for col in selected if col in clean_data.columns]
+
+    state['total_records'] += len(chunk)
+    state['clean_records'] += len(clean_data)
+    state['selected'] = list(selected)
+    state['columns'] = list(clean_data.columns)
+    state['moments'] = merge_column_moments(
+        state['moments'], column_moments(clean_data, available_cols)
+    )
+
+    sketch_k = _state_sketch_k(config)
+    for names, block in column_blocks(clean_data, available_cols):
+        for column, values in zip(names, block.T, strict=True):
+            sketch = state['sketches'].get(column, empty_sketch(sketch_k))
+            state['sketches'][column] = update_sketch(sketch, values)
+
+    return state
+
+
+def merge(state_a: dict[str, Any], state_b: dict[str, Any]) -> dict[str, Any]:
+    """
+    Combine the states of two disjoint parts of a dataset.
+
+    Args:
+        state_a: State of the earlier part
+        state_b: State of the later part
+
+    Returns:
+        State of both parts
+    """
+    if state_a['columns'] is None:
+        return state_b
+    if state_b['columns'] is None:
+        return state_a
+    if state_a['columns'] != state_b['columns']:
+        raise ValueError(
+            "Chunks have different numerical columns for outlier detection"
+        )
+
+    sketches = dict(state_a['sketches'])
+    for column, sketch in state_b['sketches'].items():
+        sketches[column] = (
+            merge_sketches(sketches[column], sketch) if column in sketches else sketch
+        )
+
+    return {
+        'total_records': state_a['total_records'] + state_b['total_records'],
+        'clean_records': state_a['clean_records'] + state_b['clean_records'],
+        'selected': state_a['selected'],
+        'columns': state_a['columns'],
+        'moments': merge_column_moments(state_a['moments'], state_b['moments']),
+        'sketches': sketches,
+    }
+
+
+def init_scan(state: dict[str, Any], model: Any, config: Any) -> dict[str, Any]:
+    """
+    Start the second pass, which collects the rows outside the bounds.
+
+    The IQR fences and z-score moments of every column are fixed here from
+    the state of the whole dataset, so each chunk can be screened on its
+    own and only its candidate rows kept.
+
+    Args:
+        state: State covering the whole dataset
+        model: Loaded model module
+        config: Loaded config module
+
+    Returns:
+        Empty scan holding the bounds
+    """
+    if state['clean_records'] < 3:
+        raise ValueError("Need at least 3 records for meaningful outlier detection")
+
+    columns = [col for col in state['selected'] if col in state['columns']]
+    moments = [state['moments'][col] for col in columns]
+    sketches = [state['sketches'][col] for col in columns]
+    if sketches:
+        q1, q3 = np.array(
+            [sketch_quantiles(sketch, [0.25, 0.75]) for sketch in sketches]
+        ).T
+    else:
+        q1 = q3 = np.empty(0)
+    errors = [rank_error(sketch) for sketch in sketches]
+    return {
+        'bounds': {
+            'columns': columns,
+            'q1': q1,
+            'q3': q3,
+            'mean': np.array([m['mean'] for m in moments], dtype='float64'),
+            'std': np.sqrt([variance(m) for m in moments]),
+            'rank_error': (
+                errors if _sketch_k(config) is not None or any(errors) else None
+            ),
+        },
+        'index': [],
+        'values': [],
+        'ids': [],
+    }
+
+
+def scan_chunk(
+    scan: dict[str, Any],
+    chunk: pd.DataFrame,
+    model: Any,
+    config: Any,
+    prepared: Any = None,
+) -> dict[str, Any]:
+    """
+    Keep the rows of one chunk that lie outside the bounds of any column.
+
+    Args:
+        scan: Scan returned by init_scan, scan_chunk or merge_scans
+        chunk: Next chunk of the dataset
+        model: Loaded model module
+        config: Loaded config module
+        prepared: Shared preparation of the chunk, if the runner provides one
+
+    Returns:
+        Updated scan
+    """
+    bounds = scan['bounds']
+    selected = _select_columns(chunk, model, config, prepared)
+    clean_data = model.prepare_data(chunk, prepared, selected)
+    candidates = np.zeros(len(clean_data), dtype=bool)
+    for window, (_, block) in _windows(column_blocks(clean_data, bounds['columns'])):
+        for mask, _ in _screen(block, bounds, window, model, config).values():
+            candidates |= mask.any(axis=1)
+
+    rows = np.flatnonzero(candidates)
+    scan['index'].append(clean_data.index.to_numpy()[rows])
+    scan['values'].append(clean_data[bounds['columns']].to_numpy(dtype='float64')[rows])
+    if 'id' in clean_data.columns and 'id' not in bounds['columns']:
+        scan['ids'].append(clean_data['id'].to_numpy()[rows])
+    return scan
+
+
+def merge_scans(scan_a: dict[str, Any], scan_b: dict[str, Any]) -> dict[str, Any]:
+    """
+    Combine the scans of two disjoint parts of a dataset.
+
+    Args:
+        scan_a: Scan of the earlier part
+        scan_b: Scan of the later part, started from the same state
+
+    Returns:
+        Scan of both parts
+    """
+    return {
+        'bounds': scan_a['bounds'],
+        'index': scan_a['index'] + scan_b['index'],
+        'values': scan_a['values'] + scan_b['values'],
+        'ids': scan_a['ids'] + scan_b['ids'],
+    }
+
+
+def finalize(
+    state: dict[str, Any], model: Any, config: Any, scan: Any = None
+) -> dict[str, Any]:
+    """
+    Turn an analysis state into the results analyze would have returned.
+
+    Args:
+        state: State covering the whole dataset
+        model: Loaded model module
+        config: Loaded config module
+        scan: Second pass over the same dataset, started by init_scan
+
+    Returns:
+        Dictionary containing outlier detection results
+    """
+    if state['clean_records'] < 3:
+        raise ValueError("Need at least 3 records for meaningful outlier detection")
+    if scan is None:
+        raise ValueError(
+            "outlier_detection needs a second pass over the data to find the outliers"
+        )
+
+    bounds = scan['bounds']
+    if not bounds['columns']:
+        raise ValueError("No analyzable columns found in the dataset")
+    candidates = pd.DataFrame(
+        np.concatenate(scan['values'] or [np.empty((0, len(bounds['columns'])))]),
+        index=np.concatenate(scan['index'] or [np.empty(0, dtype='int64')]),
+        columns=bounds['columns'],
+    )
+    ids = np.concatenate(scan['ids']) if scan['ids'] else None
+    return _summarize_outliers(
+        candidates,
+        ids,
+        bounds,
+        state['clean_records'],
+        state['total_records'],
+        model,
+        config,
+    )
+
+
+def _sketch_k(config: Any) -> int | None:
+    """Return the sketch accuracy if quartiles are estimated, else None."""
+    parameters = getattr(config, 'PARAMETERS', {})
+    if parameters.get('quantile_method', 'exact') != 'sketch':
+        return None
+    return parameters.get('sketch_k', 200)
+
+
+def _state_sketch_k(config: Any) -> int:
+    """Return the accuracy of the sketches kept by chunked states."""
+    return getattr(config, 'PARAMETERS', {}).get('sketch_k', 200)
+
+
+def _select_columns(
+    dataset: pd.DataFrame, model: Any, config: Any, prepared: Any
+) -> list[Any]:
+    """Validate the dataset and return the columns to screen."""
+    selection = getattr(config, 'PARAMETERS', {}).get(
+        'columns_to_analyze', model.DEFAULT_COLUMNS
+    )
+    columns = resolve_columns(dataset, selection, prepared)
+    if not model.validate_input(dataset, columns):
+        raise ValueError("Dataset missing numerical columns for outlier detection")
+    return columns
+
+
+def _detect_outliers(
+    clean_data: pd.DataFrame,
+    columns: list[Any],
+    total_records: int,
+    model: Any,
+    config: Any,
+    stats: Any = None,
+) -> dict[str, Any]:
+    """Detect outliers in the cleaned data and summarize them.
+
+    Quartiles, means and standard deviations of all columns come from one
+    summary, shared with other modules through the column statistics, if
+    given. With the "sketch" quantile method, IQR quartiles come from
+    sketches of the columns instead.
+    """
     if len(clean_data) < 3:
         raise ValueError("Need at least 3 records for meaningful outlier detection")
-    
+
+    methods = getattr(config, 'PARAMETERS', {}).get('methods', ['iqr', 'zscore'])
+    sketch_k = _sketch_k(config)
+
+    # Filter to available columns
+    available_cols = [col for col in columns if col in clean_data.columns]
+
+    if not available_cols:
+        raise ValueError("No analyzable columns found in the dataset")
+
+    # Quartiles, means and standard deviations of all columns at once
+    summary = model.summarize_columns(
+        clean_data, available_cols, [0.25, 0.75] if sketch_k is None else [], stats
+    )
+    bounds = {
+        'columns': available_cols,
+        'q1': None,
+        'q3': None,
+        'mean': summary['mean'],
+        'std': summary['std'],
+        'rank_error': None,
+    }
+    if sketch_k is None:
+        bounds['q1'], bounds['q3'] = summary['quantiles']
+    elif 'iqr' in methods:
+        sketches = [
+            sketch_values(clean_data[col].to_numpy(), sketch_k)
+            for col in available_cols
+        ]
+        bounds['q1'], bounds['q3'] = np.array(
+            [sketch_quantiles(sketch, [0.25, 0.75]) for sketch in sketches]
+        ).T
+        bounds['rank_error'] = [rank_error(sketch) for sketch in sketches]
+
+    ids = (
+        clean_data['id'].to_numpy()
+        if 'id' in clean_data.columns and 'id' not in available_cols
+        else None
+    )
+    return _summarize_outliers(
+        clean_data, ids, bounds, len(clean_data), total_records, model, config
+    )
+
+
+def _windows(
+    blocks: Iterable[tuple[list[Any], np.ndarray]],
+) -> Iterator[tuple[slice, tuple[list[Any], np.ndarray]]]:
+    """Pair each block of columns with its columns' slice of the bounds."""
+    start = 0
+    for names, block in blocks:
+        yield slice(start, start + len(names)), (names, block)
+        start += len(names)
+
+
+def _screen(
+    block: np.ndarray, bounds: dict[str, Any], window: slice, model: Any, config: Any
+) -> dict[str, tuple[np.ndarray, dict[str, np.ndarray]]]:
+    """Compare a block of columns with their bounds, method by method.
+
+    Returns:
+        Mask of the outliers and details of the bounds, for each method
+    """
+    iqr_multiplier = getattr(config, 'PARAMETERS', {}).get('iqr_multiplier', 1.5)
+    zscore_threshold = getattr(config, 'PARAMETERS', {}).get('zscore_threshold', 2.5)
+    methods = getattr(config, 'PARAMETERS', {}).get('methods', ['iqr', 'zscore'])
+
+    found = {}
+
+    # IQR method
+    if 'iqr' in methods:
+        found['iqr'] = model.detect_outliers_iqr(
+            block, bounds['q1'][window], bounds['q3'][window], iqr_multiplier
+        )
+
+    # Z-score method
+    if 'zscore' in methods:
+        found['zscore'] = model.detect_outliers_zscore(
+            block, bounds['mean'][window], bounds['std'][window], zscore_threshold
+        )
+
+    return found
+
+
+def _summarize_outliers(
+    candidates: pd.DataFrame,
+    ids: np.ndarray | None,
+    bounds: dict[str, Any],
+    clean_records: int,
+    total_records: int,
+    model: Any,
+    config: Any,
+) -> dict[str, Any]:
+    """List the outliers among candidate rows and summarize them.
+
+    The columns are screened a block at a time, each method comparing the
+    whole block with per-column bounds at once. The candidates are all
+    cleaned rows, or in a chunked run only those the second pass kept.
+    """
     # Get parameters from config
     iqr_multiplier = getattr(config, 'PARAMETERS', {}).get('iqr_multiplier', 1.5)
     zscore_threshold = getattr(config, 'PARAMETERS', {}).get('zscore_threshold', 2.5)
     methods = getattr(config, 'PARAMETERS', {}).get('methods', ['iqr', 'zscore'])
     precision = getattr(config, 'PARAMETERS', {}).get('precision', 3)
-    columns_to_analyze = getattr(config, 'PARAMETERS', {}).get(
-        'columns_to_analyze', ['value', 'score', 'count']
-    )
-    
-    # Filter to available columns
-    available_cols = [col for col in columns_to_analyze if col in clean_data.columns]
-    
-    if not available_cols:
-        raise ValueError("No analyzable columns found in the dataset")
-    
+
+    available_cols = bounds['columns']
+    index = candidates.index
+
     # Results storage
-    outliers_by_column = {}
+    outliers_by_column = {col: {'column': col, 'methods': {}} for col in available_cols}
     all_outlier_indices = set()
-    
-    # Analyze each column
-    for column in available_cols:
-        column_data = clean_data[column]
-        column_outliers = {
-            'column': column,
-            'methods': {}
-        }
-        
-        # IQR method
-        if 'iqr' in methods:
-            iqr_outliers, iqr_bounds = model.detect_outliers_iqr(column_data, iqr_multiplier)
-            column_outliers['methods']['iqr'] = {
-                'outlier_indices': iqr_outliers,
-                'outlier_count': len(iqr_outliers),
-                'bounds': iqr_bounds,
-                'outliers': model.format_outlier_details(clean_data, iqr_outliers, column)
-            }
-            all_outlier_indices.update(iqr_outliers)
-        
-        # Z-score method
-        if 'zscore' in methods:
-            zscore_outliers, zscore_stats = model.detect_outliers_zscore(column_data, zscore_threshold)
-            column_outliers['methods']['zscore'] = {
-                'outlier_indices': zscore_outliers,
-                'outlier_count': len(zscore_outliers),
-                'statistics': zscore_stats,
-                'outliers': model.format_outlier_details(clean_data, zscore_outliers, column)
-            }
-            all_outlier_indices.update(zscore_outliers)
-        
-        outliers_by_column[column] = column_outliers
-    
+
+    # Analyze the columns a block at a time
+    for window, (names, block) in _windows(column_blocks(candidates, available_cols)):
+        found = _screen(block, bounds, window, model, config)
+
+        for method, (mask, details) in found.items():
+            # Row positions of each column's outliers, column by column
+            cols, rows = np.nonzero(mask.T)
+            splits = np.searchsorted(cols, np.arange(1, len(names)))
+            for j, (column, positions) in enumerate(
+                zip(names, np.split(rows, splits), strict=True)
+            ):
+                outlier_indices = index[positions].tolist()
+                outliers = model.format_outlier_details(
+                    outlier_indices,
+                    column,
+                    block[positions, j],
+                    ids[positions] if ids is not None else None,
+                )
+                if method == 'iqr':
+                    result = {
+                        'outlier_indices': outlier_indices,
+                        'outlier_count': len(outlier_indices),
+                        'bounds': {
+                            key: float(values[j]) for key, values in details.items()
+                        },
+                        'outliers': outliers,
+                    }
+                    if bounds['rank_error'] is not None:
+                        result['bounds']['rank_error'] = bounds['rank_error'][
+                            window.start + j
+                        ]
+                else:
+                    result = {
+                        'outlier_indices': outlier_indices,
+                        'outlier_count': len(outlier_indices),
+                        'statistics': {
+                            'mean': float(details['mean'][j]),
+                            'std': float(details['std'][j]),
+                            'threshold': zscore_threshold,
+                        },
+                        'outliers': outliers,
+                    }
+                outliers_by_column[column]['methods'][method] = result
+                all_outlier_indices.update(outlier_indices)
     # Calculate summary statistics
     total_outliers = len(all_outlier_indices)
-    outlier_percentage = (total_outliers / len(clean_data)) * 100 if len(clean_data) > 0 else 0
-    
+    outlier_percentage = (
+        (total_outliers / clean_records) * 100 if clean_records > 0 else 0
+    )
+
     # Count outliers per method across all columns
     method_summary = {}
     for method in methods:
@@ -91,14 +516,16 @@ def analyze(dataset: pd.DataFrame, model: Any, config: Any) -> Dict[str, Any]:
                 method_outliers.update(col_data['methods'][method]['outlier_indices'])
         method_summary[method] = {
             'total_outliers': len(method_outliers),
-            'percentage': (len(method_outliers) / len(clean_data)) * 100 if len(clean_data) > 0 else 0
+            'percentage': (len(method_outliers) / clean_records) * 100
+            if clean_records > 0
+            else 0,
         }
-    
+
     # Round percentages
     outlier_percentage = round(outlier_percentage, precision)
     for method_data in method_summary.values():
         method_data['percentage'] = round(method_data['percentage'], precision)
-    
+
     # Prepare results
     results = {
         'module': 'outlier_detection',
@@ -106,21 +533,21 @@ def analyze(dataset: pd.DataFrame, model: Any, config: Any) -> Dict[str, Any]:
         'methods_used': methods,
         'parameters': {
             'iqr_multiplier': iqr_multiplier,
-            'zscore_threshold': zscore_threshold
+            'zscore_threshold': zscore_threshold,
         },
         'outliers_by_column': outliers_by_column,
         'summary': {
             'total_unique_outliers': total_outliers,
             'outlier_percentage': outlier_percentage,
             'method_summary': method_summary,
-            'columns_analyzed': available_cols
+            'columns_analyzed': available_cols,
         },
-        'total_records': len(dataset),
-        'clean_records': len(clean_data)
+        'total_records': total_records,
+        'clean_records': clean_records,
     }
-    
+
     # Validate output
     if not model.validate_output(results):
         raise ValueError("Generated results failed validation")
-    
+
     return results
@@ -1,98 +1,147 @@
 """Data models and validation for outlier detection module."""
 
-import pandas as pd
+from typing import Any
+
 import numpy as np
-from typing import Any, Dict, List, Tuple
+import pandas as pd
+
+from src.core.describe import describe_columns
 
+DEFAULT_COLUMNS = ['value', 'score', 'count']
 
-def validate_input(data: pd.DataFrame) -> bool:
-    """Validate that input data has required numerical columns."""
-    numerical_cols = ['value', 'score', 'count']
+
+def validate_input(data: pd.DataFrame, columns: list[Any] | None = None) -> bool:
+    """Validate that input data has some of the numerical columns to screen."""
+    numerical_cols = columns if columns is not None else DEFAULT_COLUMNS
     return any(col in data.columns for col in numerical_cols)
 
 
-def prepare_data(data: pd.DataFrame) -> pd.DataFrame:
-    """Clean and prepare data for outlier detection."""
+def prepare_data(
+    data: pd.DataFrame, prepared: Any = None, columns: list[Any] | None = None
+) -> pd.DataFrame:
+    """Clean and prepare data for outlier detection.
+
+    The numerical columns (the selected ones, by default value, score and
+    count) are coerced to numbers and kept with the record ids in the rows
+    where all of them are present. If the runner shares a prepared context
+    of the data, the coerced columns and the rows to keep are taken from it.
+    """
     # Get numerical columns
-    numerical_cols = ['value', 'score', 'count']
+    numerical_cols = columns if columns is not None else DEFAULT_COLUMNS
     available_cols = [col for col in numerical_cols if col in data.columns]
-    
-    # Select only numerical columns and remove missing values
-    clean_data = data[available_cols + ['id']].copy() if 'id' in data.columns else data[available_cols].copy()
-    
+    id_cols = ['id'] if 'id' in data.columns and 'id' not in available_cols else []
+    if prepared is not None:
+        return prepared.frame(available_cols, rows='complete', extra_columns=id_cols)
+
     # Convert to numeric
-    for col in available_cols:
-        clean_data[col] = pd.to_numeric(clean_data[col], errors='coerce')
-    
+    clean_data = data[available_cols].apply(pd.to_numeric, errors='coerce')
+    if id_cols:
+        clean_data['id'] = data['id']
+
     # Remove rows with missing numerical values
     clean_data = clean_data.dropna(subset=available_cols)
-    
+
     return clean_data
 
 
-def detect_outliers_iqr(data: pd.Series, multiplier: float = 1.5) -> Tuple[List[int], Dict[str, float]]:
-    """Detect outliers using Interquartile Range (IQR) method."""
-    q1 = data.quantile(0.25)
-    q3 = data.quantile(0.75)
+def summarize_columns(
+    data: pd.DataFrame, columns: list[Any], quantiles: list[float], stats: Any = None
+) -> dict[str, Any]:
+    """Describe all screened columns of the prepared data at once.
+
+    With the runner's shared column statistics the summary of the rows
+    ``prepare_data`` keeps is computed once per run and shared, for
+    instance with ``basic_stats``.
+
+    Returns:
+        Arrays of statistics with an entry per column, as from
+        ``src.core.describe.describe_columns``
+    """
+    if stats is not None:
+        return stats.describe(columns, rows='complete', quantiles=quantiles)
+    return describe_columns(data[columns], quantiles)
+
+
+def detect_outliers_iqr(
+    values: np.ndarray, q1: np.ndarray, q3: np.ndarray, multiplier: float = 1.5
+) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+    """Detect outliers using Interquartile Range (IQR) method.
+
+    Args:
+        values: Values with a column per variable
+        q1: First quartile of each column, exact or estimated
+        q3: Third quartile of each column
+        multiplier: Width of the fences in interquartile ranges
+
+    Returns:
+        Mask of the values outside the fences, and the bounds of each column
+    """
     iqr = q3 - q1
-    
+
     lower_bound = q1 - multiplier * iqr
     upper_bound = q3 + multiplier * iqr
-    
-    outlier_indices = data[(data < lower_bound) | (data > upper_bound)].index.tolist()
-    
+
+    outliers = (values < lower_bound) | (values > upper_bound)
+
     bounds = {
-        'lower_bound': float(lower_bound),
-        'upper_bound': float(upper_bound),
-        'q1': float(q1),
-        'q3': float(q3),
-        'iqr': float(iqr)
+        'lower_bound': lower_bound,
+        'upper_bound': upper_bound,
+        'q1': q1,
+        'q3': q3,
+        'iqr': iqr,
     }
-    
-    return outlier_indices, bounds
-
-
-def detect_outliers_zscore(data: pd.Series, threshold: float = 2.5) -> Tuple[List[int], Dict[str, float]]:
-    """Detect outliers using Z-score method."""
-    mean = data.mean()
-    std = data.std()
-    
-    if std == 0:  # Avoid division by zero
-        return [], {'mean': float(mean), 'std': float(std), 'threshold': threshold}
-    
-    z_scores = np.abs((data - mean) / std)
-    outlier_indices = data[z_scores > threshold].index.tolist()
-    
-    stats = {
-        'mean': float(mean),
-        'std': float(std),
-        'threshold': threshold
-    }
-    
-    return outlier_indices, stats
 
+    return outliers, bounds
+
+
+def detect_outliers_zscore(
+    values: np.ndarray, mean: np.ndarray, std: np.ndarray, threshold: float = 2.5
+) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+    """Detect outliers using Z-score method.
 
-def validate_output(result: Dict[str, Any]) -> bool:
+    Args:
+        values: Values with a column per variable
+        mean: Mean of each column
+        std: Standard deviation of each column
+        threshold: Absolute z-score above which a value is an outlier
+
+    Returns:
+        Mask of the values beyond the threshold, and the mean and standard
+        deviation of each column. Constant columns have no outliers.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z_scores = np.abs((values - mean) / std)
+    outliers = z_scores > threshold
+    outliers[:, std == 0] = False  # Avoid division by zero
+
+    return outliers, {'mean': mean, 'std': std}
+
+
+def validate_output(result: dict[str, Any]) -> bool:
     """Validate outlier detection results."""
     required_keys = ['outliers_by_column', 'summary', 'total_records']
     return all(key in result for key in required_keys)
 
 
-def format_outlier_details(data: pd.DataFrame, outlier_indices: List[int], column: str) -> List[Dict[str, Any]]:
-    """Format outlier details for reporting."""
-    outliers = []
-    for idx in outlier_indices:
-        if idx in data.index:
-            outlier_data = {
-                'index': int(idx),
-                'column': column,
-                'value': float(data.loc[idx, column])
-            }
-            
-            # Add ID if available
-            if 'id' in data.columns:
-                outlier_data['id'] = int(data.loc[idx, 'id'])
-            
-            outliers.append(outlier_data)
-    
+def format_outlier_details(
+    indices: list[Any], column: str, values: np.ndarray, ids: np.ndarray | None = None
+) -> list[dict[str, Any]]:
+    """Format outlier details for reporting.
+
+    Args:
+        indices: Row labels of the outliers
+        column: Column the outliers were found in
+        values: Their values
+        ids: Their record ids, if the data has them
+    """
+    outliers = [
+        {'index': int(idx), 'column': column, 'value': value}
+        for idx, value in zip(indices, values.tolist(), strict=True)
+    ]
+
+    # Add ID if available
+    if ids is not None:
+        for outlier_data, record_id in zip(outliers, ids.tolist(), strict=True):
+            outlier_data['id'] = int(record_id)
+
     return outliers
@@ -7,4 +7,4 @@ PARAMETERS = {
     "ddof": 1,  # Delta degrees of freedom (1 for sample variance, 0 for population)
     "include_std": True,
     "include_population_variance": False
-}
\ No newline at end of file
+}
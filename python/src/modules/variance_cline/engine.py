@@ -1,84 +1,159 @@
-import pandas as pd
+from functools import reduce
+from typing import Any
+
 import numpy as np
-from typing import Any, Dict
+import pandas as pd
 
-def analyze(dataset: pd.DataFrame, model: Any, config: Any) -> Dict[str, Any]:
+from src.core.moments import (
+    column_moments,
+    empty_moments,
+    merge_column_moments,
+    merge_moments,
+)
+from src.core.moments import (
+    variance as variance_of,
+)
+
+
+def analyze(
+    dataset: pd.DataFrame,
+    model: Any,
+    config: Any,
+    prepared: Any = None,
+    stats: Any = None,
+) -> dict[str, Any]:
     """Calculate variance and related statistical measures for the dataset."""
 
     # Validate input
     if not model.validate_input(dataset):
-        raise ValueError("Invalid input data: No numeric columns found or dataset is empty")
+        raise ValueError(
+            "Invalid input data: No numeric columns found or dataset is empty"
+        )
 
     # Prepare data
-    clean_data = model.prepare_data(dataset)
+    clean_data = model.prepare_data(dataset, prepared)
 
     if clean_data.empty:
         raise ValueError("No valid numeric data remaining after cleaning")
 
-    # Get configuration parameters
+    # Moments of all columns at once, shared with the other variance
+    # modules when the runner provides column statistics
+    if stats is not None:
+        moments = stats.moments(clean_data.columns)
+    else:
+        moments = column_moments(clean_data)
+
+    state = {'clean_records': len(clean_data), 'moments': moments}
+    return finalize(state, model, config)
+
+
+def init_state(config: Any) -> dict[str, Any]:
+    """Start variance analysis over a dataset given in chunks."""
+    return {'clean_records': 0, 'moments': {}}
+
+
+def analyze_chunk(
+    state: dict[str, Any],
+    chunk: pd.DataFrame,
+    model: Any,
+    config: Any,
+    prepared: Any = None,
+) -> dict[str, Any]:
+    """Add the mergeable moments of one chunk's numeric columns to the state."""
+    if not model.validate_input(chunk):
+        raise ValueError(
+            "Invalid input data: No numeric columns found or dataset is empty"
+        )
+
+    clean_data = model.prepare_data(chunk, prepared)
+    state['clean_records'] += len(clean_data)
+    state['moments'] = merge_column_moments(
+        state['moments'], column_moments(clean_data)
+    )
+    return state
+
+
+def merge(state_a: dict[str, Any], state_b: dict[str, Any]) -> dict[str, Any]:
+    """Combine the states of two disjoint parts of a dataset."""
+    return {
+        'clean_records': state_a['clean_records'] + state_b['clean_records'],
+        'moments': merge_column_moments(state_a['moments'], state_b['moments']),
+    }
+
+
+def finalize(state: dict[str, Any], model: Any, config: Any) -> dict[str, Any]:
+    """Turn an analysis state into the results analyze would have returned."""
+    if state['clean_records'] == 0 or not state['moments']:
+        raise ValueError("No valid numeric data remaining after cleaning")
+
     ddof = config.PARAMETERS.get('ddof', 1)
-    precision = config.PARAMETERS.get('precision', 4)
     include_std = config.PARAMETERS.get('include_std', True)
-    include_population_variance = config.PARAMETERS.get('include_population_variance', False)
-    include_coefficient_of_variation = config.PARAMETERS.get('include_coefficient_of_variation', True)
+    include_population_variance = config.PARAMETERS.get(
+        'include_population_variance', False
+    )
+    include_coefficient_of_variation = config.PARAMETERS.get(
+        'include_coefficient_of_variation', True
+    )
 
-    # Calculate variance for each numeric column
     column_results = {}
     overall_results = {}
 
-    for column in clean_data.columns:
-        col_data = clean_data[column].dropna()
-
-        if len(col_data) > 0:
-            # Sample variance (ddof=1) or population variance (ddof=0)
-            variance = col_data.var(ddof=ddof)
-            mean_val = col_data.mean()
-            
+    for column, moments in state['moments'].items():
+        if moments['count'] > 0:
+            variance_value = variance_of(moments, ddof)
+            mean_val = moments['mean']
             col_result = {
-                'variance': variance,
-                'count': len(col_data),
-                'mean': mean_val
+                'variance': variance_value,
+                'count': moments['count'],
+                'mean': mean_val,
             }
 
             if include_std:
-                std_val = col_data.std(ddof=ddof)
+                std_val = np.sqrt(variance_value)
                 col_result['std'] = std_val
-                
+
                 # Add coefficient of variation if requested and mean is not zero
                 if include_coefficient_of_variation and mean_val != 0:
                     col_result['coefficient_of_variation'] = std_val / abs(mean_val)
 
             if include_population_variance and ddof != 0:
-                col_result['population_variance'] = col_data.var(ddof=0)
+                col_result['population_variance'] = variance_of(moments, 0)
 
             column_results[column] = col_result
 
-    # Calculate overall statistics if multiple columns
-    if len(clean_data.columns) > 1:
-        # Flatten all numeric values
-        all_values = clean_data.values.flatten()
-        all_values = all_values[~np.isnan(all_values)]
-
-        if len(all_values) > 0:
-            overall_variance = np.var(all_values, ddof=ddof)
-            overall_mean = np.mean(all_values)
-            
-            overall_results = {
-                'overall_variance': overall_variance,
-                'overall_count': len(all_values),
-                'overall_mean': overall_mean
-            }
+    # The overall moments are those of all columns' values together
+    overall = reduce(merge_moments, state['moments'].values(), empty_moments())
+    if len(state['moments']) > 1 and overall['count'] > 0:
+        overall_variance = variance_of(overall, ddof)
+        overall_mean = overall['mean']
+        overall_results = {
+            'overall_variance': overall_variance,
+            'overall_count': overall['count'],
+            'overall_mean': overall_mean,
+        }
 
-            if include_std:
-                overall_std = np.std(all_values, ddof=ddof)
-                overall_results['overall_std'] = overall_std
-                
-                # Add overall coefficient of variation if requested and mean is not zero
-                if include_coefficient_of_variation and overall_mean != 0:
-                    overall_results['overall_coefficient_of_variation'] = overall_std / abs(overall_mean)
+        if include_std:
+            overall_std = np.sqrt(overall_variance)
+            overall_results['overall_std'] = overall_std
 
-            if include_population_variance and ddof != 0:
-                overall_results['overall_population_variance'] = np.var(all_values, ddof=0)
+            # Add overall coefficient of variation if requested and mean is not zero
+            if include_coefficient_of_variation and overall_mean != 0:
+                overall_results['overall_coefficient_of_variation'] = overall_std / abs(
+                    overall_mean
+                )
+
+        if include_population_variance and ddof != 0:
+            overall_results['overall_population_variance'] = variance_of(overall, 0)
+
+    return _build_results(column_results, overall_results, config)
+
+
+def _build_results(
+    column_results: dict[str, Any], overall_results: dict[str, Any], config: Any
+) -> dict[str, Any]:
+    """Compile the final results and apply precision formatting."""
+    ddof = config.PARAMETERS.get('ddof', 1)
+    precision = config.PARAMETERS.get('precision', 4)
 
     # Compile final results
     results = {
@@ -87,8 +162,8 @@ def analyze(dataset: pd.DataFrame, model: Any, config: Any) -> Dict[str, Any]:
             'total_columns': len(column_results),
             'ddof': ddof,
             'precision': precision,
-            'module_author': config.AUTHOR
-        }
+            'module_author': config.AUTHOR,
+        },
     }
 
     if overall_results:
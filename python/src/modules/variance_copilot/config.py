@@ -11,5 +11,7 @@ PARAMETERS = {
     "include_standard_deviation": True,
     "include_coefficient_variation": True,
     "ddof": 1,  # Delta degrees of freedom for sample variance
-    "columns_to_analyze": ["value", "score", "count"]
-}
\ No newline at end of file
+    "columns_to_analyze": ["value", "score", "count"],
+    "quantile_method": "exact",  # exact (in memory; chunks use sketches), or sketch
+    "sketch_k": 200  # Accuracy of the quantile sketch
+}
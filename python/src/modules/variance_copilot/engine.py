@@ -1,124 +1,440 @@
 """Main execution logic for variance computation module."""
 
-import pandas as pd
+from typing import Any
+
 import numpy as np
-from typing import Any, Dict
+import pandas as pd
+
+from src.core.moments import column_moments, merge_column_moments, variance
+from src.core.quantile_sketch import (
+    empty_sketch,
+    merge_sketches,
+    rank_error,
+    sketch_quantiles,
+    sketch_values,
+    update_sketch,
+)
 
 
-def analyze(dataset: pd.DataFrame, model: Any, config: Any) -> Dict[str, Any]:
+def analyze(
+    dataset: pd.DataFrame,
+    model: Any,
+    config: Any,
+    prepared: Any = None,
+    stats: Any = None,
+) -> dict[str, Any]:
     """
     Perform comprehensive variance analysis on the dataset.
-    
+
     Args:
         dataset: Input pandas DataFrame
         model: Loaded model module
         config: Loaded config module
-        
+        prepared: Shared preparation of the dataset, if the runner provides one
+        stats: Shared column statistics of the dataset, if the runner provides them
+
     Returns:
         Dictionary containing variance analysis results
     """
     # Validate input
     if not model.validate_input(dataset):
-        raise ValueError("Invalid input data: Dataset must contain numerical data with at least 2 rows")
-    
+        raise ValueError(
+            "Invalid input data: "
+            "Dataset must contain numerical data with at least 2 rows"
+        )
+
     # Prepare data
-    clean_data = model.prepare_data(dataset)
-    
+    clean_data = model.prepare_data(dataset, prepared)
+
     if len(clean_data) == 0:
         raise ValueError("No valid numerical data remaining after cleaning")
-    
-    # Get configuration parameters
-    precision = getattr(config, 'PARAMETERS', {}).get('precision', 4)
-    include_sample = getattr(config, 'PARAMETERS', {}).get('include_sample_variance', True)
-    include_population = getattr(config, 'PARAMETERS', {}).get('include_population_variance', True)
-    include_std = getattr(config, 'PARAMETERS', {}).get('include_standard_deviation', True)
-    include_cv = getattr(config, 'PARAMETERS', {}).get('include_coefficient_variation', True)
+
+    columns_to_analyze = getattr(config, 'PARAMETERS', {}).get(
+        'columns_to_analyze', None
+    )
     ddof = getattr(config, 'PARAMETERS', {}).get('ddof', 1)
-    columns_to_analyze = getattr(config, 'PARAMETERS', {}).get('columns_to_analyze', None)
-    
+
     # Filter columns if specified in config
     if columns_to_analyze:
-        available_columns = [col for col in columns_to_analyze if col in clean_data.columns]
+        available_columns = [
+            col for col in columns_to_analyze if col in clean_data.columns
+        ]
         if available_columns:
             clean_data = clean_data[available_columns]
-    
+
+    # Moments of all columns at once, shared with the other variance
+    # modules when the runner provides column statistics
+    if stats is not None:
+        moments = stats.moments(clean_data.columns)
+    else:
+        moments = column_moments(clean_data)
+    sketch_k = _sketch_k(config)
+
     # Perform variance analysis for each numerical column
     variance_results = {}
-    
+
     for column in clean_data.columns:
-        col_data = clean_data[column].dropna()  # Remove NaN values for this column
-        
-        if len(col_data) < 2:
+        column_summary = moments[column]
+
+        if column_summary['count'] < 2:
             # Cannot calculate meaningful variance with less than 2 data points
-            variance_results[column] = {
-                'sample_variance': None,
-                'population_variance': None,
-                'sample_std': None,
-                'population_std': None,
-                'coefficient_of_variation': None,
-                'count': len(col_data),
-                'mean': None,
-                'interpretation': 'insufficient data',
-                'error': 'Insufficient data points for variance calculation (need at least 2)'
+            variance_results[column] = _insufficient_data(column_summary['count'])
+            continue
+
+        # The median and quartiles still need the values themselves
+        col_data = (
+            stats.column(column) if stats is not None else clean_data[column].dropna()
+        )
+        if sketch_k is not None:
+            quartiles = _sketch_quartiles(
+                sketch_values(col_data.to_numpy(dtype='float64'), sketch_k)
+            )
+        else:
+            quartiles = {
+                'median': col_data.median(),
+                'q25': col_data.quantile(0.25),
+                'q75': col_data.quantile(0.75),
             }
+        variance_results[column] = _column_results(
+            {
+                'count': column_summary['count'],
+                'mean': column_summary['mean'],
+                'min': column_summary['min'],
+                'max': column_summary['max'],
+                'sample_variance': variance(column_summary, ddof),
+                'population_variance': variance(column_summary, 0),
+                **quartiles,
+            },
+            model,
+            config,
+        )
+
+    dataset_summary = {
+        'original_rows': len(dataset),
+        'clean_rows': len(clean_data),
+        'original_columns': len(dataset.columns),
+        'numerical_columns': len(clean_data.columns),
+    }
+    return _build_results(variance_results, dataset_summary, model, config)
+
+
+def init_state(config: Any) -> dict[str, Any]:
+    """
+    Start variance analysis over a dataset given in chunks.
+
+    Args:
+        config: Loaded config module
+
+    Returns:
+        Empty analysis state
+    """
+    return {'total_records': 0, 'columns': [], 'moments': {}, 'sketches': {}}
+
+
+def analyze_chunk(
+    state: dict[str, Any],
+    chunk: pd.DataFrame,
+    model: Any,
+    config: Any,
+    prepared: Any = None,
+) -> dict[str, Any]:
+    """
+    Add one chunk of the dataset to the analysis state.
+
+    Means, variances and ranges are kept as mergeable moments, and the
+    median and quartiles come from a quantile sketch of each numerical
+    column, so the state stays bounded. Exact quartiles would need every
+    value and are only computed in memory, by analyze. Row and column
+    counts are checked by finalize, since a single chunk may legitimately
+    be small.
+
+    Args:
+        state: State returned by init_state, analyze_chunk or merge
+        chunk: Next chunk of the dataset
+        model: Loaded model module
+        config: Loaded config module
+        prepared: Shared preparation of the chunk, if the runner provides one
+
+    Returns:
+        Updated analysis state
+    """
+    # Not model.prepare_data: whether a column is entirely NaN can only be
+    # decided for the whole dataset
+    if prepared is not None:
+        numerical_data = prepared.frame(prepared.numeric_columns)
+    else:
+        numerical_data = chunk.select_dtypes(include=[np.number])
+
+    state['total_records'] += len(chunk)
+    state['columns'] += [col for col in chunk.columns if col not in state['columns']]
+
+    sketch_k = _state_sketch_k(config)
+    for column in numerical_data.columns:
+        values = numerical_data[column].dropna().to_numpy()
+        sketch = state['sketches'].get(column, empty_sketch(sketch_k))
+        state['sketches'][column] = update_sketch(sketch, values)
+    state['moments'] = merge_column_moments(
+        state['moments'], column_moments(numerical_data)
+    )
+
+    return state
+
+
+def merge(state_a: dict[str, Any], state_b: dict[str, Any]) -> dict[str, Any]:
+    """
+    Combine the states of two disjoint parts of a dataset.
+
+    Args:
+        state_a: State of the earlier part
+        state_b: State of the later part
+
+    Returns:
+        State of both parts
+    """
+    sketches = dict(state_a['sketches'])
+    for column, sketch in state_b['sketches'].items():
+        sketches[column] = (
+            merge_sketches(sketches[column], sketch) if column in sketches else sketch
+        )
+
+    return {
+        'total_records': state_a['total_records'] + state_b['total_records'],
+        'columns': state_a['columns']
+        + [col for col in state_b['columns'] if col not in state_a['columns']],
+        'moments': merge_column_moments(state_a['moments'], state_b['moments']),
+        'sketches': sketches,
+    }
+
+
+def finalize(state: dict[str, Any], model: Any, config: Any) -> dict[str, Any]:
+    """
+    Turn an analysis state into the results analyze would have returned.
+
+    Args:
+        state: State covering the whole dataset
+        model: Loaded model module
+        config: Loaded config module
+
+    Returns:
+        Dictionary containing variance analysis results
+    """
+    if state['total_records'] < 2 or not state['moments']:
+        raise ValueError(
+            "Invalid input data: "
+            "Dataset must contain numerical data with at least 2 rows"
+        )
+
+    columns_to_analyze = getattr(config, 'PARAMETERS', {}).get(
+        'columns_to_analyze', None
+    )
+    ddof = getattr(config, 'PARAMETERS', {}).get('ddof', 1)
+
+    # Columns that are entirely NaN are dropped, as in model.prepare_data
+    columns = [col for col, moments in state['moments'].items() if moments['count'] > 0]
+    if columns_to_analyze:
+        available_columns = [col for col in columns_to_analyze if col in columns]
+        if available_columns:
+            columns = available_columns
+
+    variance_results = {}
+    report_error = _sketch_k(config) is not None
+
+    for column in columns:
+        moments = state['moments'][column]
+
+        if moments['count'] < 2:
+            variance_results[column] = _insufficient_data(moments['count'])
             continue
-        
-        # Calculate basic statistics
-        mean_val = col_data.mean()
-        min_val = col_data.min()
-        max_val = col_data.max()
-        count = len(col_data)
-        
-        # Initialize column results
-        col_results = {
-            'count': count,
-            'mean': round(mean_val, precision),
-            'min': round(min_val, precision),
-            'max': round(max_val, precision),
-            'range': round(max_val - min_val, precision)
-        }
-        
-        # Calculate sample variance and standard deviation
-        if include_sample:
-            sample_var = col_data.var(ddof=ddof)
-            sample_std = np.sqrt(sample_var)
-            col_results['sample_variance'] = round(sample_var, precision)
-            if include_std:
-                col_results['sample_std'] = round(sample_std, precision)
-            
-            # Use sample std for coefficient of variation by default
-            if include_cv and not np.isnan(sample_std):
-                cv = model.calculate_coefficient_of_variation(mean_val, sample_std)
-                col_results['coefficient_of_variation'] = round(cv, precision)
-        
-        # Calculate population variance and standard deviation
-        if include_population:
-            pop_var = col_data.var(ddof=0)
-            pop_std = np.sqrt(pop_var)
-            col_results['population_variance'] = round(pop_var, precision)
-            if include_std:
-                col_results['population_std'] = round(pop_std, precision)
-        
-        # Add interpretation of variance level
-        if include_sample and 'sample_variance' in col_results:
-            interpretation = model.interpret_variance_level(col_results['sample_variance'], mean_val)
-            col_results['interpretation'] = interpretation
-        elif include_population and 'population_variance' in col_results:
-            interpretation = model.interpret_variance_level(col_results['population_variance'], mean_val)
-            col_results['interpretation'] = interpretation
-        
-        # Additional statistical measures
-        col_results['median'] = round(col_data.median(), precision)
-        col_results['q25'] = round(col_data.quantile(0.25), precision)
-        col_results['q75'] = round(col_data.quantile(0.75), precision)
-        col_results['iqr'] = round(col_results['q75'] - col_results['q25'], precision)
-        
-        variance_results[column] = col_results
-    
+
+        quartiles = _sketch_quartiles(state['sketches'][column], report_error)
+        variance_results[column] = _column_results(
+            {
+                'count': moments['count'],
+                'mean': moments['mean'],
+                'min': moments['min'],
+                'max': moments['max'],
+                'sample_variance': variance(moments, ddof),
+                'population_variance': variance(moments, 0),
+                **quartiles,
+            },
+            model,
+            config,
+        )
+
+    dataset_summary = {
+        'original_rows': state['total_records'],
+        'clean_rows': state['total_records'],
+        'original_columns': len(state['columns']),
+        'numerical_columns': len(columns),
+    }
+    return _build_results(variance_results, dataset_summary, model, config)
+
+
+def _sketch_k(config: Any) -> int | None:
+    """Return the sketch accuracy if quartiles are estimated, else None."""
+    parameters = getattr(config, 'PARAMETERS', {})
+    if parameters.get('quantile_method', 'exact') != 'sketch':
+        return None
+    return parameters.get('sketch_k', 200)
+
+
+def _state_sketch_k(config: Any) -> int:
+    """Return the accuracy of the sketches kept by chunked states."""
+    return getattr(config, 'PARAMETERS', {}).get('sketch_k', 200)
+
+
+def _sketch_quartiles(
+    sketch: dict[str, Any], report_error: bool = True
+) -> dict[str, Any]:
+    """
+    Estimate the median and quartiles of a column from its sketch.
+
+    The rank error is reported if asked for, or else once the estimates
+    are no longer exact.
+    """
+    median, q25, q75 = sketch_quantiles(sketch, [0.5, 0.25, 0.75])
+    quartiles = {'median': median, 'q25': q25, 'q75': q75}
+    error = rank_error(sketch)
+    if report_error or error:
+        quartiles['quantile_rank_error'] = error
+    return quartiles
+
+
+def _insufficient_data(count: int) -> dict[str, Any]:
+    """Return the results of a column with less than 2 data points."""
+    return {
+        'sample_variance': None,
+        'population_variance': None,
+        'sample_std': None,
+        'population_std': None,
+        'coefficient_of_variation': None,
+        'count': count,
+        'mean': None,
+        'interpretation': 'insufficient data',
+        'error': 'Insufficient data points for variance calculation (need at least 2)',
+    }
+
+
+def _column_results(stats: dict[str, Any], model: Any, config: Any) -> dict[str, Any]:
+    """
+    Derive the reported measures of one column from its basic statistics.
+
+    Args:
+        stats: Count, mean, min, max, sample and population variance,
+            median and quartiles of the column's values
+        model: Loaded model module
+        config: Loaded config module
+
+    Returns:
+        Dictionary of the column's results
+    """
+    precision = getattr(config, 'PARAMETERS', {}).get('precision', 4)
+    include_sample = getattr(config, 'PARAMETERS', {}).get(
+        'include_sample_variance', True
+    )
+    include_population = getattr(config, 'PARAMETERS', {}).get(
+        'include_population_variance', True
+    )
+    include_std = getattr(config, 'PARAMETERS', {}).get(
+        'include_standard_deviation', True
+    )
+    include_cv = getattr(config, 'PARAMETERS', {}).get(
+        'include_coefficient_variation', True
+    )
+
+    # Calculate basic statistics
+    mean_val = stats['mean']
+    min_val = stats['min']
+    max_val = stats['max']
+    count = stats['count']
+
+    # Initialize column results
+    col_results = {
+        'count': count,
+        'mean': round(mean_val, precision),
+        'min': round(min_val, precision),
+        'max': round(max_val, precision),
+        'range': round(max_val - min_val, precision),
+    }
+
+    # Calculate sample variance and standard deviation
+    if include_sample:
+        sample_var = stats['sample_variance']
+        sample_std = np.sqrt(sample_var)
+        col_results['sample_variance'] = round(sample_var, precision)
+        if include_std:
+            col_results['sample_std'] = round(sample_std, precision)
+
+        # Use sample std for coefficient of variation by default
+        if include_cv and not np.isnan(sample_std):
+            cv = model.calculate_coefficient_of_variation(mean_val, sample_std)
+            col_results['coefficient_of_variation'] = round(cv, precision)
+
+    # Calculate population variance and standard deviation
+    if include_population:
+        pop_var = stats['population_variance']
+        pop_std = np.sqrt(pop_var)
+        col_results['population_variance'] = round(pop_var, precision)
+        if include_std:
+            col_results['population_std'] = round(pop_std, precision)
+
+    # Add interpretation of variance level
+    if include_sample and 'sample_variance' in col_results:
+        interpretation = model.interpret_variance_level(
+            col_results['sample_variance'], mean_val
+        )
+        col_results['interpretation'] = interpretation
+    elif include_population and 'population_variance' in col_results:
+        interpretation = model.interpret_variance_level(
+            col_results['population_variance'], mean_val
+        )
+        col_results['interpretation'] = interpretation
+
+    # Additional statistical measures
+    col_results['median'] = round(stats['median'], precision)
+    col_results['q25'] = round(stats['q25'], precision)
+    col_results['q75'] = round(stats['q75'], precision)
+    col_results['iqr'] = round(col_results['q75'] - col_results['q25'], precision)
+    if 'quantile_rank_error' in stats:
+        col_results['quantile_rank_error'] = stats['quantile_rank_error']
+
+    return col_results
+
+
+def _build_results(
+    variance_results: dict[str, Any],
+    dataset_summary: dict[str, int],
+    model: Any,
+    config: Any,
+) -> dict[str, Any]:
+    """Compile, validate and format the final results."""
+    precision = getattr(config, 'PARAMETERS', {}).get('precision', 4)
+    include_sample = getattr(config, 'PARAMETERS', {}).get(
+        'include_sample_variance', True
+    )
+    include_population = getattr(config, 'PARAMETERS', {}).get(
+        'include_population_variance', True
+    )
+    include_std = getattr(config, 'PARAMETERS', {}).get(
+        'include_standard_deviation', True
+    )
+    include_cv = getattr(config, 'PARAMETERS', {}).get(
+        'include_coefficient_variation', True
+    )
+    ddof = getattr(config, 'PARAMETERS', {}).get('ddof', 1)
+    columns_to_analyze = getattr(config, 'PARAMETERS', {}).get(
+        'columns_to_analyze', None
+    )
+
     # Calculate overall dataset statistics
-    total_variance_cols = len([col for col, stats in variance_results.items() 
-                              if stats.get('sample_variance') is not None])
-    
+    total_variance_cols = len(
+        [
+            col
+            for col, stats in variance_results.items()
+            if stats.get('sample_variance') is not None
+        ]
+    )
+
     # Compile final results
     results = {
         'module': 'variance_copilot',
@@ -129,12 +445,7 @@ def analyze(dataset: pd.DataFrame, model: Any, config: Any) -> Dict[str, Any]:
         'total_columns': len(variance_results),
         'valid_variance_columns': total_variance_cols,
         'variance_results': variance_results,
-        'dataset_summary': {
-            'original_rows': len(dataset),
-            'clean_rows': len(clean_data),
-            'original_columns': len(dataset.columns),
-            'numerical_columns': len(clean_data.columns)
-        },
+        'dataset_summary': dataset_summary,
         'parameters_used': {
             'precision': precision,
             'include_sample_variance': include_sample,
@@ -142,14 +453,14 @@ def analyze(dataset: pd.DataFrame, model: Any, config: Any) -> Dict[str, Any]:
             'include_standard_deviation': include_std,
             'include_coefficient_variation': include_cv,
             'ddof': ddof,
-            'columns_filter': columns_to_analyze
-        }
+            'columns_filter': columns_to_analyze,
+        },
     }
-    
+
     # Validate and format output
     if not model.validate_output(results):
         raise ValueError("Generated results failed validation")
-    
+
     results = model.format_output(results)
-    
-    return results
\ No newline at end of file
+
+    return results
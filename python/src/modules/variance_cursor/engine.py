@@ -2,77 +2,223 @@
 Main execution logic for variance analysis.
 """
 
-import pandas as pd
+from typing import Any
+
 import numpy as np
-from typing import Any, Dict
+import pandas as pd
 
+from src.core.moments import column_moments, merge_column_moments, variance
 
-def analyze(dataset: pd.DataFrame, model: Any, config: Any) -> Dict[str, Any]:
+
+def analyze(
+    dataset: pd.DataFrame,
+    model: Any,
+    config: Any,
+    prepared: Any = None,
+    stats: Any = None,
+) -> dict[str, Any]:
     """
     Perform variance analysis on the dataset.
-    
+
     Args:
         dataset: Input pandas DataFrame
         model: Loaded model module
         config: Loaded config module
-        
+        prepared: Shared preparation of the dataset, if the runner provides one
+        stats: Shared column statistics of the dataset, if the runner provides them
+
     Returns:
         Dictionary containing variance analysis results
     """
     # Validate input
     if not model.validate_input(dataset):
-        raise ValueError("Invalid input data: Dataset must contain numerical data with at least 2 rows")
-    
+        raise ValueError(
+            "Invalid input data: "
+            "Dataset must contain numerical data with at least 2 rows"
+        )
+
     # Prepare data
-    clean_data = model.prepare_data(dataset)
-    
-    # Get configuration parameters
-    precision = getattr(config, 'PARAMETERS', {}).get('precision', 4)
-    include_sample = getattr(config, 'PARAMETERS', {}).get('include_sample_variance', True)
-    include_population = getattr(config, 'PARAMETERS', {}).get('include_population_variance', True)
+    clean_data = model.prepare_data(dataset, prepared)
+
+    # Moments of all columns at once, shared with the other variance
+    # modules when the runner provides column statistics
+    if stats is not None:
+        moments = stats.moments(clean_data.columns)
+    else:
+        moments = column_moments(clean_data)
+
+    return finalize({'total_records': len(dataset), 'moments': moments}, model, config)
+
+
+def init_state(config: Any) -> dict[str, Any]:
+    """
+    Start variance analysis over a dataset given in chunks.
+
+    Args:
+        config: Loaded config module
+
+    Returns:
+        Empty analysis state
+    """
+    return {'total_records': 0, 'moments': {}}
+
+
+def analyze_chunk(
+    state: dict[str, Any],
+    chunk: pd.DataFrame,
+    model: Any,
+    config: Any,
+    prepared: Any = None,
+) -> dict[str, Any]:
+    """
+    Add the mergeable moments of one chunk's numerical columns to the state.
+
+    Args:
+        state: State returned by init_state, analyze_chunk or merge
+        chunk: Next chunk of the dataset
+        model: Loaded model module
+        config: Loaded config module
+        prepared: Shared preparation of the chunk, if the runner provides one
+
+    Returns:
+        Updated analysis state
+    """
+    clean_data = model.prepare_data(chunk, prepared)
+
+    state['total_records'] += len(chunk)
+    state['moments'] = merge_column_moments(
+        state['moments'], column_moments(clean_data)
+    )
+
+    return state
+
+
+def merge(state_a: dict[str, Any], state_b: dict[str, Any]) -> dict[str, Any]:
+    """
+    Combine the states of two disjoint parts of a dataset.
+
+    Args:
+        state_a: State of the earlier part
+        state_b: State of the later part
+
+    Returns:
+        State of both parts
+    """
+    return {
+        'total_records': state_a['total_records'] + state_b['total_records'],
+        'moments': merge_column_moments(state_a['moments'], state_b['moments']),
+    }
+
+
+def finalize(state: dict[str, Any], model: Any, config: Any) -> dict[str, Any]:
+    """
+    Turn an analysis state into the results analyze would have returned.
+
+    Args:
+        state: State covering the whole dataset
+        model: Loaded model module
+        config: Loaded config module
+
+    Returns:
+        Dictionary containing variance analysis results
+    """
+    # The row and column checks of model.validate_input, for the whole dataset
+    if state['total_records'] < 2 or not state['moments']:
+        raise ValueError(
+            "Invalid input data: "
+            "Dataset must contain numerical data with at least 2 rows"
+        )
+
     ddof = getattr(config, 'PARAMETERS', {}).get('ddof', 1)
-    
-    # Perform variance analysis for each numerical column
+
     variance_results = {}
-    
-    for column in clean_data.columns:
-        col_data = clean_data[column].dropna()  # Remove NaN values for this column
-        
-        if len(col_data) < 2:
-            # Cannot calculate meaningful variance with less than 2 data points
-            variance_results[column] = {
-                'sample_variance': None,
-                'population_variance': None,
-                'standard_deviation': None,
-                'count': len(col_data),
-                'error': 'Insufficient data points for variance calculation'
-            }
+
+    for column, moments in state['moments'].items():
+        if moments['count'] < 2:
+            variance_results[column] = _insufficient_data(moments['count'])
             continue
-        
-        # Calculate variances
-        col_results = {
-            'count': len(col_data),
-            'mean': col_data.mean()
-        }
-        
-        if include_sample:
-            sample_var = col_data.var(ddof=ddof)  # Sample variance (default ddof=1)
-            col_results['sample_variance'] = round(sample_var, precision)
-            col_results['sample_std'] = round(np.sqrt(sample_var), precision)
-        
-        if include_population:
-            pop_var = col_data.var(ddof=0)  # Population variance (ddof=0)
-            col_results['population_variance'] = round(pop_var, precision)
-            col_results['population_std'] = round(np.sqrt(pop_var), precision)
-        
-        # Additional statistics
-        col_results['min'] = round(col_data.min(), precision)
-        col_results['max'] = round(col_data.max(), precision)
-        col_results['range'] = round(col_data.max() - col_data.min(), precision)
-        col_results['mean'] = round(col_results['mean'], precision)
-        
-        variance_results[column] = col_results
-    
+
+        variance_results[column] = _column_results(
+            {
+                'count': moments['count'],
+                'mean': moments['mean'],
+                'sample_variance': variance(moments, ddof),
+                'population_variance': variance(moments, 0),
+                'min': moments['min'],
+                'max': moments['max'],
+            },
+            config,
+        )
+
+    return _build_results(variance_results, model, config)
+
+
+def _insufficient_data(count: int) -> dict[str, Any]:
+    """Return the results of a column with less than 2 data points."""
+    return {
+        'sample_variance': None,
+        'population_variance': None,
+        'standard_deviation': None,
+        'count': count,
+        'error': 'Insufficient data points for variance calculation',
+    }
+
+
+def _column_results(stats: dict[str, Any], config: Any) -> dict[str, Any]:
+    """
+    Derive the reported measures of one column from its basic statistics.
+
+    Args:
+        stats: Count, mean, sample and population variance, min and max of
+            the column's values
+        config: Loaded config module
+
+    Returns:
+        Dictionary of the column's results
+    """
+    precision = getattr(config, 'PARAMETERS', {}).get('precision', 4)
+    include_sample = getattr(config, 'PARAMETERS', {}).get(
+        'include_sample_variance', True
+    )
+    include_population = getattr(config, 'PARAMETERS', {}).get(
+        'include_population_variance', True
+    )
+
+    # Calculate variances
+    col_results = {'count': stats['count'], 'mean': stats['mean']}
+
+    if include_sample:
+        sample_var = stats['sample_variance']
+        col_results['sample_variance'] = round(sample_var, precision)
+        col_results['sample_std'] = round(np.sqrt(sample_var), precision)
+
+    if include_population:
+        pop_var = stats['population_variance']
+        col_results['population_variance'] = round(pop_var, precision)
+        col_results['population_std'] = round(np.sqrt(pop_var), precision)
+
+    # Additional statistics
+    col_results['min'] = round(stats['min'], precision)
+    col_results['max'] = round(stats['max'], precision)
+    col_results['range'] = round(stats['max'] - stats['min'], precision)
+    col_results['mean'] = round(col_results['mean'], precision)
+
+    return col_results
+
+
+def _build_results(
+    variance_results: dict[str, Any], model: Any, config: Any
+) -> dict[str, Any]:
+    """Compile, validate and format the final results."""
+    precision = getattr(config, 'PARAMETERS', {}).get('precision', 4)
+    include_sample = getattr(config, 'PARAMETERS', {}).get(
+        'include_sample_variance', True
+    )
+    include_population = getattr(config, 'PARAMETERS', {}).get(
+        'include_population_variance', True
+    )
+    ddof = getattr(config, 'PARAMETERS', {}).get('ddof', 1)
+
     # Compile final results
     results = {
         'module': 'variance_cursor',
@@ -85,16 +231,16 @@ def analyze(dataset: pd.DataFrame, model: Any, config: Any) -> Dict[str, Any]:
             'precision': precision,
             'include_sample_variance': include_sample,
             'include_population_variance': include_population,
-            'ddof': ddof
-        }
+            'ddof': ddof,
+        },
     }
-    
+
     # Validate and format output
     if hasattr(model, 'validate_output'):
         if not model.validate_output(results):
             raise ValueError("Generated results failed validation")
-    
+
     if hasattr(model, 'format_output'):
         results = model.format_output(results)
-    
+
     return results
@@ -1,5 +1,7 @@
+from typing import Any
+
 import pandas as pd
-from typing import Any, Dict
+
 
 def validate_input(data: pd.DataFrame) -> bool:
     """Validate that input data has numeric columns for variance calculation."""
@@ -10,8 +12,16 @@ def validate_input(data: pd.DataFrame) -> bool:
     numeric_columns = data.select_dtypes(include=['number']).columns
     return len(numeric_columns) > 0
 
-def prepare_data(data: pd.DataFrame) -> pd.DataFrame:
-    """Clean and prepare data for variance analysis."""
+
+def prepare_data(data: pd.DataFrame, prepared: Any = None) -> pd.DataFrame:
+    """Clean and prepare data for variance analysis.
+
+    If the runner shares a prepared context of the data, the schema and
+    row mask are taken from it.
+    """
+    if prepared is not None:
+        return prepared.frame(prepared.numeric_columns, rows='nonempty')
+
     # Select only numeric columns
     numeric_data = data.select_dtypes(include=['number'])
 
@@ -20,19 +30,23 @@ def prepare_data(data: pd.DataFrame) -> pd.DataFrame:
 
     return clean_data
 
-def validate_output(result: Dict[str, Any]) -> bool:
+
+def validate_output(result: dict[str, Any]) -> bool:
     """Validate that analysis results contain expected variance metrics."""
     required_keys = ['variance']
     return all(key in result for key in required_keys)
 
-def format_output(result: Dict[str, Any]) -> Dict[str, Any]:
+
+def format_output(result: dict[str, Any]) -> dict[str, Any]:
     """Format results for display with proper precision."""
     formatted = {}
     for key, value in result.items():
         if isinstance(value, dict):
-            formatted[key] = {k: round(v, 3) if isinstance(v, float) else v for k, v in value.items()}
+            formatted[key] = {
+                k: round(v, 3) if isinstance(v, float) else v for k, v in value.items()
+            }
         elif isinstance(value, float):
             formatted[key] = round(value, 3)
         else:
             formatted[key] = value
-    return formatted
\ No newline at end of file
+    return formatted
@@ -0,0 +1,199 @@
+"""Long-running analysis server with warm modules.
+
+The server keeps the module registry and the loaded module files in
+memory and answers analysis requests over a local Unix socket, so that
+each request skips interpreter start-up, imports and module discovery.
+
+Protocol: the client sends one JSON object on a single line and receives
+one JSON line back. A request looks like::
+
+    {"dataset": "/path/to/data.json", "modules": ["basic_stats"]}
+
+``modules`` is optional and defaults to all registered modules. The
+response has the same structure as ``output.json``, or ``{"error": ...}``
+if the request itself could not be served.
+"""
+
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from src.core.data_loader import DataLoader
+from src.core.dataset_cache import DatasetCache
+from src.core.module_registry import ModuleRegistry
+from src.core.module_runner import ModuleRunner
+from src.core.serialization import NumpyJSONEncoder
+from src.main import build_output
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisRequestHandler(socketserver.StreamRequestHandler):
+    """Serves a single analysis request on one connection."""
+
+    server: "AnalysisServer"
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            response = self.server.analyze(json.loads(line))
+        except Exception as e:
+            logger.error(f"Request failed: {e}")
+            response = {"error": str(e)}
+
+        payload = json.dumps(response, ensure_ascii=False, cls=NumpyJSONEncoder)
+        self.wfile.write(payload.encode("utf-8") + b"\n")
+
+
+class AnalysisServer(socketserver.UnixStreamServer):
+    """Unix socket server answering analysis requests with warm modules.
+
+    Connections are handed to a bounded thread pool; requests beyond
+    ``max_workers`` wait in the pool's queue.
+    """
+
+    def __init__(
+        self,
+        socket_path: Path,
+        modules_dir: Path,
+        data_dir: Path,
+        max_workers: int | None = None,
+        dataset_cache_bytes: int = 1 << 30,
+    ):
+        """Initialize the server and warm up the modules.
+
+        Args:
+            socket_path: Path of the Unix socket to listen on
+            modules_dir: Path to the directory containing modules
+            data_dir: Path to the data directory
+            max_workers: Maximum number of requests served concurrently.
+                Defaults to the number of available CPUs.
+            dataset_cache_bytes: Memory budget for parsed datasets kept
+                between requests
+        """
+        self.socket_path = socket_path
+        self.data_loader = DataLoader(data_dir, cache=DatasetCache(dataset_cache_bytes))
+        self.module_registry = ModuleRegistry(modules_dir)
+        self.module_runner = ModuleRunner()
+        self.modules = self.module_registry.discover_modules()
+        self.module_runner.preload_modules(self.modules)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers or os.cpu_count())
+
+        # Remove a stale socket left behind by a previous server
+        if socket_path.exists():
+            socket_path.unlink()
+        super().__init__(str(socket_path), AnalysisRequestHandler)
+
+    def process_request(self, request: socket.socket, client_address: Any) -> None:
+        """Serve the connection on the bounded worker pool."""
+        self.executor.submit(self._process_request, request, client_address)
+
+    def _process_request(self, request: socket.socket, client_address: Any) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def analyze(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Run the requested modules on the requested dataset.
+
+        Args:
+            request: Decoded request with "dataset" and optional "modules"
+
+        Returns:
+            Output document in the same structure as ``output.json``
+
+        Raises:
+            ValueError: If the request is malformed or names unknown modules
+        """
+        if "dataset" not in request:
+            raise ValueError("Request is missing the 'dataset' path")
+
+        module_names = request.get("modules") or list(self.modules)
+        unknown = [name for name in module_names if name not in self.modules]
+        if unknown:
+            raise ValueError(f"Unknown modules requested: {unknown}")
+        modules = {name: self.modules[name] for name in module_names}
+
+        dataset = self.data_loader.load_file(Path(request["dataset"]))
+        logger.info(f"Analyzing {request['dataset']} with {len(modules)} modules")
+        results, report = self.module_runner.run_modules(modules, dataset)
+        logger.debug(f"Dataset cache: {self.data_loader.cache.stats}")
+        dataset_info = {
+            "total_records": len(dataset),
+            "cached_modules": sorted(report.cache_hits),
+        }
+        if report.preparation_savings:
+            dataset_info["shared_preparation"] = report.preparation_savings
+        return build_output(results, dataset_info)
+
+    def server_close(self) -> None:
+        """Stop the worker pool and remove the socket file."""
+        super().server_close()
+        self.executor.shutdown(wait=True)
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+
+
+def serve(
+    socket_path: Path,
+    modules_dir: Path,
+    data_dir: Path,
+    max_workers: int | None = None,
+    dataset_cache_bytes: int = 1 << 30,
+) -> None:
+    """Run the analysis server until interrupted or terminated.
+
+    Args:
+        socket_path: Path of the Unix socket to listen on
+        modules_dir: Path to the directory containing modules
+        data_dir: Path to the data directory
+        max_workers: Maximum number of requests served concurrently
+        dataset_cache_bytes: Memory budget for parsed datasets
+    """
+    server = AnalysisServer(
+        socket_path, modules_dir, data_dir, max_workers, dataset_cache_bytes
+    )
+
+    def _terminate(signum: int, frame: Any) -> None:
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, _terminate)
+    logger.info(f"Analysis server listening on {socket_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Analysis server shutting down")
+    finally:
+        server.server_close()
+
+
+def request_analysis(
+    socket_path: Path, dataset: Path, modules: list[str] | None = None
+) -> dict[str, Any]:
+    """Send an analysis request to a running server.
+
+    Args:
+        socket_path: Path of the server's Unix socket
+        dataset: Path to the dataset to analyze
+        modules: Names of the modules to run, or None for all modules
+
+    Returns:
+        The server's response document
+    """
+    request = {"dataset": str(dataset), "modules": modules}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(str(socket_path))
+        client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with client.makefile("rb") as response:
+            return json.loads(response.readline())
@@ -0,0 +1,514 @@
+"""Sharded analysis: workers summarize their row shards, a coordinator merges.
+
+Each worker owns one shard of the dataset, a JSON array of records on its
+own machine, and answers requests over a TCP or Unix socket. The
+exchange takes two phases. First each worker reads its shard in chunks,
+folds them into the chunked states of the requested modules (see
+``MODULE_SPEC.md``) and returns those states: moments, co-moment
+matrices and quantile sketches, whose size does not depend on the number
+of records. Chunked states estimate quantiles with sketches whatever
+``quantile_method`` a module is configured with, so no column values are
+sent. The coordinator merges the states of all shards in shard order.
+Modules with a second pass, such as ``outlier_detection``, then derive
+their bounds from the merged state; the coordinator sends them to every
+worker, and each worker returns only the candidate rows of its shard
+outside those bounds. The coordinator merges these and finalizes
+everything into the usual output document.
+
+Protocol: one JSON line per connection in each direction, as for
+``src.server``. Requests look like::
+
+    {"op": "describe"}
+    {"op": "analyze", "modules": ["basic_stats"], "first_record": 1000}
+    {"op": "scan", "scans": {"outlier_detection": ...}, "first_record": 1000}
+
+"describe" returns the shard's record count and module fingerprints.
+"analyze" returns ``{"records": ..., "states": ..., "errors": ...}`` and
+"scan" returns ``{"scans": ..., "errors": ...}``, with states and scans
+encoded by ``src.core.serialization.encode_state``, so no pickles cross
+the network. ``first_record`` is the position of the shard's first
+record in the whole dataset; row labels such as outlier indices are
+therefore the same as for the concatenated shards.
+"""
+
+import json
+import logging
+import signal
+import socket
+import socketserver
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from src.core.data_loader import DataLoader
+from src.core.incremental import compute_module_fingerprints, fingerprints_match
+from src.core.module_registry import ModuleInfo, ModuleRegistry
+from src.core.module_runner import ModuleRunner
+from src.core.serialization import NumpyJSONEncoder, decode_state, encode_state
+
+logger = logging.getLogger(__name__)
+
+Address = str | tuple[str, int]
+
+
+def parse_address(text: str) -> Address:
+    """Parse a worker address given on the command line.
+
+    Args:
+        text: ``HOST:PORT`` for TCP, or a socket path (containing ``/`` or
+            prefixed with ``unix:``) for a Unix socket
+
+    Returns:
+        A (host, port) tuple or a Unix socket path
+    """
+    if text.startswith("unix:"):
+        return text[len("unix:") :]
+    if "/" in text:
+        return text
+    host, _, port = text.rpartition(":")
+    if not host or not port.isdigit():
+        raise ValueError(f"Invalid worker address {text!r}, expected HOST:PORT")
+    return host, int(port)
+
+
+def format_address(address: Address) -> str:
+    """Return the command-line form of an address."""
+    if isinstance(address, tuple):
+        return f"{address[0]}:{address[1]}"
+    return address
+
+
+def send_request(address: Address, request: dict[str, Any]) -> dict[str, Any]:
+    """Send one request to a shard worker and return its response.
+
+    Args:
+        address: Worker address
+        request: Request document
+
+    Returns:
+        Decoded response
+
+    Raises:
+        ConnectionError: If the worker closes the connection without
+            answering
+        RuntimeError: If the worker reports that the request failed
+    """
+    if isinstance(address, tuple):
+        client = socket.create_connection(address)
+    else:
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.connect(address)
+    with client:
+        client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with client.makefile("rb") as response:
+            line = response.readline()
+    if not line:
+        raise ConnectionError(f"Worker {format_address(address)} sent no response")
+    response = json.loads(line)
+    if "error" in response:
+        raise RuntimeError(f"Worker {format_address(address)}: {response['error']}")
+    return response
+
+
+class ShardRequestHandler(socketserver.StreamRequestHandler):
+    """Serves a single request of the coordinator on one connection."""
+
+    server: "ShardWorker"
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            response = self.server.handle_request_document(json.loads(line))
+        except Exception as e:
+            logger.error(f"Request failed: {e}")
+            response = {"error": str(e)}
+
+        payload = json.dumps(response, ensure_ascii=False, cls=NumpyJSONEncoder)
+        self.wfile.write(payload.encode("utf-8") + b"\n")
+
+
+class ShardWorker(socketserver.TCPServer):
+    """Socket server that analyzes one local shard of a dataset.
+
+    Requests are served one at a time; each one reads the shard in
+    chunks, so memory use is bounded by the chunk size and the module
+    states rather than by the size of the shard.
+    """
+
+    allow_reuse_address = True
+
+    def __init__(
+        self,
+        address: Address,
+        shard_path: Path,
+        modules_dir: Path,
+        chunk_bytes: int = 64 * 1024 * 1024,
+    ):
+        """Initialize the worker and warm up the modules.
+
+        Args:
+            address: (host, port) or Unix socket path to listen on
+            shard_path: JSON array of records forming this worker's shard
+            modules_dir: Path to the directory containing modules
+            chunk_bytes: Approximate size of the JSON text read per chunk
+        """
+        self.shard_path = shard_path
+        self.chunk_bytes = chunk_bytes
+        self.data_loader = DataLoader(shard_path.parent)
+        self.module_runner = ModuleRunner()
+        self.modules = ModuleRegistry(modules_dir).discover_modules()
+        self.module_runner.preload_modules(self.modules)
+        self._record_count: tuple[tuple[int, int], int] | None = None
+
+        if isinstance(address, tuple):
+            if ":" in address[0]:
+                self.address_family = socket.AF_INET6
+        else:
+            self.address_family = socket.AF_UNIX
+            # Remove a stale socket left behind by a previous worker
+            Path(address).unlink(missing_ok=True)
+        super().__init__(address, ShardRequestHandler)
+
+    def handle_request_document(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Answer a decoded request.
+
+        Args:
+            request: Request document with an "op" key
+
+        Returns:
+            Response document
+
+        Raises:
+            ValueError: If the request is malformed
+        """
+        op = request.get("op")
+        if op == "describe":
+            return self.describe()
+        if op == "analyze":
+            return self.analyze(
+                request.get("modules") or list(self.modules),
+                int(request.get("first_record", 0)),
+            )
+        if op == "scan":
+            return self.scan(
+                request.get("scans") or {}, int(request.get("first_record", 0))
+            )
+        raise ValueError(f"Unknown request op {op!r}")
+
+    def describe(self) -> dict[str, Any]:
+        """Report the shard's record count and the module fingerprints."""
+        return {
+            "records": self.count_records(),
+            "fingerprints": compute_module_fingerprints(self.modules),
+        }
+
+    def count_records(self) -> int:
+        """Count the shard's records, reading it at most once per version."""
+        stat = self.shard_path.stat()
+        version = (stat.st_size, stat.st_mtime_ns)
+        if self._record_count is None or self._record_count[0] != version:
+            chunks = self.data_loader.iter_chunks(self.shard_path, self.chunk_bytes)
+            self._record_count = (version, sum(len(chunk) for chunk in chunks))
+        return self._record_count[1]
+
+    def analyze(self, module_names: list[str], first_record: int) -> dict[str, Any]:
+        """Fold the shard into the states of the requested modules.
+
+        Args:
+            module_names: Names of the modules to run
+            first_record: Position of the shard's first record in the whole
+                dataset
+
+        Returns:
+            Response with the record count, the encoded states of the
+            modules that succeeded and the errors of those that failed
+
+        Raises:
+            ValueError: If unknown modules are requested
+        """
+        modules = self._requested_modules(module_names)
+
+        logger.info(f"Analyzing {self.shard_path} with {len(modules)} modules")
+        records = [0]
+        chunks = self.data_loader.iter_chunks(self.shard_path, self.chunk_bytes)
+        states, errors = self.module_runner.fold_chunks(
+            modules, _offset_chunks(chunks, first_record, records)
+        )
+        encoded = _encode_all(states, errors, "State")
+        return {"records": records[0], "states": encoded, "errors": errors}
+
+    def scan(self, scans: dict[str, Any], first_record: int) -> dict[str, Any]:
+        """Run the second pass of modules over the shard.
+
+        Args:
+            scans: Encoded scans of the modules, as returned by their
+                ``init_scan`` on the merged state of all shards
+            first_record: Position of the shard's first record in the whole
+                dataset
+
+        Returns:
+            Response with the encoded scans of the modules that succeeded,
+            holding only the shard's candidate rows, and the errors of
+            those that failed
+
+        Raises:
+            ValueError: If unknown modules are requested
+        """
+        modules = self._requested_modules(list(scans))
+
+        logger.info(f"Scanning {self.shard_path} for {len(modules)} modules")
+        chunks = self.data_loader.iter_chunks(self.shard_path, self.chunk_bytes)
+        scanned, errors = self.module_runner.scan_chunks(
+            modules,
+            {name: decode_state(scan) for name, scan in scans.items()},
+            _offset_chunks(chunks, first_record, [0]),
+        )
+        return {"scans": _encode_all(scanned, errors, "Scan"), "errors": errors}
+
+    def _requested_modules(self, module_names: list[str]) -> dict[str, ModuleInfo]:
+        """Look up requested modules, rejecting unknown ones."""
+        unknown = [name for name in module_names if name not in self.modules]
+        if unknown:
+            raise ValueError(f"Unknown modules requested: {unknown}")
+        return {name: self.modules[name] for name in module_names}
+
+    def server_close(self) -> None:
+        """Close the socket and remove the socket file."""
+        super().server_close()
+        if self.address_family == socket.AF_UNIX:
+            Path(self.server_address).unlink(missing_ok=True)
+
+
+def _offset_chunks(
+    chunks: Iterable[Any], first_record: int, records: list[int]
+) -> Iterator[Any]:
+    """Relabel chunks by their position in the whole dataset and count rows."""
+    for chunk in chunks:
+        if first_record:
+            chunk = chunk.copy(deep=False)
+            chunk.index = chunk.index + first_record
+        records[0] += len(chunk)
+        yield chunk
+
+
+def _encode_all(
+    values: dict[str, Any], errors: dict[str, str], kind: str
+) -> dict[str, Any]:
+    """Encode the states or scans of modules, moving failures to ``errors``."""
+    encoded = {}
+    for module_name, value in values.items():
+        try:
+            encoded[module_name] = encode_state(value)
+        except TypeError as e:
+            errors[module_name] = f"{kind} cannot be sent to the coordinator: {e}"
+    return encoded
+
+
+def serve_shard(
+    address: Address,
+    shard_path: Path,
+    modules_dir: Path,
+    chunk_bytes: int = 64 * 1024 * 1024,
+) -> None:
+    """Run a shard worker until interrupted or terminated.
+
+    Args:
+        address: (host, port) or Unix socket path to listen on
+        shard_path: JSON array of records forming this worker's shard
+        modules_dir: Path to the directory containing modules
+        chunk_bytes: Approximate size of the JSON text read per chunk
+    """
+    worker = ShardWorker(address, shard_path, modules_dir, chunk_bytes)
+
+    def _terminate(signum: int, frame: Any) -> None:
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, _terminate)
+    logger.info(f"Shard worker for {shard_path} listening on {format_address(address)}")
+    try:
+        worker.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shard worker shutting down")
+    finally:
+        worker.server_close()
+
+
+def run_sharded(
+    addresses: list[Address],
+    modules: dict[str, ModuleInfo],
+    module_runner: ModuleRunner | None = None,
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Analyze a dataset spread over several shard workers.
+
+    The shards, in the order of ``addresses``, form the dataset. Workers
+    are first asked for their record counts, which fix each shard's
+    position in the dataset, and then analyze their shards concurrently.
+    Modules with a second pass then have every worker scan its shard
+    against bounds computed from the merged states. Modules whose code,
+    core dependencies or parameters differ between the coordinator and a
+    worker, or that either cannot fingerprint, and modules without
+    chunked support, fail with an error.
+
+    Args:
+        addresses: Worker addresses in shard order
+        modules: Mapping of module names to ModuleInfo objects
+        module_runner: Runner used to merge and finalize the states
+
+    Returns:
+        Module results, and dataset information for ``build_output``
+    """
+    module_runner = module_runner or ModuleRunner()
+    fingerprints = compute_module_fingerprints(modules)
+
+    states: dict[str, Any] = {}
+    errors: dict[str, str] = {}
+    with ThreadPoolExecutor(max_workers=len(addresses)) as executor:
+        descriptions = list(
+            executor.map(lambda a: send_request(a, {"op": "describe"}), addresses)
+        )
+        first_records = [0]
+        for description in descriptions:
+            first_records.append(first_records[-1] + description["records"])
+        total_records = first_records.pop()
+        logger.info(f"Analyzing {total_records} records on {len(addresses)} shards")
+
+        def analyze(address: Address, first_record: int) -> dict[str, Any]:
+            request = {
+                "op": "analyze",
+                "modules": list(modules),
+                "first_record": first_record,
+            }
+            return send_request(address, request)
+
+        responses = list(executor.map(analyze, addresses, first_records))
+
+        for module_name, module_info in modules.items():
+            try:
+                states[module_name] = _merge_shards(
+                    module_runner,
+                    module_info,
+                    fingerprints.get(module_name),
+                    addresses,
+                    descriptions,
+                    responses,
+                )
+            except Exception as e:
+                logger.error(f"Module {module_name} failed: {e}")
+                errors[module_name] = str(e)
+
+        scans, scan_errors = _scan_shards(
+            executor, module_runner, modules, states, addresses, first_records
+        )
+        errors.update(scan_errors)
+
+    results: dict[str, Any] = {}
+    for module_name, module_info in modules.items():
+        if module_name in errors:
+            results[module_name] = {"error": errors[module_name]}
+            continue
+        try:
+            results[module_name] = module_runner.finalize_state(
+                module_info, states[module_name], scans.get(module_name)
+            )
+        except Exception as e:
+            results[module_name] = {"error": str(e)}
+
+    dataset_info = {
+        "total_records": sum(response["records"] for response in responses),
+        "shards": [
+            {"worker": format_address(address), "records": response["records"]}
+            for address, response in zip(addresses, responses, strict=True)
+        ],
+    }
+    return results, dataset_info
+
+
+def _merge_shards(
+    module_runner: ModuleRunner,
+    module_info: ModuleInfo,
+    fingerprint: dict[str, str] | None,
+    addresses: list[Address],
+    descriptions: list[dict[str, Any]],
+    responses: list[dict[str, Any]],
+) -> Any:
+    """Merge one module's shard states in shard order."""
+    module_name = module_info.name
+    state = None
+    for address, description, response in zip(
+        addresses, descriptions, responses, strict=True
+    ):
+        worker = format_address(address)
+        if not fingerprints_match(
+            description["fingerprints"].get(module_name), fingerprint
+        ):
+            raise ValueError(f"Worker {worker} runs a different version of the module")
+        if module_name in response["errors"]:
+            raise ValueError(f"Worker {worker}: {response['errors'][module_name]}")
+        shard_state = decode_state(response["states"][module_name])
+        if state is None:
+            state = shard_state
+        else:
+            state = module_runner.merge_states(module_info, state, shard_state)
+    return state
+
+
+def _scan_shards(
+    executor: ThreadPoolExecutor,
+    module_runner: ModuleRunner,
+    modules: dict[str, ModuleInfo],
+    states: dict[str, Any],
+    addresses: list[Address],
+    first_records: list[int],
+) -> tuple[dict[str, Any], dict[str, str]]:
+    """Run the second pass of the modules that need one on every shard.
+
+    Returns:
+        Scans of the whole dataset, merged in shard order, and error
+        messages of the modules whose second pass failed
+    """
+    scans: dict[str, Any] = {}
+    errors: dict[str, str] = {}
+    for module_name, state in states.items():
+        try:
+            if module_runner.needs_scan(modules[module_name]):
+                scan = module_runner.init_scan(modules[module_name], state)
+                scans[module_name] = encode_state(scan)
+        except Exception as e:
+            logger.error(f"Module {module_name} failed: {e}")
+            errors[module_name] = str(e)
+    if not scans:
+        return {}, errors
+
+    logger.info(f"Scanning {len(addresses)} shards for {len(scans)} modules")
+
+    def scan(address: Address, first_record: int) -> dict[str, Any]:
+        request = {"op": "scan", "scans": scans, "first_record": first_record}
+        return send_request(address, request)
+
+    responses = list(executor.map(scan, addresses, first_records))
+
+    merged: dict[str, Any] = {}
+    for module_name in scans:
+        try:
+            for address, response in zip(addresses, responses, strict=True):
+                if module_name in response["errors"]:
+                    raise ValueError(
+                        f"Worker {format_address(address)}: "
+                        f"{response['errors'][module_name]}"
+                    )
+                shard_scan = decode_state(response["scans"][module_name])
+                merged[module_name] = (
+                    module_runner.merge_scans(
+                        modules[module_name], merged[module_name], shard_scan
+                    )
+                    if module_name in merged
+                    else shard_scan
+                )
+        except Exception as e:
+            logger.error(f"Module {module_name} failed: {e}")
+            errors[module_name] = str(e)
+            merged.pop(module_name, None)
+    return merged, errors
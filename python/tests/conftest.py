@@ -0,0 +1,75 @@
+"""Fixtures shared by the tests."""
+
+from pathlib import Path
+
+import pytest
+
+from src.core import fingerprint
+from src.core.module_registry import ModuleInfo
+
+# A module with the chunked contract that counts records; its core import
+# is only ever parsed, as the kernel exists in the core_dir fixture alone
+COUNTING_ENGINE = """
+def analyze(dataset, model, config):
+    return {"records": len(dataset)}
+
+
+def init_state(config):
+    return {"records": 0}
+
+
+def analyze_chunk(state, chunk, model, config):
+    return {"records": state["records"] + len(chunk)}
+
+
+def merge(state_a, state_b):
+    return {"records": state_a["records"] + state_b["records"]}
+
+
+def finalize(state, model, config):
+    return dict(state)
+
+
+def _kernel():
+    from src.core.kernel import helper
+
+    return helper
+"""
+
+
+@pytest.fixture
+def make_module():
+    """Return a function writing a module's files into a directory."""
+    return write_module
+
+
+def write_module(module_dir: Path, engine: str = COUNTING_ENGINE) -> ModuleInfo:
+    module_dir.mkdir(parents=True)
+    (module_dir / "config.py").write_text(
+        'DESCRIPTION = "Test module"\nVERSION = "1.0.0"\nPARAMETERS = {}\n'
+    )
+    (module_dir / "model.py").write_text("")
+    (module_dir / "engine.py").write_text(engine)
+    return ModuleInfo(
+        name=module_dir.name,
+        path=module_dir,
+        engine_path=module_dir / "engine.py",
+        model_path=module_dir / "model.py",
+        config_path=module_dir / "config.py",
+    )
+
+
+@pytest.fixture
+def core_dir(tmp_path, monkeypatch):
+    """A stand-in src/core directory that the fingerprints read."""
+    core = tmp_path / "core"
+    core.mkdir()
+    (core / "kernel.py").write_text(
+        "def helper():\n    from src.core.nested import value\n    return value\n"
+    )
+    (core / "nested.py").write_text("value = 1\n")
+    (core / "prepared.py").write_text("")
+    (core / "column_stats.py").write_text("")
+    (core / "unrelated.py").write_text("")
+    monkeypatch.setattr(fingerprint, "CORE_DIR", core)
+    return core
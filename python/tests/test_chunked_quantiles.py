@@ -0,0 +1,115 @@
+"""Tests for the memory the chunked states of quantile statistics need."""
+
+import importlib
+import logging
+import types
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.modules.variance_copilot import config as copilot_config
+from src.modules.variance_copilot import engine, model
+
+
+def with_parameters(config, **parameters):
+    return types.SimpleNamespace(
+        DESCRIPTION=config.DESCRIPTION,
+        VERSION=config.VERSION,
+        PARAMETERS={**config.PARAMETERS, **parameters},
+    )
+
+
+def fold(config, chunks):
+    state = engine.init_state(config)
+    for chunk in chunks:
+        state = engine.analyze_chunk(state, chunk, model, config)
+    return state
+
+
+@pytest.fixture
+def dataset():
+    rng = np.random.default_rng(1)
+    values = rng.lognormal(size=20_000)
+    values[::11] = np.nan
+    return pd.DataFrame({"value": values, "score": rng.integers(0, 100, 20_000)})
+
+
+def test_sketch_state_stays_bounded_and_close_to_exact(dataset):
+    config = with_parameters(copilot_config, quantile_method="sketch", sketch_k=100)
+    chunks = [dataset.iloc[start : start + 1000] for start in range(0, 20_000, 1000)]
+
+    state = fold(config, chunks)
+    results = engine.finalize(state, model, config)["variance_results"]
+
+    assert "values" not in state
+    assert all(sum(map(len, s["levels"])) < 400 for s in state["sketches"].values())
+    for column in ["value", "score"]:
+        values = dataset[column].dropna().to_numpy()
+        error = results[column]["quantile_rank_error"]
+        for key, q in [("q25", 0.25), ("median", 0.5), ("q75", 0.75)]:
+            rank = np.searchsorted(np.sort(values), results[column][key]) / len(values)
+            assert abs(rank - q) <= error + 0.01
+
+
+def test_sketch_results_match_in_memory_while_exact(dataset):
+    config = with_parameters(copilot_config, quantile_method="sketch")
+    small = dataset.iloc[:150]
+
+    state = fold(config, [small.iloc[:70], small.iloc[70:]])
+    chunked = engine.finalize(state, model, config)
+    in_memory = engine.analyze(small, model, config)
+
+    assert chunked["variance_results"] == in_memory["variance_results"]
+
+
+@pytest.mark.parametrize("module", ["variance_copilot", "basic_stats"])
+def test_exact_method_keeps_sketches_in_chunked_states(dataset, module):
+    module_engine = importlib.import_module(f"src.modules.{module}.engine")
+    module_model = importlib.import_module(f"src.modules.{module}.model")
+    module_config = importlib.import_module(f"src.modules.{module}.config")
+    config = with_parameters(
+        module_config,
+        quantile_method="exact",
+        columns_to_analyze=["value", "score"],
+    )
+    small = dataset.iloc[:150]
+
+    state = module_engine.init_state(config)
+    for chunk in [small.iloc[:70], small.iloc[70:]]:
+        state = module_engine.analyze_chunk(state, chunk, module_model, config)
+    chunked = module_engine.finalize(state, module_model, config)
+    in_memory = module_engine.analyze(small, module_model, config)
+
+    # Bounded sketches, exact while they hold every value
+    assert "values" not in state
+    assert set(state["sketches"]) >= {"value", "score"}
+    chunked.pop("module_name", None)
+    assert chunked == in_memory
+
+    state = module_engine.init_state(config)
+    for chunk in [dataset.iloc[:10_000], dataset.iloc[10_000:]]:
+        state = module_engine.analyze_chunk(state, chunk, module_model, config)
+    results = str(module_engine.finalize(state, module_model, config))
+    assert "quantile_rank_error" in results
+
+
+@pytest.mark.parametrize(
+    ("module", "parameters", "warns"),
+    [
+        ("variance_copilot", {"quantile_method": "exact"}, False),
+        ("variance_copilot", {"quantile_method": "sketch"}, False),
+        ("basic_stats", {"quantile_method": "exact"}, False),
+        ("basic_stats", {"quantile_method": "sketch"}, False),
+        ("correlation", {"method": "spearman"}, True),
+        ("correlation", {"method": "pearson"}, False),
+        ("outlier_detection", {}, False),
+    ],
+)
+def test_unbounded_states_are_announced(caplog, module, parameters, warns):
+    module_engine = importlib.import_module(f"src.modules.{module}.engine")
+    module_config = importlib.import_module(f"src.modules.{module}.config")
+    with caplog.at_level(logging.WARNING):
+        module_engine.init_state(with_parameters(module_config, **parameters))
+
+    assert ("grows with the dataset" in caplog.text) is warns
@@ -0,0 +1,103 @@
+"""Tests for selecting the analyzed columns by name, pattern and dtype."""
+
+import fnmatch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.column_selection import (
+    required_columns,
+    resolve_columns,
+    select_columns,
+)
+from src.core.prepared import PreparedDataset
+
+
+@pytest.fixture
+def wide_frame():
+    """A few thousand columns of mixed dtypes and names."""
+    rng = np.random.default_rng(0)
+    n_rows = 3
+    columns = {}
+    for i in range(2000):
+        kind = i % 5
+        if kind == 0:
+            columns[f"feature_{i}"] = rng.normal(size=n_rows)
+        elif kind == 1:
+            columns[f"sensor_{i}"] = rng.integers(0, 9, n_rows)
+        elif kind == 2:
+            columns[f"label_{i}"] = rng.choice(["a", "b"], n_rows)
+        elif kind == 3:
+            columns[f"row_{i}_id"] = np.arange(n_rows)
+        else:
+            columns[f"flag_{i}"] = rng.random(n_rows) > 0.5
+    frame = pd.DataFrame(columns)
+    frame["Feature_upper"] = 1.0
+    frame["empty"] = np.nan
+    return frame
+
+
+def test_dtypes_select_like_pandas(wide_frame):
+    for dtypes in (["number"], ["integer"], ["float"], ["object"], ["bool"]):
+        expected = list(wide_frame.select_dtypes(include=dtypes).columns)
+        assert select_columns(wide_frame, {"dtypes": dtypes}) == expected
+    # Numbers by default
+    expected = list(wide_frame.select_dtypes(include="number").columns)
+    assert select_columns(wide_frame, {}) == expected
+
+
+@pytest.mark.parametrize("pattern", ["feature_*", "*_1?", "sensor_[13]*", "F*"])
+def test_globs_match_numeric_columns_in_dataset_order(wide_frame, pattern):
+    numeric = wide_frame.select_dtypes(include="number").columns
+    expected = [column for column in numeric if fnmatch.fnmatchcase(column, pattern)]
+
+    assert select_columns(wide_frame, [pattern]) == expected
+
+
+@pytest.mark.parametrize("regex", [r"sensor_\d+", r"feature_1\d", r"row_\d+"])
+def test_regex_matches_whole_names(wide_frame, regex):
+    numeric = wide_frame.select_dtypes(include="number")
+    expected = list(numeric.filter(regex=f"^(?:{regex})$").columns)
+
+    assert select_columns(wide_frame, {"regex": regex}) == expected
+
+
+def test_names_patterns_and_exclusions_combine(wide_frame):
+    selection = {
+        "include": ["label_2", "feature_0", "feature_1*", "missing", "feature_0"],
+        "regex": r"row_\d+_id",
+        "exclude": ["*_id", "feature_15"],
+    }
+
+    columns = select_columns(wide_frame, selection)
+
+    # Plain names keep any dtype and come first; duplicates are dropped
+    assert columns[:2] == ["label_2", "feature_0"]
+    assert columns[2:] == [
+        column
+        for column in wide_frame.select_dtypes(include="number").columns
+        if fnmatch.fnmatchcase(column, "feature_1*") and column != "feature_15"
+    ]
+    assert required_columns(selection) == [
+        "label_2",
+        "feature_0",
+        "missing",
+        "feature_0",
+    ]
+
+
+def test_selection_is_resolved_once_per_prepared_dataset(wide_frame):
+    prepared = PreparedDataset(wide_frame)
+    selection = {"include": ["sensor_*"], "exclude": ["sensor_1*"]}
+
+    first = resolve_columns(wide_frame, selection, prepared)
+    second = resolve_columns(wide_frame, dict(selection), prepared)
+
+    assert first == select_columns(wide_frame, selection)
+    assert second is first
+
+
+def test_unknown_selection_keys_are_rejected(wide_frame):
+    with pytest.raises(ValueError, match="Unknown column selection keys"):
+        select_columns(wide_frame, {"includes": ["value"]})
@@ -0,0 +1,80 @@
+"""Tests for the column statistics shared by the modules of a run."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.prepared import PreparedDataset
+
+COLUMNS = ["float", "wide_int", "small_int", "empty", "text"]
+
+
+def random_frame(rng, n_rows):
+    """Columns taking each path of the service: sorted order, counts, none."""
+    floats = rng.normal(size=n_rows)
+    floats[rng.random(n_rows) < 0.2] = np.nan
+    texts = rng.choice(["1.5", "2", "x", None], size=n_rows)
+    return pd.DataFrame(
+        {
+            "float": floats,
+            "wide_int": rng.integers(-(10**9), 10**9, n_rows),
+            "small_int": rng.integers(0, 5, n_rows),
+            "empty": np.full(n_rows, np.nan),
+            "text": texts,
+        }
+    )
+
+
+def expected_values(frame, column, among=None):
+    """The values the service describes, selected with pandas alone."""
+    numeric = frame.apply(pd.to_numeric, errors="coerce")
+    if among is None:
+        return numeric[column].dropna()
+    return numeric.dropna(subset=list(among))[column]
+
+
+def assert_same(actual, expected):
+    if pd.isna(expected):
+        assert pd.isna(actual)
+    else:
+        assert actual == pytest.approx(expected, rel=1e-12, abs=1e-12)
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("n_rows", [0, 1, 2, 301])
+@pytest.mark.parametrize("among", [None, ("float", "small_int")])
+def test_statistics_match_pandas(seed, n_rows, among):
+    frame = random_frame(np.random.default_rng(seed), n_rows)
+    service = PreparedDataset(frame).statistics
+
+    for column in among or COLUMNS:
+        values = expected_values(frame, column, among)
+        stats = service.column(column, rows="complete" if among else None, among=among)
+        assert stats.count() == len(values)
+        for name in ["mean", "median", "min", "max"]:
+            assert_same(getattr(stats, name)(), getattr(values, name)())
+        for ddof in (0, 1):
+            assert_same(stats.var(ddof), values.var(ddof=ddof))
+            assert_same(stats.std(ddof), values.std(ddof=ddof))
+        for q in (0.0, 0.1, 0.25, 0.75, 1.0):
+            assert_same(stats.quantile(q), values.quantile(q))
+        modes = values.mode()
+        assert_same(stats.mode(), modes.iloc[0] if len(modes) else np.nan)
+        pd.testing.assert_series_equal(stats.ranks(), values.rank())
+        lower, upper = values.quantile(0.1), values.quantile(0.9)
+        outside = values[(values < lower) | (values > upper)]
+        assert stats.outside(lower, upper) == outside.index.tolist()
+
+
+def test_statistics_are_computed_once_per_run():
+    frame = random_frame(np.random.default_rng(0), 100)
+    service = PreparedDataset(frame).statistics
+
+    first = service.column("float").median()
+    second = service.column("float").median()
+    moments = service.moments(["float", "small_int"])
+
+    assert first == second
+    assert service.moments(["float", "small_int"]) is moments
+    assert service.counters()["hits"] == 2
+    assert service.counters()["misses"] == 2
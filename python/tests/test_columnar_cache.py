@@ -0,0 +1,123 @@
+"""Tests for the memory-mapped binary copy of JSON datasets."""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.columnar_cache import ColumnarCache
+from src.core.data_loader import DataLoader
+from src.main import parse_args
+
+
+def write_records(path, values):
+    records = [
+        {"id": i, "value": value, "label": f"r{i % 3}"}
+        for i, value in enumerate(values)
+    ]
+    path.write_text(json.dumps(records))
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "data.json"
+    write_records(path, [1.5, 2.5, 3.5, 4.5])
+    return path
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    """Count how often the JSON itself is parsed."""
+    calls = []
+    parse_json = DataLoader._parse_json
+
+    def counting_parse_json(self, path):
+        calls.append(path)
+        return parse_json(self, path)
+
+    monkeypatch.setattr(DataLoader, "_parse_json", counting_parse_json)
+    return calls
+
+
+def is_memory_mapped(values):
+    while values is not None:
+        if isinstance(values, np.memmap):
+            return True
+        values = values.base
+    return False
+
+
+def test_second_load_reads_the_memory_mapped_copy(source, parses):
+    loader = DataLoader(source.parent)
+
+    parsed = loader.load_file(source)
+    cached = loader.load_file(source)
+
+    assert len(parses) == 1
+    pd.testing.assert_frame_equal(cached.copy(), parsed)
+    assert is_memory_mapped(cached["value"].to_numpy())
+
+
+def test_size_change_invalidates_the_copy(source, parses):
+    loader = DataLoader(source.parent)
+    loader.load_file(source)
+
+    write_records(source, [1.5, 2.5, 3.5, 4.5, 5.5])
+    dataset = loader.load_file(source)
+
+    assert len(parses) == 2
+    assert dataset["value"].tolist() == [1.5, 2.5, 3.5, 4.5, 5.5]
+    # The refreshed copy is used from then on
+    assert loader.load_file(source)["value"].tolist()[-1] == 5.5
+    assert len(parses) == 2
+
+
+def test_mtime_change_invalidates_the_copy(source, parses):
+    loader = DataLoader(source.parent)
+    loader.load_file(source)
+
+    # Same size, so only the modification time tells the files apart
+    write_records(source, [9.5, 2.5, 3.5, 4.5])
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert ColumnarCache(source).load() is None
+
+    dataset = loader.load_file(source)
+
+    assert len(parses) == 2
+    assert dataset["value"].tolist() == [9.5, 2.5, 3.5, 4.5]
+
+
+def test_chunks_of_a_stale_copy_come_from_the_json(source):
+    loader = DataLoader(source.parent)
+    loader.load_file(source)
+
+    write_records(source, [7.5, 8.5, 9.5])
+    chunks = list(loader.iter_chunks(source))
+
+    assert pd.concat(chunks)["value"].tolist() == [7.5, 8.5, 9.5]
+
+
+def test_no_columnar_cache_ignores_and_does_not_write_the_copy(source, parses):
+    cache = ColumnarCache(source)
+    uncached = DataLoader(source.parent, use_columnar_cache=False)
+
+    uncached.load_file(source)
+    assert not cache.cache_dir.exists()
+
+    # A current copy that disagrees with the JSON shows which one is read
+    DataLoader(source.parent).load_file(source)
+    schema = json.loads((cache.cache_dir / "schema.json").read_text())
+    value_file = next(s["file"] for s in schema["columns"] if s["name"] == "value")
+    np.save(cache.cache_dir / value_file, np.zeros(4))
+
+    assert DataLoader(source.parent).load_file(source)["value"].sum() == 0
+    assert uncached.load_file(source)["value"].tolist() == [1.5, 2.5, 3.5, 4.5]
+    assert len(parses) == 3
+
+
+def test_no_columnar_cache_flag():
+    assert not parse_args([]).no_columnar_cache
+    assert parse_args(["--no-columnar-cache"]).no_columnar_cache
@@ -0,0 +1,62 @@
+"""Tests for describing many columns at once."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core import moments
+from src.core.describe import describe_array, describe_columns
+
+QUANTILES = [0.0, 0.05, 0.25, 0.3, 0.75, 0.99, 1.0]
+
+
+def random_frame(rng, n_rows):
+    """Columns with missing values, ties, integers, no values and one value."""
+    floats = rng.normal(size=(n_rows, 3))
+    floats[rng.random(floats.shape) < 0.25] = np.nan
+    frame = pd.DataFrame(floats, columns=["a", "b", "c"])
+    frame["ties"] = np.round(rng.normal(size=n_rows))
+    frame["int"] = rng.integers(-50, 50, n_rows)
+    frame["empty"] = np.nan
+    frame["single"] = np.nan
+    if n_rows:
+        frame.loc[frame.index[-1], "single"] = 4.25
+    return frame
+
+
+def assert_matches_pandas(summary, frame, ddof=1):
+    values = frame.astype("float64")
+    np.testing.assert_array_equal(summary["count"], values.count())
+    np.testing.assert_allclose(summary["mean"], values.mean(), rtol=1e-12)
+    np.testing.assert_allclose(
+        summary["std"], values.std(ddof=ddof), rtol=1e-9, atol=1e-12
+    )
+    np.testing.assert_array_equal(summary["min"], values.min())
+    np.testing.assert_array_equal(summary["max"], values.max())
+    # Order statistics are bit for bit those of pandas
+    np.testing.assert_array_equal(summary["median"], values.median())
+    np.testing.assert_array_equal(summary["quantiles"], values.quantile(QUANTILES))
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("n_rows", [0, 1, 2, 3, 400])
+@pytest.mark.parametrize("ddof", [0, 1])
+def test_describe_array_matches_pandas(seed, n_rows, ddof):
+    frame = random_frame(np.random.default_rng(seed), n_rows)
+
+    summary = describe_array(frame.to_numpy(dtype="float64"), QUANTILES, ddof)
+
+    assert_matches_pandas(summary, frame, ddof)
+
+
+@pytest.mark.parametrize("block_values", [1, 5, 1 << 20])
+def test_describe_columns_matches_pandas_in_any_blocks(monkeypatch, block_values):
+    monkeypatch.setattr(moments, "BLOCK_VALUES", block_values)
+    frame = random_frame(np.random.default_rng(0), 50)
+
+    assert_matches_pandas(describe_columns(frame, QUANTILES), frame)
+
+
+def test_quantiles_outside_zero_and_one_are_rejected():
+    with pytest.raises(ValueError, match="between 0 and 1"):
+        describe_array(np.zeros((3, 1)), [1.5])
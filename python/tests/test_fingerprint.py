@@ -0,0 +1,64 @@
+"""Tests for module fingerprints and the result cache keys built from them."""
+
+import types
+from pathlib import Path
+
+import pytest
+
+from src.core import fingerprint
+from src.core.module_registry import ModuleInfo
+from src.core.result_cache import ResultCache
+
+
+def cache_key(module_info: ModuleInfo) -> str:
+    config = types.SimpleNamespace(VERSION="1.0.0", PARAMETERS={"precision": 3})
+    return ResultCache.make_key(
+        "dataset", fingerprint.module_fingerprint(module_info, config)
+    )
+
+
+def test_editing_an_imported_core_file_misses_the_result_cache(
+    core_dir, make_module, tmp_path
+):
+    module_info = make_module(tmp_path / "modules" / "example")
+    cache = ResultCache(tmp_path / "results")
+    cache.put(cache_key(module_info), {"value": 1})
+    assert cache.get(cache_key(module_info)) == {"value": 1}
+
+    (core_dir / "kernel.py").write_text("def helper():\n    return 2\n")
+
+    assert cache.get(cache_key(module_info)) is None
+
+
+@pytest.mark.parametrize(
+    ("edited", "changes"),
+    [
+        ("nested.py", True),  # imported by kernel.py inside a function
+        ("prepared.py", True),  # behind the runner's prepared object
+        ("column_stats.py", True),  # behind the runner's stats object
+        ("unrelated.py", False),
+    ],
+)
+def test_core_fingerprint_follows_core_dependencies(
+    core_dir, make_module, tmp_path, edited, changes
+):
+    module_dir = tmp_path / "modules" / "example"
+    make_module(
+        module_dir,
+        "def analyze(dataset, model, config):\n    from src.core import kernel\n",
+    )
+    before = fingerprint.core_fingerprint(module_dir)
+
+    (core_dir / edited).write_text("value = 2\n")
+
+    assert (fingerprint.core_fingerprint(module_dir) != before) is changes
+
+
+def test_module_fingerprint_covers_the_real_core_kernels():
+    module_dir = Path(fingerprint.__file__).parents[1] / "modules" / "basic_stats"
+    seen = [
+        name
+        for name in fingerprint._source_info(module_dir / "engine.py")[1]
+        if (fingerprint.CORE_DIR / f"{name}.py").is_file()
+    ]
+    assert {"describe", "moments", "quantile_sketch"} <= set(seen)
@@ -0,0 +1,58 @@
+"""Tests for the order statistics of small-range integers by counting."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.histogram import (
+    MAX_RANGE,
+    histogram_max,
+    histogram_mean,
+    histogram_median,
+    histogram_min,
+    histogram_mode,
+    histogram_quantile,
+    integer_histogram,
+)
+
+QUANTILES = [0.0, 0.1, 0.25, 0.3, 0.5, 0.75, 0.9, 1.0]
+
+
+@pytest.mark.parametrize("dtype", ["int64", "int32", "uint8", "int16"])
+@pytest.mark.parametrize("n_values", [1, 2, 3, 1000])
+@pytest.mark.parametrize("seed", range(3))
+def test_histogram_statistics_match_pandas_exactly(dtype, n_values, seed):
+    rng = np.random.default_rng(seed)
+    info = np.iinfo(dtype)
+    low = rng.integers(max(info.min, -1000), 100)
+    values = rng.integers(low, min(low + 500, info.max), n_values, endpoint=True)
+    series = pd.Series(values.astype(dtype))
+
+    histogram = integer_histogram(series.to_numpy())
+
+    assert histogram_min(histogram) == series.min()
+    assert histogram_max(histogram) == series.max()
+    assert type(histogram_min(histogram)) is type(series.min())
+    assert histogram_median(histogram) == series.median()
+    for q in QUANTILES:
+        assert histogram_quantile(histogram, q) == series.quantile(q)
+    assert histogram_mode(histogram) == series.mode().iloc[0]
+    assert histogram_mean(histogram) == series.mean()
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        np.array([0, MAX_RANGE], dtype="int64"),  # range too wide
+        np.array([1.0, 2.0]),  # not integers
+        np.array([], dtype="int64"),  # no values
+    ],
+)
+def test_other_arrays_are_not_counted(values):
+    assert integer_histogram(values) is None
+
+
+def test_mean_is_left_to_pandas_when_the_sum_may_round():
+    values = np.full(4, 2**51, dtype="int64")
+
+    assert histogram_mean(integer_histogram(values)) is None
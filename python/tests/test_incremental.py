@@ -0,0 +1,86 @@
+"""Tests for reusing saved results and states when module code changes."""
+
+import json
+
+import pytest
+
+from src.core.data_loader import DataLoader
+from src.core.incremental import (
+    compute_module_fingerprints,
+    fingerprints_match,
+    plan_incremental_run,
+)
+from src.core.module_cache import ModuleCache
+from src.core.module_runner import ModuleRunner
+from src.core.running_state import run_append_only
+from src.shard import _merge_shards
+
+
+@pytest.fixture
+def modules(core_dir, make_module, tmp_path):
+    module_info = make_module(tmp_path / "modules" / "counting")
+    return {module_info.name: module_info}
+
+
+def test_fingerprints_match_requires_a_current_fingerprint():
+    assert fingerprints_match({"source": "a"}, {"source": "a"})
+    assert not fingerprints_match({"source": "a"}, {"source": "b"})
+    assert not fingerprints_match(None, None)
+
+
+def test_incremental_plan_reruns_modules_after_a_core_edit(core_dir, modules):
+    fingerprints = compute_module_fingerprints(modules, ModuleCache())
+    previous_output = {
+        "analysis_metadata": {
+            "dataset_fingerprint": "dataset",
+            "module_fingerprints": fingerprints,
+        },
+        "modules": {"counting": {"status": "SUCCESS", "result": {"records": 3}}},
+    }
+    plan = plan_incremental_run(previous_output, modules, "dataset", fingerprints)
+    assert plan.reused_results == {"counting": {"records": 3}}
+
+    (core_dir / "nested.py").write_text("value = 2\n")
+    fingerprints = compute_module_fingerprints(modules, ModuleCache())
+    plan = plan_incremental_run(previous_output, modules, "dataset", fingerprints)
+
+    assert plan.reused_results == {}
+    assert list(plan.stale_modules) == ["counting"]
+
+
+def test_append_only_state_is_refolded_after_a_core_edit(core_dir, modules, tmp_path):
+    dataset_path = tmp_path / "data" / "records.json"
+    dataset_path.parent.mkdir()
+    dataset_path.write_text(json.dumps([{"id": i} for i in range(5)]))
+    loader = DataLoader(dataset_path.parent, use_columnar_cache=False)
+
+    def run() -> tuple[dict, dict]:
+        runner = ModuleRunner(module_cache=ModuleCache())
+        return run_append_only(runner, modules, loader, dataset_path)
+
+    results, info = run()
+    assert results["counting"]["records"] == 5
+    results, info = run()
+    assert (results["counting"]["records"], info["appended_records"]) == (5, 0)
+
+    (core_dir / "kernel.py").write_text("def helper():\n    return 2\n")
+    results, info = run()
+
+    # The saved state was discarded and the whole dataset folded again
+    assert (results["counting"]["records"], info["appended_records"]) == (5, 5)
+
+
+@pytest.mark.parametrize(
+    ("coordinator", "worker"),
+    [({"core": "current"}, {"core": "other"}), (None, None)],
+)
+def test_shards_with_other_core_code_are_not_merged(modules, coordinator, worker):
+    with pytest.raises(ValueError, match="different version"):
+        _merge_shards(
+            ModuleRunner(module_cache=ModuleCache()),
+            modules["counting"],
+            coordinator,
+            ["unix:/tmp/worker.sock"],
+            [{"fingerprints": {"counting": worker}}],
+            [{"records": 0, "states": {}, "errors": {}}],
+        )
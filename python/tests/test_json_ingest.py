@@ -0,0 +1,112 @@
+"""Tests for parsing JSON record arrays straight into typed columns."""
+
+import json
+
+import pandas as pd
+import pytest
+
+from src.core.data_loader import DataLoader
+from src.core.json_ingest import ColumnarRecordReader, RecordLayoutError
+
+LAYOUTS = {
+    "missing values": [
+        {"id": 1, "value": 1.5, "count": 3, "flag": True, "label": "a"},
+        {"id": 2, "value": None, "count": None, "flag": None, "label": None},
+        {"id": 3, "value": 2.5, "count": 4, "flag": False, "label": "c"},
+    ],
+    "missing keys": [
+        {"id": 1, "value": 1.5},
+        {"id": 2, "label": "b", "count": 7},
+        {"id": 3, "value": 2.5, "flag": True},
+    ],
+    "widened after the sample": [
+        {"id": 1, "value": 1, "mixed": "a", "flag": True},
+        {"id": 2, "value": 2, "mixed": "b", "flag": False},
+        {"id": 3, "value": 3, "mixed": "c", "flag": True},
+        {"id": 4, "value": 4.5, "mixed": 4, "flag": "yes"},
+    ],
+    "dates": [
+        {"id": 1, "day": "2024-01-01", "timestamp": "2024-01-01T00:00:00.000"},
+        {"id": 2, "day": None, "timestamp": "2024-01-01 12:30"},
+        {"id": 3, "day": "2024-03-01", "timestamp": "2024-02-29T23:59:59.123456"},
+    ],
+}
+
+
+def reference_frame(path, date_columns=()):
+    """What DataLoader built from the records, with its date strings parsed."""
+    with open(path) as f:
+        expected = pd.DataFrame(json.load(f))
+    for column in date_columns:
+        expected[column] = pd.to_datetime(expected[column], format="ISO8601")
+    return expected
+
+
+def write_records(path, records):
+    path.write_text(json.dumps(records))
+    return path
+
+
+@pytest.mark.parametrize("layout", LAYOUTS)
+def test_reader_matches_the_record_path(tmp_path, layout):
+    path = write_records(tmp_path / "data.json", LAYOUTS[layout])
+    date_columns = ("day", "timestamp") if layout == "dates" else ()
+
+    # One record per chunk, so later chunks widen the sampled types
+    dataset = ColumnarRecordReader(chunk_size=1, sample_size=1).read(path)
+
+    pd.testing.assert_frame_equal(dataset, reference_frame(path, date_columns))
+
+
+def test_sample_dataset_matches_the_record_path(tmp_path):
+    DataLoader(tmp_path, use_columnar_cache=False).load_sample_data()
+    path = tmp_path / "sample_data.json"
+
+    dataset = ColumnarRecordReader(chunk_size=16, sample_size=8).read(path)
+
+    expected = reference_frame(path, ["timestamp"])
+    pd.testing.assert_frame_equal(dataset, expected)
+    assert dataset.dtypes.astype(str).to_dict() == {
+        "id": "int64",
+        "value": "float64",
+        "category": "object",
+        "score": "float64",
+        "count": "int64",
+        "flag": "bool",
+        "timestamp": "datetime64[ns]",
+    }
+
+
+def test_without_date_parsing_strings_stay_strings(tmp_path):
+    path = write_records(tmp_path / "data.json", LAYOUTS["dates"])
+
+    dataset = ColumnarRecordReader(parse_dates=False).read(path)
+
+    pd.testing.assert_frame_equal(dataset, reference_frame(path))
+
+
+def test_loader_uses_the_column_reader(tmp_path):
+    path = write_records(tmp_path / "data.json", LAYOUTS["missing values"])
+
+    dataset = DataLoader(tmp_path, use_columnar_cache=False).load_file(path)
+
+    pd.testing.assert_frame_equal(dataset, ColumnarRecordReader().read(path))
+
+
+@pytest.mark.parametrize(
+    "records",
+    [
+        [{"id": 1, "nested": {"a": 1}}],
+        [{"id": 1, "tags": ["a", "b"]}],
+        [{"id": 1, "value": 1.5}, {"id": 2, "value": "many"}],
+        [{"id": 1, "when": "2024-01-01"}, {"id": 2, "when": 5}],
+        [{"id": 1, "when": "2024-01-01T00:00:00Z"}],
+        [{"id": 1}, 2],
+    ],
+    ids=["object", "array", "number to string", "date to number", "zone", "scalar"],
+)
+def test_layouts_pandas_would_read_differently_are_refused(tmp_path, records):
+    path = write_records(tmp_path / "data.json", records)
+
+    with pytest.raises(RecordLayoutError):
+        ColumnarRecordReader(chunk_size=1, sample_size=1).read(path)
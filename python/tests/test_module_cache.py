@@ -0,0 +1,100 @@
+"""Tests for caching loaded module files across runs."""
+
+import os
+
+import pandas as pd
+import pytest
+
+from src.core.module_cache import ModuleCache
+from src.core.module_runner import ModuleRunner
+
+# Records how often the engine file is executed
+LOADING_ENGINE = """
+import builtins
+
+builtins.ENGINE_LOADS = getattr(builtins, "ENGINE_LOADS", 0) + 1
+
+
+def analyze(dataset, model, config):
+    return {"records": len(dataset)}
+"""
+
+NAMED_ENGINE = """
+def analyze(dataset, model, config):
+    return {"engine": "{name}"}
+"""
+
+
+@pytest.fixture
+def dataset():
+    return pd.DataFrame({"value": [1.0, 2.0, 3.0]})
+
+
+@pytest.fixture
+def engine_loads(monkeypatch):
+    import builtins
+
+    monkeypatch.setattr(builtins, "ENGINE_LOADS", 0, raising=False)
+    return lambda: builtins.ENGINE_LOADS
+
+
+def test_second_run_reuses_the_cached_engine(
+    make_module, tmp_path, dataset, engine_loads
+):
+    module_info = make_module(tmp_path / "modules" / "loading", LOADING_ENGINE)
+    module_cache = ModuleCache()
+    runner = ModuleRunner(module_cache)
+
+    first, _ = runner.run_modules({"loading": module_info}, dataset)
+    misses = module_cache.misses
+    second, _ = runner.run_modules({"loading": module_info}, dataset)
+
+    assert first["loading"]["records"] == second["loading"]["records"] == 3
+    assert engine_loads() == 1
+    assert module_cache.misses == misses
+    assert module_cache.hits > 0
+
+
+def test_modules_with_the_same_component_names_do_not_collide(
+    make_module, tmp_path, dataset
+):
+    modules = {
+        name: make_module(
+            tmp_path / "modules" / name, NAMED_ENGINE.replace("{name}", name)
+        )
+        for name in ("alpha", "beta")
+    }
+    module_cache = ModuleCache()
+
+    results, _ = ModuleRunner(module_cache).run_modules(modules, dataset)
+
+    assert [result["engine"] for result in results.values()] == ["alpha", "beta"]
+    alpha, beta = modules["alpha"], modules["beta"]
+    loaded = {
+        module_cache.load(info.qualified_name(component), path)
+        for info in (alpha, beta)
+        for component, path in [
+            ("config", info.config_path),
+            ("model", info.model_path),
+            ("engine", info.engine_path),
+        ]
+    }
+    assert len(loaded) == 6
+
+
+def test_changed_engine_is_reloaded_but_a_touched_one_is_not(
+    make_module, tmp_path, engine_loads
+):
+    module_info = make_module(tmp_path / "modules" / "loading", LOADING_ENGINE)
+    module_cache = ModuleCache()
+    name = module_info.qualified_name("engine")
+    engine = module_cache.load(name, module_info.engine_path)
+
+    stat = module_info.engine_path.stat()
+    os.utime(module_info.engine_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert module_cache.load(name, module_info.engine_path) is engine
+
+    module_info.engine_path.write_text(LOADING_ENGINE + "\nCHANGED = True\n")
+    reloaded = module_cache.load(name, module_info.engine_path)
+    assert reloaded is not engine and reloaded.CHANGED
+    assert engine_loads() == 2
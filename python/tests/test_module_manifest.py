@@ -0,0 +1,150 @@
+"""Tests for the module index that lets discovery skip executing configs."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.core.module_cache import ModuleCache
+from src.core.module_manifest import MANIFEST_FORMAT, content_fingerprint
+from src.core.module_registry import ModuleRegistry
+from src.main import list_modules
+
+PROJECT_ROOT = Path(__file__).parents[1]
+
+# Leaves a marker next to itself if it is ever executed
+MARKING_ENGINE = """
+from pathlib import Path
+
+Path(__file__).with_name("engine-was-imported").touch()
+
+
+def analyze(dataset, model, config):
+    return {}
+"""
+
+
+def write_config(module_dir: Path, description: str) -> None:
+    (module_dir / "config.py").write_text(
+        f'DESCRIPTION = "{description}"\nVERSION = "1.0.0"\n'
+        'PARAMETERS = {"precision": 3}\n'
+    )
+
+
+@pytest.fixture
+def modules_dir(tmp_path, make_module):
+    modules_dir = tmp_path / "modules"
+    for name in ("alpha", "beta"):
+        make_module(modules_dir / name, MARKING_ENGINE)
+        write_config(modules_dir / name, f"Module {name}")
+    return modules_dir
+
+
+def registry(modules_dir: Path) -> tuple[ModuleRegistry, ModuleCache]:
+    module_cache = ModuleCache()
+    return ModuleRegistry(modules_dir, module_cache), module_cache
+
+
+def read_index(modules_dir: Path) -> dict:
+    return json.loads((modules_dir / ".module_index.json").read_text())
+
+
+def test_discovery_builds_the_index(modules_dir):
+    module_registry, _ = registry(modules_dir)
+
+    module_registry.discover_modules()
+
+    index = read_index(modules_dir)
+    assert index["format"] == MANIFEST_FORMAT
+    assert sorted(index["modules"]) == ["alpha", "beta"]
+    entry = index["modules"]["alpha"]
+    assert entry["description"] == "Module alpha"
+    assert entry["version"] == "1.0.0"
+    assert entry["parameters"] == {"precision": 3}
+    assert entry["fingerprint"] == content_fingerprint(modules_dir / "alpha")
+
+
+def test_unchanged_modules_come_from_the_index(modules_dir):
+    registry(modules_dir)[0].discover_modules()
+    module_registry, module_cache = registry(modules_dir)
+
+    modules = module_registry.discover_modules()
+
+    assert modules["beta"].description == "Module beta"
+    assert modules["beta"].parameters == {"precision": 3}
+    assert module_cache.misses == 0
+
+
+def test_index_follows_added_and_removed_modules(modules_dir, make_module):
+    registry(modules_dir)[0].discover_modules()
+
+    make_module(modules_dir / "gamma")
+    write_config(modules_dir / "gamma", "Module gamma")
+    modules = registry(modules_dir)[0].discover_modules()
+    assert sorted(modules) == ["alpha", "beta", "gamma"]
+    assert modules["gamma"].description == "Module gamma"
+    assert sorted(read_index(modules_dir)["modules"]) == ["alpha", "beta", "gamma"]
+
+    for path in (modules_dir / "alpha").iterdir():
+        path.unlink()
+    (modules_dir / "alpha").rmdir()
+    modules = registry(modules_dir)[0].discover_modules()
+    assert sorted(modules) == ["beta", "gamma"]
+    assert sorted(read_index(modules_dir)["modules"]) == ["beta", "gamma"]
+
+
+def test_rebuild_index_rereads_a_config_the_index_hides(modules_dir):
+    registry(modules_dir)[0].discover_modules()
+    # Same size and timestamps, so the index still looks up to date
+    config_path = modules_dir / "alpha" / "config.py"
+    stat = config_path.stat()
+    write_config(modules_dir / "alpha", "Module ALPHA")
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    module_registry, _ = registry(modules_dir)
+    assert module_registry.discover_modules()["alpha"].description == "Module alpha"
+
+    modules = module_registry.rebuild_index()
+
+    assert modules["alpha"].description == "Module ALPHA"
+    assert read_index(modules_dir)["modules"]["alpha"]["description"] == (
+        "Module ALPHA"
+    )
+
+
+def test_list_modules_does_not_import_engines(modules_dir, capsys):
+    module_registry, module_cache = registry(modules_dir)
+
+    list_modules(module_registry)
+    list_modules(registry(modules_dir)[0])
+
+    lines = capsys.readouterr().out.splitlines()
+    assert lines == ["alpha 1.0.0: Module alpha", "beta 1.0.0: Module beta"] * 2
+    assert not list(modules_dir.glob("*/engine-was-imported"))
+    # Only the configs, on the first listing
+    assert module_cache.misses == 2
+
+
+def test_list_modules_command_does_not_import_pandas():
+    listing = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys\n"
+            "from src.main import main\n"
+            "main(['--list-modules'])\n"
+            "print('pandas' in sys.modules, 'numpy' in sys.modules)\n",
+        ],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=60,
+        check=True,
+    )
+
+    lines = listing.stdout.splitlines()
+    assert any(line.startswith("basic_stats ") for line in lines)
+    assert lines[-1] == "False False"
@@ -0,0 +1,106 @@
+"""Tests for the reports module runners return with their results."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from src.core.module_cache import ModuleCache
+from src.core.module_runner import ModuleRunner
+from src.core.parallel_runner import ThreadedModuleRunner
+from src.core.result_cache import ResultCache
+
+# Waits for the other request, so that both runs are in flight at once;
+# failing keeps its results out of the result cache
+GATE_ENGINE = """
+BARRIER = None
+
+
+def analyze(dataset, model, config):
+    BARRIER.wait(timeout=10)
+    raise RuntimeError("gate passed")
+"""
+
+
+# Asks the shared preparation for the complete rows of "value"
+PREPARED_ENGINE = """
+def analyze(dataset, model, config, prepared=None):
+    return {"rows": len(prepared.frame(["value"], rows="complete"))}
+"""
+
+
+@pytest.fixture
+def modules(make_module, tmp_path):
+    counting = make_module(tmp_path / "modules" / "counting")
+    gate = make_module(tmp_path / "modules" / "gate", GATE_ENGINE)
+    return {"counting": counting, "gate": gate}
+
+
+def test_concurrent_runs_on_one_runner_get_their_own_reports(modules, tmp_path):
+    module_cache = ModuleCache()
+    runner = ModuleRunner(module_cache, ResultCache(tmp_path / "results"))
+    runner.preload_modules(modules)
+    gate = modules["gate"]
+    engine = module_cache.load(gate.qualified_name("engine"), gate.engine_path)
+    cached = pd.DataFrame({"value": [1.0, 2.0]})
+    fresh = pd.DataFrame({"value": [3.0, 4.0, 5.0]})
+    _, report = runner.run_modules({"counting": modules["counting"]}, cached)
+    assert report.cache_hits == set()
+
+    engine.BARRIER = threading.Barrier(2)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        hit = executor.submit(runner.run_modules, modules, cached)
+        miss = executor.submit(runner.run_modules, modules, fresh)
+        (hit_results, hit_report), (miss_results, miss_report) = (
+            hit.result(),
+            miss.result(),
+        )
+
+    assert hit_results["counting"]["records"] == 2
+    assert miss_results["counting"]["records"] == 3
+    assert hit_report.cache_hits == {"counting"}
+    assert miss_report.cache_hits == set()
+
+
+def test_threaded_runner_reports_cache_hits_per_call(modules, tmp_path):
+    counting = {"counting": modules["counting"]}
+    runner = ThreadedModuleRunner(result_cache=ResultCache(tmp_path / "results"))
+    dataset = pd.DataFrame({"value": [1.0, 2.0]})
+
+    _, first = runner.run_modules(counting, dataset)
+    _, second = runner.run_modules(counting, dataset)
+
+    assert (first.cache_hits, second.cache_hits) == (set(), {"counting"})
+
+
+def test_report_sums_what_the_shared_preparation_saved(make_module, tmp_path):
+    modules = {
+        name: make_module(tmp_path / "modules" / name, PREPARED_ENGINE)
+        for name in ("first", "second")
+    }
+    dataset = pd.DataFrame({"value": [1.0, None, 3.0, 4.0], "label": list("abcd")})
+
+    runner = ModuleRunner(ModuleCache())
+    _, alone = runner.run_modules({"first": modules["first"]}, dataset)
+    results, report = runner.run_modules(modules, dataset)
+
+    assert [result["rows"] for result in results.values()] == [3, 3]
+    savings, alone = report.preparation_savings, alone.preparation_savings
+    # The second module reuses the frame of three values the first one built
+    assert savings["computed"] == alone["computed"] > 0
+    assert savings["reused"] == alone["reused"] + 1
+    assert savings["bytes_saved"] == alone["bytes_saved"] + 3 * 8
+    assert savings["seconds_saved"] > alone["seconds_saved"]
+
+
+@pytest.mark.parametrize("runner_type", [ModuleRunner, ThreadedModuleRunner])
+def test_report_has_no_savings_when_nothing_was_prepared(
+    runner_type, modules, tmp_path
+):
+    counting = {"counting": modules["counting"]}
+    dataset = pd.DataFrame({"value": [1.0, 2.0]})
+
+    _, report = runner_type().run_modules(counting, dataset)
+
+    assert report.preparation_savings is None
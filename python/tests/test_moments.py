@@ -0,0 +1,169 @@
+"""Tests for the mergeable summary statistics of chunked analysis."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core import moments as moments_module
+from src.core.moments import (
+    array_moments,
+    column_moments,
+    compute_comoments,
+    compute_moments,
+    correlation_matrix,
+    empty_comoments,
+    merge_column_moments,
+    merge_comoments,
+    variance,
+)
+
+
+@pytest.mark.parametrize(
+    "second",
+    [
+        [4.0, np.nan, 23.0],  # promotes the integer chunk's extremes
+        [np.nan, np.nan],  # no values, but still a floating-point column
+        [5, 6],  # stays integer
+    ],
+)
+def test_merged_extremes_have_the_dtype_of_the_whole_column(second):
+    chunks = [pd.DataFrame({"x": [1, 2, 3]}), pd.DataFrame({"x": second})]
+
+    merged = merge_column_moments(*(column_moments(chunk) for chunk in chunks))
+    whole = column_moments(pd.concat(chunks, ignore_index=True))
+
+    for key in ("min", "max"):
+        assert type(merged["x"][key]) is type(whole["x"][key])
+        assert merged["x"][key] == whole["x"][key]
+    assert merged["x"]["count"] == whole["x"]["count"]
+
+
+def test_merged_extremes_do_not_depend_on_the_order_of_chunks():
+    chunks = [pd.DataFrame({"x": [np.nan]}), pd.DataFrame({"x": [7, 8]})]
+
+    forward = merge_column_moments(*(column_moments(chunk) for chunk in chunks))
+    backward = merge_column_moments(*(column_moments(c) for c in reversed(chunks)))
+
+    assert forward == backward
+    assert type(forward["x"]["min"]) is np.float64
+
+
+def random_frame(rng, n_rows):
+    """Floats with missing values, integers, an empty and a constant column."""
+    floats = rng.normal(50, 20, n_rows)
+    floats[rng.random(n_rows) < 0.2] = np.nan
+    return pd.DataFrame(
+        {
+            "float": floats,
+            "int": rng.integers(-1000, 1000, n_rows),
+            "empty": np.full(n_rows, np.nan),
+            "constant": np.full(n_rows, 3.5),
+        }
+    )
+
+
+def random_splits(rng, frame, n_chunks):
+    """Split a frame at random row positions; chunks may be empty or single rows."""
+    cuts = np.sort(rng.integers(0, len(frame) + 1, n_chunks - 1))
+    bounds = [0, *cuts, len(frame)]
+    return [
+        frame.iloc[start:stop]
+        for start, stop in zip(bounds[:-1], bounds[1:], strict=True)
+    ]
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("n_rows", [1, 2, 57, 1000])
+def test_merged_chunk_moments_match_pandas(seed, n_rows):
+    rng = np.random.default_rng(seed)
+    frame = random_frame(rng, n_rows)
+    chunks = random_splits(rng, frame, 6)
+
+    merged = {}
+    for chunk in chunks:
+        merged = merge_column_moments(merged, column_moments(chunk))
+
+    for column in frame.columns:
+        values = frame[column]
+        moments = merged[column]
+        assert moments["count"] == values.count()
+        if moments["count"] == 0:
+            continue
+        assert moments["mean"] == pytest.approx(values.mean(), rel=1e-12)
+        for ddof in (0, 1):
+            assert variance(moments, ddof) == pytest.approx(
+                values.var(ddof=ddof), rel=1e-9, abs=1e-12, nan_ok=True
+            )
+        assert moments["min"] == values.min()
+        assert moments["max"] == values.max()
+
+
+def test_mixed_int_and_float_chunks_match_their_concatenation():
+    rng = np.random.default_rng(7)
+    chunks = [
+        pd.DataFrame({"x": rng.integers(0, 10**6, 300)}),
+        pd.DataFrame({"x": rng.normal(size=200)}),
+        pd.DataFrame({"x": rng.integers(0, 10, 1)}),
+    ]
+    whole = pd.concat(chunks, ignore_index=True)["x"]
+
+    merged = merge_column_moments(
+        merge_column_moments(column_moments(chunks[0]), column_moments(chunks[1])),
+        column_moments(chunks[2]),
+    )["x"]
+
+    assert merged["mean"] == pytest.approx(whole.mean(), rel=1e-12)
+    assert variance(merged) == pytest.approx(whole.var(), rel=1e-12)
+    assert (merged["min"], merged["max"]) == (whole.min(), whole.max())
+    assert type(merged["min"]) is type(whole.min())
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("n_rows", [2, 3, 500])
+def test_merged_chunk_comoments_match_pandas(seed, n_rows):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame(rng.normal(size=(n_rows, 4)), columns=list("abcd"))
+    frame["d"] = frame["a"] * 2 + rng.normal(scale=0.1, size=n_rows)
+    frame["e"] = 1.0  # constant: its correlations are NaN
+    comoments = empty_comoments(frame.shape[1])
+    for chunk in random_splits(rng, frame, 5):
+        comoments = merge_comoments(comoments, compute_comoments(chunk.to_numpy()))
+
+    assert comoments["count"] == n_rows
+    np.testing.assert_allclose(comoments["mean"], frame.mean(), rtol=1e-12)
+    np.testing.assert_allclose(
+        comoments["comoment"] / (n_rows - 1), frame.cov(), rtol=1e-9, atol=1e-12
+    )
+    np.testing.assert_allclose(
+        correlation_matrix(comoments), frame.corr(), rtol=1e-9, atol=1e-12
+    )
+
+
+@pytest.mark.parametrize("block_values", [1, 7, 1 << 20])
+@pytest.mark.parametrize("n_rows", [0, 1, 2, 333])
+def test_array_moments_match_pandas(monkeypatch, block_values, n_rows):
+    monkeypatch.setattr(moments_module, "BLOCK_VALUES", block_values)
+    frame = random_frame(np.random.default_rng(n_rows), n_rows)
+
+    summary = array_moments(frame.to_numpy(dtype="float64"))
+
+    np.testing.assert_array_equal(summary["count"], frame.count())
+    np.testing.assert_allclose(summary["mean"], frame.mean(), rtol=1e-12)
+    sample_variance = [
+        variance({"count": count, "m2": m2})
+        for count, m2 in zip(summary["count"], summary["m2"], strict=True)
+    ]
+    np.testing.assert_allclose(sample_variance, frame.var(), rtol=1e-9, atol=1e-12)
+    np.testing.assert_array_equal(summary["min"], frame.min())
+    np.testing.assert_array_equal(summary["max"], frame.max())
+
+
+def test_array_moments_reproduce_compute_moments_without_missing_values():
+    values = np.random.default_rng(3).normal(size=(500, 6))
+
+    summary = array_moments(values)
+
+    for i in range(values.shape[1]):
+        expected = compute_moments(values[:, i])
+        for key in ("count", "mean", "m2", "min", "max"):
+            assert summary[key][i] == expected[key]
@@ -0,0 +1,128 @@
+"""Tests for parsing JSON record arrays in byte ranges of whole records."""
+
+import json
+
+import pandas as pd
+import pytest
+
+from src.core.data_loader import DataLoader
+from src.core.json_ingest import ColumnarRecordReader, RecordLayoutError
+from src.core.parallel_ingest import (
+    ParallelRecordReader,
+    iter_record_chunks,
+    split_record_ranges,
+)
+
+
+def make_records(n_records, timestamp_suffix=""):
+    return [
+        {
+            "id": i,
+            "value": i * 0.5,
+            "label": "abc"[i % 3],
+            "timestamp": f"2024-01-01T00:{i % 60:02d}:00{timestamp_suffix}",
+        }
+        for i in range(n_records)
+    ]
+
+
+def write_records(path, records, indent=None):
+    path.write_text(json.dumps(records, indent=indent))
+    return path
+
+
+def range_texts(path, ranges):
+    data = path.read_bytes()
+    return [data[start:end].decode() for start, end in ranges]
+
+
+def parse_ranges(path, ranges):
+    return [json.loads(f"[{text}]") for text in range_texts(path, ranges)]
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_ranges_hold_whole_records_in_order(tmp_path, indent):
+    records = make_records(100)
+    path = write_records(tmp_path / "data.json", records, indent)
+
+    ranges = split_record_ranges(path, 4)
+
+    assert len(ranges) == 4
+    assert all(a[1] <= b[0] for a, b in zip(ranges, ranges[1:], strict=False))
+    parts = parse_ranges(path, ranges)
+    assert all(parts)
+    assert [record for part in parts for record in part] == records
+
+
+def test_record_straddling_a_split_point_stays_whole(tmp_path):
+    records = make_records(6)
+    records[1]["label"] = "x" * 5000
+    path = write_records(tmp_path / "data.json", records)
+    size = path.stat().st_size
+
+    ranges = split_record_ranges(path, 4)
+
+    # The even split points at a quarter and half of the file both fall
+    # inside the long record, which therefore ends the first range
+    assert size // 4 < ranges[0][1] and size // 2 < ranges[0][1]
+    parts = parse_ranges(path, ranges)
+    assert parts[0][-1] == records[1]
+    assert [record for part in parts for record in part] == records
+
+
+def test_split_point_inside_a_string_is_joined_with_the_next_range(tmp_path):
+    records = make_records(40)
+    records[20]["label"] = '}, {"injected": 1' * 50
+    path = write_records(tmp_path / "data.json", records)
+
+    chunks = list(iter_record_chunks(path, chunk_bytes=400))
+
+    dataset = pd.concat(chunks)
+    assert dataset["label"].tolist() == [record["label"] for record in records]
+    assert dataset.index.tolist() == list(range(40))
+
+
+def test_parallel_read_matches_a_single_process_read(tmp_path):
+    records = make_records(500)
+    # Integers in the first part and floats in the last combine like pandas
+    for record in records[:250]:
+        record["value"] = int(record["id"])
+    records[3]["label"] = "x" * 20_000
+    path = write_records(tmp_path / "data.json", records)
+
+    dataset = ParallelRecordReader(max_workers=3, min_parallel_bytes=0).read(path)
+
+    expected = ColumnarRecordReader().read(path)
+    pd.testing.assert_frame_equal(dataset, expected)
+    assert dataset["value"].dtype == "float64"
+    assert dataset["timestamp"].dtype == "datetime64[ns]"
+
+
+def test_zone_suffixed_timestamps_fall_back_to_the_record_path(tmp_path):
+    path = write_records(tmp_path / "data.json", make_records(300, "Z"))
+    reader = ParallelRecordReader(max_workers=2, min_parallel_bytes=0)
+
+    with pytest.raises(RecordLayoutError, match="timezone"):
+        reader.read(path)
+    dataset = DataLoader(tmp_path, use_columnar_cache=False, parse_workers=2).load_file(
+        path
+    )
+
+    pd.testing.assert_frame_equal(dataset, pd.DataFrame(make_records(300, "Z")))
+    assert dataset["timestamp"].dtype == object
+
+
+def test_chunks_with_zone_suffixed_timestamps_fall_back_per_range(tmp_path):
+    records = make_records(100)
+    for record in records[50:]:
+        record["timestamp"] += "Z"
+    path = write_records(tmp_path / "data.json", records)
+
+    chunks = list(iter_record_chunks(path, chunk_bytes=1000))
+
+    assert len(chunks) > 2
+    assert chunks[0]["timestamp"].dtype == "datetime64[ns]"
+    assert chunks[-1]["timestamp"].tolist() == [
+        record["timestamp"] for record in records[-len(chunks[-1]) :]
+    ]
+    assert sum(len(chunk) for chunk in chunks) == 100
@@ -0,0 +1,81 @@
+"""Tests for running modules concurrently in worker processes and threads."""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.core.data_loader import DataLoader
+from src.core.module_registry import ModuleRegistry
+from src.core.module_runner import ModuleRunner
+from src.core.parallel_runner import ParallelModuleRunner, ThreadedModuleRunner
+from src.core.serialization import NumpyJSONEncoder
+
+MODULES_DIR = Path(__file__).parents[1] / "src" / "modules"
+
+RAISING_ENGINE = """
+class UnpicklableError(Exception):
+    def __reduce__(self):
+        raise TypeError("cannot pickle")
+
+
+def analyze(dataset, model, config):
+    raise UnpicklableError("no analysis today")
+"""
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    rng = np.random.default_rng(1)
+    values = rng.normal(50, 10, 200)
+    values[::31] *= 4
+    records = [
+        {
+            "id": i + 1,
+            "value": round(float(values[i]), 6),
+            "category": "ABC"[i % 3],
+            "score": round(float(rng.uniform(0, 100)), 6),
+            "count": int(rng.integers(0, 20)),
+            "flag": bool(i % 2),
+            "timestamp": f"2024-01-01T00:00:{i % 60:02d}.000",
+        }
+        for i in range(200)
+    ]
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps(records))
+    return DataLoader(tmp_path).load_file(path)
+
+
+@pytest.fixture
+def modules():
+    discovered = ModuleRegistry(MODULES_DIR).discover_modules()
+    return {name: discovered[name] for name in ("basic_stats", "outlier_detection")}
+
+
+def test_process_pool_matches_the_sequential_runner(modules, dataset):
+    results, report = ParallelModuleRunner(max_workers=2).run_modules(modules, dataset)
+    expected, _ = ModuleRunner().run_modules(modules, dataset)
+
+    assert list(results) == list(modules)
+    assert not any("error" in result for result in results.values())
+    assert json.dumps(results, cls=NumpyJSONEncoder) == json.dumps(
+        expected, cls=NumpyJSONEncoder
+    )
+    assert report.cache_hits == set()
+
+
+@pytest.mark.parametrize("runner_type", [ParallelModuleRunner, ThreadedModuleRunner])
+def test_raising_module_is_reported_as_an_error(
+    runner_type, modules, dataset, make_module, tmp_path
+):
+    raising = make_module(tmp_path / "modules" / "raising", RAISING_ENGINE)
+    basic_stats = modules["basic_stats"]
+
+    results, _ = runner_type(max_workers=2).run_modules(
+        {"raising": raising, "basic_stats": basic_stats}, dataset
+    )
+
+    assert results["raising"] == {"error": "no analysis today"}
+    assert "error" not in results["basic_stats"]
+    assert results["basic_stats"]["total_records"] == 200
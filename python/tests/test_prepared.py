@@ -0,0 +1,72 @@
+"""Tests for the memo behind the shared preparation of a dataset."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.core.prepared import MemoTable
+
+
+def test_counters_credit_every_reuse():
+    memo = MemoTable(measure=len)
+
+    def build():
+        time.sleep(0.01)
+        return "x" * 100
+
+    values = [memo.get("key", build) for _ in range(3)]
+    memo.get("other", lambda: "y")
+
+    assert values == ["x" * 100] * 3
+    assert (memo.hits, memo.misses) == (2, 2)
+    assert memo.bytes_saved == 2 * 100
+    assert memo.seconds_saved >= 2 * 0.01
+
+
+def test_values_are_not_measured_without_a_measure():
+    memo = MemoTable()
+
+    memo.get("key", lambda: [1, 2, 3])
+    memo.get("key", lambda: [1, 2, 3])
+
+    assert (memo.hits, memo.bytes_saved) == (1, 0)
+
+
+def test_concurrent_gets_of_one_key_build_it_once():
+    memo = MemoTable()
+    builds = []
+    barrier = threading.Barrier(8)
+
+    def build():
+        builds.append(threading.get_ident())
+        time.sleep(0.05)
+        return object()
+
+    def get():
+        barrier.wait(timeout=10)
+        return memo.get("key", build)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        values = list(executor.map(lambda _: get(), range(8)))
+
+    assert len(builds) == 1
+    assert all(value is values[0] for value in values)
+    assert (memo.hits, memo.misses) == (7, 1)
+
+
+def test_builds_of_different_keys_do_not_wait_for_each_other():
+    memo = MemoTable()
+    other_built = threading.Event()
+
+    def build_slow():
+        # Only finishes once the other key was built meanwhile
+        assert other_built.wait(timeout=10)
+        return "slow"
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        slow = executor.submit(memo.get, "slow", build_slow)
+        time.sleep(0.05)
+        assert memo.get("fast", lambda: "fast") == "fast"
+        other_built.set()
+        assert slow.result(timeout=10) == "slow"
+    assert memo.misses == 2
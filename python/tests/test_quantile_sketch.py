@@ -0,0 +1,93 @@
+"""Tests for the mergeable KLL quantile sketch."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.quantile_sketch import (
+    empty_sketch,
+    merge_sketches,
+    rank_error,
+    sketch_quantiles,
+    sketch_values,
+    update_sketch,
+)
+
+QUANTILES = [0.0, 0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99, 1.0]
+
+
+def rank_of(sorted_values: np.ndarray, estimate: float) -> tuple[float, float]:
+    """Return the range of normalized ranks an estimate may stand for."""
+    low = np.searchsorted(sorted_values, estimate, side="left")
+    high = np.searchsorted(sorted_values, estimate, side="right")
+    return low / len(sorted_values), high / len(sorted_values)
+
+
+def random_column(rng, n_values):
+    """Floats with missing values, as a column to be summarized."""
+    values = rng.lognormal(size=n_values)
+    values[rng.random(n_values) < 0.1] = np.nan
+    return pd.Series(values)
+
+
+@pytest.mark.parametrize("n_values", [1, 2, 17, 200])
+def test_sketches_that_never_compacted_match_pandas(n_values):
+    column = random_column(np.random.default_rng(n_values), n_values + 5)
+    values = column.dropna().to_numpy()[:n_values]
+
+    sketch = sketch_values(values, k=200)
+
+    assert rank_error(sketch) == 0.0
+    np.testing.assert_allclose(
+        sketch_quantiles(sketch, QUANTILES),
+        pd.Series(values).quantile(QUANTILES),
+        rtol=1e-12,
+    )
+
+
+def test_empty_sketch_has_no_quantiles():
+    sketch = merge_sketches(empty_sketch(), sketch_values(np.empty(0)))
+
+    assert sketch["count"] == 0
+    assert np.isnan(sketch_quantiles(sketch, QUANTILES)).all()
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_merged_chunk_sketches_stay_within_their_rank_error(seed):
+    rng = np.random.default_rng(seed)
+    column = random_column(rng, 50_000)
+    cuts = np.sort(rng.integers(0, len(column), 30))
+    chunks = np.split(column.to_numpy(), cuts)
+    # Mixed int and float chunks, including empty and single-value ones
+    chunks[1] = rng.integers(0, 5, len(chunks[1]))
+    chunks += [np.array([7.5]), np.empty(0)]
+
+    sketches = [sketch_values(chunk[~np.isnan(chunk)], k=100) for chunk in chunks]
+    # Merge as a tree of random shape, as shards and runs would
+    while len(sketches) > 1:
+        i = rng.integers(len(sketches) - 1)
+        sketches[i : i + 2] = [merge_sketches(sketches[i], sketches[i + 1])]
+    sketch = sketches[0]
+
+    values = np.sort(np.concatenate(chunks).astype("float64"))
+    values = values[~np.isnan(values)]
+    assert sketch["count"] == len(values)
+    assert sum(len(level) for level in sketch["levels"]) <= 3 * 100
+    estimates = sketch_quantiles(sketch, QUANTILES)
+    assert (estimates[0], estimates[-1]) == (values.min(), values.max())
+    error = rank_error(sketch)
+    for q, estimate in zip(QUANTILES, estimates, strict=True):
+        low, high = rank_of(values, estimate)
+        assert low - error <= q <= high + error
+
+
+def test_updating_leaves_the_sketch_unchanged():
+    sketch = sketch_values(np.arange(1000.0), k=50)
+    levels = [level.copy() for level in sketch["levels"]]
+
+    update_sketch(sketch, np.arange(1000.0, 5000.0))
+
+    assert sketch["count"] == 1000
+    assert all(
+        np.array_equal(a, b) for a, b in zip(sketch["levels"], levels, strict=True)
+    )
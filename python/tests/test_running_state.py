@@ -0,0 +1,146 @@
+"""Tests for updating saved module states with records appended to a dataset."""
+
+import json
+import math
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.core import parallel_ingest
+from src.core.data_loader import DataLoader
+from src.core.module_cache import ModuleCache
+from src.core.module_registry import ModuleRegistry
+from src.core.module_runner import ModuleRunner
+from src.core.running_state import RunningStateStore, run_append_only
+
+MODULES_DIR = Path(__file__).parents[1] / "src" / "modules"
+
+
+def make_records(n_records: int, seed: int = 0) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    values = rng.normal(50, 10, n_records)
+    values[::53] *= 4
+    return [
+        {
+            "id": i + 1,
+            "value": round(float(values[i]), 6),
+            "category": "ABC"[i % 3],
+            "score": round(float(rng.uniform(0, 100)), 6),
+            "count": int(rng.integers(0, 20)),
+            "flag": bool(i % 2),
+        }
+        for i in range(n_records)
+    ]
+
+
+def write_records(path: Path, records: list[dict]) -> Path:
+    path.write_text(json.dumps(records))
+    return path
+
+
+def assert_close(actual, expected, path="result"):
+    """Compare results, allowing floating-point rounding of merged moments."""
+    if isinstance(expected, dict):
+        assert set(actual) == set(expected), path
+        for key in expected:
+            assert_close(actual[key], expected[key], f"{path}.{key}")
+    elif isinstance(expected, list):
+        assert len(actual) == len(expected), path
+        for i, (a, e) in enumerate(zip(actual, expected, strict=True)):
+            assert_close(a, e, f"{path}[{i}]")
+    elif isinstance(expected, float) and math.isnan(expected):
+        assert math.isnan(actual), path
+    elif isinstance(expected, float):
+        assert actual == pytest.approx(expected, rel=1e-9, abs=1e-9), path
+    else:
+        assert actual == expected, path
+
+
+def run(modules, dataset_path, chunk_bytes=2048):
+    runner = ModuleRunner(module_cache=ModuleCache())
+    loader = DataLoader(dataset_path.parent, use_columnar_cache=False)
+    return run_append_only(
+        runner, modules, loader, dataset_path, chunk_bytes=chunk_bytes
+    )
+
+
+@pytest.fixture
+def counting(core_dir, make_module, tmp_path):
+    module_info = make_module(tmp_path / "modules" / "counting")
+    return {module_info.name: module_info}
+
+
+@pytest.fixture
+def read_rows(monkeypatch):
+    """Record the positions of the rows parsed from the JSON file."""
+    rows = []
+    iter_record_chunks = parallel_ingest.iter_record_chunks
+
+    def recording_iter_record_chunks(*args, **kwargs):
+        for chunk in iter_record_chunks(*args, **kwargs):
+            rows.extend(chunk.index)
+            yield chunk
+
+    monkeypatch.setattr(
+        parallel_ingest, "iter_record_chunks", recording_iter_record_chunks
+    )
+    return rows
+
+
+def test_appended_run_equals_a_full_recompute(tmp_path):
+    discovered = ModuleRegistry(MODULES_DIR).discover_modules()
+    modules = {
+        name: discovered[name]
+        for name in ("basic_stats", "correlation", "outlier_detection")
+    }
+    # Few enough records for the quantile sketches to stay exact
+    records = make_records(180)
+    (tmp_path / "data").mkdir()
+    dataset_path = write_records(tmp_path / "data" / "records.json", records[:120])
+    run(modules, dataset_path)
+
+    write_records(dataset_path, records)
+    results, info = run(modules, dataset_path)
+    full_path = tmp_path / "full" / "records.json"
+    full_path.parent.mkdir()
+    shutil.copy(dataset_path, full_path)
+    expected, full_info = run(modules, full_path)
+
+    assert (info["appended_records"], full_info["appended_records"]) == (60, 180)
+    assert info["total_records"] == full_info["total_records"] == 180
+    assert info["high_water_mark"] == 180
+    assert not any("error" in result for result in results.values())
+    assert results["outlier_detection"]["summary"]["total_unique_outliers"] > 0
+    assert_close(results, expected)
+
+
+def test_rows_below_the_mark_are_not_read_again(counting, tmp_path, read_rows):
+    dataset_path = tmp_path / "records.json"
+    write_records(dataset_path, [{"id": i} for i in range(1, 101)])
+    results, _ = run(counting, dataset_path)
+    assert results["counting"]["records"] == 100
+    read_rows.clear()
+
+    write_records(dataset_path, [{"id": i} for i in range(1, 131)])
+    results, info = run(counting, dataset_path)
+
+    assert results["counting"]["records"] == 130
+    assert info["appended_records"] == 30
+    assert sorted(read_rows) == list(range(100, 130))
+
+
+def test_rewritten_file_only_ingests_records_above_the_mark(counting, tmp_path):
+    dataset_path = tmp_path / "records.json"
+    write_records(dataset_path, [{"id": i} for i in range(1, 101)])
+    run(counting, dataset_path)
+
+    # Earlier bytes change, so the saved offset cannot be resumed from
+    write_records(dataset_path, [{"id": i, "note": "x"} for i in range(1, 121)])
+    document = RunningStateStore(dataset_path).load()
+    assert RunningStateStore(dataset_path).resume_offset(document) is None
+    results, info = run(counting, dataset_path)
+
+    assert results["counting"]["records"] == 120
+    assert (info["appended_records"], info["high_water_mark"]) == (20, 120)
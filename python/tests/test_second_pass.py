@@ -0,0 +1,111 @@
+"""Tests for modules that find rows with a second pass over the chunks."""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.module_cache import ModuleCache
+from src.core.module_registry import ModuleRegistry
+from src.core.module_runner import ModuleRunner
+from src.core.serialization import NumpyJSONEncoder, encode_state
+
+MODULES_DIR = Path(__file__).parents[1] / "src" / "modules"
+
+
+@pytest.fixture
+def runner():
+    return ModuleRunner(module_cache=ModuleCache())
+
+
+@pytest.fixture
+def outliers():
+    modules = ModuleRegistry(MODULES_DIR).discover_modules()
+    return {"outlier_detection": modules["outlier_detection"]}
+
+
+def make_dataset(n_rows: int, seed: int = 3) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    dataset = pd.DataFrame(
+        {
+            "id": np.arange(1, n_rows + 1),
+            "value": rng.normal(100, 10, n_rows),
+            "score": rng.normal(50, 5, n_rows),
+            "count": rng.integers(0, 20, n_rows),
+        }
+    )
+    dataset.loc[::37, "value"] *= 3
+    dataset.loc[5::41, "score"] = np.nan
+    return dataset
+
+
+def chunks_of(dataset: pd.DataFrame, size: int) -> list[pd.DataFrame]:
+    return [
+        dataset.iloc[start : start + size] for start in range(0, len(dataset), size)
+    ]
+
+
+def test_two_passes_match_an_in_memory_run(runner, outliers):
+    dataset = make_dataset(180)
+    chunks = chunks_of(dataset, 50)
+
+    chunked, _ = runner.run_modules_chunked(
+        outliers, iter(chunks), rescan=lambda: iter(chunks)
+    )
+    expected, _ = runner.run_modules(outliers, dataset)
+
+    result = chunked["outlier_detection"]
+    reference = expected["outlier_detection"]
+    assert result["summary"] == reference["summary"]
+    for column, found in reference["outliers_by_column"].items():
+        for method, details in found["methods"].items():
+            actual = result["outliers_by_column"][column]["methods"][method]
+            assert actual["outliers"] == details["outliers"]
+            for key in ("bounds", "statistics"):
+                if key in details:
+                    assert actual[key] == pytest.approx(details[key])
+    assert result["summary"]["total_unique_outliers"] > 0
+
+
+def test_state_and_scan_stay_bounded(runner, outliers):
+    module_info = outliers["outlier_detection"]
+
+    def passes(dataset):
+        states, errors = runner.fold_chunks(outliers, chunks_of(dataset, 1000))
+        assert not errors
+        scans, errors = runner.scan_states(
+            outliers, states, lambda: chunks_of(dataset, 1000)
+        )
+        assert not errors
+        return states["outlier_detection"], scans["outlier_detection"]
+
+    small_state, _ = passes(make_dataset(2_000))
+    state, scan = passes(make_dataset(20_000))
+    size = len(json.dumps(encode_state(state), cls=NumpyJSONEncoder))
+    small_size = len(json.dumps(encode_state(small_state), cls=NumpyJSONEncoder))
+
+    # Moments and sketches only, not one entry per row
+    assert size < 2 * small_size
+    # The scan keeps just the rows outside some column's bounds
+    result = runner.finalize_state(module_info, state, scan)
+    candidates = sum(len(index) for index in scan["index"])
+    assert candidates == result["summary"]["total_unique_outliers"] < 20_000 // 10
+
+
+def test_second_pass_needs_the_chunks_again(runner, outliers):
+    chunks = chunks_of(make_dataset(100), 50)
+
+    results, _ = runner.run_modules_chunked(outliers, iter(chunks))
+
+    assert "second pass" in results["outlier_detection"]["error"]
+
+
+def test_finalize_without_a_scan_fails(runner, outliers):
+    states, _ = runner.fold_chunks(outliers, chunks_of(make_dataset(100), 50))
+
+    with pytest.raises(ValueError, match="second pass"):
+        runner.finalize_state(
+            outliers["outlier_detection"], states["outlier_detection"]
+        )
@@ -0,0 +1,141 @@
+"""Tests for the analysis server and the datasets it keeps between requests."""
+
+import json
+import threading
+
+import pandas as pd
+import pytest
+
+from src import server as server_module
+from src.core.data_loader import DataLoader
+from src.core.dataset_cache import DatasetCache
+from src.main import build_output, main
+from src.server import AnalysisServer, request_analysis
+
+
+def write_dataset(path, n_records):
+    records = [{"id": i, "value": float(i), "label": f"r{i}"} for i in range(n_records)]
+    path.write_text(json.dumps(records))
+    return path
+
+
+def dataset_bytes(path):
+    dataset = DataLoader(path.parent, use_columnar_cache=False).load_file(path)
+    return int(dataset.memory_usage(deep=True).sum())
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    for name in ("a", "b", "c"):
+        write_dataset(data_dir / f"{name}.json", 100)
+    return data_dir
+
+
+@pytest.fixture
+def start_server(tmp_path, make_module, data_dir):
+    """Start a server on a Unix socket, answering from a background thread."""
+    modules_dir = tmp_path / "modules"
+    make_module(modules_dir / "counting")
+    started = []
+
+    def start(dataset_cache_bytes: int = 1 << 30) -> AnalysisServer:
+        server = AnalysisServer(
+            tmp_path / "server.sock",
+            modules_dir,
+            data_dir,
+            max_workers=2,
+            dataset_cache_bytes=dataset_cache_bytes,
+        )
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        started.append(server)
+        return server
+
+    yield start
+    for server in started:
+        server.shutdown()
+        server.server_close()
+
+
+def test_request_gets_the_output_document(start_server, data_dir):
+    server = start_server()
+
+    response = request_analysis(server.socket_path, data_dir / "a.json")
+
+    expected = build_output(
+        {"counting": {"records": 100}}, {"total_records": 100, "cached_modules": []}
+    )
+    assert response.keys() == expected.keys()
+    metadata = response["analysis_metadata"]
+    assert metadata.keys() == expected["analysis_metadata"].keys()
+    assert metadata["dataset_records"] == 100
+    assert (metadata["modules_executed"], metadata["modules_failed"]) == (1, 0)
+    counting = response["modules"]["counting"]
+    assert counting["status"] == "SUCCESS"
+    assert counting["result"]["records"] == 100
+
+
+def test_second_request_reuses_the_parsed_dataset(start_server, data_dir):
+    server = start_server()
+
+    for _ in range(2):
+        response = request_analysis(
+            server.socket_path, data_dir / "a.json", ["counting"]
+        )
+        assert response["modules"]["counting"]["result"]["records"] == 100
+
+    stats = server.data_loader.cache.stats
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+
+
+def test_unknown_module_gets_an_error_response(start_server, data_dir):
+    server = start_server()
+
+    response = request_analysis(server.socket_path, data_dir / "a.json", ["missing"])
+
+    assert response == {"error": "Unknown modules requested: ['missing']"}
+
+
+def test_request_without_a_dataset_is_rejected(start_server):
+    server = start_server()
+
+    with pytest.raises(ValueError, match="dataset"):
+        server.analyze({"modules": ["counting"]})
+
+
+def test_server_evicts_least_recently_used_datasets(start_server, data_dir):
+    budget = int(2.5 * dataset_bytes(data_dir / "a.json"))
+    server = start_server(dataset_cache_bytes=budget)
+
+    # "a" is used again before "c" arrives, so "b" is the one evicted
+    for name in ("a", "b", "a", "c", "a"):
+        request_analysis(server.socket_path, data_dir / f"{name}.json")
+
+    stats = server.data_loader.cache.stats
+    assert (stats.hits, stats.misses, stats.evictions) == (2, 3, 1)
+    assert stats.entries == 2
+    assert stats.current_bytes <= budget
+    request_analysis(server.socket_path, data_dir / "b.json")
+    assert server.data_loader.cache.stats.misses == 4
+
+
+def test_cache_keeps_datasets_larger_than_its_budget_out(data_dir):
+    cache = DatasetCache(max_bytes=dataset_bytes(data_dir / "a.json") // 2)
+    loader = DataLoader(data_dir, cache=cache)
+
+    first = loader.load_file(data_dir / "a.json")
+    second = loader.load_file(data_dir / "a.json")
+
+    pd.testing.assert_frame_equal(first, second)
+    stats = cache.stats
+    assert (stats.misses, stats.entries, stats.current_bytes) == (2, 0, 0)
+
+
+def test_dataset_cache_mb_sets_the_server_budget(monkeypatch, tmp_path):
+    calls = []
+    monkeypatch.setattr(server_module, "serve", lambda **kwargs: calls.append(kwargs))
+
+    main(["--serve", "--dataset-cache-mb", "3", "--socket", str(tmp_path / "s")])
+
+    assert calls[0]["dataset_cache_bytes"] == 3 * 1024 * 1024
@@ -0,0 +1,154 @@
+"""Tests for sharded analysis with shard workers and a coordinator."""
+
+import json
+import math
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.core.data_loader import DataLoader
+from src.core.module_registry import ModuleRegistry
+from src.core.module_runner import ModuleRunner
+from src.core.serialization import NumpyJSONEncoder, decode_state, encode_state
+from src.shard import ShardWorker, run_sharded
+
+MODULES_DIR = Path(__file__).parents[1] / "src" / "modules"
+
+
+def make_records(n_records: int, seed: int = 0) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    values = rng.normal(50, 10, n_records)
+    values[::53] *= 4
+    return [
+        {
+            "id": i + 1,
+            "value": round(float(values[i]), 6),
+            "category": "ABC"[i % 3],
+            "score": round(float(rng.uniform(0, 100)), 6),
+            "count": int(rng.integers(0, 20)),
+            "flag": bool(i % 2),
+            "timestamp": f"2024-01-01T00:00:{i % 60:02d}.000",
+        }
+        for i in range(n_records)
+    ]
+
+
+def write_shard(path: Path, records: list[dict]) -> Path:
+    path.write_text(json.dumps(records))
+    return path
+
+
+def encoded_size(document: dict) -> int:
+    return len(json.dumps(document, cls=NumpyJSONEncoder))
+
+
+def assert_close(actual, expected, path="result"):
+    """Compare results, allowing floating-point rounding of merged moments."""
+    if isinstance(expected, dict):
+        assert set(actual) == set(expected), path
+        for key in expected:
+            assert_close(actual[key], expected[key], f"{path}.{key}")
+    elif isinstance(expected, list):
+        assert len(actual) == len(expected), path
+        for i, (a, e) in enumerate(zip(actual, expected, strict=True)):
+            assert_close(a, e, f"{path}[{i}]")
+    elif isinstance(expected, float) and math.isnan(expected):
+        assert math.isnan(actual), path
+    elif isinstance(expected, float):
+        assert actual == pytest.approx(expected, rel=1e-9, abs=1e-9), path
+    else:
+        assert actual == expected, path
+
+
+@pytest.fixture
+def workers(tmp_path):
+    """Start workers serving shards in background threads."""
+    started = []
+
+    def start(*shards: Path) -> list[str]:
+        addresses = []
+        for i, shard in enumerate(shards):
+            address = str(tmp_path / f"worker-{i}.sock")
+            worker = ShardWorker(address, shard, MODULES_DIR, chunk_bytes=4096)
+            threading.Thread(target=worker.serve_forever, daemon=True).start()
+            started.append(worker)
+            addresses.append(address)
+        return addresses
+
+    yield start
+    for worker in started:
+        worker.shutdown()
+        worker.server_close()
+
+
+def test_two_workers_match_a_single_process_run(tmp_path, workers):
+    records = make_records(150)
+    whole = write_shard(tmp_path / "whole.json", records)
+    shards = [
+        write_shard(tmp_path / "part-0.json", records[:90]),
+        write_shard(tmp_path / "part-1.json", records[90:]),
+    ]
+    modules = ModuleRegistry(MODULES_DIR).discover_modules()
+
+    results, dataset_info = run_sharded(workers(*shards), modules)
+    expected, _ = ModuleRunner().run_modules(
+        modules, DataLoader(tmp_path).load_file(whole)
+    )
+
+    assert dataset_info["total_records"] == 150
+    assert [shard["records"] for shard in dataset_info["shards"]] == [90, 60]
+    assert not any("error" in result for result in results.values())
+    assert results["outlier_detection"]["summary"]["total_unique_outliers"] > 0
+    assert_close(results, expected)
+
+
+@pytest.fixture
+def worker(tmp_path):
+    """A worker that is asked directly, without a connection."""
+    started = []
+
+    def start(n_records: int) -> ShardWorker:
+        shard = write_shard(
+            tmp_path / f"shard-{n_records}.json", make_records(n_records)
+        )
+        address = str(tmp_path / f"shard-{n_records}.sock")
+        started.append(ShardWorker(address, shard, MODULES_DIR))
+        return started[-1]
+
+    yield start
+    for started_worker in started:
+        started_worker.server_close()
+
+
+def test_summaries_do_not_grow_with_the_shard(worker):
+    request = {"op": "analyze", "first_record": 0}
+
+    small = worker(5_000).handle_request_document(request)
+    large = worker(50_000).handle_request_document(request)
+
+    assert not small["errors"] and not large["errors"]
+    assert large["records"] == 10 * small["records"]
+    assert encoded_size(large) < 1.5 * encoded_size(small)
+
+
+def test_second_phase_returns_only_candidate_rows(worker):
+    shard_worker = worker(20_000)
+    module_info = shard_worker.modules["outlier_detection"]
+    runner = ModuleRunner()
+    response = shard_worker.handle_request_document(
+        {"op": "analyze", "modules": ["outlier_detection"]}
+    )
+    state = decode_state(response["states"]["outlier_detection"])
+    scan = encode_state(runner.init_scan(module_info, state))
+
+    response = shard_worker.handle_request_document(
+        {"op": "scan", "scans": {"outlier_detection": scan}, "first_record": 0}
+    )
+    scanned = decode_state(response["scans"]["outlier_detection"])
+    result = runner.finalize_state(module_info, state, scanned)
+
+    candidates = sum(len(index) for index in scanned["index"])
+    assert candidates == result["summary"]["total_unique_outliers"]
+    assert candidates < 20_000 // 10
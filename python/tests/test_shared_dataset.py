@@ -0,0 +1,198 @@
+"""Tests for sharing the dataset with worker processes through shared memory."""
+
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.parallel_runner import ParallelModuleRunner
+from src.core.shared_dataset import SharedDataset, SharedDatasetHandle
+
+SHM_DIR = Path("/dev/shm")
+
+CRASHING_ENGINE = """
+import os
+
+
+def analyze(dataset, model, config):
+    os._exit(1)
+"""
+
+# Shares a dataset, reports its segments and then ends without closing it
+OWNER_SCRIPT = """
+import os
+import signal
+import sys
+
+import pandas as pd
+
+from src.core.shared_dataset import SharedDataset
+
+shared = SharedDataset(pd.DataFrame({"value": [1.0, 2.0], "label": ["a", "b"]}))
+print(" ".join(column.shm_name for column in shared.handle.columns), flush=True)
+if sys.argv[1] == "kill":
+    os.kill(os.getpid(), signal.SIGKILL)
+"""
+
+SUMMING_ENGINE = """
+def analyze(dataset, model, config):
+    return {"total": float(dataset["value"].sum())}
+"""
+
+
+@pytest.fixture
+def dataset():
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=1000)
+    values[::7] = np.nan
+    return pd.DataFrame(
+        {
+            "id": np.arange(1000, dtype="int64"),
+            "value": values,
+            "flag": rng.random(1000) > 0.5,
+            "timestamp": pd.date_range("2024-01-01", periods=1000, freq="min"),
+            "category": pd.Categorical(rng.choice(["A", "B", "C"], size=1000)),
+            "label": rng.choice(["x", "y", None], size=1000),
+        }
+    )
+
+
+def inspect_in_worker(
+    handle: SharedDatasetHandle, expected: pd.DataFrame
+) -> dict[str, bool]:
+    """Attach to the shared dataset and check it against the original frame."""
+    attached = handle.attach()
+    try:
+        pd.testing.assert_frame_equal(attached.dataset, expected)
+        buffers = [
+            np.frombuffer(segment.buf, dtype=np.uint8) for segment in attached._segments
+        ]
+        views = {}
+        for name in ["id", "value", "flag", "timestamp"]:
+            values = attached.dataset[name].to_numpy()
+            views[name] = not values.flags.writeable and any(
+                np.shares_memory(values, buffer) for buffer in buffers
+            )
+        del buffers, values
+        return views
+    finally:
+        attached.close()
+
+
+def run_owner(how: str) -> tuple[list[str], str]:
+    """Run a process owning a shared dataset; return its segments and stderr."""
+    owner = subprocess.run(
+        [sys.executable, "-c", OWNER_SCRIPT, how],
+        cwd=Path(__file__).parents[1],
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    return owner.stdout.split(), owner.stderr
+
+
+def wait_until_unlinked(names: list[str], timeout: float = 10.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while any(segment_exists(name) for name in names):
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.05)
+    return True
+
+
+def segment_exists(name: str) -> bool:
+    try:
+        segment = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return False
+    segment.close()
+    return True
+
+
+def shared_segments() -> set[str]:
+    return {path.name for path in SHM_DIR.glob("psm_*")}
+
+
+def test_workers_see_identical_data_without_a_copy(dataset):
+    with SharedDataset(dataset) as shared:
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            futures = [
+                executor.submit(inspect_in_worker, shared.handle, dataset)
+                for _ in range(2)
+            ]
+            reports = [future.result() for future in futures]
+        # Detaching in the workers leaves the segments to their owner
+        names = [column.shm_name for column in shared.handle.columns]
+        assert all(segment_exists(name) for name in names)
+
+    # Numeric columns are read-only views over the shared segments
+    for report in reports:
+        assert report == dict.fromkeys(["id", "value", "flag", "timestamp"], True)
+
+
+def test_worker_rebuilds_a_shared_index(dataset):
+    dataset = dataset.set_index(dataset["id"] * 10).iloc[::-1]
+
+    with SharedDataset(dataset) as shared:
+        assert not isinstance(shared.handle.index, range)
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            executor.submit(inspect_in_worker, shared.handle, dataset).result()
+
+
+def test_segments_are_unlinked_on_close(dataset):
+    shared = SharedDataset(dataset)
+    names = [column.shm_name for column in shared.handle.columns]
+    assert all(segment_exists(name) for name in names)
+
+    shared.close()
+
+    assert not any(segment_exists(name) for name in names)
+
+
+def test_segments_are_unlinked_when_collected(dataset):
+    shared = SharedDataset(dataset)
+    names = [column.shm_name for column in shared.handle.columns]
+
+    del shared
+
+    assert not any(segment_exists(name) for name in names)
+
+
+@pytest.mark.skipif(not SHM_DIR.is_dir(), reason="needs /dev/shm")
+@pytest.mark.parametrize(
+    ("engine", "failed"), [(SUMMING_ENGINE, False), (CRASHING_ENGINE, True)]
+)
+def test_runner_unlinks_segments_after_its_workers_exit(
+    dataset, make_module, tmp_path, engine, failed
+):
+    module_info = make_module(tmp_path / "modules" / "worker", engine)
+    before = shared_segments()
+
+    results, _ = ParallelModuleRunner(max_workers=1).run_modules(
+        {"worker": module_info}, dataset
+    )
+
+    assert ("error" in results["worker"]) is failed
+    assert shared_segments() <= before
+
+
+def test_segments_are_unlinked_at_interpreter_exit():
+    names, stderr = run_owner("exit")
+
+    assert names
+    assert not any(segment_exists(name) for name in names)
+    # Released by the finalizer, so the resource tracker found nothing left
+    assert "leaked" not in stderr
+
+
+def test_resource_tracker_unlinks_segments_of_a_killed_owner():
+    names, _ = run_owner("kill")
+
+    assert names
+    assert wait_until_unlinked(names)
@@ -0,0 +1,75 @@
+"""Tests for the shared sorted order of the numeric columns."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.prepared import PreparedDataset
+from src.core.sorted_index import average_ranks, linear_quantile, sorted_median
+
+QUANTILES = [0.0, 0.1, 0.25, 0.3, 0.5, 0.75, 0.9, 1.0]
+
+
+def random_frame(rng, n_rows):
+    """Floats with missing values and ties, wide and small-range integers."""
+    floats = np.round(rng.normal(size=n_rows), 1)
+    floats[rng.random(n_rows) < 0.2] = np.nan
+    return pd.DataFrame(
+        {
+            "float": floats,
+            "wide_int": rng.integers(-(10**12), 10**12, n_rows),
+            "small_int": rng.integers(-300, 300, n_rows),
+            "empty": np.full(n_rows, np.nan),
+            "integral": rng.integers(0, 9, n_rows).astype("float64"),
+        }
+    )
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("n_rows", [0, 1, 2, 501])
+def test_order_sorts_like_a_stable_argsort(seed, n_rows):
+    frame = random_frame(np.random.default_rng(seed), n_rows)
+    index = PreparedDataset(frame).sorted_index
+
+    for column in frame.columns:
+        values = frame[column].to_numpy(dtype="float64")
+        expected = np.argsort(values, kind="stable")
+        np.testing.assert_array_equal(index.order(column), expected)
+        present = np.flatnonzero(~np.isnan(values[expected]))
+        np.testing.assert_array_equal(index.sorted_positions(column), expected[present])
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("n_rows", [0, 1, 2, 4, 501])
+def test_order_statistics_match_pandas_exactly(seed, n_rows):
+    frame = random_frame(np.random.default_rng(seed), n_rows)
+    index = PreparedDataset(frame).sorted_index
+
+    for column in frame.columns:
+        series = frame[column]
+        positions = index.sorted_positions(column)
+        sorted_values = series.to_numpy()[positions]
+        values = series.dropna()
+
+        for q in QUANTILES:
+            expected = values.quantile(q)
+            actual = linear_quantile(sorted_values, q)
+            assert actual == expected or (np.isnan(actual) and np.isnan(expected))
+        median = sorted_median(sorted_values)
+        assert median == values.median() or (np.isnan(median) and values.empty)
+        ranks = np.empty(len(series))
+        ranks[positions] = average_ranks(sorted_values)
+        np.testing.assert_array_equal(ranks[np.sort(positions)], values.rank())
+
+
+def test_sorted_positions_of_a_row_subset():
+    frame = random_frame(np.random.default_rng(5), 200)
+    prepared = PreparedDataset(frame)
+    rows = prepared.complete_rows(["float", "small_int"])
+
+    positions = prepared.sorted_index.sorted_positions("small_int", rows)
+
+    subset = frame.loc[rows, "small_int"]
+    np.testing.assert_array_equal(
+        frame.index[positions], subset.sort_values(kind="stable").index
+    )
@@ -0,0 +1,115 @@
+"""Tests for running modules over a stream of micro-batches."""
+
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.module_cache import ModuleCache
+from src.core.module_registry import ModuleRegistry
+from src.core.module_runner import ModuleRunner
+from src.core.stream_runner import StreamingRunner
+
+MODULES_DIR = Path(__file__).parents[1] / "src" / "modules"
+
+# A module with only the analyze function, which runs on windows
+WINDOW_ENGINE = """
+def analyze(dataset, model, config):
+    return {"records": len(dataset)}
+"""
+
+
+@pytest.fixture
+def runner():
+    return ModuleRunner(module_cache=ModuleCache())
+
+
+@pytest.fixture
+def modules(make_module, tmp_path):
+    counting = make_module(tmp_path / "modules" / "counting")
+    window = make_module(tmp_path / "modules" / "window", WINDOW_ENGINE)
+    return {"counting": counting, "window": window}
+
+
+def batches_of(sizes: list[int]) -> list[pd.DataFrame]:
+    starts = np.cumsum([0, *sizes])
+    return [
+        pd.DataFrame({"value": np.arange(start, stop, dtype="float64")})
+        for start, stop in zip(starts[:-1], starts[1:], strict=True)
+    ]
+
+
+def test_emissions_cover_every_record_seen(runner, modules):
+    streaming = StreamingRunner(runner, emit_every=2)
+
+    emitted = list(streaming.run(modules, batches_of([3, 4, 5, 6, 7])))
+
+    assert [results["counting"]["records"] for results, _ in emitted] == [7, 18, 25]
+    # Modules without the chunked contract see the batches since the last emission
+    assert [results["window"]["records"] for results, _ in emitted] == [7, 11, 7]
+    assert [(w.first_record, w.records, w.records_seen) for _, w in emitted] == [
+        (0, 7, 7),
+        (7, 11, 18),
+        (18, 7, 25),
+    ]
+
+
+def test_final_emission_matches_an_in_memory_run(runner):
+    modules = ModuleRegistry(MODULES_DIR).discover_modules()
+    dataset = pd.read_json(Path(__file__).parents[1] / "data" / "sample_data.json")
+    batches = [dataset.iloc[start : start + 30] for start in range(0, len(dataset), 30)]
+
+    *_, (streamed, window) = StreamingRunner(runner, emit_every=2).run(modules, batches)
+    expected, _ = runner.run_modules(modules, dataset)
+    # Modules with a second pass cannot read the stream twice, so they
+    # report on the last window only
+    scanned = [name for name, info in modules.items() if runner.needs_scan(info)]
+    last_window, _ = runner.run_modules(
+        {name: modules[name] for name in scanned},
+        dataset.iloc[window.first_record :],
+    )
+
+    assert scanned == ["outlier_detection"]
+    assert window.records_seen == len(dataset)
+    assert streamed == {**expected, **last_window}
+
+
+def test_interval_emits_while_the_stream_is_idle(runner, modules):
+    resumed = threading.Event()
+
+    def stream():
+        first, second = batches_of([2, 3])
+        yield first
+        # Only continue once results for the first batch have been emitted
+        assert resumed.wait(timeout=10)
+        yield second
+
+    emitted = []
+    for results, window in StreamingRunner(runner, emit_interval=0.05).run(
+        {"counting": modules["counting"]}, stream()
+    ):
+        emitted.append((results["counting"]["records"], window.batches))
+        resumed.set()
+
+    assert emitted == [(2, 1), (5, 1)]
+
+
+def test_interval_only_caps_the_window(runner, modules):
+    streaming = StreamingRunner(runner, emit_interval=3600, max_window_batches=2)
+
+    emitted = list(streaming.run(modules, batches_of([1] * 5)))
+
+    assert [window.batches for _, window in emitted] == [2, 2, 1]
+    assert [results["counting"]["records"] for results, _ in emitted] == [2, 4, 5]
+
+
+def test_window_is_not_kept_for_chunked_modules_alone(runner, modules):
+    streaming = StreamingRunner(runner, emit_interval=3600, max_window_batches=2)
+
+    emitted = list(
+        streaming.run({"counting": modules["counting"]}, batches_of([1] * 5))
+    )
+
+    assert [window.batches for _, window in emitted] == [5]